@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Capability search matching/scoring benchmark.
+
+Builds a synthetic catalog of ``--records`` capability records and times, per query,
+the historical linear path (``_search_matches`` + ``_score_item_tokens`` over every
+record) against ``CapabilitySearchIndex.query`` on an already-synced index.
+
+Usage:
+    PYTHONPATH=src python scripts/bench/capability_search_bench.py [--records 5000] [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from cccc.daemon.ops.capability_ops._remote import _tokenize_search_text
+from cccc.daemon.ops.capability_ops._search import _score_item_tokens, _search_fields, _search_matches
+from cccc.daemon.ops.capability_ops._search_index import CapabilitySearchIndex
+
+_WORDS = (
+    "github gitlab postgres mysql redis kafka browser playwright slack discord notion linear jira "
+    "calendar email search crawler scraper vector embedding pdf image audio video terminal shell "
+    "docker kubernetes terraform aws azure gcp stripe sentry grafana metrics logs tracing finance "
+    "weather maps translate summarize database filesystem memory notes tasks review deploy"
+).split()
+_QUERIES = ["github", "postgres database", "brows", "kube", "mcp server", "pdf summarize", "zzzz-none", "vector embed"]
+
+
+def _corpus(n: int) -> List[Dict[str, Any]]:
+    rng = random.Random(7)
+    out = []
+    for i in range(n):
+        words = rng.sample(_WORDS, 6)
+        out.append(
+            {
+                "capability_id": f"mcp:{words[0]}-{words[1]}-{i}",
+                "kind": "mcp_toolpack",
+                "name": f"{words[0].title()} {words[1]}",
+                "description_short": " ".join(rng.sample(_WORDS, 12)),
+                "tags": words[2:4],
+                "tool_names": [f"{w}_run" for w in words[4:]],
+                "use_when": [" ".join(rng.sample(_WORDS, 5))],
+            }
+        )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    records = _corpus(max(1, args.records))
+    started = time.perf_counter()
+    index = CapabilitySearchIndex(_search_fields)
+    index.sync(lambda: records, signature=("bench",))
+    print(json.dumps({"records": len(records), "build_ms": round((time.perf_counter() - started) * 1000, 1)}))
+
+    for query in _QUERIES:
+        tokens = _tokenize_search_text(query)
+        linear: List[float] = []
+        indexed: List[float] = []
+        for _ in range(max(1, args.rounds)):
+            t0 = time.perf_counter()
+            hits = [r for r in records if _search_matches(query, r)]
+            for r in hits:
+                _score_item_tokens(r, tokens)
+            linear.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            index.sync(lambda: records, signature=("bench",))
+            result = index.query(query, score_tokens=tokens, relevance_tokens=tokens)
+            indexed.append(time.perf_counter() - t0)
+        assert len(result.matched or ()) == len(hits), query
+        print(
+            json.dumps(
+                {
+                    "query": query,
+                    "matches": len(hits),
+                    "linear_ms": round(statistics.median(linear) * 1000, 2),
+                    "index_ms": round(statistics.median(indexed) * 1000, 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Cron next-fire benchmark.
+
+Compares the historical minute-stepping search (up to 366*24*60 ``_cron_matches``
+calls per rule) with the field-wise solver in ``daemon.automation.engine`` over a
+corpus of cron expressions and time zones. The solver is timed with its
+(expr, tz, minute) cache cleared before every call, so the numbers reflect cold
+solves; a warm-cache pass is reported separately.
+
+Usage:
+    PYTHONPATH=src python scripts/bench/cron_next_fire_bench.py [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from cccc.daemon.automation import engine
+from cccc.daemon.automation.engine import _compile_cron, _cron_matches, _cron_next_fire_utc
+
+CORPUS = [
+    "* * * * *",
+    "*/5 * * * *",
+    "0 * * * *",
+    "30 9 * * 1-5",
+    "0 9,13,17 * * *",
+    "0 0 * * 0",
+    "15 2 * * *",
+    "0 0 1 * *",
+    "0 0 1 1 *",
+    "0 12 25 12 *",
+    "0 0 29 2 *",
+    "0 0 30 2 *",
+    "0 0 31 4,6,9,11 *",
+]
+ZONES = ["UTC", "America/New_York", "Europe/Berlin", "Asia/Shanghai", "Australia/Sydney"]
+
+
+def _legacy_next_fire_utc(*, cron_expr: str, tz_name: str, now_utc: datetime) -> Optional[datetime]:
+    spec = _compile_cron(cron_expr)
+    tz = ZoneInfo(str(tz_name or "UTC"))
+    now_local = now_utc.astimezone(tz)
+    cursor = now_local.replace(second=0, microsecond=0)
+    if now_local > cursor:
+        cursor = cursor + timedelta(minutes=1)
+
+    for _ in range(366 * 24 * 60):
+        if _cron_matches(spec, cursor):
+            return cursor.astimezone(timezone.utc)
+        cursor = cursor + timedelta(minutes=1)
+    return None
+
+
+def _solver_cold(**kwargs) -> Optional[datetime]:
+    engine._CRON_NEXT_FIRE_CACHE.clear()
+    return _cron_next_fire_utc(**kwargs)
+
+
+def _time_one(fn, expr: str, tz_name: str, now: datetime, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(cron_expr=expr, tz_name=tz_name, now_utc=now)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    repeat = max(1, int(args.repeat))
+    now = datetime(2026, 3, 7, 12, 34, 56, tzinfo=timezone.utc)
+
+    print(f"{'expr':<22} {'legacy_ms':>10} {'solver_ms':>10} {'speedup':>9}")
+    total_legacy = 0.0
+    total_solver = 0.0
+    mismatches = 0
+    for expr in CORPUS:
+        legacy_s = 0.0
+        solver_s = 0.0
+        for tz_name in ZONES:
+            legacy_s += _time_one(_legacy_next_fire_utc, expr, tz_name, now, repeat)
+            solver_s += _time_one(_solver_cold, expr, tz_name, now, repeat)
+            expected = _legacy_next_fire_utc(cron_expr=expr, tz_name=tz_name, now_utc=now)
+            got = _solver_cold(cron_expr=expr, tz_name=tz_name, now_utc=now)
+            # The legacy search gives up after a year; the solver looks further ahead. Other
+            # differences are wall times inside a DST gap, which the legacy search reported
+            # although the tick loop never fires them.
+            if expected is not None and got != expected:
+                mismatches += 1
+                print(f"  differs: {expr!r} tz={tz_name} legacy={expected.isoformat()} solver={got.isoformat() if got else None}")
+        total_legacy += legacy_s
+        total_solver += solver_s
+        print(f"{expr:<22} {legacy_s * 1000:>10.2f} {solver_s * 1000:>10.3f} {legacy_s / max(solver_s, 1e-9):>8.0f}x")
+
+    engine._CRON_NEXT_FIRE_CACHE.clear()
+    for expr in CORPUS:
+        for tz_name in ZONES:
+            _cron_next_fire_utc(cron_expr=expr, tz_name=tz_name, now_utc=now)
+    started = time.perf_counter()
+    for expr in CORPUS:
+        for tz_name in ZONES:
+            _cron_next_fire_utc(cron_expr=expr, tz_name=tz_name, now_utc=now)
+    warm_s = time.perf_counter() - started
+
+    print()
+    print(f"total legacy: {total_legacy * 1000:.1f} ms  solver (cold): {total_solver * 1000:.2f} ms  speedup: {total_legacy / max(total_solver, 1e-9):.0f}x")
+    print(f"solver (warm cache) for {len(CORPUS) * len(ZONES)} rules: {warm_s * 1000:.3f} ms")
+    print(f"mismatches vs legacy: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Daemon request-ingestion load test.
+
+Starts an in-process daemon socket (unix) whose requests are answered by a small
+thread pool, then fires ``--clients`` concurrent clients at it. ``--slow`` of them
+send half a request line, stall for ``--stall-ms`` and then finish it. Reports p50/p99
+round-trip latency of the well-behaved clients for two ingestion loops:
+
+- ``serial``: the historical accept loop (``handle_incoming_connection`` reads each
+  request line on the accept thread, bounded by ``REQUEST_READ_TIMEOUT_S``).
+- ``reactor``: ``RequestFrameReactor`` reading all connections concurrently.
+
+Usage:
+    PYTHONPATH=src python scripts/bench/daemon_ingest_bench.py [--clients 200] [--slow 20] [--stall-ms 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cccc.contracts.v1 import DaemonError, DaemonRequest, DaemonResponse
+from cccc.daemon.ops.socket_accept_ops import dispatch_incoming_request, handle_incoming_connection
+from cccc.daemon.ops.socket_reactor_ops import RequestFrameReactor
+from cccc.daemon.socket_protocol_ops import dump_response, recv_json_line, send_json
+
+LOG = logging.getLogger("bench")
+
+
+def _routing_kwargs(pool: ThreadPoolExecutor) -> Dict[str, Any]:
+    def run(req: Any, conn: Any) -> None:
+        try:
+            send_json(conn, dump_response(DaemonResponse(ok=True, result={"n": req.args.get("n")})))
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def schedule(req: Any, conn: Any) -> bool:
+        pool.submit(run, req, conn)
+        return True
+
+    return {
+        "parse_request": DaemonRequest.model_validate,
+        "make_invalid_request_error": lambda err: DaemonResponse(
+            ok=False, error=DaemonError(code="invalid_request", message="invalid request", details={"error": err})
+        ),
+        "send_json": send_json,
+        "dump_response": dump_response,
+        "try_handle_special": lambda _req, _conn: False,
+        "handle_request": lambda _req: (DaemonResponse(ok=True, result={}), False),
+        "schedule_request": schedule,
+        "logger": LOG,
+    }
+
+
+def _serve_serial(server: socket.socket, stop: threading.Event, kwargs: Dict[str, Any]) -> None:
+    server.settimeout(0.2)
+    while not stop.is_set():
+        try:
+            conn, _ = server.accept()
+        except socket.timeout:
+            continue
+        except OSError:
+            return
+        handle_incoming_connection(conn, recv_json_line=recv_json_line, **kwargs)
+
+
+def _serve_reactor(server: socket.socket, stop: threading.Event, kwargs: Dict[str, Any]) -> None:
+    RequestFrameReactor(
+        server,
+        on_frame=lambda conn, raw: dispatch_incoming_request(conn, raw, **kwargs),
+        stop_event=stop,
+        logger=LOG,
+    ).run()
+
+
+def _client(sock_path: Path, n: int, stall_s: float) -> Optional[float]:
+    line = (json.dumps({"v": 1, "op": "ping", "args": {"n": n}}) + "\n").encode("utf-8")
+    started = time.perf_counter()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as c:
+            c.settimeout(10.0)
+            c.connect(str(sock_path))
+            if stall_s > 0:
+                c.sendall(line[:10])
+                time.sleep(stall_s)
+                c.sendall(line[10:])
+            else:
+                c.sendall(line)
+            buf = b""
+            while b"\n" not in buf:
+                chunk = c.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        if not json.loads(buf.split(b"\n", 1)[0] or b"{}").get("ok"):
+            return None
+    except (OSError, ValueError):
+        return None
+    return time.perf_counter() - started
+
+
+def _run(mode: str, clients: int, slow: int, stall_s: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as td:
+        sock_path = Path(td) / "bench.sock"
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen(512)
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=8)
+        target = _serve_serial if mode == "serial" else _serve_reactor
+        thread = threading.Thread(target=target, args=(server, stop, _routing_kwargs(pool)), daemon=True)
+        thread.start()
+
+        # Spread slow clients evenly through the burst.
+        stride = max(1, clients // max(1, slow)) if slow else clients + 1
+        barrier = threading.Barrier(clients)
+        results: List[Optional[float]] = [None] * clients
+        slow_ids = {i for i in range(clients) if slow and i % stride == 0 and i // stride < slow}
+
+        def worker(i: int) -> None:
+            barrier.wait()
+            results[i] = _client(sock_path, i, stall_s if i in slow_ids else 0.0)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+        wall = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - wall
+        stop.set()
+        thread.join(timeout=2)
+        server.close()
+        pool.shutdown(wait=True)
+
+    fast = sorted(r for i, r in enumerate(results) if i not in slow_ids and r is not None)
+    failed = sum(1 for r in results if r is None)
+    p99 = fast[min(len(fast) - 1, int(len(fast) * 0.99))] if fast else float("nan")
+    return {
+        "mode": mode,
+        "p50_ms": round(statistics.median(fast) * 1000, 2) if fast else None,
+        "p99_ms": round(p99 * 1000, 2),
+        "max_ms": round(fast[-1] * 1000, 2) if fast else None,
+        "failed": failed,
+        "wall_s": round(wall, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--slow", type=int, default=20)
+    parser.add_argument("--stall-ms", type=int, default=300)
+    parser.add_argument("--modes", default="serial,reactor")
+    args = parser.parse_args()
+
+    print(f"clients={args.clients} slow={args.slow} stall_ms={args.stall_ms}")
+    for mode in [m.strip() for m in str(args.modes).split(",") if m.strip()]:
+        print(json.dumps(_run(mode, max(1, args.clients), max(0, args.slow), max(0, args.stall_ms) / 1000.0)))
+
+
+if __name__ == "__main__":
+    main()
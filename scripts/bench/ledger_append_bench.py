@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Ledger append throughput benchmark.
+
+Seeds a ledger with N events (default 100k), builds its index once, then measures
+``append_event`` throughput in three modes:
+
+- ``legacy``: fresh sqlite connection per append, full schema DDL including dropping and
+  recreating the events indexes (the historical behaviour).
+- ``per_call``: fresh sqlite connection + schema verification per append.
+- ``pooled``: process-wide connection pool, schema verified once.
+
+Usage:
+    PYTHONPATH=src python scripts/bench/ledger_append_bench.py [--seed 100000] [--appends 2000] [--legacy-appends 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+from cccc.kernel import ledger_index
+from cccc.kernel.ledger import append_event
+from cccc.kernel.ledger_index import catch_up_ledger_index, close_ledger_index_connections
+
+
+def _seed_ledger(ledger_path: Path, count: int) -> None:
+    ledger_path.parent.mkdir(parents=True, exist_ok=True)
+    (ledger_path.parent / "state" / "ledger").mkdir(parents=True, exist_ok=True)
+    with ledger_path.open("w", encoding="utf-8") as handle:
+        for idx in range(count):
+            event = {
+                "v": 1,
+                "id": uuid.uuid4().hex,
+                "ts": f"2026-01-01T00:{(idx // 60) % 60:02d}:{idx % 60:02d}.000000Z",
+                "kind": "chat.message",
+                "group_id": "g_bench",
+                "scope_key": "",
+                "by": "user",
+                "data": {"text": f"seed message {idx}", "to": ["@all"]},
+            }
+            handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+    catch_up_ledger_index(ledger_path)
+
+
+def _append_loop(ledger_path: Path, *, appends: int, per_call: bool) -> float:
+    started = time.perf_counter()
+    for idx in range(appends):
+        if per_call:
+            close_ledger_index_connections(ledger_path)
+        append_event(
+            ledger_path,
+            kind="chat.message",
+            group_id="g_bench",
+            scope_key="",
+            by="user",
+            data={"text": f"bench message {idx}", "to": ["@all"]},
+        )
+    elapsed = time.perf_counter() - started
+    return appends / elapsed if elapsed > 0 else 0.0
+
+
+def _run(ledger_path: Path, *, mode: str, appends: int) -> float:
+    close_ledger_index_connections()
+    if mode == "pooled":
+        # Pay the one-time schema verification outside the timed loop.
+        catch_up_ledger_index(ledger_path)
+        return _append_loop(ledger_path, appends=appends, per_call=False)
+    if mode == "legacy":
+        rebuild = ledger_index._rebuild_events_indexes
+        with patch.object(ledger_index, "_rebuild_events_indexes", lambda conn, force=True: rebuild(conn, force=True)):
+            return _append_loop(ledger_path, appends=appends, per_call=True)
+    return _append_loop(ledger_path, appends=appends, per_call=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=100_000, help="events pre-seeded into the ledger")
+    parser.add_argument("--appends", type=int, default=2_000, help="appends measured for per_call/pooled")
+    parser.add_argument("--legacy-appends", type=int, default=20, help="appends measured for legacy (slow)")
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as td:
+        ledger_path = Path(td) / "g_bench" / "ledger.jsonl"
+        t0 = time.perf_counter()
+        _seed_ledger(ledger_path, max(0, int(args.seed)))
+        print(f"seeded {args.seed} events in {time.perf_counter() - t0:.1f}s")
+        results["legacy"] = _run(ledger_path, mode="legacy", appends=max(1, int(args.legacy_appends)))
+        results["per_call"] = _run(ledger_path, mode="per_call", appends=max(1, int(args.appends)))
+        results["pooled"] = _run(ledger_path, mode="pooled", appends=max(1, int(args.appends)))
+        close_ledger_index_connections()
+    for mode, rate in results.items():
+        print(f"{mode:>9}: {rate:,.1f} events/s")
+    if results["legacy"] > 0:
+        print(f"speedup (pooled vs legacy): {results['pooled'] / results['legacy']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
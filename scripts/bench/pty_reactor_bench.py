@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""PTY session scaling benchmark.
+
+Starts ``--sessions`` PTY sessions whose children are ``cat`` (an idle, echoing
+stand-in for an agent CLI) and reports, for this process:
+
+- threads and RSS before/after starting the sessions,
+- CPU time burned while every session sits idle for ``--idle-s`` seconds,
+- wall/CPU time for one echo round trip through every session.
+
+Run it on two revisions to compare per-session threads against the shared reactor.
+
+Usage:
+    PYTHONPATH=src python scripts/bench/pty_reactor_bench.py [--sessions 100] [--idle-s 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+from cccc.runners import pty as pty_runner
+
+
+def _rss_kb() -> int:
+    try:
+        for line in Path("/proc/self/status").read_text(encoding="utf-8").splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except Exception:
+        pass
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _snapshot() -> Dict[str, int]:
+    return {"threads": threading.active_count(), "rss_kb": _rss_kb()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--idle-s", type=float, default=5.0)
+    args = parser.parse_args()
+
+    before = _snapshot()
+    started = time.perf_counter()
+    sessions = [
+        pty_runner.PtySession(
+            group_id=f"g_bench{i // 6}",
+            actor_id=f"a{i % 6}",
+            cwd=Path.cwd(),
+            command=["cat"],
+            env={},
+        )
+        for i in range(max(1, args.sessions))
+    ]
+    start_ms = (time.perf_counter() - started) * 1000
+    time.sleep(0.5)
+    after = _snapshot()
+
+    cpu0 = time.process_time()
+    time.sleep(max(0.0, args.idle_s))
+    idle_cpu_ms = (time.process_time() - cpu0) * 1000
+
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    for i, session in enumerate(sessions):
+        session.write_input(f"echo-{i}\n".encode())
+    pending = set(range(len(sessions)))
+    deadline = time.monotonic() + 30.0
+    while pending and time.monotonic() < deadline:
+        for i in list(pending):
+            if f"echo-{i}".encode() in sessions[i].tail_output(max_bytes=4096):
+                pending.discard(i)
+        time.sleep(0.001)
+    echo_wall_ms = (time.perf_counter() - wall0) * 1000
+    echo_cpu_ms = (time.process_time() - cpu0) * 1000
+
+    for session in sessions:
+        session.stop()
+
+    print(
+        json.dumps(
+            {
+                "sessions": len(sessions),
+                "start_ms": round(start_ms, 1),
+                "threads_before": before["threads"],
+                "threads_after": after["threads"],
+                "rss_delta_kb": after["rss_kb"] - before["rss_kb"],
+                "idle_s": args.idle_s,
+                "idle_cpu_ms": round(idle_cpu_ms, 1),
+                "echo_wall_ms": round(echo_wall_ms, 1),
+                "echo_cpu_ms": round(echo_cpu_ms, 1),
+                "echo_missing": len(pending),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ from __future__ import annotations
 """IM bridge related CLI command handlers."""
 
 from .common import *  # noqa: F401,F403
+from ..daemon.im.im_bridge_ops import is_im_bridge_host_pid
+from ..ports.im.outbound import read_outbound_status
 from ..util.process import SOFT_TERMINATE_SIGNAL, best_effort_signal_pid, pid_is_alive, resolve_background_python_argv, supervised_process_popen_kwargs
 
 __all__ = [
@@ -197,7 +199,9 @@ def cmd_im_unset(args: argparse.Namespace) -> int:
         try:
             pid = int(pid_path.read_text(encoding="utf-8").strip())
             if pid > 0:
-                best_effort_signal_pid(pid, SOFT_TERMINATE_SIGNAL, include_group=True)
+                # A bridge host detaches this group once the pid file is removed.
+                if not is_im_bridge_host_pid(pid, pid_path):
+                    best_effort_signal_pid(pid, SOFT_TERMINATE_SIGNAL, include_group=True)
                 killed.add(pid)
         except Exception:
             pass
@@ -273,8 +277,10 @@ def _im_find_bridge_pids_by_script(group_id: str) -> list[int]:
                 # We support both historical entrypoints:
                 # - python -m cccc.ports.im.bridge <group_id> ...
                 # - python -m cccc.ports.im <group_id> ...
+                # Bridge hosts serve several groups and are stopped per group via the pid file.
                 if (
                     ("cccc.ports.im.bridge" in cmdline or "cccc.ports.im" in cmdline)
+                    and "cccc.ports.im.host" not in cmdline
                     and group_id in cmdline
                 ):
                     pids.append(pid)
@@ -308,6 +314,11 @@ def cmd_im_start(args: argparse.Namespace) -> int:
     if orphan_pids:
         _print_json({"ok": False, "error": {"code": "already_running", "message": f"bridge already running (pid={orphan_pids[0]})"}})
         return 2
+    # Drop a stale pid file so the one found after spawning belongs to this start.
+    try:
+        (group.path / "state" / "im_bridge.pid").unlink(missing_ok=True)
+    except Exception:
+        pass
 
     # Check IM config
     im_config = canonicalize_im_config(group.doc.get("im", {}))
@@ -416,9 +427,11 @@ def cmd_im_start(args: argparse.Namespace) -> int:
             })
             return 2
 
-        # Write PID file only after we know it stayed up.
+        # Write PID file only after we know it stayed up. A bridge that handed the group
+        # to a running bridge host has already pointed it at the host.
         pid_path = state_dir / "im_bridge.pid"
-        pid_path.write_text(str(proc.pid), encoding="utf-8")
+        if not pid_path.exists():
+            pid_path.write_text(str(proc.pid), encoding="utf-8")
 
         _print_json({"ok": True, "result": {"group_id": group_id, "platform": platform, "pid": proc.pid, "log": str(log_path)}})
         return 0
@@ -461,10 +474,12 @@ def cmd_im_stop(args: argparse.Namespace) -> int:
         try:
             pid = int(pid_path.read_text(encoding="utf-8").strip())
             if pid not in killed:
-                try:
-                    best_effort_signal_pid(pid, SOFT_TERMINATE_SIGNAL, include_group=True)
-                except Exception:
-                    pass
+                # A bridge host detaches this group once the pid file is removed.
+                if not is_im_bridge_host_pid(pid, pid_path):
+                    try:
+                        best_effort_signal_pid(pid, SOFT_TERMINATE_SIGNAL, include_group=True)
+                    except Exception:
+                        pass
                 killed.add(pid)
                 stopped += 1
         except Exception:
@@ -528,6 +543,8 @@ def cmd_im_status(args: argparse.Namespace) -> int:
         "running": running,
         "pid": pid,
         "subscribers": subscriber_count,
+        # Per-chat outbound queue depth and lag, as last published by the bridge.
+        "outbound": read_outbound_status(_im_group_dir(group_id) / "state") if running else None,
     }
 
     _print_json({"ok": True, "result": result})
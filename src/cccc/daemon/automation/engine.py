@@ -12,6 +12,8 @@ All automation respects group state:
 """
 from __future__ import annotations
 
+import bisect
+import calendar
 import json
 import re
 import threading
@@ -379,19 +381,93 @@ def _cron_matches(spec: _CronSpec, local_dt: datetime) -> bool:
     return day_of_month_match or day_of_week_match
 
 
+# Feb 29 recurs within 8 years (2096 -> 2104), so every satisfiable expression fires in this horizon.
+_CRON_SEARCH_YEARS = 8
+# Longest wall-clock rollback a DST transition is assumed to cause.
+_CRON_DST_LOOKAHEAD = timedelta(hours=3)
+_CRON_NEXT_FIRE_CACHE: Dict[Tuple[str, str, int], Optional[datetime]] = {}
+_CRON_NEXT_FIRE_CACHE_MAX = 4096
+
+
+def _cron_day_matches(spec: _CronSpec, year: int, month: int, day: int) -> bool:
+    if spec.dom_any and spec.dow_any:
+        return True
+    day_of_week = (calendar.weekday(year, month, day) + 1) % 7  # Sunday=0, Monday=1...
+    if spec.dom_any:
+        return day_of_week in spec.days_of_week
+    if spec.dow_any:
+        return day in spec.days_of_month
+    return day in spec.days_of_month or day_of_week in spec.days_of_week
+
+
+def _cron_next_wall(spec: _CronSpec, start: datetime) -> Optional[datetime]:
+    """First naive wall-clock minute >= start matching spec (field-wise: month, day, hour, minute)."""
+    months = sorted(spec.months)
+    hours = sorted(spec.hours)
+    minutes = sorted(spec.minutes)
+    for year in range(start.year, start.year + _CRON_SEARCH_YEARS + 1):
+        for month in months:
+            if (year, month) < (start.year, start.month):
+                continue
+            same_month = (year, month) == (start.year, start.month)
+            for day in range(start.day if same_month else 1, calendar.monthrange(year, month)[1] + 1):
+                if not _cron_day_matches(spec, year, month, day):
+                    continue
+                same_day = same_month and day == start.day
+                for hour in hours[bisect.bisect_left(hours, start.hour) if same_day else 0 :]:
+                    first_minute = start.minute if same_day and hour == start.hour else 0
+                    idx = bisect.bisect_left(minutes, first_minute)
+                    if idx < len(minutes):
+                        return datetime(year, month, day, hour, minutes[idx])
+    return None
+
+
+def _cron_solve_next_fire(spec: _CronSpec, tz: ZoneInfo, cursor_utc: datetime) -> Optional[datetime]:
+    """Earliest UTC minute >= cursor_utc whose local wall time matches spec.
+
+    Wall times skipped by a DST gap never fire; wall times repeated by a DST rollback
+    fire once per occurrence, mirroring how the tick loop matches the local clock.
+    """
+    cursor_local = cursor_utc.astimezone(tz)
+    wall = cursor_local.replace(tzinfo=None)
+    # If the clock rolls back shortly, wall times just below the current one recur after
+    # cursor_utc; widen the search so those second occurrences are considered.
+    rollback = (cursor_local.utcoffset() or timedelta(0)) - ((cursor_utc + _CRON_DST_LOOKAHEAD).astimezone(tz).utcoffset() or timedelta(0))
+    rollback = max(timedelta(0), rollback)
+    best: Optional[datetime] = None
+    best_wall: Optional[datetime] = None
+    candidate = _cron_next_wall(spec, wall - rollback)
+    while candidate is not None:
+        if best_wall is not None and candidate > best_wall + rollback:
+            break
+        for fold in (0, 1):
+            instant = candidate.replace(tzinfo=tz, fold=fold).astimezone(timezone.utc)
+            if instant < cursor_utc or instant.astimezone(tz).replace(tzinfo=None) != candidate:
+                continue
+            if best is None or instant < best:
+                best, best_wall = instant, candidate
+        if best is not None and not rollback:
+            break
+        candidate = _cron_next_wall(spec, candidate + timedelta(minutes=1))
+    return best
+
+
 def _cron_next_fire_utc(*, cron_expr: str, tz_name: str, now_utc: datetime) -> Optional[datetime]:
     spec = _compile_cron(cron_expr)
     tz = ZoneInfo(str(tz_name or "UTC"))
-    now_local = now_utc.astimezone(tz)
-    cursor = now_local.replace(second=0, microsecond=0)
-    if now_local > cursor:
+    now_utc = now_utc.astimezone(timezone.utc)
+    cursor = now_utc.replace(second=0, microsecond=0)
+    if now_utc > cursor:
         cursor = cursor + timedelta(minutes=1)
 
-    for _ in range(366 * 24 * 60):
-        if _cron_matches(spec, cursor):
-            return cursor.astimezone(timezone.utc)
-        cursor = cursor + timedelta(minutes=1)
-    return None
+    key = (str(cron_expr or "").strip(), str(tz_name or "UTC"), int(cursor.timestamp()) // 60)
+    if key in _CRON_NEXT_FIRE_CACHE:
+        return _CRON_NEXT_FIRE_CACHE[key]
+    out = _cron_solve_next_fire(spec, tz, cursor)
+    if len(_CRON_NEXT_FIRE_CACHE) >= _CRON_NEXT_FIRE_CACHE_MAX:
+        _CRON_NEXT_FIRE_CACHE.clear()
+    _CRON_NEXT_FIRE_CACHE[key] = out
+    return out
 
 
 def _rule_next_fire_at(rule: AutomationRule, rule_state: Dict[str, Any], *, now_utc: datetime) -> Optional[datetime]:
@@ -583,21 +659,11 @@ def _terminal_tail_snippet(group: Group, *, actor_id: str, lines: int) -> str:
     if n_lines > 80:
         n_lines = 80
 
+    # The session keeps its rendered transcript up to date incrementally; only the newest lines are rendered.
     try:
-        raw = pty_runner.SUPERVISOR.tail_output(group_id=group.group_id, actor_id=aid, max_bytes=200_000)
-    except Exception:
-        raw = b""
-    raw_text = raw.decode("utf-8", errors="replace")
-    if not raw_text.strip():
-        return ""
-
-    text = raw_text
-    try:
-        from ...util.terminal_render import render_transcript
-
-        text = render_transcript(text, compact=True)
+        text = pty_runner.SUPERVISOR.render_tail(group_id=group.group_id, actor_id=aid, max_lines=n_lines, compact=True)
     except Exception:
-        pass
+        text = ""
 
     tail_lines = text.splitlines()[-n_lines:] if text else []
     snippet = "\n".join(tail_lines).rstrip()
@@ -23,7 +23,7 @@ from typing import Any, Dict, List, Optional
 
 from ..kernel.actors import find_actor
 from ..kernel.blobs import resolve_blob_attachment_path
-from ..kernel.headless_events import append_headless_event
+from ..kernel.headless_events import HeadlessEventWriter
 from ..kernel.group import load_group
 from ..kernel.system_prompt import render_system_prompt
 from ..paths import ensure_home
@@ -136,6 +136,7 @@ class ClaudeAppSession:
     ) -> None:
         self.group_id = str(group_id or "").strip()
         self.actor_id = str(actor_id or "").strip()
+        self._events = HeadlessEventWriter(group_id=self.group_id, actor_id=self.actor_id)
         self.cwd = cwd
         self.env = dict(env or {})
         self.model = str(model or "").strip()
@@ -192,17 +193,8 @@ class ClaudeAppSession:
     # ── headless streaming event emission ─────────────────────────────────
 
     def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
-        group = load_group(self.group_id)
-        if group is None:
-            return
         try:
-            append_headless_event(
-                group.path,
-                group_id=self.group_id,
-                actor_id=self.actor_id,
-                event_type=event_type,
-                data=data,
-            )
+            self._events.emit(event_type, data)
         except Exception:
             logger.exception("failed to append claude event: %s/%s %s", self.group_id, self.actor_id, event_type)
 
@@ -2,10 +2,28 @@
 
 from __future__ import annotations
 
+import itertools
 import json
+import os
 import socket
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Multiplexed session protocol (see daemon/ops/socket_session_ops.py).
+IPC_SESSION_OP = "ipc_session"
+IPC_SESSION_PROTOCOL = "cccc.ipc.multiplex/1"
+# Ops that take over their connection (streams, attaches) always use a dedicated socket.
+SESSION_EXCLUDED_OPS = frozenset(
+    {
+        IPC_SESSION_OP,
+        "term_attach",
+        "events_stream",
+        "presentation_browser_attach",
+        "space_provider_auth_browser_attach",
+    }
+)
 
 
 class DaemonClientError(RuntimeError):
@@ -133,15 +151,16 @@ def _read_response_line(
     return line
 
 
-def send_daemon_request(
+def _connect_and_send(
     endpoint: Dict[str, Any],
-    request_payload: Dict[str, Any],
+    payload: Dict[str, Any],
     *,
+    op: str,
     timeout_s: float,
     sock_path_default: Path,
-) -> Dict[str, Any]:
+) -> Tuple[socket.socket, str, Dict[str, Any]]:
+    """Connect to the daemon endpoint and write one JSON line; returns (sock, transport, endpoint)."""
     transport = str(endpoint.get("transport") or "").strip().lower()
-    op = str(request_payload.get("op") or "").strip() or "unknown"
     if transport == "tcp":
         host = str(endpoint.get("host") or "127.0.0.1").strip() or "127.0.0.1"
         try:
@@ -157,67 +176,11 @@ def send_daemon_request(
                 op=op,
                 timeout_s=timeout_s,
             )
-        resolved_endpoint = {"transport": "tcp", "host": host, "port": port}
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            sock.settimeout(timeout_s)
-            try:
-                sock.connect((host, port))
-            except socket.timeout as exc:
-                _raise_client_error(
-                    phase="connect",
-                    reason="timeout",
-                    transport="tcp",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            except OSError as exc:
-                _raise_client_error(
-                    phase="connect",
-                    reason="os_error",
-                    transport="tcp",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            try:
-                sock.sendall((json.dumps(request_payload, ensure_ascii=False) + "\n").encode("utf-8"))
-            except socket.timeout as exc:
-                _raise_client_error(
-                    phase="send",
-                    reason="timeout",
-                    transport="tcp",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            except OSError as exc:
-                _raise_client_error(
-                    phase="send",
-                    reason="os_error",
-                    transport="tcp",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            line = _read_response_line(
-                sock,
-                transport="tcp",
-                endpoint=resolved_endpoint,
-                op=op,
-                timeout_s=timeout_s,
-            )
-        finally:
-            try:
-                sock.close()
-            except Exception:
-                pass
+        resolved_endpoint: Dict[str, Any] = {"transport": "tcp", "host": host, "port": port}
+        family = socket.AF_INET
+        address: Any = (host, port)
     else:
+        transport = "unix"
         af_unix = getattr(socket, "AF_UNIX", None)
         if af_unix is None:
             _raise_client_error(
@@ -230,74 +193,401 @@ def send_daemon_request(
             )
         path = str(endpoint.get("path") or sock_path_default)
         resolved_endpoint = {"transport": "unix", "path": path}
-        sock = socket.socket(af_unix, socket.SOCK_STREAM)
+        family = af_unix
+        address = path
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout_s)
         try:
-            sock.settimeout(timeout_s)
-            try:
-                sock.connect(path)
-            except socket.timeout as exc:
-                _raise_client_error(
-                    phase="connect",
-                    reason="timeout",
-                    transport="unix",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            except OSError as exc:
-                _raise_client_error(
-                    phase="connect",
-                    reason="os_error",
-                    transport="unix",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            try:
-                sock.sendall((json.dumps(request_payload, ensure_ascii=False) + "\n").encode("utf-8"))
-            except socket.timeout as exc:
-                _raise_client_error(
-                    phase="send",
-                    reason="timeout",
-                    transport="unix",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            except OSError as exc:
-                _raise_client_error(
-                    phase="send",
-                    reason="os_error",
-                    transport="unix",
-                    endpoint=resolved_endpoint,
-                    op=op,
-                    timeout_s=timeout_s,
-                    cause=exc,
-                )
-            line = _read_response_line(
-                sock,
-                transport="unix",
+            sock.connect(address)
+        except socket.timeout as exc:
+            _raise_client_error(
+                phase="connect",
+                reason="timeout",
+                transport=transport,
                 endpoint=resolved_endpoint,
                 op=op,
                 timeout_s=timeout_s,
+                cause=exc,
             )
-        finally:
-            try:
-                sock.close()
-            except Exception:
-                pass
+        except OSError as exc:
+            _raise_client_error(
+                phase="connect",
+                reason="os_error",
+                transport=transport,
+                endpoint=resolved_endpoint,
+                op=op,
+                timeout_s=timeout_s,
+                cause=exc,
+            )
+        try:
+            sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        except socket.timeout as exc:
+            _raise_client_error(
+                phase="send",
+                reason="timeout",
+                transport=transport,
+                endpoint=resolved_endpoint,
+                op=op,
+                timeout_s=timeout_s,
+                cause=exc,
+            )
+        except OSError as exc:
+            _raise_client_error(
+                phase="send",
+                reason="os_error",
+                transport=transport,
+                endpoint=resolved_endpoint,
+                op=op,
+                timeout_s=timeout_s,
+                cause=exc,
+            )
+    except BaseException:
+        try:
+            sock.close()
+        except Exception:
+            pass
+        raise
+    return sock, transport, resolved_endpoint
+
+
+def _send_one_shot(
+    endpoint: Dict[str, Any],
+    request_payload: Dict[str, Any],
+    *,
+    op: str,
+    timeout_s: float,
+    sock_path_default: Path,
+) -> Dict[str, Any]:
+    sock, transport, resolved_endpoint = _connect_and_send(
+        endpoint,
+        request_payload,
+        op=op,
+        timeout_s=timeout_s,
+        sock_path_default=sock_path_default,
+    )
+    try:
+        line = _read_response_line(
+            sock,
+            transport=transport,
+            endpoint=resolved_endpoint,
+            op=op,
+            timeout_s=timeout_s,
+        )
+    finally:
+        try:
+            sock.close()
+        except Exception:
+            pass
     try:
         return json.loads(line.decode("utf-8", errors="replace"))
     except json.JSONDecodeError as exc:
         _raise_client_error(
             phase="decode",
             reason="invalid_json",
-            transport=transport or "unix",
+            transport=transport,
             endpoint=resolved_endpoint,
             op=op,
             timeout_s=timeout_s,
             cause=exc,
         )
+
+
+# -----------------------------------------------------------------------------
+# Multiplexed sessions (persistent, pipelined connections)
+# -----------------------------------------------------------------------------
+
+# Connections kept per daemon endpoint; each carries any number of in-flight requests.
+SESSION_POOL_SIZE = 2
+# Socket timeout while a session is open: bounds sends; the reader just keeps waiting.
+_SESSION_IO_TIMEOUT_S = 5.0
+# After a daemon rejects the upgrade, use one-shot requests for a while before probing again.
+_SESSION_RETRY_AFTER_S = 60.0
+
+
+class _SessionUnavailable(Exception):
+    """The request was not written; it is safe to retry it on another connection."""
+
+
+class _PendingReply:
+    __slots__ = ("event", "response", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.response: Optional[Dict[str, Any]] = None
+        self.error: Optional[DaemonClientError] = None
+
+
+class _MultiplexedConnection:
+    """One upgraded daemon connection shared by concurrent callers (replies matched by id)."""
+
+    def __init__(self, sock: socket.socket, *, transport: str, endpoint: Dict[str, Any]) -> None:
+        self._sock = sock
+        self._transport = transport
+        self._endpoint = endpoint
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[int, _PendingReply] = {}
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._close_reason = "eof"
+        sock.settimeout(_SESSION_IO_TIMEOUT_S)
+        threading.Thread(target=self._read_loop, daemon=True, name="cccc-ipc-client").start()
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def _read_loop(self) -> None:
+        buf = b""
+        try:
+            while not self._closed:
+                try:
+                    chunk = self._sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                buf += chunk
+                while b"\n" in buf:
+                    line, buf = buf.split(b"\n", 1)
+                    if line.strip():
+                        self._dispatch(line)
+        except OSError:
+            self._close_reason = "os_error"
+        finally:
+            self.close()
+
+    def _dispatch(self, line: bytes) -> None:
+        try:
+            envelope = json.loads(line.decode("utf-8", errors="replace"))
+            request_id = int(envelope.get("id"))
+            response = envelope.get("response")
+        except Exception:
+            self._close_reason = "invalid_json"
+            self.close()
+            return
+        with self._lock:
+            pending = self._pending.pop(request_id, None)
+        if pending is None:
+            return  # caller already timed out
+        pending.response = response if isinstance(response, dict) else {}
+        pending.event.set()
+
+    def request(self, payload: Dict[str, Any], *, op: str, timeout_s: float) -> Dict[str, Any]:
+        pending = _PendingReply()
+        with self._lock:
+            if self._closed:
+                raise _SessionUnavailable()
+            request_id = next(self._ids)
+            self._pending[request_id] = pending
+        data = (json.dumps({"id": request_id, "request": payload}, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            with self._write_lock:
+                self._sock.sendall(data)
+        except OSError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            # A partial write leaves the stream unusable; nothing was dispatched for this id.
+            self.close()
+            raise _SessionUnavailable()
+        if not pending.event.wait(max(0.0, float(timeout_s or 0.0))):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            if not pending.event.is_set():
+                _raise_client_error(
+                    phase="read",
+                    reason="timeout",
+                    transport=self._transport,
+                    endpoint=self._endpoint,
+                    op=op,
+                    timeout_s=timeout_s,
+                )
+        if pending.error is not None:
+            raise pending.error
+        return pending.response or {}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed and not self._pending:
+                return
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+        try:
+            self._sock.close()
+        except Exception:
+            pass
+        for item in pending:
+            item.error = DaemonClientError(
+                phase="read",
+                reason=self._close_reason,
+                transport=self._transport,
+                endpoint=self._endpoint,
+                op="unknown",
+                timeout_s=0.0,
+            )
+            item.event.set()
+
+
+_SESSIONS: Dict[Tuple[str, str], List[_MultiplexedConnection]] = {}
+_SESSIONS_UNSUPPORTED_UNTIL: Dict[Tuple[str, str], float] = {}
+_SESSIONS_OPENING: Dict[Tuple[str, str], int] = {}
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS_PID = os.getpid()
+
+
+def _session_key(endpoint: Dict[str, Any], sock_path_default: Path) -> Tuple[str, str]:
+    transport = str(endpoint.get("transport") or "").strip().lower()
+    if transport == "tcp":
+        return ("tcp", f"{str(endpoint.get('host') or '127.0.0.1').strip() or '127.0.0.1'}:{endpoint.get('port')}")
+    return ("unix", str(endpoint.get("path") or sock_path_default))
+
+
+def _open_session(
+    endpoint: Dict[str, Any],
+    *,
+    op: str,
+    timeout_s: float,
+    sock_path_default: Path,
+) -> Optional[_MultiplexedConnection]:
+    """Upgrade a new connection; None when the daemon only speaks the one-shot protocol."""
+    sock, transport, resolved_endpoint = _connect_and_send(
+        endpoint,
+        {"v": 1, "op": IPC_SESSION_OP, "args": {}},
+        op=op,
+        timeout_s=timeout_s,
+        sock_path_default=sock_path_default,
+    )
+    try:
+        line = _read_response_line(sock, transport=transport, endpoint=resolved_endpoint, op=op, timeout_s=timeout_s)
+        ack = json.loads(line.decode("utf-8", errors="replace"))
+    except Exception:
+        ack = None
+    result = ack.get("result") if isinstance(ack, dict) else None
+    if not (isinstance(ack, dict) and ack.get("ok") is True and isinstance(result, dict) and result.get("protocol") == IPC_SESSION_PROTOCOL):
+        try:
+            sock.close()
+        except Exception:
+            pass
+        return None
+    return _MultiplexedConnection(sock, transport=transport, endpoint=resolved_endpoint)
+
+
+def _acquire_session(
+    endpoint: Dict[str, Any],
+    *,
+    op: str,
+    timeout_s: float,
+    sock_path_default: Path,
+) -> Optional[_MultiplexedConnection]:
+    global _SESSIONS_PID
+    key = _session_key(endpoint, sock_path_default)
+    with _SESSIONS_LOCK:
+        if _SESSIONS_PID != os.getpid():
+            # Forked child: never share the parent's sockets.
+            _SESSIONS.clear()
+            _SESSIONS_UNSUPPORTED_UNTIL.clear()
+            _SESSIONS_OPENING.clear()
+            _SESSIONS_PID = os.getpid()
+        if _SESSIONS_UNSUPPORTED_UNTIL.get(key, 0.0) > time.monotonic():
+            return None
+        conns = [c for c in _SESSIONS.get(key, []) if c.alive]
+        _SESSIONS[key] = conns
+        idle = min(conns, key=lambda c: c.in_flight) if conns else None
+        full = len(conns) + _SESSIONS_OPENING.get(key, 0) >= SESSION_POOL_SIZE
+        if idle is not None and (idle.in_flight == 0 or full):
+            return idle
+        if full:
+            # Every slot is still handshaking; don't pile up extra connections.
+            return None
+        _SESSIONS_OPENING[key] = _SESSIONS_OPENING.get(key, 0) + 1
+    try:
+        conn = _open_session(endpoint, op=op, timeout_s=timeout_s, sock_path_default=sock_path_default)
+    finally:
+        with _SESSIONS_LOCK:
+            _SESSIONS_OPENING[key] = max(0, _SESSIONS_OPENING.get(key, 0) - 1)
+    with _SESSIONS_LOCK:
+        if conn is None:
+            _SESSIONS_UNSUPPORTED_UNTIL[key] = time.monotonic() + _SESSION_RETRY_AFTER_S
+            return None
+        _SESSIONS.setdefault(key, []).append(conn)
+    return conn
+
+
+def close_daemon_sessions() -> None:
+    """Close pooled session connections (e.g. before the daemon endpoint changes)."""
+    with _SESSIONS_LOCK:
+        conns = [c for group in _SESSIONS.values() for c in group]
+        _SESSIONS.clear()
+        _SESSIONS_UNSUPPORTED_UNTIL.clear()
+    for conn in conns:
+        conn.close()
+
+
+def _send_via_session(
+    endpoint: Dict[str, Any],
+    request_payload: Dict[str, Any],
+    *,
+    op: str,
+    timeout_s: float,
+    sock_path_default: Path,
+) -> Optional[Dict[str, Any]]:
+    for _ in range(2):
+        conn = _acquire_session(endpoint, op=op, timeout_s=timeout_s, sock_path_default=sock_path_default)
+        if conn is None:
+            return None
+        try:
+            return conn.request(request_payload, op=op, timeout_s=timeout_s)
+        except _SessionUnavailable:
+            # Stale pooled connection (e.g. daemon restarted); the request never went out.
+            continue
+        except DaemonClientError as exc:
+            if exc.op == "unknown":
+                raise DaemonClientError(
+                    phase=exc.phase,
+                    reason=exc.reason,
+                    transport=exc.transport,
+                    endpoint=exc.endpoint,
+                    op=op,
+                    timeout_s=timeout_s,
+                ) from exc
+            raise
+    return None
+
+
+def send_daemon_request(
+    endpoint: Dict[str, Any],
+    request_payload: Dict[str, Any],
+    *,
+    timeout_s: float,
+    sock_path_default: Path,
+    reuse_connection: bool = False,
+) -> Dict[str, Any]:
+    """Send one request and return the decoded response.
+
+    With reuse_connection, the request is pipelined over a pooled multiplexed session
+    when the daemon supports it, falling back to a one-shot connection otherwise.
+    """
+    op = str(request_payload.get("op") or "").strip() or "unknown"
+    if reuse_connection and op not in SESSION_EXCLUDED_OPS:
+        out = _send_via_session(
+            endpoint,
+            request_payload,
+            op=op,
+            timeout_s=timeout_s,
+            sock_path_default=sock_path_default,
+        )
+        if out is not None:
+            return out
+    return _send_one_shot(
+        endpoint,
+        request_payload,
+        op=op,
+        timeout_s=timeout_s,
+        sock_path_default=sock_path_default,
+    )
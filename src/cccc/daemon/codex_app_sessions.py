@@ -14,7 +14,7 @@ from typing import Any, Dict, Optional
 
 from ..kernel.actors import find_actor
 from ..kernel.blobs import resolve_blob_attachment_path
-from ..kernel.headless_events import append_headless_event
+from ..kernel.headless_events import HeadlessEventWriter
 from ..kernel.group import load_group
 from ..kernel.system_prompt import render_system_prompt
 from ..paths import ensure_home
@@ -145,6 +145,7 @@ class CodexAppSession:
     def __init__(self, *, group_id: str, actor_id: str, cwd: Path, env: Dict[str, str], model: str = "") -> None:
         self.group_id = str(group_id or "").strip()
         self.actor_id = str(actor_id or "").strip()
+        self._events = HeadlessEventWriter(group_id=self.group_id, actor_id=self.actor_id)
         self.cwd = cwd
         self.env = dict(env or {})
         self.model = str(model or "").strip()
@@ -1265,17 +1266,8 @@ class CodexAppSession:
             return
 
     def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
-        group = load_group(self.group_id)
-        if group is None:
-            return
         try:
-            append_headless_event(
-                group.path,
-                group_id=self.group_id,
-                actor_id=self.actor_id,
-                event_type=event_type,
-                data=data,
-            )
+            self._events.emit(event_type, data)
         except Exception:
             logger.exception("failed to append headless event: %s/%s %s", self.group_id, self.actor_id, event_type)
 
@@ -1284,6 +1276,7 @@ class _FallbackCodexAppSession:
     def __init__(self, *, group_id: str, actor_id: str, cwd: Path, env: Dict[str, str], model: str = "", reason: str = "") -> None:
         self.group_id = str(group_id or "").strip()
         self.actor_id = str(actor_id or "").strip()
+        self._events = HeadlessEventWriter(group_id=self.group_id, actor_id=self.actor_id)
         self.cwd = cwd
         self.env = dict(env or {})
         self.model = str(model or "").strip()
@@ -1309,17 +1302,8 @@ class _FallbackCodexAppSession:
         )
 
     def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
-        group = load_group(self.group_id)
-        if group is None:
-            return
         try:
-            append_headless_event(
-                group.path,
-                group_id=self.group_id,
-                actor_id=self.actor_id,
-                event_type=event_type,
-                data=data,
-            )
+            self._events.emit(event_type, data)
         except Exception:
             logger.exception("failed to append fallback headless event: %s/%s %s", self.group_id, self.actor_id, event_type)
 
@@ -968,6 +968,9 @@ def _rebuild_summary_snapshot(group_id: str, *, max_attempts: int = 3) -> bool:
         )
         after_basis = storage.summary_basis()
         after_version = storage.compute_version()
+        if not (storage.group.path / "group.yaml").exists():
+            # The group (or its home) was removed while we were building; don't recreate it.
+            return False
         last_result = result
         last_basis = after_basis
         last_version = after_version
@@ -1025,6 +1028,23 @@ def _wait_for_summary_snapshot_rebuild(group_id: str, *, timeout_s: float = 1.0)
         time.sleep(0.01)
 
 
+def wait_for_summary_rebuilds(*, timeout_s: float = 5.0) -> bool:
+    """Wait until no background summary rebuild is running in any group.
+
+    Rebuild threads write under CCCC_HOME after the op that scheduled them has
+    returned; call this before removing a home directory. False on timeout.
+    """
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    while True:
+        with _SUMMARY_REBUILD_LOCK:
+            idle = not _SUMMARY_REBUILD_IN_FLIGHT
+        if idle:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+
+
 def _get_summary_context_fast(storage: ContextStorage, *, group_id: str) -> Dict[str, Any]:
     snapshot = storage.load_summary_snapshot()
     basis = storage.summary_basis()
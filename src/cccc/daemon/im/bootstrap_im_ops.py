@@ -8,6 +8,7 @@ import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 from ...kernel.group import load_group
 from ...util.conv import coerce_bool
@@ -26,12 +27,54 @@ def _pid_alive(pid: int) -> bool:
         return False
 
 
+def _bridge_host_enabled() -> bool:
+    # CCCC_IM_BRIDGE_HOST=1 serves all enabled groups of a platform from one host process.
+    return coerce_bool(os.environ.get("CCCC_IM_BRIDGE_HOST"), default=False)
+
+
+def _spawn_bridge_process(
+    home: Path,
+    *,
+    module_args: List[str],
+    log_path: Path,
+    label: str,
+    pid_paths: List[Path],
+) -> None:
+    try:
+        with log_path.open("a", encoding="utf-8") as log_file:
+            env = os.environ.copy()
+            env["CCCC_HOME"] = str(home)
+            proc = subprocess.Popen(
+                resolve_background_python_argv([sys.executable, "-m", *module_args]),
+                env=env,
+                stdout=log_file,
+                stderr=log_file,
+                stdin=subprocess.DEVNULL,
+                cwd=str(home),
+                **supervised_process_popen_kwargs(),
+            )
+            time.sleep(0.25)
+            rc = proc.poll()
+            if rc is not None:
+                logger.warning("IM bridge autostart failed for %s (code=%s). See log: %s", label, rc, log_path)
+                return
+            for pid_path in pid_paths:
+                try:
+                    pid_path.write_text(str(proc.pid), encoding="utf-8")
+                except Exception:
+                    pass
+    except Exception as e:
+        logger.warning("IM bridge autostart failed for %s: %s", label, e)
+
+
 def autostart_enabled_im_bridges(home: Path) -> None:
     """Autostart IM bridges marked enabled in group settings (best effort)."""
     base = home / "groups"
     if not base.exists():
         return
 
+    # platform -> [(group_id, pid_path)] for groups that need a bridge.
+    pending: Dict[str, List[Tuple[str, Path]]] = {}
     for group_yaml in base.glob("*/group.yaml"):
         group_id = group_yaml.parent.name
         group = load_group(group_id)
@@ -62,35 +105,31 @@ def autostart_enabled_im_bridges(home: Path) -> None:
             state_dir.mkdir(parents=True, exist_ok=True)
         except Exception:
             pass
-        log_path = state_dir / "im_bridge.log"
+        pending.setdefault(platform, []).append((group_id, pid_path))
 
+    if _bridge_host_enabled():
+        log_dir = home / "daemon"
         try:
-            with log_path.open("a", encoding="utf-8") as log_file:
-                env = os.environ.copy()
-                env["CCCC_HOME"] = str(home)
-                proc = subprocess.Popen(
-                    resolve_background_python_argv([sys.executable, "-m", "cccc.ports.im.bridge", group_id, platform]),
-                    env=env,
-                    stdout=log_file,
-                    stderr=log_file,
-                    stdin=subprocess.DEVNULL,
-                    cwd=str(home),
-                    **supervised_process_popen_kwargs(),
-                )
-                time.sleep(0.25)
-                rc = proc.poll()
-                if rc is not None:
-                    logger.warning(
-                        "IM bridge autostart failed for %s (platform=%s, code=%s). See log: %s",
-                        group_id,
-                        platform,
-                        rc,
-                        log_path,
-                    )
-                    continue
-                try:
-                    pid_path.write_text(str(proc.pid), encoding="utf-8")
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.warning("IM bridge autostart failed for %s (platform=%s): %s", group_id, platform, e)
+            log_dir.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        for platform, groups in pending.items():
+            _spawn_bridge_process(
+                home,
+                module_args=["cccc.ports.im.host", platform, *[group_id for group_id, _ in groups]],
+                log_path=log_dir / f"im_bridge_host_{platform}.log",
+                label=f"bridge host (platform={platform}, groups={len(groups)})",
+                # The host writes pid files for the groups it actually attaches.
+                pid_paths=[],
+            )
+        return
+
+    for platform, groups in pending.items():
+        for group_id, pid_path in groups:
+            _spawn_bridge_process(
+                home,
+                module_args=["cccc.ports.im.bridge", group_id, platform],
+                log_path=pid_path.parent / "im_bridge.log",
+                label=f"{group_id} (platform={platform})",
+                pid_paths=[pid_path],
+            )
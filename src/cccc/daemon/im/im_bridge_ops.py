@@ -33,6 +33,20 @@ def _proc_cccc_home(pid: int) -> Optional[Path]:
         return None
 
 
+# Written next to a group's im_bridge.pid by a multi-group bridge host
+# (`cccc.ports.im.host`) that serves the group; holds the host's pid.
+IM_BRIDGE_HOST_MARKER = "im_bridge.host"
+
+
+def is_im_bridge_host_pid(pid: int, pid_path: Path) -> bool:
+    """True if pid is a multi-group bridge host serving the group whose pid file is pid_path."""
+    try:
+        marker = pid_path.with_name(IM_BRIDGE_HOST_MARKER).read_text(encoding="utf-8").strip()
+        return int(marker) == int(pid)
+    except Exception:
+        return False
+
+
 def stop_im_bridges_for_group(
     home: Path,
     *,
@@ -49,7 +63,10 @@ def stop_im_bridges_for_group(
         try:
             pid = int(pid_path.read_text(encoding="utf-8").strip())
             if pid > 0:
-                best_effort_killpg(pid, signal.SIGTERM)
+                # A bridge host also serves other groups: removing the pid file below
+                # detaches just this group.
+                if not is_im_bridge_host_pid(pid, pid_path):
+                    best_effort_killpg(pid, signal.SIGTERM)
                 killed.add(pid)
         except Exception:
             pass
@@ -120,7 +137,7 @@ def stop_all_im_bridges(
                 cmdline = (proc_dir / "cmdline").read_bytes().decode("utf-8", "ignore")
             except Exception:
                 continue
-            if "cccc.ports.im.bridge" not in cmdline:
+            if "cccc.ports.im.bridge" not in cmdline and "cccc.ports.im.host" not in cmdline:
                 continue
             proc_home = _proc_cccc_home(pid)
             if proc_home is None:
@@ -164,8 +181,9 @@ def cleanup_invalid_im_bridges(
                 continue
 
             if not group_yaml.exists():
-                best_effort_killpg(pid, signal.SIGTERM)
-                killed += 1
+                if not is_im_bridge_host_pid(pid, pid_path):
+                    best_effort_killpg(pid, signal.SIGTERM)
+                    killed += 1
                 try:
                     pid_path.unlink(missing_ok=True)
                 except Exception:
@@ -18,6 +18,7 @@ from ...contracts.v1 import DaemonError, DaemonResponse
 from ...kernel.context import ContextStorage, TaskStatus
 from ...kernel.group import load_group
 from ...kernel.ledger import read_last_lines
+from ...kernel.ledger_tail_cache import recent_ledger_events
 from ...kernel.memory_reme import (
     append_daily_entry,
     append_memory_entry,
@@ -512,13 +513,17 @@ def _collect_recent_chat_messages(
     group = load_group(group_id)
     if group is None:
         return []
-    lines = read_last_lines(group.ledger_path, min(4000, max(200, int(max_messages) * 8)))
+    window = min(4000, max(200, int(max_messages) * 8))
+    events = recent_ledger_events(group.ledger_path, window)
+    if events is None:
+        events = []
+        for raw in read_last_lines(group.ledger_path, window):
+            try:
+                events.append(json.loads(raw))
+            except Exception:
+                continue
     out: List[Dict[str, Any]] = []
-    for raw in lines:
-        try:
-            ev = json.loads(raw)
-        except Exception:
-            continue
+    for ev in events:
         if not isinstance(ev, dict) or str(ev.get("kind") or "") != "chat.message":
             continue
         data = ev.get("data")
@@ -16,6 +16,7 @@ from ...kernel.group import get_group_state, load_group, set_group_state
 from ...kernel.inbox import find_event_with_chat_ack, is_message_for_actor
 from ...kernel.context import ContextStorage
 from ...kernel.ledger import append_event, read_last_lines
+from ...kernel.ledger_tail_cache import recent_ledger_events
 from ...kernel.messaging import (
     default_reply_recipients,
     enabled_recipient_actor_ids,
@@ -310,14 +311,17 @@ def _tracked_send_existing_result(group: Any, *, client_id: str) -> Optional[Dic
     if not client_id:
         return None
     try:
-        lines = read_last_lines(group.ledger_path, 800)
+        events = recent_ledger_events(group.ledger_path, 800)
+        if events is None:
+            events = []
+            for raw_line in read_last_lines(group.ledger_path, 800):
+                try:
+                    events.append(json.loads(raw_line))
+                except Exception:
+                    continue
     except Exception:
         return None
-    for raw_line in reversed(lines):
-        try:
-            event = json.loads(raw_line)
-        except Exception:
-            continue
+    for event in reversed(events):
         if not isinstance(event, dict) or str(event.get("kind") or "") != "chat.message":
             continue
         data = event.get("data") if isinstance(event.get("data"), dict) else {}
@@ -645,6 +649,7 @@ def handle_send(
             dst_to=dst_to if dst_group_id else None,
             client_id=client_id or None,
         ).model_dump(),
+        group=group,
     )
     effective_to = to if to else ["@all"]
     event_id = str(event.get("id") or "").strip()
@@ -1109,6 +1114,7 @@ def handle_reply(
             **build_sender_snapshot(group, by=by),
             client_id=client_id or None,
         ).model_dump(),
+        group=group,
     )
 
     ack_event: Optional[dict[str, Any]] = None
@@ -225,6 +225,14 @@ def _tail_events(group_id: str, *, max_lines: int = 2000) -> list[Dict[str, Any]
     g = load_group(group_id)
     if g is None:
         return []
+    try:
+        from ...kernel.ledger_tail_cache import recent_ledger_events
+
+        cached = recent_ledger_events(g.ledger_path, int(max_lines))
+    except Exception:
+        cached = None
+    if cached is not None:
+        return cached
     try:
         from ...kernel.ledger import read_last_lines
 
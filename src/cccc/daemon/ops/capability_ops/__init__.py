@@ -73,6 +73,12 @@ from ._documents import (  # noqa: F401
     _load_runtime_doc,
     _save_runtime_doc,
 )
+from ._doc_cache import (  # noqa: F401
+    CapabilityDocumentCache,
+    capability_document_cache_stats,
+    configure_capability_document_writes,
+    flush_capability_documents,
+)
 from ._runtime import (  # noqa: F401
     _runtime_artifacts,
     _runtime_capability_artifacts,
@@ -228,6 +234,11 @@ from ._install import (  # noqa: F401
     _invoke_installed_external_tool,
     _invoke_installed_external_tool_with_aliases,
 )
+from ._mcp_pool import (  # noqa: F401
+    CapabilityRuntimePool,
+    _capability_runtime_pool,
+    close_capability_runtime_pool,
+)
 from ._handlers import (  # noqa: F401
     _curated_install_metadata,
     _build_curated_records_from_policy,
@@ -0,0 +1,258 @@
+"""Process-level cache for the capability state/catalog/runtime JSON documents.
+
+Nearly every capability op (``capability_state`` runs on most MCP ``tools/list``)
+used to read, parse and normalize whole JSON documents, and every mutation rewrote
+the file. The cache keeps one normalized snapshot per document, validated against
+the file's mtime/size/inode so external edits are still picked up, and hands every
+reader its own parsed copy (a consistent snapshot that callers may mutate freely).
+
+Saves go through a single writer:
+
+- By default a save is durable when it returns, but concurrent saves of the same
+  document are group-committed: savers that queue up behind an in-flight write are
+  all covered by the next single write of the latest snapshot.
+- With write-behind enabled (the daemon turns it on while serving), a save returns
+  immediately and a background writer flushes the latest snapshot once per window,
+  so enable/disable/block storms become one atomic write. ``flush`` writes pending
+  snapshots synchronously (daemon shutdown, interpreter exit).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from ....util.fs import atomic_write_json, read_json
+
+from ._common import _env_bool, _env_int
+
+logger = logging.getLogger(__name__)
+
+_Normalizer = Callable[[Any], Dict[str, Any]]
+_WRITE_RETRY_S = 1.0
+
+
+def _snapshot_text(doc: Dict[str, Any]) -> str:
+    # json.loads of compact text is the cheapest deep copy of JSON data in CPython.
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@dataclass
+class _CachedDocument:
+    doc_text: str
+    payload: Dict[str, Any]
+    signature: Optional[Tuple[int, int, int]]
+    version: int = 0
+    flushed_version: int = 0
+    due: float = 0.0
+
+    @property
+    def dirty(self) -> bool:
+        return self.flushed_version < self.version
+
+
+class CapabilityDocumentCache:
+    """mtime-validated document snapshots with a single coalescing writer."""
+
+    def __init__(self, *, write_behind_s: float = 0.0) -> None:
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._entries: Dict[str, _CachedDocument] = {}
+        self._pending: Set[str] = set()
+        self._write_behind_s = max(0.0, float(write_behind_s))
+        self._writer: Optional[threading.Thread] = None
+        self._stats = {"hits": 0, "misses": 0, "saves": 0, "writes": 0, "write_errors": 0, "dropped": 0}
+
+    @property
+    def write_behind_s(self) -> float:
+        return self._write_behind_s
+
+    def set_write_behind(self, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        if seconds <= 0:
+            self.flush()
+        with self._lock:
+            self._write_behind_s = seconds
+            self._cond.notify_all()
+
+    def load(self, path: Path, normalize: _Normalizer) -> Dict[str, Any]:
+        key = str(path)
+        signature = _stat_signature(path)
+        text: Optional[str] = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.dirty or entry.signature == signature):
+                self._stats["hits"] += 1
+                text = entry.doc_text
+        if text is not None:
+            return json.loads(text)
+        raw = read_json(path)
+        doc = normalize(raw)
+        text = _snapshot_text(doc)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.dirty:
+                # A save landed while we were reading; it is newer than the file.
+                self._stats["hits"] += 1
+                return json.loads(entry.doc_text)
+            self._stats["misses"] += 1
+            # Keep the parsed file as the payload; a later flush only writes newer saves.
+            self._entries[key] = _CachedDocument(doc_text=text, payload=raw, signature=signature)
+        return doc
+
+    def save(self, path: Path, payload: Dict[str, Any], normalize: Optional[_Normalizer] = None) -> None:
+        """Replace the document; ``normalize`` maps the written payload to what loads return."""
+        key = str(path)
+        payload_text = _snapshot_text(payload)
+        stored = json.loads(payload_text)
+        doc_text = _snapshot_text(normalize(json.loads(payload_text))) if normalize is not None else payload_text
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CachedDocument(doc_text=doc_text, payload=stored, signature=None)
+            else:
+                entry.doc_text = doc_text
+                entry.payload = stored
+            entry.version += 1
+            version = entry.version
+            self._stats["saves"] += 1
+            if self._write_behind_s > 0:
+                if key not in self._pending:
+                    self._pending.add(key)
+                    entry.due = time.monotonic() + self._write_behind_s
+                self._ensure_writer()
+                self._cond.notify_all()
+                return
+        self._write(key, path, up_to=version)
+
+    def flush(self) -> None:
+        """Write every pending snapshot now."""
+        with self._lock:
+            keys = list(self._pending)
+            self._pending.clear()
+        for key in keys:
+            self._write_pending(key)
+
+    def invalidate(self) -> None:
+        """Flush, then forget every snapshot (the next load re-reads the files)."""
+        self.flush()
+        with self._lock:
+            self._entries = {k: e for k, e in self._entries.items() if e.dirty}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["coalesced"] = max(0, out["saves"] - out["writes"] - out["dropped"] - len(self._pending))
+            out["pending"] = len(self._pending)
+            out["documents"] = len(self._entries)
+            out["write_behind_ms"] = int(self._write_behind_s * 1000)
+            return out
+
+    def _write(self, key: str, path: Path, *, up_to: Optional[int] = None) -> None:
+        with self._write_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or not entry.dirty:
+                    return
+                if up_to is not None and entry.flushed_version >= up_to:
+                    return
+                payload, version = entry.payload, entry.version
+            if up_to is None and not path.parent.is_dir():
+                # The home directory went away (e.g. a removed temp home); nothing to persist into.
+                with self._lock:
+                    entry.flushed_version = max(entry.flushed_version, version)
+                    self._stats["dropped"] += 1
+                return
+            try:
+                atomic_write_json(path, payload, indent=2)
+            except Exception:
+                with self._lock:
+                    self._stats["write_errors"] += 1
+                raise
+            signature = _stat_signature(path)
+            with self._lock:
+                entry.flushed_version = max(entry.flushed_version, version)
+                entry.signature = signature
+                self._stats["writes"] += 1
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        self._writer = threading.Thread(target=self._run_writer, name="cccc-capability-doc-writer", daemon=True)
+        self._writer.start()
+
+    def _due(self, key: str) -> float:
+        entry = self._entries.get(key)
+        return entry.due if entry is not None else 0.0
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._lock:
+                while True:
+                    now = time.monotonic()
+                    ready = [k for k in self._pending if self._due(k) <= now]
+                    if ready:
+                        break
+                    timeout = min((self._due(k) for k in self._pending), default=now + 60.0) - now
+                    self._cond.wait(max(0.001, timeout))
+                self._pending.difference_update(ready)
+            for key in ready:
+                self._write_pending(key)
+
+    def _write_pending(self, key: str) -> None:
+        try:
+            self._write(key, Path(key))
+        except Exception as e:
+            logger.warning("capability document write failed for %s: %s", key, e)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.dirty and key not in self._pending:
+                    self._pending.add(key)
+                    entry.due = time.monotonic() + _WRITE_RETRY_S
+                    self._ensure_writer()
+
+
+_DOC_CACHE = CapabilityDocumentCache()
+atexit.register(_DOC_CACHE.flush)
+
+
+def _load_document(path: Path, normalize: _Normalizer) -> Dict[str, Any]:
+    if not _env_bool("CCCC_CAPABILITY_DOC_CACHE", True):
+        return normalize(read_json(path))
+    return _DOC_CACHE.load(path, normalize)
+
+
+def _save_document(path: Path, payload: Dict[str, Any], normalize: Optional[_Normalizer] = None) -> None:
+    if not _env_bool("CCCC_CAPABILITY_DOC_CACHE", True):
+        atomic_write_json(path, payload, indent=2)
+        return
+    _DOC_CACHE.save(path, payload, normalize)
+
+
+def configure_capability_document_writes(*, write_behind: bool) -> None:
+    """Enable (daemon serving) or disable write-behind; disabling flushes pending writes."""
+    window_ms = max(0, min(_env_int("CCCC_CAPABILITY_DOC_WRITE_BEHIND_MS", 50), 5000)) if write_behind else 0
+    _DOC_CACHE.set_write_behind(window_ms / 1000.0)
+
+
+def flush_capability_documents() -> None:
+    _DOC_CACHE.flush()
+
+
+def capability_document_cache_stats() -> Dict[str, Any]:
+    return _DOC_CACHE.stats()
@@ -6,7 +6,6 @@ import hashlib
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from ....util.fs import atomic_write_json, read_json
 from ....util.time import parse_utc_iso, utc_now_iso
 
 from ._common import (
@@ -18,6 +17,7 @@ from ._common import (
     _catalog_path,
     _runtime_path,
 )
+from ._doc_cache import _load_document, _save_document
 
 _SELF_PROPOSED_SKILL_PREFIX = "skill:agent_self_proposed:"
 
@@ -471,33 +471,33 @@ def _normalize_runtime_doc(raw: Any) -> Dict[str, Any]:
 
 def _load_state_doc() -> Tuple[Path, Dict[str, Any]]:
     path = _state_path()
-    return path, _normalize_state_doc(read_json(path))
+    return path, _load_document(path, _normalize_state_doc)
 
 
 def _save_state_doc(path: Path, doc: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     doc["updated_at"] = utc_now_iso()
-    atomic_write_json(path, doc, indent=2)
+    _save_document(path, doc, _normalize_state_doc)
 
 
 def _load_catalog_doc() -> Tuple[Path, Dict[str, Any]]:
     path = _catalog_path()
-    return path, _normalize_catalog_doc(read_json(path))
+    return path, _load_document(path, _normalize_catalog_doc)
 
 
 def _save_catalog_doc(path: Path, doc: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     normalized = _normalize_catalog_doc(doc)
     normalized["updated_at"] = utc_now_iso()
-    atomic_write_json(path, normalized, indent=2)
+    _save_document(path, normalized)
 
 
 def _load_runtime_doc() -> Tuple[Path, Dict[str, Any]]:
     path = _runtime_path()
-    return path, _normalize_runtime_doc(read_json(path))
+    return path, _load_document(path, _normalize_runtime_doc)
 
 
 def _save_runtime_doc(path: Path, doc: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     doc["updated_at"] = utc_now_iso()
-    atomic_write_json(path, doc, indent=2)
+    _save_document(path, doc, _normalize_runtime_doc)
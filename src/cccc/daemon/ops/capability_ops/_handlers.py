@@ -386,6 +386,18 @@ def _build_builtin_skill_records() -> Dict[str, Dict[str, Any]]:
     return out
 
 
+# Curated records are rebuilt (and re-stamped) on every call; only content changes count.
+_CURATED_REFRESH_FIELDS = frozenset({"updated_at_source", "last_synced_at"})
+
+
+def _same_curated_record(existing: Dict[str, Any], rec: Dict[str, Any]) -> bool:
+    if existing == rec:
+        return True
+    if existing.keys() != rec.keys():
+        return False
+    return all(existing[k] == v for k, v in rec.items() if k not in _CURATED_REFRESH_FIELDS)
+
+
 def _ensure_curated_catalog_records(catalog_doc: Dict[str, Any], *, policy: Dict[str, Any]) -> bool:
     records = catalog_doc.get("records") if isinstance(catalog_doc.get("records"), dict) else {}
     if not isinstance(records, dict):
@@ -402,7 +414,7 @@ def _ensure_curated_catalog_records(catalog_doc: Dict[str, Any], *, policy: Dict
     for cap_id, rec in curated.items():
         existing = records.get(cap_id) if isinstance(records.get(cap_id), dict) else None
         if isinstance(existing, dict):
-            if existing == rec:
+            if _same_curated_record(existing, rec):
                 continue
             touched_sources.add(str(existing.get("source_id") or "").strip())
             records[cap_id] = rec
@@ -23,6 +23,7 @@ from ._common import (
     _QUAL_BLOCKED,
     _env_int,
 )
+from ._mcp_pool import _capability_runtime_pool
 from ._runtime import _runtime_artifacts, _set_runtime_capability_artifact
 
 
@@ -1361,22 +1362,32 @@ def _invoke_installed_external_tool(
 ) -> Dict[str, Any]:
     invoker = install.get("invoker") if isinstance(install.get("invoker"), dict) else {}
     invoker_type = str(invoker.get("type") or "").strip()
+    call_params = {"name": real_tool_name, "arguments": arguments if isinstance(arguments, dict) else {}}
+    pool = _capability_runtime_pool()
     if invoker_type == "remote_http":
         url = str(invoker.get("url") or "").strip()
         if not url:
             raise ValueError("missing_remote_url")
-        return _remote_mcp_call(
-            url,
-            "tools/call",
-            {"name": real_tool_name, "arguments": arguments if isinstance(arguments, dict) else {}},
-            timeout_s=30.0,
-        )
+        if pool is not None:
+            resp = pool.request(invoker, "tools/call", call_params, timeout_s=30.0)
+            if resp is not None:
+                if isinstance(resp.get("error"), dict):
+                    raise RuntimeError(str((resp.get("error") or {}).get("message") or "remote tools/call failed"))
+                result = resp.get("result")
+                return result if isinstance(result, dict) else {}
+        return _remote_mcp_call(url, "tools/call", call_params, timeout_s=30.0)
     if invoker_type in {"npm_stdio", "package_stdio", "command_stdio"}:
         command = invoker.get("command")
         cmd = [str(x) for x in command] if isinstance(command, list) else []
         if not cmd:
             raise ValueError("missing_package_command")
         env_override = invoker.get("env") if isinstance(invoker.get("env"), dict) else {}
+        call_timeout_s = float(max(5, min(_env_int("CCCC_CAPABILITY_PACKAGE_CALL_TIMEOUT_SECONDS", 45), 180)))
+        if pool is not None:
+            resp = pool.request(invoker, "tools/call", call_params, timeout_s=call_timeout_s)
+            if resp is not None:
+                return _extract_jsonrpc_result([resp], req_id=int(resp.get("id") or -1), operation="tools/call")
+        # Pool disabled or saturated: one-shot process per call.
         requests = [
             {
                 "jsonrpc": "2.0",
@@ -1392,13 +1403,9 @@ def _invoke_installed_external_tool(
                 "jsonrpc": "2.0",
                 "id": 2,
                 "method": "tools/call",
-                "params": {
-                    "name": real_tool_name,
-                    "arguments": arguments if isinstance(arguments, dict) else {},
-                },
+                "params": call_params,
             },
         ]
-        call_timeout_s = float(max(5, min(_env_int("CCCC_CAPABILITY_PACKAGE_CALL_TIMEOUT_SECONDS", 45), 180)))
         if env_override:
             responses = _pkg()._stdio_mcp_roundtrip(
                 cmd,
@@ -0,0 +1,521 @@
+"""Warm session pool for external MCP capability tool calls.
+
+Installed package/command capabilities used to spawn a fresh MCP server process for
+every ``tools/call`` (initialize + call + exit), and remote capabilities re-ran
+``initialize`` on every call. The pool keeps initialized stdio processes and HTTP
+sessions alive per invoker (command or URL plus env fingerprint), reusing
+``Mcp-Session-Id`` for HTTP. Idle sessions are evicted, the number of live processes
+is bounded, dead processes are restarted on the next call, and sessions idle for a
+while are pinged before reuse.
+
+Install probes stay one-shot (``_stdio_mcp_roundtrip``); only tool invocation goes
+through the pool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ._common import _env_bool, _env_int
+
+_MCP_PROTOCOL_VERSION = "2024-11-05"
+_CLIENT_INFO = {"name": "cccc-capability-runtime", "version": "1.0"}
+_STDERR_TAIL_CHARS = 4000
+_HEALTH_CHECK_TIMEOUT_S = 5.0
+
+
+def _pkg():
+    """Get parent package module for mock-compatible function lookups."""
+    return sys.modules[__name__.rsplit(".", 1)[0]]
+
+
+def _initialize_request(req_id: int) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": req_id,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": _MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": dict(_CLIENT_INFO),
+        },
+    }
+
+
+_INITIALIZED_NOTIFICATION = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+
+
+class _SessionDead(RuntimeError):
+    """The session died before the request was written; retrying is safe."""
+
+
+class _StdioMcpSession:
+    """One initialized MCP server process with id-routed JSON-RPC over stdio."""
+
+    def __init__(self, command: List[str], env_override: Dict[str, str], *, timeout_s: float) -> None:
+        env: Optional[Dict[str, str]] = None
+        if env_override:
+            env = dict(os.environ)
+            for key, value in env_override.items():
+                k = str(key or "").strip()
+                if k:
+                    env[k] = str(value or "")
+        self._proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=env,
+            bufsize=1,
+        )
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._pending: Dict[int, List[Any]] = {}
+        self._stderr_tail = ""
+        self._closed = False
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        threading.Thread(target=self._read_stdout, daemon=True, name="cccc-mcp-stdout").start()
+        threading.Thread(target=self._read_stderr, daemon=True, name="cccc-mcp-stderr").start()
+        try:
+            self._handshake(timeout_s)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def pid(self) -> int:
+        return int(self._proc.pid)
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self._proc.poll() is None
+
+    def _exit_error(self) -> RuntimeError:
+        try:
+            rc = self._proc.wait(timeout=1.0)
+        except Exception:
+            rc = self._proc.poll()
+        return RuntimeError(f"stdio mcp exited with code {rc}: {self._stderr_tail.strip()}")
+
+    def _handshake(self, timeout_s: float) -> None:
+        resp = self.request("initialize", _initialize_request(0)["params"], timeout_s=timeout_s)
+        err = resp.get("error")
+        if isinstance(err, dict):
+            raise RuntimeError(f"initialize failed: {str(err.get('message') or 'unknown error')}")
+        self._write(_INITIALIZED_NOTIFICATION)
+
+    def _write(self, payload: Dict[str, Any]) -> None:
+        line = json.dumps(payload, ensure_ascii=False) + "\n"
+        with self._write_lock:
+            if not self.alive:
+                raise _SessionDead("stdio mcp session is not running")
+            stdin = self._proc.stdin
+            if stdin is None:
+                raise _SessionDead("stdio mcp session has no stdin")
+            try:
+                stdin.write(line)
+                stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                raise _SessionDead(f"stdio mcp session write failed: {e}") from e
+
+    def request(self, method: str, params: Dict[str, Any], *, timeout_s: float) -> Dict[str, Any]:
+        """Send one request and wait for its response; timeouts kill the process."""
+        done = threading.Event()
+        slot: List[Any] = [done, None]
+        with self._lock:
+            req_id = self._next_id
+            self._next_id += 1
+            self._pending[req_id] = slot
+            self.in_flight += 1
+        try:
+            self._write({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+            if not done.wait(max(0.1, float(timeout_s))):
+                # A stuck server may never answer; don't hand it to the next caller.
+                self.close()
+                raise TimeoutError("stdio mcp request timed out")
+            resp = slot[1]
+            if resp is None:
+                raise self._exit_error()
+            return resp
+        finally:
+            with self._lock:
+                self._pending.pop(req_id, None)
+                self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    def _read_stdout(self) -> None:
+        stdout = self._proc.stdout
+        try:
+            for line in iter(stdout.readline, "") if stdout is not None else ():
+                raw = line.strip()
+                if not raw:
+                    continue
+                try:
+                    item = json.loads(raw)
+                except Exception:
+                    continue
+                if not isinstance(item, dict):
+                    continue
+                if "method" in item and "id" in item:
+                    self._answer_server_request(item)
+                    continue
+                try:
+                    req_id = int(item.get("id"))
+                except Exception:
+                    continue
+                with self._lock:
+                    slot = self._pending.get(req_id)
+                if slot is not None:
+                    slot[1] = item
+                    slot[0].set()
+        except Exception:
+            pass
+        finally:
+            self._closed = True
+            with self._lock:
+                slots = list(self._pending.values())
+            for slot in slots:
+                slot[0].set()
+
+    def _answer_server_request(self, item: Dict[str, Any]) -> None:
+        if item.get("method") == "ping":
+            reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": item.get("id"), "result": {}}
+        else:
+            reply = {"jsonrpc": "2.0", "id": item.get("id"), "error": {"code": -32601, "message": "method not supported by client"}}
+        try:
+            self._write(reply)
+        except Exception:
+            pass
+
+    def _read_stderr(self) -> None:
+        stderr = self._proc.stderr
+        try:
+            for line in iter(stderr.readline, "") if stderr is not None else ():
+                self._stderr_tail = (self._stderr_tail + line)[-_STDERR_TAIL_CHARS:]
+        except Exception:
+            pass
+
+    def ping(self) -> bool:
+        try:
+            # Any response (including method-not-found) proves the server is responsive.
+            self.request("ping", {}, timeout_s=_HEALTH_CHECK_TIMEOUT_S)
+            return True
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        self._closed = True
+        proc = self._proc
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+        except Exception:
+            pass
+        if proc.poll() is None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=1.0)
+            except Exception:
+                try:
+                    proc.kill()
+                    proc.wait(timeout=1.0)
+                except Exception:
+                    pass
+
+
+class _HttpMcpSession:
+    """Initialized remote MCP session; carries Mcp-Session-Id across calls."""
+
+    def __init__(self, url: str, *, timeout_s: float) -> None:
+        self.url = url
+        self.session_id = ""
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._initialize(timeout_s)
+
+    @property
+    def alive(self) -> bool:
+        return True
+
+    def _post(self, payload: Dict[str, Any], *, timeout_s: float) -> Dict[str, Any]:
+        data, session_id = _pkg()._http_jsonrpc_request(self.url, payload, timeout_s=timeout_s, session_id=self.session_id)
+        if session_id:
+            self.session_id = session_id
+        return data
+
+    def _initialize(self, timeout_s: float) -> None:
+        self.session_id = ""
+        init_resp = self._post(_initialize_request(self._take_id()), timeout_s=timeout_s)
+        if isinstance(init_resp.get("error"), dict):
+            raise RuntimeError(str((init_resp.get("error") or {}).get("message") or "remote initialize failed"))
+        try:
+            self._post(_INITIALIZED_NOTIFICATION, timeout_s=timeout_s)
+        except Exception:
+            # Servers that predate the notification may reject it; the session is still usable.
+            pass
+
+    def _take_id(self) -> int:
+        with self._lock:
+            req_id = self._next_id
+            self._next_id += 1
+            return req_id
+
+    def request(self, method: str, params: Dict[str, Any], *, timeout_s: float) -> Dict[str, Any]:
+        with self._lock:
+            self.in_flight += 1
+        try:
+            payload = {"jsonrpc": "2.0", "id": self._take_id(), "method": method, "params": params}
+            try:
+                return self._post(payload, timeout_s=timeout_s)
+            except Exception as e:
+                # Streamable HTTP servers answer 404 once a session has expired.
+                if getattr(e, "code", None) != 404 or not self.session_id:
+                    raise
+            self._initialize(timeout_s)
+            payload["id"] = self._take_id()
+            return self._post(payload, timeout_s=timeout_s)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    def ping(self) -> bool:
+        try:
+            self.request("ping", {}, timeout_s=_HEALTH_CHECK_TIMEOUT_S)
+            return True
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        return None
+
+
+def _env_fingerprint(env_override: Dict[str, str]) -> str:
+    items = sorted((str(k), str(v)) for k, v in (env_override or {}).items())
+    return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()[:16] if items else ""
+
+
+def _invoker_pool_key(invoker: Dict[str, Any]) -> Tuple[str, ...]:
+    invoker_type = str(invoker.get("type") or "").strip()
+    if invoker_type == "remote_http":
+        return ("http", str(invoker.get("url") or "").strip())
+    command = invoker.get("command")
+    cmd = [str(x) for x in command] if isinstance(command, list) else []
+    env_override = invoker.get("env") if isinstance(invoker.get("env"), dict) else {}
+    return ("stdio", json.dumps(cmd), _env_fingerprint(env_override))
+
+
+class CapabilityRuntimePool:
+    """Bounded LRU of warm MCP sessions keyed by invoker identity."""
+
+    def __init__(self, *, max_processes: int, idle_ttl_s: float, health_check_after_s: float) -> None:
+        self.max_processes = max(1, int(max_processes))
+        self.idle_ttl_s = max(1.0, float(idle_ttl_s))
+        self.health_check_after_s = max(0.0, float(health_check_after_s))
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        # Per-key start lock plus the number of callers holding or waiting on it.
+        self._key_locks: Dict[Tuple[str, ...], List[Any]] = {}
+        # stdio processes being started; they count against max_processes.
+        self._starting = 0
+        self._reaper_started = False
+        self._closed = False
+        self.stats = {"started": 0, "reused": 0, "restarted": 0, "evicted": 0}
+
+    def _start_reaper(self) -> None:
+        if self._reaper_started:
+            return
+        self._reaper_started = True
+
+        def _loop() -> None:
+            while not self._closed:
+                time.sleep(max(1.0, min(30.0, self.idle_ttl_s / 2.0)))
+                self.evict_idle()
+
+        threading.Thread(target=_loop, daemon=True, name="cccc-mcp-pool-reaper").start()
+
+    def evict_idle(self, *, now: Optional[float] = None) -> int:
+        cutoff = (time.monotonic() if now is None else now) - self.idle_ttl_s
+        with self._lock:
+            stale = [k for k, s in self._sessions.items() if s.in_flight == 0 and (s.last_used <= cutoff or not s.alive)]
+            victims = [self._pop_session(k) for k in stale]
+            self.stats["evicted"] += len(victims)
+        for session in victims:
+            session.close()
+        return len(victims)
+
+    def _pop_session(self, key: Tuple[str, ...]) -> Any:
+        """Remove a session and its start lock if no caller uses it (caller holds lock)."""
+        session = self._sessions.pop(key, None)
+        entry = self._key_locks.get(key)
+        if entry is not None and entry[1] == 0:
+            del self._key_locks[key]
+        return session
+
+    def _make_room(self) -> bool:
+        """Evict the least recently used idle stdio session if the pool is full (caller holds lock)."""
+        stdio = [k for k in self._sessions if k[0] == "stdio"]
+        if len(stdio) + self._starting < self.max_processes:
+            return True
+        for key in stdio:
+            session = self._sessions[key]
+            if session.in_flight == 0:
+                self._pop_session(key)
+                self.stats["evicted"] += 1
+                threading.Thread(target=session.close, daemon=True).start()
+                return True
+        return False
+
+    def _acquire(self, key: Tuple[str, ...], factory: Callable[[], Any]) -> Optional[Any]:
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                return self._acquire_locked(key, factory)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0 and key not in self._sessions and self._key_locks.get(key) is entry:
+                    del self._key_locks[key]
+
+    def _acquire_locked(self, key: Tuple[str, ...], factory: Callable[[], Any]) -> Optional[Any]:
+        """Return the warm session for key or start one (caller holds the key's start lock)."""
+        restarted = False
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and not session.alive:
+                self._sessions.pop(key, None)
+                session = None
+                restarted = True
+            if session is not None:
+                self._sessions.move_to_end(key)
+        if session is not None:
+            idle_s = time.monotonic() - session.last_used
+            if session.in_flight == 0 and idle_s >= self.health_check_after_s and not session.ping():
+                with self._lock:
+                    if self._sessions.get(key) is session:
+                        self._sessions.pop(key, None)
+                session.close()
+                session = None
+                restarted = True
+            else:
+                self.stats["reused"] += 1
+                return session
+        stdio = key[0] == "stdio"
+        with self._lock:
+            if stdio:
+                # Reserve the slot before spawning so concurrent cold keys cannot overshoot.
+                if not self._make_room():
+                    return None
+                self._starting += 1
+        try:
+            session = factory()
+        except BaseException:
+            if stdio:
+                with self._lock:
+                    self._starting -= 1
+            raise
+        with self._lock:
+            if stdio:
+                self._starting -= 1
+            self._sessions[key] = session
+            self.stats["started"] += 1
+            if restarted:
+                self.stats["restarted"] += 1
+        self._start_reaper()
+        return session
+
+    def request(
+        self,
+        invoker: Dict[str, Any],
+        method: str,
+        params: Dict[str, Any],
+        *,
+        timeout_s: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Run one JSON-RPC request on a warm session; None when the pool is saturated."""
+        key = _invoker_pool_key(invoker)
+        if key[0] == "http":
+            factory: Callable[[], Any] = lambda: _HttpMcpSession(key[1], timeout_s=timeout_s)
+        else:
+            cmd = json.loads(key[1])
+            env_override = invoker.get("env") if isinstance(invoker.get("env"), dict) else {}
+            factory = lambda: _StdioMcpSession(cmd, env_override, timeout_s=timeout_s)
+        for attempt in range(2):
+            session = self._acquire(key, factory)
+            if session is None:
+                return None
+            try:
+                return session.request(method, params, timeout_s=timeout_s)
+            except _SessionDead:
+                # Crashed between calls; the request never reached it, so restart once.
+                if attempt:
+                    raise
+                continue
+        return None
+
+    def discard(self, invoker: Dict[str, Any]) -> None:
+        key = _invoker_pool_key(invoker)
+        with self._lock:
+            session = self._pop_session(key)
+        if session is not None:
+            session.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            self._closed = True
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._key_locks = {k: e for k, e in self._key_locks.items() if e[1]}
+        for session in sessions:
+            session.close()
+
+
+_CAPABILITY_RUNTIME_POOL: Optional[CapabilityRuntimePool] = None
+_CAPABILITY_RUNTIME_POOL_LOCK = threading.Lock()
+
+
+def _capability_runtime_pool() -> Optional[CapabilityRuntimePool]:
+    global _CAPABILITY_RUNTIME_POOL
+    if not _env_bool("CCCC_CAPABILITY_RUNTIME_POOL", True):
+        return None
+    with _CAPABILITY_RUNTIME_POOL_LOCK:
+        if _CAPABILITY_RUNTIME_POOL is None:
+            _CAPABILITY_RUNTIME_POOL = CapabilityRuntimePool(
+                max_processes=max(1, min(_env_int("CCCC_CAPABILITY_RUNTIME_POOL_MAX_PROCESSES", 8), 64)),
+                idle_ttl_s=float(max(10, _env_int("CCCC_CAPABILITY_RUNTIME_POOL_IDLE_SECONDS", 600))),
+                health_check_after_s=float(max(0, _env_int("CCCC_CAPABILITY_RUNTIME_POOL_HEALTH_CHECK_SECONDS", 60))),
+            )
+        return _CAPABILITY_RUNTIME_POOL
+
+
+def _discard_pooled_invoker(invoker: Any) -> None:
+    pool = _CAPABILITY_RUNTIME_POOL
+    if pool is not None and isinstance(invoker, dict):
+        pool.discard(invoker)
+
+
+def close_capability_runtime_pool() -> None:
+    """Stop every pooled MCP server process (daemon shutdown)."""
+    global _CAPABILITY_RUNTIME_POOL
+    with _CAPABILITY_RUNTIME_POOL_LOCK:
+        pool = _CAPABILITY_RUNTIME_POOL
+        _CAPABILITY_RUNTIME_POOL = None
+    if pool is not None:
+        pool.close_all()
@@ -11,6 +11,7 @@ from ....util.time import utc_now_iso
 
 from ._common import _RUNTIME_LOCK, _AUDIT_LOCK, _runtime_path, _audit_path, _quota_limit
 from ._documents import _load_runtime_doc, _save_runtime_doc
+from ._mcp_pool import _discard_pooled_invoker
 
 def _runtime_artifacts(runtime_doc: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     raw = runtime_doc.get("artifacts")
@@ -154,7 +155,9 @@ def _remove_runtime_artifact_if_unreferenced(
             return False
     artifacts = _runtime_artifacts(runtime_doc)
     if aid in artifacts:
-        artifacts.pop(aid, None)
+        removed = artifacts.pop(aid, None)
+        if isinstance(removed, dict):
+            _discard_pooled_invoker(removed.get("invoker"))
         runtime_doc["artifacts"] = artifacts
         return True
     return False
@@ -69,6 +69,14 @@ from ._remote import (
 from ._install import (
     _catalog_staleness_seconds,
 )
+from ._search_index import (
+    MATCH_FIELDS,
+    SCORE_FIELDS,
+    CapabilitySearchIndex,
+    count_token_hits,
+    join_search_text,
+    text_matches_query,
+)
 
 
 def _pkg():
@@ -386,49 +394,75 @@ def _capability_recommendation_search_text(item: Dict[str, Any]) -> str:
     return " ".join(chunks)
 
 
+def _search_fields(item: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "capability_id": str(item.get("capability_id") or ""),
+        "name": str(item.get("name") or ""),
+        "description_short": str(item.get("description_short") or ""),
+        "tags": " ".join(str(x) for x in (item.get("tags") or [])),
+        "tool_names": " ".join(str(x) for x in (item.get("tool_names") or [])),
+        "recommendation": _capability_recommendation_search_text(item),
+    }
+
+
 def _search_matches(query: str, item: Dict[str, Any]) -> bool:
     q = str(query or "").strip().lower()
     if not q:
         return True
-    fields = [
-        str(item.get("capability_id") or ""),
-        str(item.get("name") or ""),
-        str(item.get("description_short") or ""),
-        " ".join(str(x) for x in (item.get("tags") or [])),
-        _capability_recommendation_search_text(item),
-    ]
-    haystack = " ".join(fields).lower()
-    if q in haystack:
-        return True
-    tokens = _tokenize_search_text(q)
-    if not tokens:
-        return False
-    generic_tokens = {"mcp", "skill", "skills", "tool", "tools", "server", "capability", "capabilities"}
-    specific_tokens = [tok for tok in tokens if tok not in generic_tokens]
-    if specific_tokens:
-        return any(tok in haystack for tok in specific_tokens)
-    return any(tok in haystack for tok in tokens)
+    return text_matches_query(q, join_search_text(_search_fields(item), MATCH_FIELDS))
 
 
 def _score_item_tokens(item: Dict[str, Any], tokens: List[str]) -> int:
     if not tokens:
         return 0
-    fields = [
-        str(item.get("capability_id") or ""),
-        str(item.get("name") or ""),
-        str(item.get("description_short") or ""),
-        " ".join(str(x) for x in (item.get("tags") or [])),
-        " ".join(str(x) for x in (item.get("tool_names") or [])),
-        _capability_recommendation_search_text(item),
-    ]
-    haystack = " ".join(fields).lower()
-    if not haystack:
-        return 0
-    score = 0
-    for tok in tokens:
-        if tok in haystack:
-            score += 1
-    return score
+    return count_token_hits(join_search_text(_search_fields(item), SCORE_FIELDS), tokens)
+
+
+_SEARCH_INDEX = CapabilitySearchIndex(_search_fields)
+_BUILTIN_SEARCH_RECORDS: Optional[List[Dict[str, Any]]] = None
+
+
+def _merge_search_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Dedupe by capability_id; later records fill in / override non-empty fields."""
+    deduped_records: Dict[str, Dict[str, Any]] = {}
+    for rec in records:
+        cap_id = str(rec.get("capability_id") or "").strip()
+        if not cap_id:
+            continue
+        existing = deduped_records.get(cap_id) if isinstance(deduped_records.get(cap_id), dict) else {}
+        merged = dict(existing)
+        merged.update({k: v for k, v in rec.items() if v not in (None, "", [], {}) or k not in merged})
+        merged["capability_id"] = cap_id
+        deduped_records[cap_id] = merged
+    return list(deduped_records.values())
+
+
+def _catalog_search_signature(catalog_path: Any, catalog_doc: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """Version of the on-disk catalog; None (always resync) when it cannot be trusted."""
+    updated_at = str(catalog_doc.get("updated_at") or "")
+    try:
+        st = catalog_path.stat()
+    except (AttributeError, OSError):
+        return None
+    if not updated_at:
+        return None
+    return (str(catalog_path), st.st_ino, st.st_mtime_ns, st.st_size, updated_at)
+
+
+def _sync_capability_search_index(catalog_doc: Dict[str, Any], *, signature: Optional[Tuple[Any, ...]]) -> CapabilitySearchIndex:
+    """Keep the builtin+catalog search index current (caller holds _CATALOG_LOCK)."""
+
+    def _load() -> List[Dict[str, Any]]:
+        global _BUILTIN_SEARCH_RECORDS
+        if _BUILTIN_SEARCH_RECORDS is None:
+            _BUILTIN_SEARCH_RECORDS = _build_builtin_search_records()
+        rows = catalog_doc.get("records") if isinstance(catalog_doc.get("records"), dict) else {}
+        return _merge_search_records(
+            list(_BUILTIN_SEARCH_RECORDS) + [item for item in rows.values() if isinstance(item, dict)]
+        )
+
+    _SEARCH_INDEX.sync(_load, signature=signature)
+    return _SEARCH_INDEX
 
 
 def _canonicalize_actor_hint(actor_id: str) -> str:
@@ -869,39 +903,41 @@ def handle_capability_search(args: Dict[str, Any]) -> DaemonResponse:
         context_tokens = _context_search_tokens(group_id=group_id, actor_id=actor_id)
         preferred_packs = set(_role_preferred_pack_ids(actor_role))
 
-        external_records: List[Dict[str, Any]] = []
         source_states: Dict[str, Dict[str, Any]] = {}
         remote_augmented = False
         remote_added = 0
         remote_error = ""
+        search_index: Optional[CapabilitySearchIndex] = None
         with _CATALOG_LOCK:
             catalog_path, catalog_doc = _pkg()._load_catalog_doc()
             if include_external and _pkg()._ensure_curated_catalog_records(catalog_doc, policy=policy):
                 _pkg()._save_catalog_doc(catalog_path, catalog_doc)
+                # Index the normalized records as later loads will see them.
+                catalog_path, catalog_doc = _pkg()._load_catalog_doc()
             if include_external:
-                for item in (
-                    catalog_doc.get("records")
-                    if isinstance(catalog_doc.get("records"), dict)
-                    else {}
-                ).values():
-                    if isinstance(item, dict):
-                        external_records.append(dict(item))
+                search_index = _sync_capability_search_index(
+                    catalog_doc, signature=_catalog_search_signature(catalog_path, catalog_doc)
+                )
             source_states = _render_source_states(catalog_doc)
 
-        records: List[Dict[str, Any]] = _build_builtin_search_records()
-        if include_external:
-            records.extend(external_records)
-        deduped_records: Dict[str, Dict[str, Any]] = {}
-        for rec in records:
-            cap_id = str(rec.get("capability_id") or "").strip()
-            if not cap_id:
-                continue
-            existing = deduped_records.get(cap_id) if isinstance(deduped_records.get(cap_id), dict) else {}
-            merged = dict(existing)
-            merged.update({k: v for k, v in rec.items() if v not in (None, "", [], {}) or k not in merged})
-            merged["capability_id"] = cap_id
-            deduped_records[cap_id] = merged
-        records = list(deduped_records.values())
+        # Indexed records are shared with the index: copy before mutating.
+        records: List[Dict[str, Any]]
+        if search_index is not None:
+            hits = search_index.query(
+                query,
+                score_tokens=query_tokens or context_tokens,
+                relevance_tokens=query_tokens,
+            )
+            records = hits.records
+            query_matched = hits.matched
+        else:
+            hits = None
+            records = _merge_search_records(_build_builtin_search_records())
+            query_matched = None
+            if query:
+                query_matched = frozenset(
+                    str(r.get("capability_id") or "").strip() for r in records if _search_matches(query, r)
+                )
 
         if kind_filter:
             desired_kind = "mcp_toolpack" if kind_filter in {"mcp", "mcp_toolpack"} else kind_filter
@@ -927,6 +963,11 @@ def handle_capability_search(args: Dict[str, Any]) -> DaemonResponse:
                 source_id=str(rec.get("source_id") or ""),
                 actor_role=actor_role,
             )
+            if (not _policy_level_visible(policy_level)) and (cap_id not in enabled_set):
+                policy_hidden_count += 1
+                continue
+            if query_matched is not None and cap_id not in query_matched:
+                continue
             next_rec = dict(rec)
             next_rec["policy_level"] = policy_level
             block_entry = blocked_caps.get(cap_id) if isinstance(blocked_caps.get(cap_id), dict) else None
@@ -941,9 +982,6 @@ def handle_capability_search(args: Dict[str, Any]) -> DaemonResponse:
                     reasons = [f"runtime_block_{scope_text or 'group'}"]
                 next_rec["qualification_reasons"] = reasons
                 next_rec["blocked_scope"] = scope_text or "group"
-            if (not _policy_level_visible(policy_level)) and (cap_id not in enabled_set):
-                policy_hidden_count += 1
-                continue
             visible_records.append(next_rec)
         records = visible_records
         if kind_filter == "pack":
@@ -952,7 +990,7 @@ def handle_capability_search(args: Dict[str, Any]) -> DaemonResponse:
             records = [r for r in records if str(r.get("kind") or "").strip().lower() == "mcp_toolpack"]
         elif kind_filter == "skill":
             records = [r for r in records if str(r.get("kind") or "").strip().lower() == "skill"]
-        records = [r for r in records if _search_matches(query, r)]
+        indexed_ids = {str(r.get("capability_id") or "") for r in records} if hits is not None else set()
 
         remote_limit = max(1, min(_env_int("CCCC_CAPABILITY_SEARCH_REMOTE_FALLBACK_LIMIT", 40), 100))
         target_fill = max(1, min(limit, remote_limit))
@@ -1085,7 +1123,12 @@ def handle_capability_search(args: Dict[str, Any]) -> DaemonResponse:
             if remote_errors:
                 remote_error = "; ".join(str(x) for x in remote_errors if str(x))
 
-        def _rank(item: Dict[str, Any]) -> Tuple[int, int, int, int, int, str]:
+        def _token_score(item: Dict[str, Any], cap_id: str, tokens: List[str]) -> int:
+            if cap_id in indexed_ids and hits is not None:
+                return int(hits.token_scores.get(cap_id) or 0)
+            return _score_item_tokens(item, tokens)
+
+        def _rank(item: Dict[str, Any]) -> Tuple[int, int, int, int, float, str]:
             cap_id = str(item.get("capability_id") or "")
             is_builtin = 0 if _is_builtin_search_record(item) else 1
             name_key = str(item.get("name") or cap_id).lower()
@@ -1100,18 +1143,24 @@ def handle_capability_search(args: Dict[str, Any]) -> DaemonResponse:
 
             # Query-first path: preserve deterministic behavior with stronger lexical score.
             if query_tokens:
-                query_score = _score_item_tokens(item, query_tokens)
+                query_score = _token_score(item, cap_id, query_tokens)
+                if cap_id in indexed_ids and hits is not None:
+                    relevance = float(hits.relevance.get(cap_id) or 0.0)
+                elif search_index is not None:
+                    relevance = search_index.relevance_of(item, query_tokens)
+                else:
+                    relevance = 0.0
                 return (
                     is_builtin,
                     enabled_bias,
                     -query_score,
                     qualification_penalty,
-                    0,
+                    -relevance,
                     name_key,
                 )
 
             # Empty-query path: prioritize actionable + context-relevant packs.
-            context_score = _score_item_tokens(item, context_tokens)
+            context_score = _token_score(item, cap_id, context_tokens)
             preferred_bias = 0 if cap_id in preferred_packs else 1
             return (
                 is_builtin,
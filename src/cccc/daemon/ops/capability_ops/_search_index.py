@@ -0,0 +1,334 @@
+"""Persistent inverted index over capability search records.
+
+``capability_search`` used to rebuild every builtin record, merge the whole catalog
+and re-join/lower/tokenize each record's text on every query.  The index keeps the
+merged records together with their precomputed search text and a token -> record
+postings map, so a query only touches records that share a token with it.
+
+Matching keeps the historical substring semantics: a query token matches a record
+when it occurs anywhere in the record's text.  Every such occurrence lies inside a
+vocabulary token (both are ``[a-z0-9]{3,}`` runs), so a trigram index over the
+vocabulary finds all containing tokens -- exact, prefix and infix -- and the
+candidates are then verified against the precomputed text.  Among records the old
+ranking considers equal, a BM25-style relevance score (weighted by field) now
+breaks the tie.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Set
+
+from ._remote import _tokenize_search_text
+
+# Search field name -> BM25 term weight.
+SEARCH_FIELD_WEIGHTS: Dict[str, float] = {
+    "capability_id": 2.0,
+    "name": 3.0,
+    "description_short": 1.0,
+    "tags": 2.0,
+    "tool_names": 1.5,
+    "recommendation": 0.5,
+}
+# Fields (in order) joined into the text used for query matching / token scoring.
+MATCH_FIELDS = ("capability_id", "name", "description_short", "tags", "recommendation")
+SCORE_FIELDS = ("capability_id", "name", "description_short", "tags", "tool_names", "recommendation")
+GENERIC_SEARCH_TOKENS = frozenset(
+    {"mcp", "skill", "skills", "tool", "tools", "server", "capability", "capabilities"}
+)
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+# A query token matching a longer vocabulary token counts for less than an exact hit.
+_PREFIX_MATCH_WEIGHT = 0.7
+_INFIX_MATCH_WEIGHT = 0.4
+_EXPANSION_CACHE_MAX = 4096
+
+
+def join_search_text(fields: Dict[str, str], names: Iterable[str]) -> str:
+    return " ".join(fields.get(name, "") for name in names).lower()
+
+
+def specific_query_tokens(tokens: List[str]) -> List[str]:
+    specific = [tok for tok in tokens if tok not in GENERIC_SEARCH_TOKENS]
+    return specific or list(tokens)
+
+
+def text_matches_query(query: str, haystack: str) -> bool:
+    """Whether lower-cased ``query`` matches ``haystack`` (whole phrase or any specific token)."""
+    if query in haystack:
+        return True
+    tokens = _tokenize_search_text(query)
+    if not tokens:
+        return False
+    return any(tok in haystack for tok in specific_query_tokens(tokens))
+
+
+def count_token_hits(haystack: str, tokens: List[str]) -> int:
+    if not haystack:
+        return 0
+    return sum(1 for tok in tokens if tok in haystack)
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+def _match_weight(query_token: str, vocab_token: str) -> float:
+    if vocab_token == query_token:
+        return 1.0
+    if vocab_token.startswith(query_token):
+        return _PREFIX_MATCH_WEIGHT
+    return _INFIX_MATCH_WEIGHT
+
+
+@dataclass
+class _IndexedRecord:
+    record: Dict[str, Any]
+    fields: Dict[str, str]
+    match_text: str
+    score_text: str
+    term_weights: Dict[str, float]
+    length: float
+
+
+@dataclass
+class CapabilitySearchHits:
+    """Snapshot of one index query; safe to use after the index lock is released.
+
+    ``records`` are the index's own merged records and must be treated as read-only.
+    ``matched`` is None when every record matches (empty query).
+    """
+
+    records: List[Dict[str, Any]]
+    matched: Optional[FrozenSet[str]]
+    token_scores: Dict[str, int] = field(default_factory=dict)
+    relevance: Dict[str, float] = field(default_factory=dict)
+
+
+class CapabilitySearchIndex:
+    """Token -> record index kept in sync with the merged capability records."""
+
+    def __init__(self, fields_fn: Callable[[Dict[str, Any]], Dict[str, str]]) -> None:
+        self._fields_fn = fields_fn
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _IndexedRecord] = {}
+        self._order: List[str] = []
+        self._postings: Dict[str, Set[str]] = {}
+        self._trigram_vocab: Dict[str, Set[str]] = defaultdict(set)
+        self._expansions: Dict[str, FrozenSet[str]] = {}
+        self._total_length = 0.0
+        self._signature: Optional[Hashable] = None
+        self._stats = {"syncs": 0, "skipped_syncs": 0, "indexed": 0, "refreshed": 0, "removed": 0, "queries": 0}
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    def sync(self, load_records: Callable[[], Iterable[Dict[str, Any]]], *, signature: Optional[Hashable]) -> None:
+        """Bring the index up to date, reindexing only records that changed.
+
+        ``load_records`` is only called when ``signature`` differs from the last sync
+        (a None signature always resyncs).
+        """
+        with self._lock:
+            if signature is not None and signature == self._signature:
+                self._stats["skipped_syncs"] += 1
+                return
+            self._signature = None
+            order: List[str] = []
+            seen: Set[str] = set()
+            for rec in load_records():
+                cap_id = str(rec.get("capability_id") or "").strip()
+                if not cap_id or cap_id in seen:
+                    continue
+                seen.add(cap_id)
+                order.append(cap_id)
+                entry = self._entries.get(cap_id)
+                if entry is None or entry.record != rec:
+                    self._put(cap_id, rec, entry)
+            for cap_id in [cid for cid in self._entries if cid not in seen]:
+                self._remove(cap_id)
+            self._order = order
+            self._signature = signature
+            self._stats["syncs"] += 1
+
+    def query(
+        self,
+        query: str,
+        *,
+        score_tokens: List[str],
+        relevance_tokens: Sequence[str] = (),
+    ) -> CapabilitySearchHits:
+        """Match ``query``; precompute token-hit counts and BM25 relevance of the matches."""
+        q = str(query or "").strip().lower()
+        with self._lock:
+            self._stats["queries"] += 1
+            records = [self._entries[cap_id].record for cap_id in self._order]
+            if not q:
+                return CapabilitySearchHits(
+                    records=records,
+                    matched=None,
+                    token_scores={
+                        cap_id: count_token_hits(self._entries[cap_id].score_text, score_tokens)
+                        for cap_id in self._order
+                    } if score_tokens else {},
+                )
+            matched = frozenset(self._match(q))
+            hits = CapabilitySearchHits(records=records, matched=matched)
+            idf = self._idf(relevance_tokens) if relevance_tokens else {}
+            for cap_id in matched:
+                entry = self._entries[cap_id]
+                if score_tokens:
+                    hits.token_scores[cap_id] = count_token_hits(entry.score_text, score_tokens)
+                if relevance_tokens:
+                    hits.relevance[cap_id] = self._bm25(entry.term_weights, entry.length, relevance_tokens, idf)
+            return hits
+
+    def relevance_of(self, record: Dict[str, Any], tokens: List[str]) -> float:
+        """Relevance of a record that is not (necessarily) indexed, using current corpus stats."""
+        if not tokens:
+            return 0.0
+        weights = self._term_weights(self._fields_fn(record))
+        with self._lock:
+            return self._bm25(weights, sum(weights.values()), tokens, self._idf(tokens))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["records"] = len(self._entries)
+            out["vocabulary"] = len(self._postings)
+            return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._order = []
+            self._postings.clear()
+            self._trigram_vocab.clear()
+            self._expansions.clear()
+            self._total_length = 0.0
+            self._signature = None
+
+    # -- internals (caller holds the lock) -------------------------------------------------
+
+    def _term_weights(self, fields: Dict[str, str]) -> Dict[str, float]:
+        weights: Dict[str, float] = defaultdict(float)
+        for name, weight in SEARCH_FIELD_WEIGHTS.items():
+            for tok in _tokenize_search_text(fields.get(name, "")):
+                weights[tok] += weight
+        return dict(weights)
+
+    def _put(self, cap_id: str, rec: Dict[str, Any], previous: Optional[_IndexedRecord]) -> None:
+        stored = copy.deepcopy(rec)
+        fields = self._fields_fn(stored)
+        if previous is not None:
+            if previous.fields == fields:
+                # Only non-searchable fields (timestamps, status) changed.
+                previous.record = stored
+                self._stats["refreshed"] += 1
+                return
+            self._remove(cap_id, count=False)
+        weights = self._term_weights(fields)
+        entry = _IndexedRecord(
+            record=stored,
+            fields=fields,
+            match_text=join_search_text(fields, MATCH_FIELDS),
+            score_text=join_search_text(fields, SCORE_FIELDS),
+            term_weights=weights,
+            length=sum(weights.values()),
+        )
+        self._entries[cap_id] = entry
+        self._total_length += entry.length
+        for tok in weights:
+            postings = self._postings.get(tok)
+            if postings is None:
+                postings = self._postings[tok] = set()
+                for gram in _trigrams(tok):
+                    self._trigram_vocab[gram].add(tok)
+                self._expansions.clear()
+            postings.add(cap_id)
+        self._stats["indexed"] += 1
+
+    def _remove(self, cap_id: str, *, count: bool = True) -> None:
+        entry = self._entries.pop(cap_id, None)
+        if entry is None:
+            return
+        self._total_length -= entry.length
+        for tok in entry.term_weights:
+            postings = self._postings.get(tok)
+            if postings is None:
+                continue
+            postings.discard(cap_id)
+            if postings:
+                continue
+            del self._postings[tok]
+            for gram in _trigrams(tok):
+                vocab = self._trigram_vocab.get(gram)
+                if vocab is not None:
+                    vocab.discard(tok)
+                    if not vocab:
+                        del self._trigram_vocab[gram]
+            self._expansions.clear()
+        if count:
+            self._stats["removed"] += 1
+
+    def _expand(self, token: str) -> FrozenSet[str]:
+        """Vocabulary tokens that contain ``token``."""
+        cached = self._expansions.get(token)
+        if cached is not None:
+            return cached
+        grams = sorted((self._trigram_vocab.get(g, set()) for g in _trigrams(token)), key=len)
+        if not grams or not grams[0]:
+            out: FrozenSet[str] = frozenset()
+        else:
+            out = frozenset(v for v in grams[0] if token in v)
+        if len(self._expansions) >= _EXPANSION_CACHE_MAX:
+            self._expansions.clear()
+        self._expansions[token] = out
+        return out
+
+    def _match(self, q: str) -> List[str]:
+        tokens = _tokenize_search_text(q)
+        if not tokens:
+            # Too short for the index: only a whole-phrase hit can match.
+            return [cap_id for cap_id, entry in self._entries.items() if q in entry.match_text]
+        specific = specific_query_tokens(tokens)
+        candidates: Set[str] = set()
+        for tok in specific:
+            for vocab in self._expand(tok):
+                candidates.update(self._postings.get(vocab, ()))
+        matched: List[str] = []
+        for cap_id in candidates:
+            text = self._entries[cap_id].match_text
+            # Same test as text_matches_query; candidates may only have hit via tool_names.
+            if q in text or any(tok in text for tok in specific):
+                matched.append(cap_id)
+        return matched
+
+    def _idf(self, tokens: Sequence[str]) -> Dict[str, float]:
+        n = len(self._entries)
+        out: Dict[str, float] = {}
+        for tok in set(tokens):
+            docs: Set[str] = set()
+            for vocab in self._expand(tok):
+                docs.update(self._postings.get(vocab, ()))
+            df = len(docs)
+            out[tok] = math.log(1.0 + (n - df + 0.5) / (df + 0.5)) if n else 0.0
+        return out
+
+    def _bm25(self, weights: Dict[str, float], length: float, tokens: Sequence[str], idf: Dict[str, float]) -> float:
+        if not weights:
+            return 0.0
+        avg_length = (self._total_length / len(self._entries)) if self._entries else length
+        norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * (length / avg_length if avg_length > 0 else 1.0))
+        score = 0.0
+        for tok in tokens:
+            tf = sum(w * _match_weight(tok, vocab) for vocab, w in weights.items() if tok in vocab)
+            if tf > 0:
+                score += idf.get(tok, 0.0) * tf * (_BM25_K1 + 1.0) / (tf + norm)
+        return score
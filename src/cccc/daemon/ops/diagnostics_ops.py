@@ -9,6 +9,8 @@ from typing import Any, Callable, Dict, Optional
 from ...contracts.v1 import DaemonError, DaemonResponse
 from ...kernel.actors import find_actor, get_effective_role, list_actors
 from ...kernel.group import load_group
+from ...kernel.inbox import event_lookup_stats
+from ...kernel.ledger_index import ledger_search_backend
 from ...kernel.settings import get_remote_access_settings, resolve_remote_access_web_binding
 from ...kernel.terminal_transcript import get_terminal_transcript_settings
 from ...paths import ensure_home
@@ -27,6 +29,8 @@ from ...util.conv import coerce_bool
 from ...util.process import pid_is_alive
 from ...util.time import utc_now_iso
 from ... import __version__
+from .capability_ops import capability_document_cache_stats
+from .execution_queues import request_execution_stats
 
 
 def _error(code: str, message: str, *, details: Optional[Dict[str, Any]] = None) -> DaemonResponse:
@@ -162,6 +166,8 @@ def handle_debug_snapshot(
                 "version": __version__,
                 "ts": utc_now_iso(),
                 "log_path": str(home / "daemon" / "ccccd.log"),
+                "request_lanes": request_execution_stats(),
+                "capability_documents": capability_document_cache_stats(),
             },
             "web": _build_web_debug_snapshot(home=home),
         }
@@ -206,6 +212,14 @@ def handle_debug_snapshot(
                 out["delivery"] = throttle_debug_summary(group.group_id)
             except Exception:
                 out["delivery"] = {}
+            try:
+                search_backend = ledger_search_backend(group.ledger_path)
+            except Exception:
+                search_backend = ""
+            out["ledger"] = {
+                "search_backend": search_backend,
+                "event_lookup": event_lookup_stats(),
+            }
         return DaemonResponse(ok=True, result=out)
     except Exception as e:
         return _error("debug_snapshot_failed", str(e))
@@ -257,23 +271,20 @@ def handle_terminal_tail(
     if max_chars > 200_000:
         max_chars = 200_000
     try:
-        raw = b""
-        try:
-            raw = pty_runner.SUPERVISOR.tail_output(group_id=group_id, actor_id=actor_id, max_bytes=pty_backlog_bytes())
-        except Exception:
-            raw = b""
-        raw_text = raw.decode("utf-8", errors="replace")
-        text = raw_text
         hint = ""
         if strip_ansi:
+            text = pty_runner.SUPERVISOR.render_tail(group_id=group_id, actor_id=actor_id, compact=compact)
+            if not text.strip():
+                raw = pty_runner.SUPERVISOR.tail_output(group_id=group_id, actor_id=actor_id, max_bytes=65536)
+                if raw.decode("utf-8", errors="replace").strip():
+                    hint = "Rendered transcript is empty; try disabling Strip ANSI for full-screen TUIs."
+        else:
+            raw = b""
             try:
-                from ...util.terminal_render import render_transcript
-
-                text = render_transcript(text, compact=compact)
+                raw = pty_runner.SUPERVISOR.tail_output(group_id=group_id, actor_id=actor_id, max_bytes=pty_backlog_bytes())
             except Exception:
-                pass
-            if not text.strip() and raw_text.strip():
-                hint = "Rendered transcript is empty; try disabling Strip ANSI for full-screen TUIs."
+                raw = b""
+            text = raw.decode("utf-8", errors="replace")
         if len(text) > max_chars:
             text = text[-max_chars:]
         return DaemonResponse(
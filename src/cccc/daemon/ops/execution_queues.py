@@ -7,15 +7,24 @@ from dataclasses import dataclass
 import logging
 from queue import Empty, Queue
 import threading
+import time
 from typing import Any, Callable, Deque, Dict, Optional, Tuple
 
 from ...contracts.v1 import DaemonError, DaemonResponse, build_async_result_fields
 
 
+REQUEST_WRITE_GLOBAL_LANE = "__global__"
+_MAX_TRACKED_LANES = 256
+
+_EXECUTORS: Dict[str, Any] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
 @dataclass
 class _QueuedRequest:
     conn: Any
     req: Any
+    enqueued_at: float = 0.0
 
 
 @dataclass
@@ -26,6 +35,98 @@ class GroupSpaceSyncRunTask:
     by: str
 
 
+@dataclass
+class _LaneStats:
+    submitted: int = 0
+    completed: int = 0
+    max_depth: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+    last_wait_s: float = 0.0
+    last_active: float = 0.0
+
+    def record_start(self, enqueued_at: float, now: float) -> None:
+        wait_s = max(0.0, now - enqueued_at) if enqueued_at else 0.0
+        self.wait_total_s += wait_s
+        self.wait_max_s = max(self.wait_max_s, wait_s)
+        self.last_wait_s = wait_s
+        self.last_active = now
+
+    def snapshot(self, *, depth: int, running: int) -> Dict[str, Any]:
+        started = max(0, self.completed + running)
+        return {
+            "depth": int(depth),
+            "running": int(running),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "max_depth": self.max_depth,
+            "wait_avg_ms": round(self.wait_total_s * 1000.0 / started, 3) if started else 0.0,
+            "wait_max_ms": round(self.wait_max_s * 1000.0, 3),
+            "wait_last_ms": round(self.last_wait_s * 1000.0, 3),
+        }
+
+
+def _register_executor(name: str, executor: Any) -> None:
+    if not name:
+        return
+    with _EXECUTORS_LOCK:
+        _EXECUTORS[name] = executor
+
+
+def _unregister_executor(name: str) -> None:
+    with _EXECUTORS_LOCK:
+        _EXECUTORS.pop(name, None)
+
+
+def request_execution_stats() -> Dict[str, Any]:
+    """Per-lane queue depth and wait-time snapshot of the registered request executors."""
+    with _EXECUTORS_LOCK:
+        executors = dict(_EXECUTORS)
+    out: Dict[str, Any] = {}
+    for name, executor in sorted(executors.items()):
+        try:
+            out[name] = executor.stats()
+        except Exception:
+            continue
+    return out
+
+
+def _execute_queued_request(
+    item: _QueuedRequest,
+    *,
+    handle_request: Callable[[Any], Tuple[Any, bool]],
+    send_json: Callable[[Any, Dict[str, Any]], None],
+    dump_response: Callable[[Any], Dict[str, Any]],
+    logger: logging.Logger,
+) -> bool:
+    should_exit = False
+    try:
+        resp, should_exit = handle_request(item.req)
+        try:
+            send_json(item.conn, dump_response(resp))
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+    except Exception as exc:
+        logger.exception("Unexpected error in request worker: %s", exc)
+        try:
+            error_resp = DaemonResponse(
+                ok=False,
+                error=DaemonError(
+                    code="internal_error",
+                    message=f"internal error: {type(exc).__name__}: {exc}",
+                ),
+            )
+            send_json(item.conn, dump_response(error_resp))
+        except Exception:
+            pass
+    finally:
+        try:
+            item.conn.close()
+        except Exception:
+            pass
+    return bool(should_exit)
+
+
 class DaemonRequestExecutionQueue:
     """Single-writer request executor for daemon request handling."""
 
@@ -38,6 +139,7 @@ class DaemonRequestExecutionQueue:
         dump_response: Callable[[Any], Dict[str, Any]],
         logger: logging.Logger,
         on_should_exit: Callable[[], None],
+        name: str = "",
     ) -> None:
         self._stop_event = stop_event
         self._handle_request = handle_request
@@ -46,45 +148,59 @@ class DaemonRequestExecutionQueue:
         self._logger = logger
         self._on_should_exit = on_should_exit
         self._queue: Queue[_QueuedRequest] = Queue()
+        self._stats_lock = threading.Lock()
+        self._stats = _LaneStats()
+        self._running = 0
+        self._workers = 0
+        _register_executor(name, self)
 
     def submit(self, *, conn: Any, req: Any) -> bool:
         if self._stop_event.is_set():
             return False
-        self._queue.put(_QueuedRequest(conn=conn, req=req))
+        self._queue.put(_QueuedRequest(conn=conn, req=req, enqueued_at=time.monotonic()))
+        with self._stats_lock:
+            self._stats.submitted += 1
+            self._stats.max_depth = max(self._stats.max_depth, self._queue.qsize())
         return True
 
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "workers": self._workers,
+                "lanes": {"default": self._stats.snapshot(depth=self._queue.qsize(), running=self._running)},
+            }
+
     def run_forever(self) -> None:
+        with self._stats_lock:
+            self._workers += 1
+        try:
+            self._run()
+        finally:
+            with self._stats_lock:
+                self._workers -= 1
+
+    def _run(self) -> None:
         while not self._stop_event.is_set():
             try:
                 item = self._queue.get(timeout=0.2)
             except Empty:
                 continue
 
-            should_exit = False
+            with self._stats_lock:
+                self._stats.record_start(item.enqueued_at, time.monotonic())
+                self._running += 1
             try:
-                resp, should_exit = self._handle_request(item.req)
-                try:
-                    self._send_json(item.conn, self._dump_response(resp))
-                except (BrokenPipeError, ConnectionResetError, OSError):
-                    pass
-            except Exception as exc:
-                self._logger.exception("Unexpected error in request worker: %s", exc)
-                try:
-                    error_resp = DaemonResponse(
-                        ok=False,
-                        error=DaemonError(
-                            code="internal_error",
-                            message=f"internal error: {type(exc).__name__}: {exc}",
-                        ),
-                    )
-                    self._send_json(item.conn, self._dump_response(error_resp))
-                except Exception:
-                    pass
+                should_exit = _execute_queued_request(
+                    item,
+                    handle_request=self._handle_request,
+                    send_json=self._send_json,
+                    dump_response=self._dump_response,
+                    logger=self._logger,
+                )
             finally:
-                try:
-                    item.conn.close()
-                except Exception:
-                    pass
+                with self._stats_lock:
+                    self._running -= 1
+                    self._stats.completed += 1
                 self._queue.task_done()
 
             if should_exit:
@@ -92,6 +208,158 @@ class DaemonRequestExecutionQueue:
                 self._stop_event.set()
 
 
+class GroupShardedRequestExecutor:
+    """Write executor that serializes requests per group and runs groups in parallel.
+
+    ``lane_for`` maps a request to its lane: a group_id, or REQUEST_WRITE_GLOBAL_LANE for
+    ops that are not scoped to one group (registry writes, daemon-wide settings). Each
+    lane runs one request at a time in arrival order. A global request waits for running
+    group requests to finish, and no group request starts while a global one is waiting
+    or running. Parallelism is bounded by the number of worker threads started on
+    ``run_forever``.
+    """
+
+    def __init__(
+        self,
+        *,
+        stop_event: threading.Event,
+        handle_request: Callable[[Any], Tuple[Any, bool]],
+        send_json: Callable[[Any, Dict[str, Any]], None],
+        dump_response: Callable[[Any], Dict[str, Any]],
+        logger: logging.Logger,
+        on_should_exit: Callable[[], None],
+        lane_for: Callable[[Any], str],
+        name: str = "",
+    ) -> None:
+        self._stop_event = stop_event
+        self._handle_request = handle_request
+        self._send_json = send_json
+        self._dump_response = dump_response
+        self._logger = logger
+        self._on_should_exit = on_should_exit
+        self._lane_for = lane_for
+        self._cond = threading.Condition()
+        self._lanes: Dict[str, Deque[_QueuedRequest]] = {}
+        self._ready: Deque[str] = deque()
+        self._running: set[str] = set()
+        self._stats: Dict[str, _LaneStats] = {}
+        self._workers = 0
+        _register_executor(name, self)
+
+    def _lane(self, req: Any) -> str:
+        try:
+            lane = str(self._lane_for(req) or "").strip()
+        except Exception:
+            lane = ""
+        return lane or REQUEST_WRITE_GLOBAL_LANE
+
+    def submit(self, *, conn: Any, req: Any) -> bool:
+        if self._stop_event.is_set():
+            return False
+        lane = self._lane(req)
+        now = time.monotonic()
+        with self._cond:
+            pending = self._lanes.setdefault(lane, deque())
+            pending.append(_QueuedRequest(conn=conn, req=req, enqueued_at=now))
+            if len(pending) == 1 and lane not in self._running:
+                self._ready.append(lane)
+            stats = self._lane_stats(lane, now)
+            stats.submitted += 1
+            stats.max_depth = max(stats.max_depth, len(pending))
+            self._cond.notify()
+        return True
+
+    def _lane_stats(self, lane: str, now: float) -> _LaneStats:
+        stats = self._stats.get(lane)
+        if stats is None:
+            if len(self._stats) >= _MAX_TRACKED_LANES:
+                idle = [k for k in self._stats if k not in self._lanes and k not in self._running and k != REQUEST_WRITE_GLOBAL_LANE]
+                idle.sort(key=lambda k: self._stats[k].last_active)
+                for key in idle[: max(1, len(idle) // 4)]:
+                    self._stats.pop(key, None)
+            stats = _LaneStats(last_active=now)
+            self._stats[lane] = stats
+        return stats
+
+    def _take_next(self) -> Optional[Tuple[str, _QueuedRequest]]:
+        """Pick the next runnable lane (caller holds the condition)."""
+        if REQUEST_WRITE_GLOBAL_LANE in self._running:
+            return None
+        if REQUEST_WRITE_GLOBAL_LANE in self._ready:
+            if self._running:
+                return None
+            self._ready.remove(REQUEST_WRITE_GLOBAL_LANE)
+            lane = REQUEST_WRITE_GLOBAL_LANE
+        elif self._ready:
+            lane = self._ready.popleft()
+        else:
+            return None
+        item = self._lanes[lane].popleft()
+        self._running.add(lane)
+        now = time.monotonic()
+        self._lane_stats(lane, now).record_start(item.enqueued_at, now)
+        return lane, item
+
+    def _finish(self, lane: str) -> None:
+        with self._cond:
+            self._running.discard(lane)
+            pending = self._lanes.get(lane)
+            if pending:
+                self._ready.append(lane)
+            else:
+                self._lanes.pop(lane, None)
+            stats = self._stats.get(lane)
+            if stats is not None:
+                stats.completed += 1
+                stats.last_active = time.monotonic()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            lanes = {
+                lane: stats.snapshot(depth=len(self._lanes.get(lane) or ()), running=1 if lane in self._running else 0)
+                for lane, stats in self._stats.items()
+            }
+            return {
+                "workers": self._workers,
+                "depth": sum(len(q) for q in self._lanes.values()),
+                "running": len(self._running),
+                "lanes": lanes,
+            }
+
+    def run_forever(self) -> None:
+        with self._cond:
+            self._workers += 1
+        try:
+            self._run()
+        finally:
+            with self._cond:
+                self._workers -= 1
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            with self._cond:
+                picked = self._take_next()
+                if picked is None:
+                    self._cond.wait(timeout=0.2)
+                    continue
+            lane, item = picked
+            try:
+                should_exit = _execute_queued_request(
+                    item,
+                    handle_request=self._handle_request,
+                    send_json=self._send_json,
+                    dump_response=self._dump_response,
+                    logger=self._logger,
+                )
+            finally:
+                self._finish(lane)
+
+            if should_exit:
+                self._on_should_exit()
+                self._stop_event.set()
+
+
 class GroupSpaceSyncRunQueue:
     """Serialized queue for manual work-lane space sync runs."""
 
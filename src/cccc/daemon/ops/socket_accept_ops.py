@@ -7,6 +7,7 @@ import socket
 from typing import Any, Callable, Dict, Tuple
 
 from ...contracts.v1 import DaemonError, DaemonResponse
+from ..client_ops import IPC_SESSION_OP
 
 REQUEST_READ_TIMEOUT_S = 0.5
 
@@ -22,6 +23,7 @@ def handle_incoming_connection(
     try_handle_special: Callable[[Any, Any], bool],
     handle_request: Callable[[Any], Tuple[Any, bool]],
     schedule_request: Callable[[Any, Any], bool] | None = None,
+    start_session: Callable[[Any, Any], bool] | None = None,
     logger: logging.Logger,
 ) -> bool:
     """Handle a single accepted daemon connection.
@@ -44,6 +46,40 @@ def handle_incoming_connection(
         except Exception:
             pass
         return False
+    return dispatch_incoming_request(
+        conn,
+        raw,
+        parse_request=parse_request,
+        make_invalid_request_error=make_invalid_request_error,
+        send_json=send_json,
+        dump_response=dump_response,
+        try_handle_special=try_handle_special,
+        handle_request=handle_request,
+        schedule_request=schedule_request,
+        start_session=start_session,
+        logger=logger,
+    )
+
+
+def dispatch_incoming_request(
+    conn: Any,
+    raw: Dict[str, Any],
+    *,
+    parse_request: Callable[[Dict[str, Any]], Any],
+    make_invalid_request_error: Callable[[str], DaemonResponse],
+    send_json: Callable[[Any, Dict[str, Any]], None],
+    dump_response: Callable[[Any], Dict[str, Any]],
+    try_handle_special: Callable[[Any, Any], bool],
+    handle_request: Callable[[Any], Tuple[Any, bool]],
+    schedule_request: Callable[[Any, Any], bool] | None = None,
+    start_session: Callable[[Any, Any], bool] | None = None,
+    logger: logging.Logger,
+) -> bool:
+    """Route one already-read request frame (parse, special ops, sessions, execution).
+
+    Returns:
+        should_exit flag requested by request handling.
+    """
     try:
         req = parse_request(raw)
     except Exception as e:
@@ -62,6 +98,24 @@ def handle_incoming_connection(
     if try_handle_special(req, conn):
         return False
 
+    if start_session is not None and str(getattr(req, "op", "") or "").strip() == IPC_SESSION_OP:
+        # The session thread owns the connection from here on.
+        if start_session(req, conn):
+            return False
+        try:
+            send_json(
+                conn,
+                dump_response(DaemonResponse(ok=False, error=DaemonError(code="internal_error", message="internal error: ipc session unavailable"))),
+            )
+        except Exception:
+            pass
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        return False
+
     if schedule_request is not None:
         try:
             conn.settimeout(None)
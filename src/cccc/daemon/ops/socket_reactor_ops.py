@@ -0,0 +1,186 @@
+"""Selector-based request ingestion for the daemon socket.
+
+The accept loop used to read each connection's request line synchronously, so one
+slow or half-open client (or a large request body) delayed every other client. The
+reactor accepts and reads many connections concurrently on non-blocking sockets and
+hands each complete request frame to ``on_frame`` (parse + route to the execution
+queues) with the socket restored to the blocking mode handlers expect.
+"""
+
+from __future__ import annotations
+
+import logging
+import selectors
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from ..socket_protocol_ops import MAX_REQUEST_LINE_BYTES, decode_json_line
+from .socket_accept_ops import REQUEST_READ_TIMEOUT_S
+
+# Reads no longer block other clients, so a request may trickle in for longer than
+# the old per-connection read timeout before it is dropped.
+REQUEST_FRAME_DEADLINE_S = 5.0
+MAX_PENDING_CONNECTIONS = 1024
+_ACCEPT_BATCH = 64
+_IDLE_SELECT_S = 1.0
+
+
+@dataclass
+class _PendingFrame:
+    conn: Any
+    deadline: float
+    buf: bytearray = field(default_factory=bytearray)
+
+
+class RequestFrameReactor:
+    """Accept connections and read request lines without blocking on any one client."""
+
+    def __init__(
+        self,
+        server_sock: socket.socket,
+        *,
+        on_frame: Callable[[Any, Dict[str, Any]], bool],
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        frame_deadline_s: float = REQUEST_FRAME_DEADLINE_S,
+        max_frame_bytes: int = MAX_REQUEST_LINE_BYTES,
+        max_pending: int = MAX_PENDING_CONNECTIONS,
+    ) -> None:
+        self._server = server_sock
+        self._on_frame = on_frame
+        self._stop_event = stop_event
+        self._logger = logger
+        self._frame_deadline_s = float(frame_deadline_s)
+        self._max_frame_bytes = int(max_frame_bytes)
+        self._max_pending = max(1, int(max_pending))
+        self._pending: Dict[int, _PendingFrame] = {}
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._accepting = False
+
+    def run(self) -> bool:
+        """Serve until stop_event is set; returns True when a handler requested exit."""
+        self._server.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ, None)
+        self._accepting = True
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    events = self._selector.select(self._select_timeout())
+                except InterruptedError:
+                    continue
+                for key, _mask in events:
+                    if key.data is None:
+                        self._accept_ready()
+                        continue
+                    if self._read_ready(key.data):
+                        return True
+                self._expire(time.monotonic())
+            return False
+        except KeyboardInterrupt:
+            return False
+        finally:
+            for pending in list(self._pending.values()):
+                self._drop(pending)
+            self._pending.clear()
+            try:
+                self._selector.close()
+            except Exception:
+                pass
+            self._selector = None
+
+    def _select_timeout(self) -> float:
+        if not self._pending:
+            return _IDLE_SELECT_S
+        earliest = min(p.deadline for p in self._pending.values())
+        return max(0.0, min(_IDLE_SELECT_S, earliest - time.monotonic()))
+
+    def _set_accepting(self, enabled: bool) -> None:
+        if enabled == self._accepting or self._selector is None:
+            return
+        if enabled:
+            self._selector.register(self._server, selectors.EVENT_READ, None)
+        else:
+            # Leave further connections in the listen backlog until reads drain.
+            self._selector.unregister(self._server)
+        self._accepting = enabled
+
+    def _accept_ready(self) -> None:
+        assert self._selector is not None
+        for _ in range(_ACCEPT_BATCH):
+            if len(self._pending) >= self._max_pending:
+                self._set_accepting(False)
+                return
+            try:
+                conn, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            try:
+                conn.setblocking(False)
+                pending = _PendingFrame(conn=conn, deadline=time.monotonic() + self._frame_deadline_s)
+                self._selector.register(conn, selectors.EVENT_READ, pending)
+            except Exception:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                continue
+            self._pending[id(conn)] = pending
+
+    def _read_ready(self, pending: _PendingFrame) -> bool:
+        try:
+            chunk = pending.conn.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            self._forget(pending)
+            self._drop(pending)
+            return False
+        if chunk:
+            pending.buf += chunk
+            if b"\n" not in chunk and len(pending.buf) <= self._max_frame_bytes:
+                return False
+        # Newline, EOF, or oversized body: same cut-off points as recv_json_line.
+        self._forget(pending)
+        conn = pending.conn
+        try:
+            conn.setblocking(True)
+            conn.settimeout(REQUEST_READ_TIMEOUT_S)
+        except OSError:
+            self._drop(pending)
+            return False
+        raw = decode_json_line(bytes(pending.buf))
+        pending.buf = bytearray()
+        try:
+            return bool(self._on_frame(conn, raw))
+        except Exception as e:
+            self._logger.exception("Unexpected error dispatching request frame: %s", e)
+            self._drop(pending)
+            return False
+
+    def _forget(self, pending: _PendingFrame) -> None:
+        self._pending.pop(id(pending.conn), None)
+        if self._selector is not None:
+            try:
+                self._selector.unregister(pending.conn)
+            except Exception:
+                pass
+        if len(self._pending) < self._max_pending:
+            self._set_accepting(True)
+
+    def _expire(self, now: float) -> None:
+        for pending in [p for p in self._pending.values() if p.deadline <= now]:
+            self._forget(pending)
+            self._drop(pending)
+
+    @staticmethod
+    def _drop(pending: _PendingFrame) -> None:
+        try:
+            pending.conn.close()
+        except Exception:
+            pass
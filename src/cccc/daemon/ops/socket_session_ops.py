@@ -0,0 +1,172 @@
+"""Multiplexed IPC sessions for long-lived daemon clients.
+
+A client upgrades a fresh connection by sending the ``ipc_session`` op as its first
+request. After the acknowledgement, each line from the client is an envelope
+``{"id": <request id>, "request": <DaemonRequest>}`` and each reply line is
+``{"id": <request id>, "response": <DaemonResponse>}``. Requests run on the same
+execution queues as one-shot requests, so replies may arrive out of order.
+One-shot connections are unaffected.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import threading
+from typing import Any, Callable, Dict, Set
+
+from ...contracts.v1 import DaemonError, DaemonResponse
+from ..client_ops import IPC_SESSION_PROTOCOL, SESSION_EXCLUDED_OPS
+
+MAX_SESSION_LINE_BYTES = 2_000_000
+
+_ACTIVE_SESSIONS: Set["_SessionChannel"] = set()
+_ACTIVE_SESSIONS_LOCK = threading.Lock()
+
+
+class _SessionChannel:
+    """Serializes reply writes from worker threads onto one session socket."""
+
+    def __init__(self, conn: Any) -> None:
+        self.conn = conn
+        self._write_lock = threading.Lock()
+
+    def send_envelope(self, request_id: Any, response_line: bytes) -> None:
+        body = response_line.rstrip(b"\n") or b"null"
+        data = b'{"id": ' + json.dumps(request_id).encode("utf-8") + b', "response": ' + body + b"}\n"
+        with self._write_lock:
+            self.conn.sendall(data)
+
+    def close(self) -> None:
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class _SessionReplySlot:
+    """Connection stand-in handed to execution queues for one session request."""
+
+    def __init__(self, channel: _SessionChannel, request_id: Any) -> None:
+        self._channel = channel
+        self._request_id = request_id
+
+    def sendall(self, data: bytes) -> None:
+        self._channel.send_envelope(self._request_id, data)
+
+    def settimeout(self, _timeout: Any) -> None:
+        return None
+
+    def close(self) -> None:
+        # The session owns the socket; queues close their conn after every reply.
+        return None
+
+
+def _reply(slot: _SessionReplySlot, resp: DaemonResponse, *, send_json: Callable[[Any, Dict[str, Any]], None], dump_response: Callable[[Any], Dict[str, Any]]) -> None:
+    try:
+        send_json(slot, dump_response(resp))
+    except (BrokenPipeError, ConnectionResetError, OSError):
+        pass
+
+
+def serve_ipc_session(
+    conn: Any,
+    *,
+    parse_request: Callable[[Dict[str, Any]], Any],
+    schedule_request: Callable[[Any, Any], bool],
+    send_json: Callable[[Any, Dict[str, Any]], None],
+    dump_response: Callable[[Any], Dict[str, Any]],
+    stop_event: threading.Event,
+    logger: logging.Logger,
+) -> None:
+    """Acknowledge the upgrade, then read envelopes until the client disconnects."""
+    channel = _SessionChannel(conn)
+    with _ACTIVE_SESSIONS_LOCK:
+        _ACTIVE_SESSIONS.add(channel)
+    try:
+        conn.settimeout(None)
+        send_json(conn, dump_response(DaemonResponse(ok=True, result={"protocol": IPC_SESSION_PROTOCOL})))
+        reader = conn.makefile("rb")
+        while not stop_event.is_set():
+            line = reader.readline(MAX_SESSION_LINE_BYTES + 1)
+            if not line:
+                break
+            if len(line) > MAX_SESSION_LINE_BYTES:
+                logger.warning("ipc session closed: request line exceeds %s bytes", MAX_SESSION_LINE_BYTES)
+                break
+            if not line.strip():
+                continue
+            try:
+                envelope = json.loads(line.decode("utf-8", errors="replace"))
+            except Exception:
+                envelope = None
+            request_id = envelope.get("id") if isinstance(envelope, dict) else None
+            if not isinstance(request_id, (str, int)) or isinstance(request_id, bool):
+                logger.warning("ipc session closed: malformed envelope")
+                break
+            slot = _SessionReplySlot(channel, request_id)
+            try:
+                req = parse_request(envelope.get("request") if isinstance(envelope.get("request"), dict) else {})
+            except Exception as e:
+                _reply(
+                    slot,
+                    DaemonResponse(ok=False, error=DaemonError(code="invalid_request", message="invalid request", details={"error": str(e)})),
+                    send_json=send_json,
+                    dump_response=dump_response,
+                )
+                continue
+            op = str(getattr(req, "op", "") or "").strip()
+            if op in SESSION_EXCLUDED_OPS:
+                _reply(
+                    slot,
+                    DaemonResponse(
+                        ok=False,
+                        error=DaemonError(code="unsupported_in_session", message=f"op requires a dedicated connection: {op}"),
+                    ),
+                    send_json=send_json,
+                    dump_response=dump_response,
+                )
+                continue
+            if not schedule_request(req, slot):
+                _reply(
+                    slot,
+                    DaemonResponse(ok=False, error=DaemonError(code="internal_error", message="internal error: request executor unavailable")),
+                    send_json=send_json,
+                    dump_response=dump_response,
+                )
+    except (ConnectionResetError, BrokenPipeError, OSError):
+        pass
+    except Exception as e:
+        logger.exception("Unexpected error in ipc session: %s", e)
+    finally:
+        with _ACTIVE_SESSIONS_LOCK:
+            _ACTIVE_SESSIONS.discard(channel)
+        channel.close()
+
+
+def start_ipc_session(conn: Any, **kwargs: Any) -> bool:
+    try:
+        threading.Thread(
+            target=serve_ipc_session,
+            args=(conn,),
+            kwargs=kwargs,
+            daemon=True,
+            name="cccc-ipc-session",
+        ).start()
+        return True
+    except Exception:
+        return False
+
+
+def close_all_ipc_sessions() -> None:
+    """Disconnect every session (daemon shutdown); clients reconnect on their next request."""
+    with _ACTIVE_SESSIONS_LOCK:
+        channels = list(_ACTIVE_SESSIONS)
+        _ACTIVE_SESSIONS.clear()
+    for channel in channels:
+        channel.close()
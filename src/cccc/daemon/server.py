@@ -82,7 +82,6 @@ from .runner_state_ops import (
     cleanup_stale_pty_state as _cleanup_stale_pty_state,
 )
 from .socket_protocol_ops import (
-    recv_json_line as _recv_json_line,
     send_json as _send_json,
     dump_response as _dump_response,
     supported_stream_kinds as _supported_stream_kinds,
@@ -101,9 +100,16 @@ from .messaging.delivery import (
     THROTTLE,
 )
 from .messaging.chat_support_ops import auto_wake_recipients, normalize_attachments
-from .ops.execution_queues import DaemonRequestExecutionQueue, GroupSpaceSyncRunQueue
+from .ops.execution_queues import (
+    REQUEST_WRITE_GLOBAL_LANE,
+    DaemonRequestExecutionQueue,
+    GroupShardedRequestExecutor,
+    GroupSpaceSyncRunQueue,
+)
+from .ops.socket_session_ops import close_all_ipc_sessions, start_ipc_session
 from .ops.socket_special_ops import try_handle_socket_special_op
-from .ops.socket_accept_ops import handle_incoming_connection
+from .ops.socket_accept_ops import dispatch_incoming_request
+from .ops.socket_reactor_ops import RequestFrameReactor
 from .actors.actor_runtime_ops import start_actor_process as runtime_start_actor_process
 from .actors.runner_ops import stop_actor as runner_stop_actor
 from .request_dispatch_ops import RequestDispatchDeps, dispatch_request
@@ -125,6 +131,10 @@ from .space.group_space_sync import process_due_space_syncs, sync_group_space_fi
 from .space.group_space_store import get_space_provider_state
 from .group.presentation_browser_runtime import close_all_browser_surface_sessions
 from .space.notebooklm_auth_browser_runtime import close_all_notebooklm_auth_browser_sessions
+from .ops.capability_ops import (
+    close_capability_runtime_pool,
+    configure_capability_document_writes,
+)
 from .ops.template_ops import (
     group_create_from_template,
     group_template_export,
@@ -143,6 +153,23 @@ _DAEMON_CLIENT_WARN_LOCK = threading.Lock()
 _DAEMON_CLIENT_WARN_SEEN: Dict[tuple[str, str, str], float] = {}
 _SPACE_SYNC_RUN_QUEUE: Optional[GroupSpaceSyncRunQueue] = None
 _REQUEST_FAST_QUEUE_OPS = {"send", "reply", "chat_ack"}
+# Write ops that touch the shared registry, home-level state shared by all groups, or
+# the daemon itself run in the global write lane, exclusive with every per-group lane.
+# capability_uninstall rewrites every group's group.yaml; group_space_* ops
+# read-modify-write the home-level space bindings.json/jobs.json/providers.json.
+_REQUEST_WRITE_GLOBAL_OPS = {
+    "attach",
+    "capability_uninstall",
+    "group_create",
+    "group_create_from_template",
+    "group_delete",
+    "group_detach_scope",
+    "group_update",
+    "group_use",
+    "registry_reconcile",
+    "shutdown",
+}
+_REQUEST_WRITE_WORKERS = 4
 _REQUEST_READ_QUEUE_OPS = {
     "branding_get",
     "capability_overview",
@@ -253,6 +280,18 @@ def _pty_backlog_bytes() -> int:
     return int(n)
 
 
+def _ledger_group_commit_window_seconds() -> Optional[float]:
+    """Group-commit window for in-daemon ledger appends (CCCC_LEDGER_GROUP_COMMIT_MS; 0 disables)."""
+    raw = str(os.environ.get("CCCC_LEDGER_GROUP_COMMIT_MS") or "").strip()
+    try:
+        ms = float(raw) if raw else 2.0
+    except Exception:
+        ms = 2.0
+    if ms <= 0:
+        return None
+    return min(ms, 50.0) / 1000.0
+
+
 def _effective_runner_kind(runner_kind: str) -> str:
     """Return the effective runner kind for runtime decisions.
 
@@ -262,13 +301,22 @@ def _effective_runner_kind(runner_kind: str) -> str:
     return "headless" if rk == "headless" else "pty"
 
 
+def _request_write_lane(req: Any) -> str:
+    op = str(getattr(req, "op", "") or "").strip()
+    if op in _REQUEST_WRITE_GLOBAL_OPS or op.startswith("group_space_"):
+        return REQUEST_WRITE_GLOBAL_LANE
+    args = getattr(req, "args", None)
+    group_id = str(args.get("group_id") or "").strip() if isinstance(args, dict) else ""
+    return group_id or REQUEST_WRITE_GLOBAL_LANE
+
+
 def _request_queue_for(
     req: Any,
     *,
     read_queue: DaemonRequestExecutionQueue,
     fast_queue: DaemonRequestExecutionQueue,
-    slow_queue: DaemonRequestExecutionQueue,
-) -> DaemonRequestExecutionQueue:
+    slow_queue: Any,
+) -> Any:
     op = str(getattr(req, "op", "") or "").strip()
     args = getattr(req, "args", None)
     if op in _REQUEST_READ_QUEUE_OPS:
@@ -488,6 +536,15 @@ def _allow_remote_daemon() -> bool:
     return v in ("1", "true", "yes", "y", "on")
 
 
+def _daemon_ipc_sessions_enabled() -> bool:
+    """Whether call_daemon() pipelines requests over pooled multiplexed connections.
+
+    On by default; CCCC_DAEMON_IPC_SESSIONS=0 forces one connection per request.
+    """
+    v = str(os.environ.get("CCCC_DAEMON_IPC_SESSIONS") or "").strip().lower()
+    return v not in ("0", "false", "no", "n", "off")
+
+
 def _daemon_tcp_connect_host(bind_host: str) -> str:
     """Return a TCP host that local clients can connect to."""
     h = str(bind_host or "").strip()
@@ -875,6 +932,24 @@ def _request_dispatch_deps() -> RequestDispatchDeps:
     return _REQUEST_DISPATCH_DEPS
 
 
+def wait_for_auto_wakes(*, timeout_s: float = 5.0) -> bool:
+    """Wait until no background auto-wake is still starting an actor.
+
+    Auto-wake threads keep writing under CCCC_HOME (actor state, capability
+    autoload) after the send that scheduled them has returned; call this before
+    removing a home directory. False on timeout.
+    """
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    while True:
+        with _AUTO_WAKE_LOCK:
+            idle = not _AUTO_WAKE_IN_PROGRESS
+        if idle:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+
+
 def handle_request(req: DaemonRequest) -> Tuple[DaemonResponse, bool]:
     return dispatch_request(req, deps=_request_dispatch_deps(), recurse=handle_request)
 
@@ -978,6 +1053,20 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
     except Exception:
         pass
 
+    # Coalesce bursts of appends (broadcast + delivery/ack fan-out) into group commits.
+    try:
+        from ..kernel.ledger import set_group_commit_window
+
+        set_group_commit_window(_ledger_group_commit_window_seconds())
+    except Exception:
+        pass
+
+    # Coalesce capability state/catalog/runtime rewrites (CCCC_CAPABILITY_DOC_WRITE_BEHIND_MS).
+    try:
+        configure_capability_document_writes(write_behind=True)
+    except Exception:
+        pass
+
     # Graceful shutdown on SIGTERM/SIGINT
     def _signal_handler(signum: int, frame: Any) -> None:
         stop_event.set()
@@ -1093,7 +1182,6 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
 
     with s:
         s.listen(50)
-        s.settimeout(1.0)  # Allow periodic check of stop_event
         _write_pid(p.pid_path)
         write_daemon_addr(
             atomic_write_json=atomic_write_json,
@@ -1114,13 +1202,15 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
             maybe_autostart_enabled_im_bridges=_maybe_autostart_enabled_im_bridges,
         )
 
-        request_queue = DaemonRequestExecutionQueue(
+        request_queue = GroupShardedRequestExecutor(
             stop_event=stop_event,
             handle_request=handle_request,
             send_json=_send_json,
             dump_response=_dump_response,
             logger=logger,
             on_should_exit=stop_event.set,
+            lane_for=_request_write_lane,
+            name="write",
         )
         fast_request_queue = DaemonRequestExecutionQueue(
             stop_event=stop_event,
@@ -1129,6 +1219,7 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
             dump_response=_dump_response,
             logger=logger,
             on_should_exit=stop_event.set,
+            name="fast",
         )
         read_request_queue = DaemonRequestExecutionQueue(
             stop_event=stop_event,
@@ -1137,25 +1228,26 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
             dump_response=_dump_response,
             logger=logger,
             on_should_exit=stop_event.set,
+            name="read",
         )
-        start_request_execution_thread(request_queue=request_queue, name="cccc-request-worker-slow")
+        for idx in range(_REQUEST_WRITE_WORKERS):
+            start_request_execution_thread(request_queue=request_queue, name=f"cccc-request-worker-write-{idx + 1}")
         start_request_execution_thread(request_queue=fast_request_queue, name="cccc-request-worker-fast")
         start_request_execution_thread(request_queue=read_request_queue, name="cccc-request-worker-read-1")
         start_request_execution_thread(request_queue=read_request_queue, name="cccc-request-worker-read-2")
 
-        should_exit = False
-        while not should_exit and not stop_event.is_set():
-            try:
-                conn, _ = s.accept()
-            except socket.timeout:
-                continue
-            except KeyboardInterrupt:
-                break
-            except Exception:
-                continue
-            should_exit = handle_incoming_connection(
+        def schedule_request(req: Any, conn: Any) -> bool:
+            return _request_queue_for(
+                req,
+                read_queue=read_request_queue,
+                fast_queue=fast_request_queue,
+                slow_queue=request_queue,
+            ).submit(conn=conn, req=req)
+
+        def dispatch_frame(conn: Any, raw: Dict[str, Any]) -> bool:
+            return dispatch_incoming_request(
                 conn,
-                recv_json_line=_recv_json_line,
+                raw,
                 parse_request=DaemonRequest.model_validate,
                 make_invalid_request_error=lambda err: _error(
                     "invalid_request",
@@ -1190,16 +1282,24 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
                     ),
                 ),
                 handle_request=handle_request,
-                schedule_request=lambda req, conn: _request_queue_for(
-                    req,
-                    read_queue=read_request_queue,
-                    fast_queue=fast_request_queue,
-                    slow_queue=request_queue,
-                ).submit(conn=conn, req=req),
+                schedule_request=schedule_request,
+                start_session=lambda _req, conn: start_ipc_session(
+                    conn,
+                    parse_request=DaemonRequest.model_validate,
+                    schedule_request=schedule_request,
+                    send_json=_send_json,
+                    dump_response=_dump_response,
+                    stop_event=stop_event,
+                    logger=logger,
+                ),
                 logger=logger,
             )
-            if should_exit:
-                stop_event.set()
+
+        reactor = RequestFrameReactor(s, on_frame=dispatch_frame, stop_event=stop_event, logger=logger)
+        if reactor.run():
+            stop_event.set()
+
+    close_all_ipc_sessions()
 
     try:
         close_all_browser_surface_sessions()
@@ -1209,6 +1309,14 @@ def serve_forever(paths: Optional[DaemonPaths] = None) -> int:
         close_all_notebooklm_auth_browser_sessions()
     except Exception:
         pass
+    try:
+        close_capability_runtime_pool()
+    except Exception:
+        pass
+    try:
+        configure_capability_document_writes(write_behind=False)
+    except Exception:
+        pass
     _SPACE_SYNC_RUN_QUEUE = None
 
     cleanup_after_stop(
@@ -1246,6 +1354,7 @@ def call_daemon(req: Dict[str, Any], *, paths: Optional[DaemonPaths] = None, tim
             request.model_dump(),
             timeout_s=timeout_s,
             sock_path_default=p.sock_path,
+            reuse_connection=_daemon_ipc_sessions_enabled(),
         )
         resp = DaemonResponse.model_validate(obj)
         return resp.model_dump()
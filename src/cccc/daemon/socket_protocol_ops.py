@@ -7,6 +7,16 @@ from typing import Any, Dict, Optional
 
 from ..contracts.v1 import DaemonError, DaemonResponse
 
+MAX_REQUEST_LINE_BYTES = 2_000_000
+
+
+def decode_json_line(buf: bytes) -> Dict[str, Any]:
+    line = buf.split(b"\n", 1)[0]
+    try:
+        return json.loads(line.decode("utf-8", errors="replace"))
+    except Exception:
+        return {}
+
 
 def recv_json_line(conn: socket.socket) -> Dict[str, Any]:
     buf = b""
@@ -15,13 +25,9 @@ def recv_json_line(conn: socket.socket) -> Dict[str, Any]:
         if not chunk:
             break
         buf += chunk
-        if len(buf) > 2_000_000:
+        if len(buf) > MAX_REQUEST_LINE_BYTES:
             break
-    line = buf.split(b"\n", 1)[0]
-    try:
-        return json.loads(line.decode("utf-8", errors="replace"))
-    except Exception:
-        return {}
+    return decode_json_line(buf)
 
 
 def send_json(conn: socket.socket, obj: Dict[str, Any]) -> None:
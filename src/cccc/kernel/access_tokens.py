@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
 import secrets
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -11,6 +16,9 @@ from ..util.fs import atomic_write_text
 from ..util.time import utc_now_iso
 
 _TOKEN_PREFIX = "acc_"
+# A file modified this recently may be rewritten again within the same mtime tick,
+# so its parsed table is not trusted until it ages past the window.
+_RACY_MTIME_WINDOW_S = 1.0
 
 
 def _access_tokens_path(home: Optional[Path] = None) -> Path:
@@ -53,8 +61,7 @@ def _normalize_entry(token: str, raw: Any) -> Optional[Dict[str, Any]]:
     }
 
 
-def load_access_tokens(home: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
-    path = _access_tokens_path(home)
+def _parse_access_tokens(path: Path) -> Dict[str, Dict[str, Any]]:
     if not path.exists():
         return {}
     try:
@@ -75,6 +82,72 @@ def load_access_tokens(home: Optional[Path] = None) -> Dict[str, Dict[str, Any]]
     return out
 
 
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+@dataclass(frozen=True)
+class _TokenTable:
+    signature: Optional[Tuple[int, int, int]]
+    trusted: bool
+    tokens: Dict[str, Dict[str, Any]]
+    by_digest: Dict[bytes, Dict[str, Any]]
+
+
+_TOKEN_TABLES: Dict[str, _TokenTable] = {}
+_TOKEN_TABLES_LOCK = threading.Lock()
+
+
+def _file_signature(path: Path) -> Tuple[Optional[Tuple[int, int, int]], bool]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None, True
+    trusted = (time.time() - st.st_mtime) > _RACY_MTIME_WINDOW_S
+    return (st.st_mtime_ns, st.st_size, st.st_ino), trusted
+
+
+def _token_table(home: Optional[Path] = None) -> _TokenTable:
+    """Parsed access tokens, re-read only when access_tokens.yaml changes."""
+    path = _access_tokens_path(home)
+    key = str(path)
+    signature, trusted = _file_signature(path)
+    with _TOKEN_TABLES_LOCK:
+        table = _TOKEN_TABLES.get(key)
+    if table is not None and table.trusted and table.signature == signature:
+        return table
+    tokens = _parse_access_tokens(path)
+    table = _TokenTable(
+        signature=signature,
+        trusted=trusted,
+        tokens=tokens,
+        by_digest={_token_digest(tok): entry for tok, entry in tokens.items()},
+    )
+    with _TOKEN_TABLES_LOCK:
+        _TOKEN_TABLES[key] = table
+    return table
+
+
+def _invalidate_token_table(home: Optional[Path] = None) -> None:
+    with _TOKEN_TABLES_LOCK:
+        _TOKEN_TABLES.pop(str(_access_tokens_path(home)), None)
+
+
+def _copy_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(entry)
+    out["allowed_groups"] = list(entry.get("allowed_groups") or [])
+    return out
+
+
+def load_access_tokens(home: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    return {tok: _copy_entry(entry) for tok, entry in _token_table(home).tokens.items()}
+
+
+def access_tokens_active(home: Optional[Path] = None) -> bool:
+    """Whether any access token is configured (i.e. web access requires a token)."""
+    return bool(_token_table(home).tokens)
+
+
 def save_access_tokens(tokens: Dict[str, Dict[str, Any]], home: Optional[Path] = None) -> None:
     path = _access_tokens_path(home)
     payload: Dict[str, Any] = {"tokens": {}}
@@ -89,17 +162,23 @@ def save_access_tokens(tokens: Dict[str, Dict[str, Any]], home: Optional[Path] =
             "created_at": normalized["created_at"],
             "updated_at": normalized["updated_at"],
         }
-    atomic_write_text(
-        path,
-        yaml.safe_dump(payload, allow_unicode=True, sort_keys=False, default_flow_style=False),
-    )
+    try:
+        atomic_write_text(
+            path,
+            yaml.safe_dump(payload, allow_unicode=True, sort_keys=False, default_flow_style=False),
+        )
+    finally:
+        _invalidate_token_table(home)
 
 
 def lookup_access_token(token: str, home: Optional[Path] = None) -> Optional[Dict[str, Any]]:
     tok = str(token or "").strip()
     if not tok:
         return None
-    return load_access_tokens(home).get(tok)
+    entry = _token_table(home).by_digest.get(_token_digest(tok))
+    if entry is None or not hmac.compare_digest(str(entry["token"]).encode("utf-8"), tok.encode("utf-8")):
+        return None
+    return _copy_entry(entry)
 
 
 def _new_access_token_value(existing: Dict[str, Dict[str, Any]]) -> str:
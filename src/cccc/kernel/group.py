@@ -5,11 +5,12 @@ import errno
 import hashlib
 import logging
 import shutil
+import threading
 import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml  # type: ignore
 
@@ -180,20 +181,63 @@ class Group:
     def save(self) -> None:
         self.doc.setdefault("v", 1)
         self.doc["updated_at"] = utc_now_iso()
-        atomic_write_text(self.path / "group.yaml", yaml.safe_dump(self.doc, allow_unicode=True, sort_keys=False))
+        p = self.path / "group.yaml"
+        try:
+            atomic_write_text(p, yaml.safe_dump(self.doc, allow_unicode=True, sort_keys=False))
+        finally:
+            invalidate_group_doc_cache(p)
+
+
+# Parsed group.yaml docs keyed by path and validated by (inode, mtime_ns, size).
+# atomic_write_text replaces the file, so every rewrite changes the inode even when
+# mtime granularity would hide it. Callers always get a deep copy.
+_GROUP_DOC_CACHE: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+_GROUP_DOC_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_group_doc_cache(path: Optional[Path] = None) -> None:
+    """Drop the cached parse of one group.yaml (or all of them when path is None)."""
+    with _GROUP_DOC_CACHE_LOCK:
+        if path is None:
+            _GROUP_DOC_CACHE.clear()
+        else:
+            _GROUP_DOC_CACHE.pop(str(path), None)
+
+
+def _load_group_doc(p: Path) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Return (doc copy, cache_hit); doc is None when the file is missing or not a mapping."""
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        invalidate_group_doc_cache(p)
+        return None, False
+    sig = (int(st.st_ino), int(st.st_mtime_ns), int(st.st_size))
+    key = str(p)
+    with _GROUP_DOC_CACHE_LOCK:
+        cached = _GROUP_DOC_CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        return copy.deepcopy(cached[1]), True
+    doc = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    if not isinstance(doc, dict):
+        invalidate_group_doc_cache(p)
+        return None, False
+    with _GROUP_DOC_CACHE_LOCK:
+        _GROUP_DOC_CACHE[key] = (sig, copy.deepcopy(doc))
+    return doc, False
 
 
 def load_group(group_id: str) -> Optional[Group]:
     home = ensure_home()
     gp = home / "groups" / group_id
     p = gp / "group.yaml"
-    if not p.exists():
-        return None
     try:
-        doc = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-        if not isinstance(doc, dict):
+        doc, cache_hit = _load_group_doc(p)
+        if doc is None:
             return None
-        ensure_ledger_layout(gp)
+        # The layout was ensured when this doc was first parsed; Group.ledger_path re-ensures
+        # it for every ledger access, so cache hits skip the mkdir/touch round trip.
+        if not cache_hit:
+            ensure_ledger_layout(gp)
         return Group(group_id=group_id, path=gp, doc=doc)
     except Exception:
         return None
@@ -477,6 +521,14 @@ def delete_group(reg: Registry, *, group_id: str) -> None:
     home = ensure_home()
     gp = home / "groups" / gid
     if gp.exists():
+        from .ledger import drain_group_commit_queue
+        from .ledger_index import close_ledger_index_connections
+        from .ledger_tail_cache import invalidate_ledger_tail_cache
+
+        drain_group_commit_queue(gp / "ledger.jsonl")
+        close_ledger_index_connections(gp / "ledger.jsonl")
+        invalidate_ledger_tail_cache(gp / "ledger.jsonl")
+        invalidate_group_doc_cache(gp / "group.yaml")
         _delete_group_dir(gp)
 
     reg.groups.pop(gid, None)
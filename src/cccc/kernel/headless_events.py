@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import re
+import threading
+import time
 import uuid
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from .ledger import read_last_lines
+from .group import load_group
+from .ledger import iter_lines_reverse
 from ..util.file_lock import acquire_lockfile, release_lockfile
+from ..util.fs import atomic_write_json
 from ..util.time import utc_now_iso
 
+logger = logging.getLogger(__name__)
+
 _HEADLESS_REPLAY_START_TYPES = {
     "headless.turn.started",
     "headless.control.queued",
@@ -22,16 +32,149 @@ _HEADLESS_REPLAY_END_TYPES = {
     "headless.control.failed",
 }
 
+# Streaming updates that may sit in a writer's buffer for up to one coalescing window. Anything
+# else (turn/message boundaries, control events) flushes the buffer and is written immediately.
+_HEADLESS_BUFFERED_TYPES = {
+    "headless.message.delta",
+    "headless.activity.updated",
+}
+# Buffered events with these data keys equal belong to the same stream and concatenate "delta".
+_HEADLESS_DELTA_MERGE_KEYS = ("turn_id", "event_id", "stream_id", "phase")
+
+HEADLESS_COALESCE_WINDOW_S = 0.04
+HEADLESS_COALESCE_MAX_BYTES = 16 * 1024
+
+# The active log is sealed into state/headless/segments/ once it reaches HEADLESS_ROTATE_BYTES;
+# only the newest HEADLESS_KEEP_SEGMENTS sealed segments are kept. Log positions are
+# (segment seq, byte offset) pairs; the active file owns manifest["next_segment_seq"] until sealed.
+HEADLESS_ROTATE_BYTES = 8 * 1024 * 1024
+HEADLESS_KEEP_SEGMENTS = 2
+# Upper bound on how far replay reads back to reach the start of a turn older than the tail window.
+HEADLESS_REPLAY_MAX_BYTES = 4 * 1024 * 1024
+
+_MANIFEST_SCHEMA = 1
+_SEGMENT_FILE_RE = re.compile(r"^events\.(?P<stamp>\d{8}T\d{6}Z)\.(?P<seq>\d{6})\.jsonl$")
+
+
+def headless_state_dir(group_dir: Path) -> Path:
+    return group_dir / "state" / "headless"
+
 
 def headless_events_path(group_dir: Path) -> Path:
-    return group_dir / "state" / "headless" / "events.jsonl"
+    return headless_state_dir(group_dir) / "events.jsonl"
 
 
 def headless_events_lock_path(group_dir: Path) -> Path:
-    return group_dir / "state" / "headless" / "events.lock"
+    return headless_state_dir(group_dir) / "events.lock"
 
 
-def append_headless_event(group_dir: Path, *, group_id: str, actor_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+def headless_segments_dir(group_dir: Path) -> Path:
+    return headless_state_dir(group_dir) / "segments"
+
+
+def headless_manifest_path(group_dir: Path) -> Path:
+    return headless_state_dir(group_dir) / "manifest.json"
+
+
+def _stamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def load_headless_manifest(group_dir: Path) -> Dict[str, Any]:
+    """Load the segment manifest, healing it against the segment files actually on disk."""
+    try:
+        doc = json.loads(headless_manifest_path(group_dir).read_text(encoding="utf-8"))
+    except Exception:
+        doc = {}
+    if not isinstance(doc, dict) or int(doc.get("schema") or 0) != _MANIFEST_SCHEMA:
+        doc = {}
+    by_seq: Dict[int, Dict[str, Any]] = {}
+    for item in doc.get("segments") if isinstance(doc.get("segments"), list) else []:
+        if isinstance(item, dict) and int(item.get("seq") or 0) > 0:
+            by_seq[int(item["seq"])] = dict(item)
+    on_disk: Dict[int, str] = {}
+    seg_dir = headless_segments_dir(group_dir)
+    if seg_dir.is_dir():
+        for path in seg_dir.iterdir():
+            match = _SEGMENT_FILE_RE.match(path.name)
+            if match is not None:
+                on_disk[int(match.group("seq"))] = str(path.relative_to(group_dir))
+    segments: List[Dict[str, Any]] = []
+    for seq in sorted(set(by_seq) | set(on_disk)):
+        if seq not in on_disk:
+            continue
+        entry = by_seq.get(seq) or {"id": f"{seq:06d}", "seq": seq, "sealed_at": "", "reason": "recovered"}
+        entry["path"] = on_disk[seq]
+        segments.append(entry)
+    next_seq = max(1, int(doc.get("next_segment_seq") or 1), *(int(item["seq"]) + 1 for item in segments))
+    turn_starts: Dict[str, Dict[str, int]] = {}
+    raw_starts = doc.get("turn_starts") if isinstance(doc.get("turn_starts"), dict) else {}
+    for actor_id, pos in raw_starts.items():
+        if isinstance(pos, dict):
+            turn_starts[str(actor_id)] = {"seq": int(pos.get("seq") or 0), "offset": int(pos.get("offset") or 0)}
+    return {
+        "schema": _MANIFEST_SCHEMA,
+        "next_segment_seq": next_seq,
+        "segments": segments,
+        "turn_starts": turn_starts,
+        "updated_at": str(doc.get("updated_at") or ""),
+    }
+
+
+def _save_headless_manifest(group_dir: Path, manifest: Dict[str, Any]) -> None:
+    manifest["updated_at"] = _stamp()
+    atomic_write_json(headless_manifest_path(group_dir), manifest, indent=2)
+
+
+def _rotate_locked(group_dir: Path, manifest: Dict[str, Any], *, reason: str) -> Dict[str, Any]:
+    active = headless_events_path(group_dir)
+    try:
+        size_bytes = int(active.stat().st_size)
+    except Exception:
+        size_bytes = 0
+    if size_bytes <= 0:
+        return {"rotated": False, "reason": "empty_active"}
+    seq = int(manifest["next_segment_seq"])
+    stamp = _stamp()
+    dst = headless_segments_dir(group_dir) / f"events.{stamp}.{seq:06d}.jsonl"
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(active, dst)
+    # Recreate the active file right away so stream tailers see the new inode instead of a gap.
+    active.touch(exist_ok=True)
+    segment = {
+        "id": f"{seq:06d}",
+        "seq": seq,
+        "path": str(dst.relative_to(group_dir)),
+        "sealed_at": stamp,
+        "reason": str(reason or "auto"),
+        "size_bytes": size_bytes,
+    }
+    segments = [*manifest["segments"], segment]
+    keep = max(0, int(HEADLESS_KEEP_SEGMENTS))
+    dropped = segments[: len(segments) - keep] if len(segments) > keep else []
+    for item in dropped:
+        (group_dir / str(item.get("path") or "")).unlink(missing_ok=True)
+    manifest["segments"] = segments[len(dropped) :]
+    manifest["next_segment_seq"] = seq + 1
+    oldest = int(manifest["segments"][0]["seq"]) if manifest["segments"] else seq + 1
+    manifest["turn_starts"] = {
+        actor_id: pos for actor_id, pos in manifest["turn_starts"].items() if int(pos.get("seq") or 0) >= oldest
+    }
+    _save_headless_manifest(group_dir, manifest)
+    return {"rotated": True, "segment": segment, "dropped_segments": [str(item.get("id") or "") for item in dropped]}
+
+
+def rotate_headless_events(group_dir: Path, *, reason: str = "manual") -> Dict[str, Any]:
+    """Seal the active headless log into a segment and drop segments beyond the retention count."""
+    headless_state_dir(group_dir).mkdir(parents=True, exist_ok=True)
+    lock = acquire_lockfile(headless_events_lock_path(group_dir), blocking=True)
+    try:
+        return _rotate_locked(group_dir, load_headless_manifest(group_dir), reason=reason)
+    finally:
+        release_lockfile(lock)
+
+
+def _new_headless_event(*, group_id: str, actor_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
     payload = {
         "id": uuid.uuid4().hex,
         "ts": utc_now_iso(),
@@ -42,28 +185,255 @@ def append_headless_event(group_dir: Path, *, group_id: str, actor_id: str, even
     }
     if not payload["group_id"] or not payload["actor_id"] or not payload["type"]:
         raise ValueError("missing headless event fields")
+    return payload
+
 
+def append_headless_events(group_dir: Path, payloads: Sequence[Dict[str, Any]]) -> None:
+    """Append already-built event payloads with one lock acquisition and one write."""
+    if not payloads:
+        return
     path = headless_events_path(group_dir)
     path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(payload, ensure_ascii=False)
+    lines = [json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n" for payload in payloads]
     lock = acquire_lockfile(headless_events_lock_path(group_dir), blocking=True)
     try:
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(line + "\n")
+        with path.open("ab") as handle:
+            offset = handle.tell()
+            handle.write(b"".join(lines))
+            size = handle.tell()
+        turn_starts: Dict[str, int] = {}
+        for payload, line in zip(payloads, lines):
+            if payload.get("type") in _HEADLESS_REPLAY_START_TYPES:
+                turn_starts[str(payload.get("actor_id") or "")] = offset
+            offset += len(line)
+        if turn_starts or size >= HEADLESS_ROTATE_BYTES:
+            # The events are already durable; index/rotation upkeep is best effort and retried next time.
+            try:
+                manifest = load_headless_manifest(group_dir)
+                active_seq = int(manifest["next_segment_seq"])
+                for actor_id, start in turn_starts.items():
+                    manifest["turn_starts"][actor_id] = {"seq": active_seq, "offset": start}
+                if size >= HEADLESS_ROTATE_BYTES:
+                    _rotate_locked(group_dir, manifest, reason="size")
+                else:
+                    _save_headless_manifest(group_dir, manifest)
+            except Exception:
+                logger.exception("failed to update headless event manifest: %s", group_dir)
     finally:
         release_lockfile(lock)
+
+
+def append_headless_event(group_dir: Path, *, group_id: str, actor_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    payload = _new_headless_event(group_id=group_id, actor_id=actor_id, event_type=event_type, data=data)
+    append_headless_events(group_dir, [payload])
     return payload
 
 
+def _merge_delta(buffered: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+    """Fold a message delta into the previous buffered one when both continue the same stream."""
+    if payload["type"] != "headless.message.delta" or buffered["type"] != "headless.message.delta":
+        return False
+    prev_data = buffered["data"]
+    data = payload["data"]
+    if set(prev_data) != set(data) or not isinstance(prev_data.get("delta"), str) or not isinstance(data.get("delta"), str):
+        return False
+    if any(key not in _HEADLESS_DELTA_MERGE_KEYS + ("delta",) for key in data):
+        return False
+    if any(prev_data.get(key) != data.get(key) for key in _HEADLESS_DELTA_MERGE_KEYS):
+        return False
+    prev_data["delta"] += data["delta"]
+    return True
+
+
+class HeadlessEventWriter:
+    """Per-session appender that batches streaming headless events.
+
+    Message deltas and activity updates are buffered for at most ``window_s`` (or until
+    ``max_bytes`` of delta/summary text is pending); consecutive deltas of one stream are merged into a
+    single event. Every other event flushes the buffer and is written in the caller's thread, so
+    event order in ``events.jsonl`` is unchanged. The group directory is resolved once and only
+    re-resolved if it disappears; events for a group that no longer exists are dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        group_id: str,
+        actor_id: str,
+        resolve_group_dir: Optional[Callable[[str], Optional[Path]]] = None,
+        window_s: float = HEADLESS_COALESCE_WINDOW_S,
+        max_bytes: int = HEADLESS_COALESCE_MAX_BYTES,
+    ) -> None:
+        self.group_id = str(group_id or "").strip()
+        self.actor_id = str(actor_id or "").strip()
+        self._resolve_group_dir = resolve_group_dir or _load_group_dir
+        self._window_s = max(0.0, float(window_s))
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._group_dir: Optional[Path] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_bytes = 0
+
+    def emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        payload = _new_headless_event(group_id=self.group_id, actor_id=self.actor_id, event_type=event_type, data=data)
+        buffered = payload["type"] in _HEADLESS_BUFFERED_TYPES and self._window_s > 0
+        with self._lock:
+            if buffered:
+                payload["data"] = dict(payload["data"])
+                self._pending_bytes += len(str(payload["data"].get("delta") or payload["data"].get("summary") or ""))
+                if not (self._pending and _merge_delta(self._pending[-1], payload)):
+                    self._pending.append(payload)
+                if len(self._pending) == 1:
+                    _FLUSHER.schedule(self, time.monotonic() + self._window_s)
+                if self._pending_bytes < self._max_bytes:
+                    return
+            else:
+                self._pending.append(payload)
+            self._write_pending_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending_locked()
+
+    def _write_pending_locked(self) -> None:
+        payloads, self._pending, self._pending_bytes = self._pending, [], 0
+        if not payloads:
+            return
+        group_dir = self._group_dir
+        if group_dir is None or not group_dir.is_dir():
+            group_dir = self._group_dir = self._resolve_group_dir(self.group_id)
+        if group_dir is None:
+            return
+        append_headless_events(group_dir, payloads)
+
+
+def _load_group_dir(group_id: str) -> Optional[Path]:
+    group = load_group(group_id)
+    return group.path if group is not None else None
+
+
+class _HeadlessFlusher:
+    """One daemon thread that flushes writers whose coalescing window has elapsed."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._due: Dict[HeadlessEventWriter, float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, writer: HeadlessEventWriter, deadline: float) -> None:
+        with self._cond:
+            self._due.setdefault(writer, deadline)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cccc-headless-flush", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = [writer for writer, deadline in self._due.items() if deadline <= now]
+                if not due:
+                    self._cond.wait(min(self._due.values()) - now)
+                    continue
+                for writer in due:
+                    self._due.pop(writer, None)
+            for writer in due:
+                try:
+                    writer.flush()
+                except Exception:
+                    logger.exception("failed to flush headless events: %s/%s", writer.group_id, writer.actor_id)
+
+
+_FLUSHER = _HeadlessFlusher()
+
+
+def _headless_sources(group_dir: Path, manifest: Dict[str, Any]) -> List[Tuple[int, Path]]:
+    sources = [(int(item["seq"]), group_dir / str(item["path"])) for item in manifest["segments"]]
+    sources.append((int(manifest["next_segment_seq"]), headless_events_path(group_dir)))
+    return sources
+
+
+def _read_tail_window(sources: List[Tuple[int, Path]], n: int) -> List[Tuple[Tuple[int, int], str]]:
+    window: List[Tuple[Tuple[int, int], str]] = []
+    for seq, path in reversed(sources):
+        try:
+            for offset, raw in iter_lines_reverse(path):
+                if raw:
+                    window.append(((seq, offset), raw.decode("utf-8", errors="replace")))
+                    if len(window) >= n:
+                        break
+        except FileNotFoundError:
+            continue
+        if len(window) >= n:
+            break
+    window.reverse()
+    return window
+
+
+def _iter_lines_between(
+    sources: List[Tuple[int, Path]], start: Tuple[int, int], stop: Tuple[int, int]
+) -> Iterator[Tuple[Tuple[int, int], bytes]]:
+    for seq, path in sources:
+        if seq < start[0] or seq > stop[0]:
+            continue
+        try:
+            with path.open("rb") as handle:
+                offset = start[1] if seq == start[0] else 0
+                handle.seek(offset)
+                for raw in handle:
+                    if (seq, offset) >= stop:
+                        return
+                    yield (seq, offset), raw
+                    offset += len(raw)
+        except FileNotFoundError:
+            continue
+
+
+def _read_turn_prefixes(
+    sources: List[Tuple[int, Path]], starts: Dict[str, Tuple[int, int]], stop: Tuple[int, int]
+) -> Optional[List[str]]:
+    """Lines of ``starts`` actors from their indexed turn start up to ``stop``; None past the byte cap."""
+    out: List[str] = []
+    budget = int(HEADLESS_REPLAY_MAX_BYTES)
+    for pos, raw in _iter_lines_between(sources, min(starts.values()), stop):
+        budget -= len(raw)
+        if budget < 0:
+            return None
+        line = raw.rstrip(b"\r\n").decode("utf-8", errors="replace")
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except Exception:
+            continue
+        actor_id = str(payload.get("actor_id") or "").strip() if isinstance(payload, dict) else ""
+        start = starts.get(actor_id)
+        if start is not None and pos >= start:
+            out.append(line)
+    return out
+
+
 def read_headless_replay_lines(group_dir: Path, *, limit: int = 400) -> List[str]:
-    path = headless_events_path(group_dir)
+    """Replay the latest (active or last completed) turn of every actor seen in the log tail.
+
+    Only the newest ``limit`` lines are read, backwards, across the active log and its sealed
+    segments. An actor whose turn started before that window is extended back to the turn start
+    recorded in the manifest index, so long streamed turns still replay from their beginning.
+    """
     try:
-        raw_lines = read_last_lines(path, max(50, int(limit or 400)))
+        manifest = load_headless_manifest(group_dir)
+        sources = _headless_sources(group_dir, manifest)
+        raw_lines = _read_tail_window(sources, max(50, int(limit or 400)))
     except Exception:
         return []
+    if not raw_lines:
+        return []
 
     indexed: list[tuple[int, str, str, str]] = []
-    for idx, raw in enumerate(raw_lines):
+    for idx, (_pos, raw) in enumerate(raw_lines):
         try:
             payload = json.loads(raw)
         except Exception:
@@ -94,10 +464,30 @@ def read_headless_replay_lines(group_dir: Path, *, limit: int = 400) -> List[str
 
     replay_start_by_actor = dict(latest_completed_start_by_actor)
     replay_start_by_actor.update(active_start_by_actor)
+
+    # Actors with no turn start inside the window: jump to their indexed turn start instead.
+    window_start = raw_lines[0][0]
+    extend: Dict[str, Tuple[int, int]] = {}
+    for actor_id in first_seen_by_actor:
+        if actor_id in latest_seen_start_by_actor:
+            continue
+        pos = manifest["turn_starts"].get(actor_id)
+        if pos is not None and (pos["seq"], pos["offset"]) < window_start:
+            extend[actor_id] = (pos["seq"], pos["offset"])
+    prefix: List[str] = []
+    if extend:
+        try:
+            prefix_lines = _read_turn_prefixes(sources, extend, window_start)
+        except Exception:
+            prefix_lines = None
+        if prefix_lines is not None:
+            prefix = prefix_lines
+            for actor_id in extend:
+                replay_start_by_actor[actor_id] = first_seen_by_actor[actor_id]
     if not replay_start_by_actor:
-        return []
+        return prefix
 
-    replay_lines: list[str] = []
+    replay_lines: list[str] = list(prefix)
     for idx, raw, actor_id, _event_type in indexed:
         start_idx = replay_start_by_actor.get(actor_id)
         if start_idx is None or idx < start_idx:
@@ -1,25 +1,33 @@
 from __future__ import annotations
 
-import hashlib
 import json
+import logging
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
 
-from .context import ContextStorage
 from ..util.fs import atomic_write_json, read_json
 from ..util.time import parse_utc_iso, utc_now_iso
 from .actors import find_actor, get_effective_role, is_internal_actor, list_actors
 from .group import Group
-from .ledger_index import has_chat_ack_indexed, lookup_event_by_id, lookup_events_by_ids, search_event_ids_indexed
-from .ledger_segments import iter_source_lines, list_ledger_sources
-from .ledger_state_snapshot import can_replay_from_basis, current_ledger_basis, load_latest_ledger_snapshot
+from .ledger_index import (
+    compressed_source_block_offsets,
+    has_chat_ack_indexed,
+    lookup_event_by_id,
+    lookup_events_by_ids,
+    resolve_event_id_indexed,
+    search_event_ids_indexed,
+)
+from .ledger_segments import iter_source_lines, list_ledger_sources, read_gzip_member
 
 
 # Message kind filter
 MessageKindFilter = Literal["all", "chat", "notify"]
 
-_UNREAD_INDEX_SCHEMA = 1
+LOGGER = logging.getLogger(__name__)
+_EVENT_LOOKUP_LOCK = threading.Lock()
+_EVENT_LOOKUP_STATS: Dict[str, Any] = {"indexed": 0, "scan_fallback": 0, "last_path": ""}
 
 
 def iter_events(ledger_path: Path) -> Iterable[Dict[str, Any]]:
@@ -40,6 +48,29 @@ def iter_events(ledger_path: Path) -> Iterable[Dict[str, Any]]:
                 yield obj
 
 
+def _gzip_block_offsets(ledger_path: Path, source: Dict[str, Any]) -> List[int]:
+    try:
+        return compressed_source_block_offsets(ledger_path, str(source.get("path") or ""))
+    except Exception:
+        LOGGER.debug("ledger block table unavailable for %s", source.get("path"), exc_info=True)
+        return []
+
+
+def _iter_gzip_blocks_reverse(abs_path: Path, offsets: List[int]) -> Iterable[Dict[str, Any]]:
+    """Iterate a block-compressed segment newest first, one gzip member at a time."""
+    for offset in reversed(offsets):
+        for raw_line in reversed(read_gzip_member(abs_path, offset).split(b"\n")):
+            line = raw_line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line.decode("utf-8", errors="replace"))
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                yield obj
+
+
 def iter_events_reverse(ledger_path: Path, *, block_size: int = 65536) -> Iterable[Dict[str, Any]]:
     """Iterate over ledger events from newest to oldest across all sources."""
     sources = list_ledger_sources(ledger_path.parent)
@@ -48,6 +79,10 @@ def iter_events_reverse(ledger_path: Path, *, block_size: int = 65536) -> Iterab
         if not isinstance(abs_path, Path) or not abs_path.exists():
             continue
         if str(abs_path.name).endswith(".gz"):
+            offsets = _gzip_block_offsets(ledger_path, source)
+            if offsets:
+                yield from _iter_gzip_blocks_reverse(abs_path, offsets)
+                continue
             events: List[Dict[str, Any]] = []
             for line in iter_source_lines(abs_path):
                 line = line.strip()
@@ -117,196 +152,43 @@ def _cursor_path(group: Group) -> Path:
     return group.path / "state" / "read_cursors.json"
 
 
-def _unread_index_path(group: Group) -> Path:
-    return group.path / "state" / "unread_index.json"
-
-
-def _load_unread_index(group: Group) -> Dict[str, Any]:
-    raw = read_json(_unread_index_path(group))
-    if not isinstance(raw, dict):
-        raw = {}
-    counts_raw = raw.get("counts")
-    counts: Dict[str, int] = {}
-    if isinstance(counts_raw, dict):
-        for actor_id, value in counts_raw.items():
-            aid = str(actor_id or "").strip()
-            if not aid:
-                continue
-            try:
-                counts[aid] = max(0, int(value or 0))
-            except Exception:
-                counts[aid] = 0
-    ledger_basis_raw = raw.get("ledger_basis") if isinstance(raw.get("ledger_basis"), dict) else {}
-    ledger_basis = {
-        "segment_ids": [str(item).strip() for item in (ledger_basis_raw.get("segment_ids") if isinstance(ledger_basis_raw.get("segment_ids"), list) else []) if str(item).strip()],
-        "active_size": max(0, int(ledger_basis_raw.get("active_size") or 0)) if isinstance(ledger_basis_raw, dict) else 0,
-        "active_mtime_ns": max(0, int(ledger_basis_raw.get("active_mtime_ns") or 0)) if isinstance(ledger_basis_raw, dict) else 0,
-        "active_prefix_sha256": str(ledger_basis_raw.get("active_prefix_sha256") or "") if isinstance(ledger_basis_raw, dict) else "",
-    }
-    if not ledger_basis["segment_ids"] and not ledger_basis["active_size"]:
-        try:
-            legacy_size = max(0, int(raw.get("ledger_size") or 0))
-        except Exception:
-            legacy_size = 0
-        ledger_basis = {"segment_ids": [], "active_size": legacy_size, "active_mtime_ns": 0}
+def _indexed_unread_counts(group: Group, actor_ids: List[str], kind_filter: MessageKindFilter) -> Optional[Dict[str, int]]:
     try:
-        actors_rev = max(0, int(raw.get("actors_rev") or 0))
-    except Exception:
-        actors_rev = 0
-    return {
-        "schema": int(raw.get("schema", _UNREAD_INDEX_SCHEMA) or _UNREAD_INDEX_SCHEMA),
-        "actors_rev": actors_rev,
-        "cursor_sig": str(raw.get("cursor_sig") or ""),
-        "ledger_basis": ledger_basis,
-        "counts": counts,
-        "updated_at": str(raw.get("updated_at") or ""),
-    }
-
-
-def _save_unread_index(
-    group: Group,
-    *,
-    actors_rev: int,
-    cursor_sig: str,
-    ledger_basis: Dict[str, Any],
-    counts: Dict[str, int],
-) -> Dict[str, Any]:
-    out = {
-        "schema": _UNREAD_INDEX_SCHEMA,
-        "actors_rev": max(0, int(actors_rev or 0)),
-        "cursor_sig": str(cursor_sig or ""),
-        "ledger_basis": {
-            "segment_ids": [
-                str(item).strip()
-                for item in (ledger_basis.get("segment_ids") if isinstance(ledger_basis.get("segment_ids"), list) else [])
-                if str(item).strip()
-            ],
-            "active_size": max(0, int(ledger_basis.get("active_size") or 0)),
-            "active_mtime_ns": max(0, int(ledger_basis.get("active_mtime_ns") or 0)),
-            "active_prefix_sha256": str(ledger_basis.get("active_prefix_sha256") or ""),
-        },
-        "counts": {str(actor_id): max(0, int(value or 0)) for actor_id, value in counts.items() if str(actor_id or "").strip()},
-        "updated_at": utc_now_iso(),
-    }
-    p = _unread_index_path(group)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    atomic_write_json(p, out)
-    return out
-
+        from .ledger_unread_index import indexed_unread_counts
 
-def _current_actors_rev(group: Group) -> int:
-    try:
-        return max(0, int(ContextStorage(group).load_version_state().get("actors_rev") or 0))
+        return indexed_unread_counts(group, actor_ids, kind_filter=kind_filter)
     except Exception:
-        return 0
-
-
-def _cursor_sig_for_actor_ids(group: Group, actor_ids: List[str]) -> str:
-    cursors = load_cursors(group)
-    digest = hashlib.sha256()
-    for actor_id in sorted({str(item or "").strip() for item in actor_ids if str(item or "").strip()}):
-        cur = cursors.get(actor_id)
-        event_id = str(cur.get("event_id") or "") if isinstance(cur, dict) else ""
-        ts = str(cur.get("ts") or "") if isinstance(cur, dict) else ""
-        digest.update(actor_id.encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(event_id.encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(ts.encode("utf-8"))
-        digest.update(b"\n")
-    return digest.hexdigest()
-
-
-def _iter_events_from_offset(ledger_path: Path, start: int) -> Tuple[List[Dict[str, Any]], int]:
-    out: List[Dict[str, Any]] = []
-    if not ledger_path.exists():
-        return out, 0
-    offset = max(0, int(start or 0))
-    with ledger_path.open("rb") as handle:
-        handle.seek(offset, os.SEEK_SET)
-        while True:
-            line = handle.readline()
-            if not line:
-                break
-            try:
-                obj = json.loads(line.decode("utf-8", errors="replace").strip())
-            except Exception:
-                return [], -1
-            if isinstance(obj, dict):
-                out.append(obj)
-        return out, int(handle.tell())
-
-
-def _seed_unread_index_from_snapshot(
-    group: Group,
-    *,
-    actors_rev: int,
-    cursor_sig: str,
-    ledger_basis: Dict[str, Any],
-) -> Optional[Dict[str, Any]]:
-    snapshot = load_latest_ledger_snapshot(group)
-    state = snapshot.get("state") if isinstance(snapshot.get("state"), dict) else {}
-    unread_index = state.get("unread_index") if isinstance(state.get("unread_index"), dict) else {}
-    if not unread_index:
-        return None
-    if int(unread_index.get("actors_rev") or 0) != actors_rev:
-        return None
-    if str(unread_index.get("cursor_sig") or "") != cursor_sig:
+        LOGGER.debug("unread index unavailable for %s", group.group_id, exc_info=True)
         return None
-    snapshot_basis = unread_index.get("ledger_basis") if isinstance(unread_index.get("ledger_basis"), dict) else {}
-    if not can_replay_from_basis(snapshot_basis, ledger_basis):
-        return None
-    counts = unread_index.get("counts") if isinstance(unread_index.get("counts"), dict) else {}
-    return {
-        "actors_rev": actors_rev,
-        "cursor_sig": cursor_sig,
-        "ledger_basis": snapshot_basis,
-        "counts": {str(actor_id): max(0, int(value or 0)) for actor_id, value in counts.items() if str(actor_id or "").strip()},
-    }
 
 
-def _apply_unread_delta(
+def _indexed_unread_events(
     group: Group,
+    actor_id: str,
     *,
-    actors: List[Dict[str, Any]],
-    counts: Dict[str, int],
-    events: List[Dict[str, Any]],
     kind_filter: MessageKindFilter,
-) -> Dict[str, int]:
-    next_counts = {aid: max(0, int(counts.get(aid, 0))) for aid in counts}
-    actor_ids = [str(actor.get("id") or "").strip() for actor in actors if str(actor.get("id") or "").strip()]
-    actor_roles = {aid: get_effective_role(group, aid) for aid in actor_ids}
-    cursors = load_cursors(group)
-    actor_cursor_dts: Dict[str, Optional[Any]] = {}
-    for aid in actor_ids:
-        cur = cursors.get(aid)
-        cursor_ts = str(cur.get("ts") or "") if isinstance(cur, dict) else ""
-        actor_cursor_dts[aid] = parse_utc_iso(cursor_ts) if cursor_ts else None
-
-    if kind_filter == "chat":
-        allowed_kinds = {"chat.message"}
-    elif kind_filter == "notify":
-        allowed_kinds = {"system.notify"}
-    else:
-        allowed_kinds = {"chat.message", "system.notify"}
+    limit: int = 0,
+    newest_first: bool = False,
+) -> Optional[List[Dict[str, Any]]]:
+    try:
+        from .ledger_unread_index import indexed_unread_event_ids
 
-    for ev in events:
-        ev_kind = str(ev.get("kind") or "")
-        if ev_kind not in allowed_kinds:
-            continue
-        ev_by = str(ev.get("by") or "").strip()
-        ev_ts = str(ev.get("ts") or "")
-        ev_dt = parse_utc_iso(ev_ts) if ev_ts else None
-        for aid in actor_ids:
-            if ev_kind == "chat.message" and ev_by == aid:
-                continue
-            cursor_dt = actor_cursor_dts.get(aid)
-            if cursor_dt is not None and ev_dt is not None and ev_dt <= cursor_dt:
-                continue
-            if not is_message_for_actor(group, actor_id=aid, event=ev, role=actor_roles.get(aid)):
-                continue
-            next_counts[aid] = max(0, int(next_counts.get(aid, 0)) + 1)
-    return next_counts
+        event_ids = indexed_unread_event_ids(
+            group,
+            actor_id,
+            kind_filter=kind_filter,
+            limit=limit,
+            newest_first=newest_first,
+        )
+        if event_ids is None:
+            return None
+        events = lookup_events_by_ids(group.ledger_path, event_ids)
+    except Exception:
+        LOGGER.debug("unread index unavailable for %s", group.group_id, exc_info=True)
+        return None
+    if any(not isinstance(ev, dict) for ev in events):
+        return None
+    return [ev for ev in events if isinstance(ev, dict)]
 
 
 def get_indexed_unread_counts(
@@ -315,87 +197,18 @@ def get_indexed_unread_counts(
     actors: List[Dict[str, Any]],
     kind_filter: MessageKindFilter = "all",
 ) -> Dict[str, int]:
-    """Return unread counts from the persisted unread snapshot when possible.
+    """Return unread counts from the persisted unread index.
 
-    Semantics are intentionally bound to current actor topology via `actors_rev`.
-    If actor membership/order changes, the snapshot is rebuilt from ledger truth.
+    The index (state/ledger/unread.sqlite3) is kept current by the append path and
+    is rebuilt from ledger truth when the actor topology or ledger basis changes.
     """
     actor_ids = [str(actor.get("id") or "").strip() for actor in actors if str(actor.get("id") or "").strip()]
     if not actor_ids:
         return {}
-
-    actors_rev = _current_actors_rev(group)
-    cursor_sig = _cursor_sig_for_actor_ids(group, actor_ids)
-    ledger_basis = current_ledger_basis(group)
-    snapshot = _load_unread_index(group)
-    snapshot_counts = snapshot.get("counts") if isinstance(snapshot.get("counts"), dict) else {}
-    snapshot_basis = snapshot.get("ledger_basis") if isinstance(snapshot.get("ledger_basis"), dict) else {}
-
-    if (
-        int(snapshot.get("actors_rev") or 0) == actors_rev
-        and str(snapshot.get("cursor_sig") or "") == cursor_sig
-        and snapshot_basis == ledger_basis
-    ):
-        return {aid: max(0, int(snapshot_counts.get(aid, 0))) for aid in actor_ids}
-
-    if (
-        int(snapshot.get("actors_rev") or 0) == actors_rev
-        and str(snapshot.get("cursor_sig") or "") == cursor_sig
-        and can_replay_from_basis(snapshot_basis, ledger_basis)
-    ):
-        delta_events, end_offset = _iter_events_from_offset(group.ledger_path, int(snapshot_basis.get("active_size") or 0))
-        if end_offset >= 0:
-            next_counts = _apply_unread_delta(
-                group,
-                actors=actors,
-                counts={aid: max(0, int(snapshot_counts.get(aid, 0))) for aid in actor_ids},
-                events=delta_events,
-                kind_filter=kind_filter,
-            )
-            _save_unread_index(
-                group,
-                actors_rev=actors_rev,
-                cursor_sig=cursor_sig,
-                ledger_basis={**ledger_basis, "active_size": end_offset},
-                counts=next_counts,
-            )
-            return next_counts
-
-    seeded = _seed_unread_index_from_snapshot(
-        group,
-        actors_rev=actors_rev,
-        cursor_sig=cursor_sig,
-        ledger_basis=ledger_basis,
-    )
-    if seeded is not None:
-        delta_events, end_offset = _iter_events_from_offset(group.ledger_path, int(((seeded.get("ledger_basis") if isinstance(seeded.get("ledger_basis"), dict) else {}) or {}).get("active_size") or 0))
-        if end_offset >= 0:
-            next_counts = _apply_unread_delta(
-                group,
-                actors=actors,
-                counts={aid: max(0, int((seeded.get("counts") if isinstance(seeded.get("counts"), dict) else {}).get(aid, 0))) for aid in actor_ids},
-                events=delta_events,
-                kind_filter=kind_filter,
-            )
-            _save_unread_index(
-                group,
-                actors_rev=actors_rev,
-                cursor_sig=cursor_sig,
-                ledger_basis={**ledger_basis, "active_size": end_offset},
-                counts=next_counts,
-            )
-            return next_counts
-
-    rebuilt = batch_unread_counts(group, actor_ids=actor_ids, kind_filter=kind_filter)
-    out = {aid: max(0, int(rebuilt.get(aid, 0))) for aid in actor_ids}
-    _save_unread_index(
-        group,
-        actors_rev=actors_rev,
-        cursor_sig=cursor_sig,
-        ledger_basis=ledger_basis,
-        counts=out,
-    )
-    return out
+    counts = _indexed_unread_counts(group, actor_ids, kind_filter)
+    if counts is None:
+        counts = _scan_unread_counts(group, actor_ids=actor_ids, kind_filter=kind_filter)
+    return {aid: max(0, int(counts.get(aid, 0))) for aid in actor_ids}
 
 
 def load_cursors(group: Group) -> Dict[str, Any]:
@@ -443,6 +256,12 @@ def set_cursor(group: Group, actor_id: str, *, event_id: str, ts: str) -> Dict[s
         "updated_at": utc_now_iso(),
     }
     _save_cursors(group, cursors)
+    try:
+        from .ledger_unread_index import prune_unread_index_for_cursor
+
+        prune_unread_index_for_cursor(group, str(actor_id), ts=str(ts))
+    except Exception:
+        pass
     return dict(cursors[str(actor_id)])
 
 
@@ -829,6 +648,10 @@ def unread_messages(group: Group, *, actor_id: str, limit: int = 50, kind_filter
             - "chat": chat.message only
             - "notify": system.notify only
     """
+    indexed = _indexed_unread_events(group, actor_id, kind_filter=kind_filter, limit=max(0, int(limit or 0)))
+    if indexed is not None:
+        return indexed
+
     _, cursor_ts = get_cursor(group, actor_id)
     cursor_dt = parse_utc_iso(cursor_ts) if cursor_ts else None
 
@@ -870,6 +693,10 @@ def unread_count(group: Group, *, actor_id: str, kind_filter: MessageKindFilter
         actor_id: Actor id
         kind_filter: Same semantics as unread_messages()
     """
+    indexed = _indexed_unread_counts(group, [actor_id], kind_filter)
+    if indexed is not None:
+        return int(indexed.get(actor_id, 0))
+
     _, cursor_ts = get_cursor(group, actor_id)
     cursor_dt = parse_utc_iso(cursor_ts) if cursor_ts else None
 
@@ -904,10 +731,10 @@ def batch_unread_counts(
     actor_ids: List[str],
     kind_filter: MessageKindFilter = "all",
 ) -> Dict[str, int]:
-    """Count unread events for multiple actors in a single ledger pass.
+    """Count unread events for multiple actors.
 
-    This remains O(n * m) where n = actors and m = events, but it avoids
-    re-reading/parsing the ledger for each actor and loads cursors once.
+    Served from the unread index; actors it does not cover (e.g. "user") fall back
+    to a single ledger pass.
 
     Args:
         group: Working group
@@ -917,6 +744,21 @@ def batch_unread_counts(
     Returns:
         Dict mapping actor_id -> unread count
     """
+    if not actor_ids:
+        return {}
+    indexed = _indexed_unread_counts(group, list(actor_ids), kind_filter)
+    if indexed is not None:
+        return indexed
+    return _scan_unread_counts(group, actor_ids=actor_ids, kind_filter=kind_filter)
+
+
+def _scan_unread_counts(
+    group: Group,
+    *,
+    actor_ids: List[str],
+    kind_filter: MessageKindFilter = "all",
+) -> Dict[str, int]:
+    """Count unread events for multiple actors in a single ledger pass (O(actors x events))."""
     if not actor_ids:
         return {}
 
@@ -984,6 +826,10 @@ def latest_unread_event(
     only up to the latest currently-unread message, without requiring clients
     to enumerate every event_id.
     """
+    indexed = _indexed_unread_events(group, actor_id, kind_filter=kind_filter, limit=1, newest_first=True)
+    if indexed is not None:
+        return indexed[0] if indexed else None
+
     _, cursor_ts = get_cursor(group, actor_id)
     cursor_dt = parse_utc_iso(cursor_ts) if cursor_ts else None
 
@@ -1011,16 +857,19 @@ def latest_unread_event(
     return last
 
 
-def resolve_event_id(group: Group, event_id: str) -> str:
-    """Resolve an event id from an exact id or a unique id prefix."""
-    wanted = str(event_id or "").strip()
-    if not wanted:
-        return ""
+def _record_event_lookup(path: str) -> None:
+    with _EVENT_LOOKUP_LOCK:
+        _EVENT_LOOKUP_STATS[path] = _EVENT_LOOKUP_STATS.get(path, 0) + 1
+        _EVENT_LOOKUP_STATS["last_path"] = path
+
+
+def event_lookup_stats() -> Dict[str, Any]:
+    """Process-wide counts of event lookups served by the index vs the reverse-scan fallback."""
+    with _EVENT_LOOKUP_LOCK:
+        return dict(_EVENT_LOOKUP_STATS)
 
-    event = lookup_event_by_id(group.ledger_path, wanted)
-    if event is not None:
-        return str(event.get("id") or "").strip()
 
+def _scan_resolve_event_id(group: Group, wanted: str) -> str:
     exact_match = ""
     prefix_match = ""
     prefix_ambiguous = False
@@ -1044,18 +893,52 @@ def resolve_event_id(group: Group, event_id: str) -> str:
     return ""
 
 
+def resolve_event_id(group: Group, event_id: str) -> str:
+    """Resolve an event id from an exact id or a unique id prefix.
+
+    Served by the ledger index; the reverse ledger scan only runs when the index
+    is unavailable.
+    """
+    wanted = str(event_id or "").strip()
+    if not wanted:
+        return ""
+    try:
+        resolved = resolve_event_id_indexed(group.ledger_path, wanted)
+    except Exception:
+        LOGGER.warning("ledger index unavailable for event id resolution: group=%s", group.group_id, exc_info=True)
+    else:
+        _record_event_lookup("indexed")
+        return resolved
+    _record_event_lookup("scan_fallback")
+    return _scan_resolve_event_id(group, wanted)
+
+
+def _scan_find_event(group: Group, event_id: str) -> Optional[Dict[str, Any]]:
+    for ev in iter_events_reverse(group.ledger_path):
+        if str(ev.get("id") or "").strip() == event_id:
+            return ev
+    return None
+
+
+def _indexed_event(group: Group, event_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        return lookup_event_by_id(group.ledger_path, event_id)
+    except Exception:
+        LOGGER.warning("ledger index lookup failed: group=%s event_id=%s", group.group_id, event_id, exc_info=True)
+        return None
+
+
 def find_event(group: Group, event_id: str) -> Optional[Dict[str, Any]]:
     """Find an event by exact id or a unique id prefix."""
     resolved = resolve_event_id(group, event_id)
     if not resolved:
         return None
-    event = lookup_event_by_id(group.ledger_path, resolved)
+    event = _indexed_event(group, resolved)
     if event is not None:
         return event
-    for ev in iter_events_reverse(group.ledger_path):
-        if str(ev.get("id") or "").strip() == resolved:
-            return ev
-    return None
+    # Resolved but unreadable through the index: recover from the ledger itself.
+    _record_event_lookup("scan_fallback")
+    return _scan_find_event(group, resolved)
 
 
 def find_event_with_chat_ack(group: Group, *, event_id: str, actor_id: str) -> Tuple[Optional[Dict[str, Any]], bool]:
@@ -1065,19 +948,23 @@ def find_event_with_chat_ack(group: Group, *, event_id: str, actor_id: str) -> T
     if not wanted:
         return None, False
 
-    found_event = lookup_event_by_id(group.ledger_path, wanted)
-    found_ack = has_chat_ack_indexed(group.ledger_path, event_id=wanted, actor_id=actor)
+    found_event = _indexed_event(group, wanted)
     if found_event is not None:
-        return found_event, found_ack
-
+        try:
+            return found_event, has_chat_ack_indexed(group.ledger_path, event_id=wanted, actor_id=actor)
+        except Exception:
+            LOGGER.warning("ledger index ack lookup failed: group=%s event_id=%s", group.group_id, wanted, exc_info=True)
+            found_event = None
+
+    # Index unavailable, or the id resolved but its line could not be read back. A
+    # chat.ack is always appended after the event it acknowledges, so the reverse scan
+    # stops at the event instead of walking the rest of the ledger looking for acks.
+    _record_event_lookup("scan_fallback")
+    found_ack = False
     for ev in iter_events_reverse(group.ledger_path):
-        kind = str(ev.get("kind") or "").strip()
-        if found_event is None and str(ev.get("id") or "").strip() == wanted:
-            found_event = ev
-            if found_ack:
-                break
-            continue
-        if found_ack or kind != "chat.ack":
+        if str(ev.get("id") or "").strip() == wanted:
+            return ev, found_ack
+        if found_ack or str(ev.get("kind") or "").strip() != "chat.ack":
             continue
         data = ev.get("data")
         if not isinstance(data, dict):
@@ -1087,9 +974,7 @@ def find_event_with_chat_ack(group: Group, *, event_id: str, actor_id: str) -> T
         if actor and str(data.get("actor_id") or "").strip() != actor:
             continue
         found_ack = True
-        if found_event is not None:
-            break
-    return found_event, found_ack
+    return None, False
 
 
 def get_quote_text(group: Group, event_id: str, max_len: int = 100) -> Optional[str]:
@@ -1212,6 +1097,82 @@ def get_read_status_batch(
     return result
 
 
+_MAX_INDEXED_SEARCH_PAGES = 20
+
+
+def _message_matches_query(ev: Dict[str, Any], query_lower: str) -> bool:
+    data = ev.get("data")
+    if not isinstance(data, dict):
+        return False
+    text = str(data.get("text") or "").lower()
+    title = str(data.get("title") or "").lower()
+    message = str(data.get("message") or "").lower()
+    return query_lower in text or query_lower in title or query_lower in message
+
+
+def _search_messages_indexed(
+    group: Group,
+    *,
+    allowed_kinds: set[str],
+    query_lower: str,
+    by_filter: str,
+    before_id: str,
+    after_id: str,
+    limit: int,
+    order: str,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Page through the ledger index until `limit` events survive the text re-filter.
+
+    The index matches a superset (its searchable text also covers kind/quote_text), so
+    pages are re-filtered here and the cursor advances until the page is full or the
+    index is exhausted.
+    """
+    limit = max(1, int(limit or 50))
+    relevance = str(order or "").strip().lower() == "relevance" and bool(query_lower)
+    # Pages come back newest-first without anchors, ascending with anchors.
+    direction = "after" if after_id else ("before" if before_id else "latest")
+    cursor_before = before_id
+    cursor_after = after_id
+    collected: List[Dict[str, Any]] = []
+    has_more = False
+    for _ in range(_MAX_INDEXED_SEARCH_PAGES):
+        event_ids, page_has_more = search_event_ids_indexed(
+            group.ledger_path,
+            allowed_kinds=allowed_kinds,
+            query=query_lower,
+            by_filter=by_filter,
+            before_id=cursor_before,
+            after_id=cursor_after,
+            limit=limit,
+            order=("relevance" if relevance else "time"),
+        )
+        page = [
+            ev
+            for ev in lookup_events_by_ids(group.ledger_path, event_ids)
+            if isinstance(ev, dict) and (not query_lower or _message_matches_query(ev, query_lower))
+        ]
+        has_more = page_has_more
+        if direction == "before":
+            collected = page + collected
+        elif direction == "latest" and cursor_before:
+            collected.extend(reversed(page))
+        else:
+            collected.extend(page)
+        if relevance or not page_has_more or not event_ids or len(collected) >= limit:
+            break
+        if direction == "after":
+            cursor_after = event_ids[-1]
+        elif direction == "before" or cursor_before:
+            cursor_before = event_ids[0]
+        else:
+            # First "latest" page is newest-first; continue backwards from its oldest id.
+            cursor_before = event_ids[-1]
+    if len(collected) > limit:
+        has_more = True
+        collected = collected[-limit:] if direction == "before" else collected[:limit]
+    return collected, has_more
+
+
 def search_messages(
     group: Group,
     *,
@@ -1221,6 +1182,7 @@ def search_messages(
     before_id: str = "",
     after_id: str = "",
     limit: int = 50,
+    order: str = "time",
 ) -> Tuple[List[Dict[str, Any]], bool]:
     """Search and paginate messages in the ledger.
     
@@ -1232,6 +1194,7 @@ def search_messages(
         before_id: Return messages before this event_id (for backward pagination)
         after_id: Return messages after this event_id (for forward pagination)
         limit: Maximum number of messages to return
+        order: "time" (default) or "relevance" (rank text matches; first page only)
     
     Returns:
         Tuple of (messages, has_more)
@@ -1244,55 +1207,24 @@ def search_messages(
     else:
         allowed_kinds = {"chat.message", "system.notify"}
     
-    query_lower = query.lower().strip() if query else ""
+    # A trailing "*" is accepted as prefix syntax; substring matching already covers it.
+    query_lower = query.lower().strip().rstrip("*").strip() if query else ""
     by_filter = by_filter.strip()
     
-    if not query_lower:
-        event_ids, has_more = search_event_ids_indexed(
-            group.ledger_path,
+    try:
+        return _search_messages_indexed(
+            group,
             allowed_kinds=allowed_kinds,
-            query="",
+            query_lower=query_lower,
             by_filter=by_filter,
             before_id=before_id,
             after_id=after_id,
             limit=limit,
+            order=order,
         )
-        if event_ids:
-            events: List[Dict[str, Any]] = []
-            for ev in lookup_events_by_ids(group.ledger_path, event_ids):
-                if isinstance(ev, dict):
-                    events.append(ev)
-            return events, has_more
-        if before_id or after_id:
-            return [], False
-
-    event_ids, has_more = search_event_ids_indexed(
-        group.ledger_path,
-        allowed_kinds=allowed_kinds,
-        query=query_lower,
-        by_filter=by_filter,
-        before_id=before_id,
-        after_id=after_id,
-        limit=limit,
-    )
-    if event_ids:
-        events = []
-        for ev in lookup_events_by_ids(group.ledger_path, event_ids):
-            if isinstance(ev, dict):
-                data = ev.get("data")
-                if isinstance(data, dict):
-                    text = str(data.get("text") or "").lower()
-                    title = str(data.get("title") or "").lower()
-                    message = str(data.get("message") or "").lower()
-                    if query_lower not in text and query_lower not in title and query_lower not in message:
-                        continue
-                else:
-                    continue
-                events.append(ev)
-        if events:
-            return events, has_more
-        if before_id or after_id:
-            return [], False
+    except Exception as e:
+        # The index is derived state; fall back to a ledger scan only when it is unusable.
+        LOGGER.warning("indexed message search failed, scanning ledger: group=%s err=%s", group.group_id, e)
 
     # Fallback: collect all matching events
     all_events: List[Dict[str, Any]] = []
@@ -1308,16 +1240,8 @@ def search_messages(
                 continue
         
         # Text search
-        if query_lower:
-            data = ev.get("data")
-            if isinstance(data, dict):
-                text = str(data.get("text") or "").lower()
-                title = str(data.get("title") or "").lower()
-                message = str(data.get("message") or "").lower()
-                if query_lower not in text and query_lower not in title and query_lower not in message:
-                    continue
-            else:
-                continue
+        if query_lower and not _message_matches_query(ev, query_lower):
+            continue
         
         all_events.append(ev)
     
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
-from collections import deque
 import hashlib
 import json
 import logging
 import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Optional
 
 from ..contracts.v1 import Event
 from ..contracts.v1.event import normalize_event_data
 from ..util.fs import atomic_write_text
 from ..util.file_lock import acquire_lockfile, release_lockfile
-from .ledger_index import append_event_to_index
+from ..util.file_watch import FileChangeWatcher
+from .ledger_index import append_events_to_index
 from .ledger_segments import read_last_lines_across_sources
 
+if TYPE_CHECKING:
+    from .group import Group
+
 
 MAX_EVENT_BYTES = 256_000
 MAX_CHAT_TEXT_BYTES = 32_000
@@ -64,7 +68,7 @@ def _lock_path(ledger_path: Path) -> Path:
     return ledger_path.parent / "state" / "ledger" / "ledger.lock"
 
 
-def append_event(
+def _prepare_event(
     ledger_path: Path,
     *,
     kind: str,
@@ -72,7 +76,7 @@ def append_event(
     scope_key: str,
     by: str,
     data: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
+) -> tuple[Dict[str, Any], str]:
     payload = normalize_event_data(kind, data or {})
     event = Event(kind=kind, group_id=group_id, scope_key=scope_key, by=by, data=payload)
 
@@ -90,34 +94,241 @@ def append_event(
                 attachments.append(att)
                 event.data["attachments"] = attachments
 
-    ledger_path.parent.mkdir(parents=True, exist_ok=True)
     out = event.model_dump()
     line = json.dumps(out, ensure_ascii=False)
     if len(line.encode("utf-8", errors="replace")) > MAX_EVENT_BYTES:
         raise ValueError(f"ledger event too large (>{MAX_EVENT_BYTES} bytes): {kind}")
+    return out, line
+
+
+def _commit_prepared(
+    ledger_path: Path,
+    prepared: list[tuple[Dict[str, Any], str]],
+    *,
+    group: Optional["Group"] = None,
+) -> None:
+    """Write prepared events under one ledger lock, then index, cache and notify in order."""
+    if not prepared:
+        return
+    ledger_path.parent.mkdir(parents=True, exist_ok=True)
+    indexed: list[tuple[Dict[str, Any], int]] = []
+    written: list[tuple[str, int]] = []
     lock = _lock_path(ledger_path)
     lk = acquire_lockfile(lock, blocking=True)
     try:
         with ledger_path.open("a", encoding="utf-8") as f:
-            start_offset = int(f.tell() or 0)
-            f.write(line + "\n")
-            next_offset = start_offset + len((line + "\n").encode("utf-8", errors="replace"))
+            next_offset = int(f.tell() or 0)
+            f.write("".join(line + "\n" for _, line in prepared))
+            for out, line in prepared:
+                next_offset += len((line + "\n").encode("utf-8", errors="replace"))
+                indexed.append((out, next_offset))
+                written.append((line, next_offset))
     finally:
         release_lockfile(lk)
     try:
-        append_event_to_index(ledger_path, out, next_offset_bytes=next_offset)
+        from .ledger_tail_cache import note_ledger_appended
+
+        note_ledger_appended(ledger_path, written)
+    except Exception:
+        pass
+    try:
+        append_events_to_index(ledger_path, indexed)
+    except Exception:
+        pass
+    events = [out for out, _ in prepared]
+    try:
+        from .ledger_status_cache import update_message_status_cache_on_append_batch
+
+        update_message_status_cache_on_append_batch(events)
     except Exception:
         pass
     try:
-        from .ledger_status_cache import update_message_status_cache_on_append
+        from .ledger_unread_index import update_unread_index_on_append_batch
 
-        update_message_status_cache_on_append(out)
+        update_unread_index_on_append_batch(ledger_path, indexed, group=group)
     except Exception:
         pass
-    _notify_append(out)
+    for out in events:
+        _notify_append(out)
+
+
+class _PendingAppend:
+    __slots__ = ("prepared", "group", "done", "error")
+
+    def __init__(self, prepared: list[tuple[Dict[str, Any], str]], group: Optional["Group"]) -> None:
+        self.prepared = prepared
+        self.group = group
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class _GroupCommitQueue:
+    """Leader/follower group commit for one ledger file.
+
+    The first caller to find no active leader becomes the leader: it takes every
+    pending append (in arrival order) and commits them as one batch. It waits out the
+    commit window first only when other appenders are already queued behind it, so a
+    lone append is written at once. Followers block until their batch is committed, so
+    append_event keeps its synchronous contract (the event is on disk and hooks have run
+    on return).
+    """
+
+    def __init__(self, ledger_path: Path) -> None:
+        self.ledger_path = ledger_path
+        self._cond = threading.Condition()
+        self._pending: list[_PendingAppend] = []
+        self._leader_active = False
+
+    def submit(
+        self,
+        prepared: list[tuple[Dict[str, Any], str]],
+        *,
+        window_seconds: float,
+        group: Optional["Group"] = None,
+    ) -> None:
+        item = _PendingAppend(prepared, group)
+        with self._cond:
+            self._pending.append(item)
+            while not item.done and self._leader_active:
+                self._cond.wait()
+            if item.done:
+                if item.error is not None:
+                    raise item.error
+                return
+            self._leader_active = True
+            contended = len(self._pending) > 1
+        batch: list[_PendingAppend] = []
+        try:
+            if contended and window_seconds > 0:
+                # Appends queued up while the previous batch was committing; give their
+                # peers the window to join before writing.
+                time.sleep(window_seconds)
+            with self._cond:
+                batch = self._pending
+                self._pending = []
+            try:
+                _commit_prepared(
+                    self.ledger_path,
+                    [entry for pending in batch for entry in pending.prepared],
+                    group=next((pending.group for pending in batch if pending.group is not None), None),
+                )
+            except BaseException as e:
+                for pending in batch:
+                    pending.error = e
+        finally:
+            with self._cond:
+                for pending in batch:
+                    pending.done = True
+                self._leader_active = False
+                self._cond.notify_all()
+        if item.error is not None:
+            raise item.error
+
+    def wait_idle(self, *, timeout_s: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._leader_active and not self._pending, timeout=max(0.0, timeout_s))
+
+
+_GROUP_COMMIT_WINDOW_SECONDS: Optional[float] = None
+_GROUP_COMMIT_QUEUES: Dict[str, _GroupCommitQueue] = {}
+_GROUP_COMMIT_LOCK = threading.Lock()
+
+
+def set_group_commit_window(window_seconds: Optional[float]) -> None:
+    """Enable (window >= 0) or disable (None) in-process group commit for append_event().
+
+    When enabled, appends to the same ledger that arrive within the window are
+    coalesced into one locked write and one index transaction. Ordering and
+    append-hook semantics are unchanged. Intended for the daemon process.
+    """
+    global _GROUP_COMMIT_WINDOW_SECONDS
+    if window_seconds is None:
+        _GROUP_COMMIT_WINDOW_SECONDS = None
+        return
+    _GROUP_COMMIT_WINDOW_SECONDS = max(0.0, float(window_seconds))
+
+
+def _group_commit_queue(ledger_path: Path) -> _GroupCommitQueue:
+    key = str(ledger_path)
+    with _GROUP_COMMIT_LOCK:
+        queue = _GROUP_COMMIT_QUEUES.get(key)
+        if queue is None:
+            queue = _GroupCommitQueue(ledger_path)
+            _GROUP_COMMIT_QUEUES[key] = queue
+        return queue
+
+
+def drain_group_commit_queue(ledger_path: Path, *, timeout_s: float = 5.0) -> bool:
+    """Wait for in-flight group commits to this ledger to finish and drop its queue.
+
+    Used before a group directory is removed so no leader writes into it afterwards.
+    Returns False if a commit was still running when the timeout expired.
+    """
+    with _GROUP_COMMIT_LOCK:
+        queue = _GROUP_COMMIT_QUEUES.pop(str(ledger_path), None)
+    if queue is None:
+        return True
+    return queue.wait_idle(timeout_s=timeout_s)
+
+
+def _commit(
+    ledger_path: Path,
+    prepared: list[tuple[Dict[str, Any], str]],
+    *,
+    group: Optional["Group"] = None,
+) -> None:
+    window = _GROUP_COMMIT_WINDOW_SECONDS
+    if window is None:
+        _commit_prepared(ledger_path, prepared, group=group)
+        return
+    _group_commit_queue(ledger_path).submit(prepared, window_seconds=window, group=group)
+
+
+def append_event(
+    ledger_path: Path,
+    *,
+    kind: str,
+    group_id: str,
+    scope_key: str,
+    by: str,
+    data: Optional[Dict[str, Any]] = None,
+    group: Optional["Group"] = None,
+) -> Dict[str, Any]:
+    """Append one event. Pass the already-loaded group (if any) so index upkeep reuses it."""
+    out, line = _prepare_event(ledger_path, kind=kind, group_id=group_id, scope_key=scope_key, by=by, data=data)
+    _commit(ledger_path, [(out, line)], group=group)
     return out
 
 
+def append_events(
+    ledger_path: Path,
+    events: Iterable[Dict[str, Any]],
+    *,
+    group: Optional["Group"] = None,
+) -> list[Dict[str, Any]]:
+    """Append several events with one locked write and one index transaction.
+
+    Each item takes the append_event() keyword arguments (kind, group_id, scope_key,
+    by, data). Events land in the given order and the append hook fires once per
+    event, in order. Validation happens before anything is written, so an invalid
+    item leaves the ledger untouched.
+    """
+    prepared: list[tuple[Dict[str, Any], str]] = []
+    for item in events:
+        prepared.append(
+            _prepare_event(
+                ledger_path,
+                kind=str(item.get("kind") or ""),
+                group_id=str(item.get("group_id") or ""),
+                scope_key=str(item.get("scope_key") or ""),
+                by=str(item.get("by") or ""),
+                data=item.get("data") if isinstance(item.get("data"), dict) else None,
+            )
+        )
+    _commit(ledger_path, prepared, group=group)
+    return [out for out, _ in prepared]
+
+
 def read_last_lines(path: Path, n: int) -> list[str]:
     if n <= 0:
         return []
@@ -129,23 +340,52 @@ def read_last_lines(path: Path, n: int) -> list[str]:
     try:
         if not path.exists():
             return []
-        keep = deque(maxlen=n)
-        with path.open("r", encoding="utf-8", errors="replace") as handle:
-            for raw_line in handle:
-                line = raw_line.rstrip("\n")
-                if line:
-                    keep.append(line)
-        return list(keep)
+        keep: list[str] = []
+        for _offset, raw_line in iter_lines_reverse(path):
+            line = raw_line.rstrip(b"\r").decode("utf-8", errors="replace")
+            if line:
+                keep.append(line)
+                if len(keep) >= n:
+                    break
+        keep.reverse()
+        return keep
     except Exception as e:
         LOGGER.error("failed to read text tail: path=%s err=%s", path, e)
         return []
 
 
+def iter_lines_reverse(path: Path, *, block_size: int = 64 * 1024) -> Iterator[tuple[int, bytes]]:
+    """Yield (byte_offset, line) pairs from the end of a file backwards.
+
+    Reads fixed-size blocks from the end, so the cost is proportional to how far the
+    caller iterates rather than to the file size. Lines exclude their newline; a file
+    ending in a newline yields an empty final line first.
+    """
+    step = max(1, int(block_size))
+    with path.open("rb") as handle:
+        pos = handle.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            read = min(step, pos)
+            pos -= read
+            handle.seek(pos)
+            chunk = handle.read(read) + partial
+            lines = chunk.split(b"\n")
+            partial = lines[0]
+            offset = pos + len(chunk)
+            for line in reversed(lines[1:]):
+                offset -= len(line)
+                yield offset, line
+                offset -= 1
+        yield 0, partial
+
+
 def follow(path: Path, *, sleep_seconds: float = 0.2) -> Iterable[str]:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.touch(exist_ok=True)
     inode = -1
     f = None
+    watcher = FileChangeWatcher(path, poll_interval=sleep_seconds)
 
     def _open() -> None:
         nonlocal f, inode
@@ -171,7 +411,7 @@ def follow(path: Path, *, sleep_seconds: float = 0.2) -> Iterable[str]:
             yield line.rstrip("\n")
             continue
 
-        time.sleep(sleep_seconds)
+        watcher.wait()
         try:
             st = path.stat()
             cur_inode = int(getattr(st, "st_ino", -1) or -1)
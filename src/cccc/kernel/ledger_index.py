@@ -2,14 +2,27 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional
 
-from .ledger_segments import ACTIVE_SOURCE_SEQ, iter_source_lines, list_ledger_sources, open_ledger_source_text
+from .ledger_segments import (
+    ACTIVE_SOURCE_SEQ,
+    iter_gzip_member_lines,
+    iter_source_lines,
+    list_ledger_sources,
+    open_ledger_source_text,
+    read_gzip_member,
+)
 
 
 _SCHEMA_VERSION = 4
 _DEFAULT_TIMEOUT_SECONDS = 5.0
+_FTS_TABLE = "event_search_fts"
+# The trigram tokenizer matches arbitrary substrings (CJK included) but needs >= 3 characters.
+_FTS_MIN_QUERY_CHARS = 3
+_FTS5_SUPPORTED: Optional[bool] = None
 _EVENTS_REQUIRED_COLUMNS = {
     "event_id",
     "ts",
@@ -36,6 +49,149 @@ def _connect(index_path: Path) -> sqlite3.Connection:
     return conn
 
 
+# Connection pool: one sqlite connection per (index file, thread), reused across calls.
+# Schema verification runs once per process per index file and is re-run only when the
+# sqlite schema cookie changes underneath us (e.g. another process migrated or dropped tables).
+_POOL_LOCAL = threading.local()
+_POOL_LOCK = threading.Lock()
+_POOL_GENERATION: Dict[str, int] = {}
+_VERIFIED_SCHEMA_COOKIE: Dict[str, int] = {}
+# Per-index-file locks for schema verification, so a slow first open or FTS rebuild of
+# one group's index does not block index access for other groups (_POOL_LOCK only
+# guards the dicts above).
+_SCHEMA_LOCKS: Dict[str, threading.Lock] = {}
+
+
+def _file_identity(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = path.stat()
+    except Exception:
+        return None
+    return int(getattr(st, "st_dev", 0) or 0), int(getattr(st, "st_ino", 0) or 0)
+
+
+def _schema_cookie(conn: sqlite3.Connection) -> int:
+    row = conn.execute("PRAGMA schema_version").fetchone()
+    try:
+        return int(row[0] or 0) if row is not None else 0
+    except Exception:
+        return 0
+
+
+def _pooled_connection(index_path: Path) -> sqlite3.Connection:
+    key = str(index_path)
+    pool = getattr(_POOL_LOCAL, "conns", None)
+    if pool is None:
+        pool = {}
+        _POOL_LOCAL.conns = pool
+    with _POOL_LOCK:
+        generation = _POOL_GENERATION.setdefault(key, 0)
+    entry = pool.get(key)
+    if entry is not None:
+        conn, identity, entry_generation = entry
+        if entry_generation == generation and identity is not None and identity == _file_identity(index_path):
+            return conn
+        pool.pop(key, None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+    conn = _connect(index_path)
+    pool[key] = (conn, _file_identity(index_path), generation)
+    return conn
+
+
+def _schema_verified(key: str, cookie: int) -> bool:
+    with _POOL_LOCK:
+        return bool(cookie) and _VERIFIED_SCHEMA_COOKIE.get(key) == cookie
+
+
+def _verify_schema(
+    conn: sqlite3.Connection,
+    index_path: Path,
+    ensure_schema: Optional[Callable[[sqlite3.Connection], None]] = None,
+) -> None:
+    key = str(index_path)
+    if _schema_verified(key, _schema_cookie(conn)):
+        return
+    with _POOL_LOCK:
+        schema_lock = _SCHEMA_LOCKS.setdefault(key, threading.Lock())
+    with schema_lock:
+        # Another thread may have finished verification while we waited.
+        if _schema_verified(key, _schema_cookie(conn)):
+            return
+        (ensure_schema or _ensure_schema)(conn)
+        conn.commit()
+        cookie = _schema_cookie(conn)
+        with _POOL_LOCK:
+            _VERIFIED_SCHEMA_COOKIE[key] = cookie
+
+
+def pooled_state_connection(
+    db_path: Path,
+    *,
+    ensure_schema: Callable[[sqlite3.Connection], None],
+) -> sqlite3.Connection:
+    """Pooled per-thread connection to a sqlite database kept next to the ledger index.
+
+    ensure_schema runs once per process and again only when the schema changes on
+    disk, like the index's own schema. Connections are dropped by
+    close_ledger_index_connections() together with the index.
+    """
+    conn = _pooled_connection(db_path)
+    _verify_schema(conn, db_path, ensure_schema)
+    return conn
+
+
+@contextmanager
+def _index_connection(ledger_path: Path) -> Iterator[sqlite3.Connection]:
+    index_path = _index_path_for_ledger(ledger_path)
+    conn = _pooled_connection(index_path)
+    try:
+        _verify_schema(conn, index_path)
+        yield conn
+    except BaseException:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+
+
+def close_ledger_index_connections(ledger_path: Optional[Path] = None) -> None:
+    """Drop pooled sqlite connections (all groups when ledger_path is None).
+
+    Covers every pooled database under the ledger's state directory (the index and
+    the unread index). Connections owned by the calling thread are closed immediately;
+    other threads reopen lazily on their next access. Schema verification is forgotten
+    as well.
+    """
+    keys: list[str] = []
+    with _POOL_LOCK:
+        if ledger_path is None:
+            keys = list(_POOL_GENERATION)
+        else:
+            state_dir = _index_path_for_ledger(ledger_path).parent
+            keys = [key for key in _POOL_GENERATION if Path(key).parent == state_dir]
+            keys.append(str(_index_path_for_ledger(ledger_path)))
+            keys = list(dict.fromkeys(keys))
+        for key in keys:
+            _POOL_GENERATION[key] = _POOL_GENERATION.get(key, 0) + 1
+            _VERIFIED_SCHEMA_COOKIE.pop(key, None)
+            _SCHEMA_LOCKS.pop(key, None)
+    pool = getattr(_POOL_LOCAL, "conns", None)
+    if not isinstance(pool, dict):
+        return
+    for key in keys:
+        entry = pool.pop(key, None)
+        if entry is None:
+            continue
+        try:
+            entry[0].close()
+        except Exception:
+            pass
+
+
 def _meta_int(conn: sqlite3.Connection, key: str) -> int:
     row = conn.execute("SELECT value FROM meta WHERE key = ?", (str(key or "").strip(),)).fetchone()
     if row is None:
@@ -73,18 +229,20 @@ def _reset_legacy_schema(conn: sqlite3.Connection) -> bool:
     conn.execute("DROP INDEX IF EXISTS idx_events_by_ts")
     conn.execute("DROP INDEX IF EXISTS idx_events_source_line")
     conn.execute("DROP TABLE IF EXISTS chat_ack")
+    _drop_search_fts(conn)
     conn.execute("DROP TABLE IF EXISTS event_search")
     conn.execute("DROP TABLE IF EXISTS source_state")
     conn.execute("DROP TABLE IF EXISTS events")
     return True
 
 
-def _rebuild_events_indexes(conn: sqlite3.Connection) -> None:
-    conn.execute("DROP INDEX IF EXISTS idx_events_reply_to")
-    conn.execute("DROP INDEX IF EXISTS idx_events_ts")
-    conn.execute("DROP INDEX IF EXISTS idx_events_kind_ts")
-    conn.execute("DROP INDEX IF EXISTS idx_events_by_ts")
-    conn.execute("DROP INDEX IF EXISTS idx_events_source_line")
+def _rebuild_events_indexes(conn: sqlite3.Connection, *, force: bool = True) -> None:
+    if force:
+        conn.execute("DROP INDEX IF EXISTS idx_events_reply_to")
+        conn.execute("DROP INDEX IF EXISTS idx_events_ts")
+        conn.execute("DROP INDEX IF EXISTS idx_events_kind_ts")
+        conn.execute("DROP INDEX IF EXISTS idx_events_by_ts")
+        conn.execute("DROP INDEX IF EXISTS idx_events_source_line")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_reply_to ON events(reply_to)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events(kind, ts, source_seq, line_no)")
@@ -92,6 +250,83 @@ def _rebuild_events_indexes(conn: sqlite3.Connection) -> None:
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_source_line ON events(source_path, line_no)")
 
 
+def fts5_supported() -> bool:
+    """Whether this sqlite build ships FTS5 with the trigram tokenizer (probed once)."""
+    global _FTS5_SUPPORTED
+    if _FTS5_SUPPORTED is None:
+        try:
+            probe = sqlite3.connect(":memory:")
+            try:
+                probe.execute("CREATE VIRTUAL TABLE fts_probe USING fts5(body, tokenize='trigram')")
+                _FTS5_SUPPORTED = True
+            finally:
+                probe.close()
+        except Exception:
+            _FTS5_SUPPORTED = False
+    return bool(_FTS5_SUPPORTED)
+
+
+def _drop_search_fts(conn: sqlite3.Connection) -> None:
+    conn.execute("DROP TRIGGER IF EXISTS event_search_fts_ai")
+    conn.execute("DROP TRIGGER IF EXISTS event_search_fts_ad")
+    conn.execute("DROP TRIGGER IF EXISTS event_search_fts_au")
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {_FTS_TABLE}")
+    except sqlite3.OperationalError:
+        # Without the fts5 module the virtual table cannot be dropped; the triggers are
+        # gone, so it simply goes stale and is rebuilt once FTS5 is available again.
+        pass
+
+
+def _ensure_search_fts(conn: sqlite3.Connection) -> None:
+    """Keep an external-content FTS5 index over event_search in sync via triggers."""
+    backend = _meta_text(conn, "search_backend")
+    if not fts5_supported():
+        if backend == "fts5":
+            _drop_search_fts(conn)
+        _set_meta(conn, "search_backend", "like")
+        return
+    conn.executescript(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5(
+            searchable_text,
+            content='event_search',
+            tokenize='trigram'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS event_search_fts_ai AFTER INSERT ON event_search BEGIN
+            INSERT INTO {_FTS_TABLE}(rowid, searchable_text) VALUES (new.rowid, new.searchable_text);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS event_search_fts_ad AFTER DELETE ON event_search BEGIN
+            INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, searchable_text) VALUES ('delete', old.rowid, old.searchable_text);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS event_search_fts_au AFTER UPDATE ON event_search BEGIN
+            INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, searchable_text) VALUES ('delete', old.rowid, old.searchable_text);
+            INSERT INTO {_FTS_TABLE}(rowid, searchable_text) VALUES (new.rowid, new.searchable_text);
+        END;
+        """
+    )
+    if backend != "fts5":
+        # First enablement (or re-enablement after running without FTS5): backfill.
+        conn.execute(f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')")
+        _set_meta(conn, "search_backend", "fts5")
+
+
+def _meta_text(conn: sqlite3.Connection, key: str) -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (str(key or "").strip(),)).fetchone()
+    return str(row[0] or "").strip() if row is not None else ""
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta(key, value) VALUES(?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+        (str(key or "").strip(), str(value or "")),
+    )
+
+
 def _ensure_schema(conn: sqlite3.Connection) -> None:
     rebuilt = _reset_legacy_schema(conn)
     conn.executescript(
@@ -132,20 +367,31 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
             event_id TEXT PRIMARY KEY,
             searchable_text TEXT NOT NULL
         );
+
+        CREATE TABLE IF NOT EXISTS source_blocks (
+            source_path TEXT NOT NULL,
+            block_offset INTEGER NOT NULL,
+            first_line_no INTEGER NOT NULL,
+            PRIMARY KEY (source_path, block_offset)
+        );
         """
     )
-    _rebuild_events_indexes(conn)
     current = _meta_int(conn, "schema_version")
+    # Index definitions only change together with _SCHEMA_VERSION, so a matching
+    # version only needs the (cheap) IF NOT EXISTS pass.
+    _rebuild_events_indexes(conn, force=current != _SCHEMA_VERSION or rebuilt)
     if current != _SCHEMA_VERSION or rebuilt:
         conn.execute("DELETE FROM chat_ack")
         conn.execute("DELETE FROM events")
         conn.execute("DELETE FROM source_state")
         conn.execute("DELETE FROM event_search")
+        conn.execute("DELETE FROM source_blocks")
         conn.execute(
             "INSERT INTO meta(key, value) VALUES(?, ?) "
             "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
             ("schema_version", str(_SCHEMA_VERSION)),
         )
+    _ensure_search_fts(conn)
 
 
 def _source_stat(path: Path) -> tuple[int, int]:
@@ -161,6 +407,7 @@ def _delete_source_rows(conn: sqlite3.Connection, source_path: str) -> None:
     conn.execute("DELETE FROM chat_ack WHERE event_id IN (SELECT event_id FROM events WHERE source_path = ?)", (source_path,))
     conn.execute("DELETE FROM events WHERE source_path = ?", (source_path,))
     conn.execute("DELETE FROM source_state WHERE source_path = ?", (source_path,))
+    conn.execute("DELETE FROM source_blocks WHERE source_path = ?", (source_path,))
 
 
 def _searchable_text(event: Dict[str, Any]) -> str:
@@ -236,17 +483,26 @@ def _reindex_source(conn: sqlite3.Connection, ledger_path: Path, source: Dict[st
     _delete_source_rows(conn, source_path)
     line_no = 0
     if compressed:
-        for raw_line in iter_source_lines(abs_path):
+        # Each event row points at the gzip member holding its line; source_blocks
+        # maps members to their first line so lookups inflate a single member.
+        block_offset = -1
+        for member_offset, raw_line in iter_gzip_member_lines(abs_path):
             line_no += 1
+            if member_offset != block_offset:
+                block_offset = member_offset
+                conn.execute(
+                    "INSERT OR REPLACE INTO source_blocks(source_path, block_offset, first_line_no) VALUES(?, ?, ?)",
+                    (source_path, block_offset, line_no),
+                )
             line = raw_line.strip()
             if not line:
                 continue
             try:
-                obj = json.loads(line)
+                obj = json.loads(line.decode("utf-8", errors="replace"))
             except Exception:
                 continue
             if isinstance(obj, dict):
-                _index_event(conn, obj, source_seq=source_seq, source_path=source_path, line_no=line_no, offset_bytes=0)
+                _index_event(conn, obj, source_seq=source_seq, source_path=source_path, line_no=line_no, offset_bytes=block_offset)
         size_bytes, mtime_ns = _source_stat(abs_path)
         conn.execute(
             """
@@ -359,11 +615,13 @@ def _catch_up_plain_source(conn: sqlite3.Connection, ledger_path: Path, source:
     )
 
 
+def _has_source_blocks(conn: sqlite3.Connection, source_path: str) -> bool:
+    row = conn.execute("SELECT 1 FROM source_blocks WHERE source_path = ? LIMIT 1", (source_path,)).fetchone()
+    return row is not None
+
+
 def catch_up_ledger_index(ledger_path: Path) -> None:
-    index_path = _index_path_for_ledger(ledger_path)
-    conn = _connect(index_path)
-    try:
-        _ensure_schema(conn)
+    with _index_connection(ledger_path) as conn:
         sources = list_ledger_sources(ledger_path.parent)
         current_paths = {str(source.get("path") or "").strip() for source in sources}
         stale_rows = conn.execute("SELECT source_path FROM source_state").fetchall()
@@ -394,7 +652,7 @@ def catch_up_ledger_index(ledger_path: Path) -> None:
                 _reindex_source(conn, ledger_path, source)
                 continue
             if compressed:
-                if prev_compressed and prev_size == size_bytes and prev_mtime_ns == mtime_ns:
+                if prev_compressed and prev_size == size_bytes and prev_mtime_ns == mtime_ns and _has_source_blocks(conn, source_path):
                     continue
                 _reindex_source(conn, ledger_path, source)
                 continue
@@ -403,31 +661,41 @@ def catch_up_ledger_index(ledger_path: Path) -> None:
                 continue
             _catch_up_plain_source(conn, ledger_path, source)
         conn.commit()
-    finally:
-        conn.close()
 
 
 def append_event_to_index(ledger_path: Path, event: Dict[str, Any], *, next_offset_bytes: int) -> None:
-    index_path = _index_path_for_ledger(ledger_path)
-    conn = _connect(index_path)
-    try:
-        _ensure_schema(conn)
+    append_events_to_index(ledger_path, [(event, next_offset_bytes)])
+
+
+def append_events_to_index(ledger_path: Path, entries: list[tuple[Dict[str, Any], int]]) -> None:
+    """Index events just appended to the active ledger, in one transaction.
+
+    Each entry is (event, next_offset_bytes) where next_offset_bytes is the file
+    offset right after the event's line.
+    """
+    if not entries:
+        return
+    with _index_connection(ledger_path) as conn:
         source_path = "ledger.jsonl"
         row = conn.execute(
             "SELECT last_line_no FROM source_state WHERE source_path = ?",
             (source_path,),
         ).fetchone()
-        last_line_no = int(row[0] or 0) if row is not None else 0
-        encoded = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8", errors="replace")
-        start_offset = max(0, int(next_offset_bytes or 0) - len(encoded))
-        _index_event(
-            conn,
-            event,
-            source_seq=ACTIVE_SOURCE_SEQ,
-            source_path=source_path,
-            line_no=last_line_no + 1,
-            offset_bytes=start_offset,
-        )
+        line_no = int(row[0] or 0) if row is not None else 0
+        next_offset = 0
+        for event, next_offset_bytes in entries:
+            line_no += 1
+            next_offset = int(next_offset_bytes or 0)
+            encoded = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8", errors="replace")
+            start_offset = max(0, next_offset - len(encoded))
+            _index_event(
+                conn,
+                event,
+                source_seq=ACTIVE_SOURCE_SEQ,
+                source_path=source_path,
+                line_no=line_no,
+                offset_bytes=start_offset,
+            )
         size_bytes, mtime_ns = _source_stat(ledger_path)
         conn.execute(
             """
@@ -440,18 +708,45 @@ def append_event_to_index(ledger_path: Path, event: Dict[str, Any], *, next_offs
                 last_offset_bytes=excluded.last_offset_bytes,
                 last_line_no=excluded.last_line_no
             """,
-            (source_path, 0, size_bytes, mtime_ns, int(next_offset_bytes or 0), last_line_no + 1),
+            (source_path, 0, size_bytes, mtime_ns, next_offset, line_no),
         )
         conn.commit()
-    finally:
-        conn.close()
 
 
-def _read_event_from_source(group_path: Path, *, source_path: str, line_no: int, offset_bytes: int) -> Optional[Dict[str, Any]]:
+def _read_line_from_block(abs_path: Path, *, block_offset: int, index_in_block: int) -> Optional[Dict[str, Any]]:
+    try:
+        lines = read_gzip_member(abs_path, block_offset).split(b"\n")
+    except Exception:
+        return None
+    if index_in_block < 0 or index_in_block >= len(lines):
+        return None
+    try:
+        obj = json.loads(lines[index_in_block].decode("utf-8", errors="replace"))
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _read_event_from_source(
+    group_path: Path,
+    *,
+    source_path: str,
+    line_no: int,
+    offset_bytes: int,
+    block_first_line: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
     abs_path = group_path / source_path
     if not abs_path.exists():
         return None
     if str(abs_path.name).endswith(".gz"):
+        if block_first_line is not None and block_first_line > 0:
+            obj = _read_line_from_block(
+                abs_path,
+                block_offset=int(offset_bytes or 0),
+                index_in_block=int(line_no or 0) - int(block_first_line),
+            )
+            if obj is not None:
+                return obj
         current_line = 0
         for raw_line in iter_source_lines(abs_path):
             current_line += 1
@@ -490,17 +785,35 @@ def _read_event_from_source(group_path: Path, *, source_path: str, line_no: int,
     return None
 
 
+_EVENT_LOCATION_COLUMNS = "e.source_path, e.line_no, e.offset_bytes, b.first_line_no"
+_EVENT_LOCATION_FROM = (
+    "FROM events e LEFT JOIN source_blocks b "
+    "ON b.source_path = e.source_path AND b.block_offset = e.offset_bytes"
+)
+
+
+def compressed_source_block_offsets(ledger_path: Path, source_path: str) -> list[int]:
+    """Return the indexed gzip member offsets of a compressed source, oldest first."""
+    wanted = str(source_path or "").strip()
+    if not wanted:
+        return []
+    catch_up_ledger_index(ledger_path)
+    with _index_connection(ledger_path) as conn:
+        rows = conn.execute(
+            "SELECT block_offset FROM source_blocks WHERE source_path = ? ORDER BY block_offset ASC",
+            (wanted,),
+        ).fetchall()
+    return [int(row[0] or 0) for row in rows]
+
+
 def lookup_event_by_id(ledger_path: Path, event_id: str) -> Optional[Dict[str, Any]]:
     wanted = str(event_id or "").strip()
     if not wanted:
         return None
     catch_up_ledger_index(ledger_path)
-    index_path = _index_path_for_ledger(ledger_path)
-    conn = _connect(index_path)
-    try:
-        _ensure_schema(conn)
+    with _index_connection(ledger_path) as conn:
         row = conn.execute(
-            "SELECT source_path, line_no, offset_bytes FROM events WHERE event_id = ?",
+            f"SELECT {_EVENT_LOCATION_COLUMNS} {_EVENT_LOCATION_FROM} WHERE e.event_id = ?",
             (wanted,),
         ).fetchone()
         if row is None:
@@ -508,9 +821,37 @@ def lookup_event_by_id(ledger_path: Path, event_id: str) -> Optional[Dict[str, A
         source_path = str(row[0] or "").strip()
         line_no = int(row[1] or 0)
         offset_bytes = int(row[2] or 0)
-    finally:
-        conn.close()
-    return _read_event_from_source(ledger_path.parent, source_path=source_path, line_no=line_no, offset_bytes=offset_bytes)
+        block_first_line = int(row[3]) if row[3] is not None else None
+    return _read_event_from_source(
+        ledger_path.parent,
+        source_path=source_path,
+        line_no=line_no,
+        offset_bytes=offset_bytes,
+        block_first_line=block_first_line,
+    )
+
+
+def resolve_event_id_indexed(ledger_path: Path, event_id: str) -> str:
+    """Resolve an exact id or a unique id prefix via the events primary key.
+
+    Returns "" when nothing matches or the prefix is ambiguous.
+    """
+    wanted = str(event_id or "").strip()
+    if not wanted:
+        return ""
+    catch_up_ledger_index(ledger_path)
+    with _index_connection(ledger_path) as conn:
+        row = conn.execute("SELECT event_id FROM events WHERE event_id = ?", (wanted,)).fetchone()
+        if row is not None:
+            return str(row[0] or "").strip()
+        # Range scan on the primary key: every id starting with `wanted` sorts in [wanted, wanted + U+10FFFF).
+        rows = conn.execute(
+            "SELECT event_id FROM events WHERE event_id >= ? AND event_id < ? ORDER BY event_id LIMIT 2",
+            (wanted, wanted + "\U0010ffff"),
+        ).fetchall()
+    if len(rows) != 1:
+        return ""
+    return str(rows[0][0] or "").strip()
 
 
 def lookup_events_by_ids(ledger_path: Path, event_ids: list[str]) -> list[Optional[Dict[str, Any]]]:
@@ -523,17 +864,12 @@ def lookup_events_by_ids(ledger_path: Path, event_ids: list[str]) -> list[Option
         return [None for _ in wanted_ids]
 
     catch_up_ledger_index(ledger_path)
-    index_path = _index_path_for_ledger(ledger_path)
-    conn = _connect(index_path)
-    try:
-        _ensure_schema(conn)
+    with _index_connection(ledger_path) as conn:
         placeholders = ", ".join("?" for _ in unique_ids)
         rows = conn.execute(
-            f"SELECT event_id, source_path, line_no, offset_bytes FROM events WHERE event_id IN ({placeholders})",
+            f"SELECT e.event_id, {_EVENT_LOCATION_COLUMNS} {_EVENT_LOCATION_FROM} WHERE e.event_id IN ({placeholders})",
             tuple(unique_ids),
         ).fetchall()
-    finally:
-        conn.close()
 
     found: dict[str, Optional[Dict[str, Any]]] = {}
     for row in rows:
@@ -548,6 +884,7 @@ def lookup_events_by_ids(ledger_path: Path, event_ids: list[str]) -> list[Option
             source_path=source_path,
             line_no=line_no,
             offset_bytes=offset_bytes,
+            block_first_line=int(row[4]) if row[4] is not None else None,
         )
     return [found.get(event_id) if event_id else None for event_id in wanted_ids]
 
@@ -558,10 +895,7 @@ def has_chat_ack_indexed(ledger_path: Path, *, event_id: str, actor_id: str) ->
     if not wanted:
         return False
     catch_up_ledger_index(ledger_path)
-    index_path = _index_path_for_ledger(ledger_path)
-    conn = _connect(index_path)
-    try:
-        _ensure_schema(conn)
+    with _index_connection(ledger_path) as conn:
         if actor:
             row = conn.execute(
                 "SELECT 1 FROM chat_ack WHERE event_id = ? AND actor_id = ? LIMIT 1",
@@ -573,8 +907,26 @@ def has_chat_ack_indexed(ledger_path: Path, *, event_id: str, actor_id: str) ->
                 (wanted,),
             ).fetchone()
         return row is not None
-    finally:
-        conn.close()
+
+
+def _fts_phrase(query: str) -> str:
+    # Quote the whole query as one phrase: with the trigram tokenizer this is a plain
+    # substring match, so FTS results agree with the LIKE fallback. A trailing "*"
+    # (prefix syntax) is redundant for substring matching and is dropped.
+    text = str(query or "").strip().rstrip("*").strip()
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _search_uses_fts(conn: sqlite3.Connection, query_lower: str) -> bool:
+    if len(str(query_lower or "").strip().rstrip("*").strip()) < _FTS_MIN_QUERY_CHARS:
+        return False
+    return _meta_text(conn, "search_backend") == "fts5"
+
+
+def ledger_search_backend(ledger_path: Path) -> str:
+    """Text search backend in use for this ledger's index ("fts5" or "like")."""
+    with _index_connection(ledger_path) as conn:
+        return _meta_text(conn, "search_backend") or "like"
 
 
 def search_event_ids_indexed(
@@ -586,12 +938,16 @@ def search_event_ids_indexed(
     before_id: str = "",
     after_id: str = "",
     limit: int = 50,
+    order: str = "time",
 ) -> tuple[list[str], bool]:
+    """Return matching event ids plus a has_more flag.
+
+    order="time" pages chronologically (before_id/after_id anchors). order="relevance"
+    ranks text matches by bm25 when the FTS5 backend is active and ignores anchors;
+    it behaves like "time" otherwise.
+    """
     catch_up_ledger_index(ledger_path)
-    index_path = _index_path_for_ledger(ledger_path)
-    conn = _connect(index_path)
-    try:
-        _ensure_schema(conn)
+    with _index_connection(ledger_path) as conn:
         params: list[Any] = []
         where: list[str] = []
         if allowed_kinds:
@@ -601,11 +957,36 @@ def search_event_ids_indexed(
             where.append("by_actor = ?")
             params.append(str(by_filter or "").strip())
         query_lower = str(query or "").strip().lower()
-        join_sql = ""
+        from_sql = "events"
+        from_params: list[Any] = []
+        use_fts = bool(query_lower) and _search_uses_fts(conn, query_lower)
         if query_lower:
-            join_sql = "JOIN event_search es ON es.event_id = events.event_id"
-            where.append("es.searchable_text LIKE ?")
-            params.append(f"%{query_lower}%")
+            if use_fts:
+                # Drive the query from the FTS match set (CROSS JOIN pins sqlite's join
+                # order); starting from events and probing MATCH per row is a full scan.
+                from_sql = (
+                    f"(SELECT rowid AS fts_rowid, rank AS fts_rank FROM {_FTS_TABLE} WHERE {_FTS_TABLE} MATCH ?) fts "
+                    "CROSS JOIN event_search es ON es.rowid = fts.fts_rowid "
+                    "CROSS JOIN events ON events.event_id = es.event_id"
+                )
+                from_params.append(_fts_phrase(query_lower))
+            else:
+                from_sql = "events JOIN event_search es ON es.event_id = events.event_id"
+                where.append("es.searchable_text LIKE ?")
+                params.append(f"%{query_lower}%")
+        params = [*from_params, *params]
+
+        if use_fts and str(order or "").strip().lower() == "relevance":
+            where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+            sql = (
+                f"SELECT events.event_id FROM {from_sql} {where_sql} "
+                "ORDER BY fts.fts_rank, events.ts DESC, events.source_seq DESC, events.line_no DESC "
+                "LIMIT ?"
+            )
+            rows = conn.execute(sql, (*params, max(1, int(limit or 50)) + 1)).fetchall()
+            event_ids = [str(row[0] or "").strip() for row in rows if str(row[0] or "").strip()]
+            has_more = len(event_ids) > max(1, int(limit or 50))
+            return event_ids[: max(1, int(limit or 50))], has_more
 
         anchor_id = str(before_id or after_id or "").strip()
         comparator = ""
@@ -632,7 +1013,7 @@ def search_event_ids_indexed(
 
         where_sql = ("WHERE " + " AND ".join(where)) if where else ""
         sql = (
-            f"SELECT events.event_id FROM events {join_sql} {where_sql} "
+            f"SELECT events.event_id FROM {from_sql} {where_sql} "
             f"ORDER BY events.ts {order_dir}, events.source_seq {order_dir}, events.line_no {order_dir} "
             "LIMIT ?"
         )
@@ -644,5 +1025,3 @@ def search_event_ids_indexed(
         if before_id:
             event_ids.reverse()
         return event_ids, has_more
-    finally:
-        conn.close()
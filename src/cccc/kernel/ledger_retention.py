@@ -12,6 +12,8 @@ from ..util.time import parse_utc_iso, utc_now_iso
 from .group import Group
 from .ledger import read_last_lines
 from .ledger_state_snapshot import build_state_payload, current_ledger_basis
+from .ledger_tail_cache import invalidate_ledger_tail_cache
+from .ledger_unread_index import rebase_unread_index_after_rotation
 from .ledger_segments import (
     compress_sealed_segments,
     ensure_ledger_layout,
@@ -131,6 +133,12 @@ def compact(group: Group, *, reason: str = "auto", force: bool = False) -> Dict[
     lk = acquire_lockfile(lock, blocking=True)
     try:
         rotation = rotate_active_ledger(group.path, reason=reason)
+        if bool(rotation.get("rotated")):
+            invalidate_ledger_tail_cache(group.ledger_path)
+            try:
+                rebase_unread_index_after_rotation(group, segment=rotation.get("segment") or {})
+            except Exception:
+                pass
         compressed = compress_sealed_segments(
             group.path,
             keep_recent=max(0, int(cfg.keep_recent_segments_uncompressed or 0)),
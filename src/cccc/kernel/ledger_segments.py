@@ -4,6 +4,7 @@ import gzip
 import json
 import os
 import re
+import zlib
 from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
@@ -15,6 +16,11 @@ from ..util.fs import atomic_write_json
 _MANIFEST_SCHEMA = 1
 ACTIVE_SOURCE_SEQ = 1_000_000_000
 _SEGMENT_FILE_RE = re.compile(r"^ledger\.(?P<stamp>\d{8}T\d{6}Z)\.(?P<seq>\d{6})\.jsonl(?P<gz>\.gz)?$")
+# Sealed segments are compressed as a series of independent gzip members, each
+# holding whole lines. The result is still a valid .gz file for any reader, while
+# the ledger index can seek to a single member instead of inflating the segment.
+_GZIP_BLOCK_BYTES = 256 * 1024
+_GZIP_READ_CHUNK = 1024 * 1024
 
 
 def _stamp() -> str:
@@ -312,12 +318,7 @@ def compress_sealed_segments(
         dst_rel = rel_path + ".gz"
         dst = group_path / dst_rel
         dst.parent.mkdir(parents=True, exist_ok=True)
-        with src.open("rb") as in_handle, gzip.open(dst, "wb", compresslevel=6) as out_handle:
-            while True:
-                chunk = in_handle.read(1024 * 1024)
-                if not chunk:
-                    break
-                out_handle.write(chunk)
+        block_count = _write_block_gzip(src, dst)
         try:
             size_bytes = int(dst.stat().st_size)
         except Exception:
@@ -326,6 +327,7 @@ def compress_sealed_segments(
         item["path"] = dst_rel
         item["compressed"] = True
         item["size_bytes"] = size_bytes
+        item["block_count"] = block_count
         compressed.append(str(item.get("id") or rel_path))
     manifest["segments"] = segments
     manifest["updated_at"] = _stamp()
@@ -333,6 +335,86 @@ def compress_sealed_segments(
     return {"compressed_segments": compressed, "count": len(compressed)}
 
 
+def _write_block_gzip(src: Path, dst: Path) -> int:
+    """Compress src into dst as independent gzip members of whole lines."""
+    blocks = 0
+    pending: List[bytes] = []
+    pending_bytes = 0
+    with src.open("rb") as in_handle, dst.open("wb") as out_handle:
+        for raw_line in in_handle:
+            pending.append(raw_line)
+            pending_bytes += len(raw_line)
+            if pending_bytes < _GZIP_BLOCK_BYTES:
+                continue
+            out_handle.write(gzip.compress(b"".join(pending), compresslevel=6, mtime=0))
+            blocks += 1
+            pending = []
+            pending_bytes = 0
+        if pending or blocks == 0:
+            out_handle.write(gzip.compress(b"".join(pending), compresslevel=6, mtime=0))
+            blocks += 1
+    return blocks
+
+
+def iter_gzip_member_lines(path: Path) -> Iterator[tuple[int, bytes]]:
+    """Yield (member_offset, raw_line) for every line of a gzip file.
+
+    member_offset is the compressed byte offset of the gzip member the line
+    belongs to. Single-stream files report every line at offset 0.
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        member_offset = 0
+        consumed = 0
+        decompressor = zlib.decompressobj(wbits=31)
+        pending = b""
+        raw = b""
+        while True:
+            if not raw:
+                raw = handle.read(_GZIP_READ_CHUNK)
+                if not raw:
+                    break
+            try:
+                data = decompressor.decompress(raw)
+            except zlib.error:
+                break
+            pending += data
+            if decompressor.eof:
+                rest = decompressor.unused_data
+                consumed += len(raw) - len(rest)
+                raw = rest
+            else:
+                consumed += len(raw)
+                raw = b""
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield member_offset, line + b"\n"
+            if decompressor.eof:
+                if pending:
+                    yield member_offset, pending
+                    pending = b""
+                member_offset = consumed
+                decompressor = zlib.decompressobj(wbits=31)
+        if pending:
+            yield member_offset, pending
+
+
+def read_gzip_member(path: Path, offset: int) -> bytes:
+    """Decompress the single gzip member starting at offset."""
+    out: List[bytes] = []
+    with path.open("rb") as handle:
+        handle.seek(max(0, int(offset or 0)))
+        decompressor = zlib.decompressobj(wbits=31)
+        while not decompressor.eof:
+            raw = handle.read(_GZIP_READ_CHUNK)
+            if not raw:
+                break
+            out.append(decompressor.decompress(raw))
+    return b"".join(out)
+
+
 def open_ledger_source_text(path: Path):
     if str(path.name).endswith(".gz"):
         return gzip.open(path, "rt", encoding="utf-8", errors="replace")
@@ -71,13 +71,9 @@ def _read_state_file(path: Path) -> Dict[str, Any]:
 
 def build_state_payload(group: Group) -> Dict[str, Any]:
     context = ContextStorage(group)
-    unread_index = _read_state_file(group.path / "state" / "unread_index.json")
-    if unread_index:
-        unread_index["ledger_basis"] = current_ledger_basis(group)
     return {
         "version_state": context.load_version_state(),
         "cursors": _read_state_file(group.path / "state" / "read_cursors.json"),
-        "unread_index": unread_index,
     }
 
 
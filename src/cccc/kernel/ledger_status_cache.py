@@ -316,67 +316,86 @@ def _apply_reply_update(conn: sqlite3.Connection, event_id: str, actor_id: str)
     )
 
 
-def update_message_status_cache_on_append(event: Dict[str, Any]) -> None:
-    group_id = str(event.get("group_id") or "").strip()
+_STATUS_EVENT_KINDS = {"chat.message", "chat.read", "chat.ack"}
+
+
+def _apply_event_status_update(conn: sqlite3.Connection, group: Group, event: Dict[str, Any]) -> None:
     kind = str(event.get("kind") or "").strip()
-    if not group_id or kind not in {"chat.message", "chat.read", "chat.ack"}:
-        return
-    group = load_group(group_id)
-    if group is None:
-        return
-    conn = _connect(_status_index_path(group))
-    try:
-        _ensure_schema(conn)
-        data = event.get("data") if isinstance(event.get("data"), dict) else {}
-        if kind == "chat.message":
-            read_status: Dict[str, bool] = {}
-            ack_status: Dict[str, bool] = {}
-            obligation_status: Dict[str, Dict[str, bool]] = {}
-            recipients = _recipient_actor_ids(group, event)
-            is_attention = str(data.get("priority") or "normal").strip() == "attention"
-            reply_required = bool(data.get("reply_required") is True)
-            for actor_id in recipients:
-                read_status[actor_id] = False
-                if is_attention:
-                    ack_status[actor_id] = False
-                obligation_status[actor_id] = {
-                    "read": False,
-                    "acked": not is_attention,
-                    "replied": False,
-                    "reply_required": reply_required,
-                }
-            _write_event_status_rows(
-                conn,
-                group,
-                event,
-                read_status=read_status,
-                ack_status=ack_status,
-                obligation_status=obligation_status,
-            )
-            reply_to = str(data.get("reply_to") or "").strip()
-            by = str(event.get("by") or "").strip()
-            if reply_to and by:
-                _apply_reply_update(conn, reply_to, by)
-        elif kind == "chat.read":
-            actor_id = str(data.get("actor_id") or "").strip()
-            event_id = str(data.get("event_id") or "").strip()
-            if actor_id and event_id:
-                _apply_read_update(conn, event_id, actor_id)
-        elif kind == "chat.ack":
-            actor_id = str(data.get("actor_id") or "").strip()
-            event_id = str(data.get("event_id") or "").strip()
-            if actor_id and event_id:
-                _apply_ack_update(conn, event_id, actor_id)
-        _prune(conn)
-        conn.commit()
-        logger.debug(
-            "ledger_status_cache_write group_id=%s kind=%s event_id=%s",
-            group_id,
-            kind,
-            str(event.get("id") or "").strip(),
+    data = event.get("data") if isinstance(event.get("data"), dict) else {}
+    if kind == "chat.message":
+        read_status: Dict[str, bool] = {}
+        ack_status: Dict[str, bool] = {}
+        obligation_status: Dict[str, Dict[str, bool]] = {}
+        recipients = _recipient_actor_ids(group, event)
+        is_attention = str(data.get("priority") or "normal").strip() == "attention"
+        reply_required = bool(data.get("reply_required") is True)
+        for actor_id in recipients:
+            read_status[actor_id] = False
+            if is_attention:
+                ack_status[actor_id] = False
+            obligation_status[actor_id] = {
+                "read": False,
+                "acked": not is_attention,
+                "replied": False,
+                "reply_required": reply_required,
+            }
+        _write_event_status_rows(
+            conn,
+            group,
+            event,
+            read_status=read_status,
+            ack_status=ack_status,
+            obligation_status=obligation_status,
         )
-    finally:
-        conn.close()
+        reply_to = str(data.get("reply_to") or "").strip()
+        by = str(event.get("by") or "").strip()
+        if reply_to and by:
+            _apply_reply_update(conn, reply_to, by)
+    elif kind == "chat.read":
+        actor_id = str(data.get("actor_id") or "").strip()
+        event_id = str(data.get("event_id") or "").strip()
+        if actor_id and event_id:
+            _apply_read_update(conn, event_id, actor_id)
+    elif kind == "chat.ack":
+        actor_id = str(data.get("actor_id") or "").strip()
+        event_id = str(data.get("event_id") or "").strip()
+        if actor_id and event_id:
+            _apply_ack_update(conn, event_id, actor_id)
+
+
+def update_message_status_cache_on_append(event: Dict[str, Any]) -> None:
+    update_message_status_cache_on_append_batch([event])
+
+
+def update_message_status_cache_on_append_batch(events: List[Dict[str, Any]]) -> None:
+    """Apply appended events to the status cache, one transaction per group."""
+    by_group: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        group_id = str(event.get("group_id") or "").strip()
+        kind = str(event.get("kind") or "").strip()
+        if not group_id or kind not in _STATUS_EVENT_KINDS:
+            continue
+        by_group.setdefault(group_id, []).append(event)
+    for group_id, group_events in by_group.items():
+        group = load_group(group_id)
+        if group is None:
+            continue
+        conn = _connect(_status_index_path(group))
+        try:
+            _ensure_schema(conn)
+            for event in group_events:
+                _apply_event_status_update(conn, group, event)
+            _prune(conn)
+            conn.commit()
+            for event in group_events:
+                logger.debug(
+                    "ledger_status_cache_write group_id=%s kind=%s event_id=%s",
+                    group_id,
+                    str(event.get("kind") or "").strip(),
+                    str(event.get("id") or "").strip(),
+                )
+        finally:
+            conn.close()
 
 
 def warm_message_status_cache_from_event(group: Group, event_id: str) -> None:
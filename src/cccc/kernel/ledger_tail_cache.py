@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from .inbox import iter_events_reverse
+
+# Parsed events kept per ledger. Sized for the largest tail consumer (memory auto-summary).
+TAIL_CAPACITY = 4000
+# Raw ledger bytes the kept events may add up to per ledger, so a tail of large events
+# (a line may be up to MAX_EVENT_BYTES) stays bounded well below TAIL_CAPACITY of them.
+TAIL_MAX_BYTES = 4 * 1024 * 1024
+_MAX_CACHED_LEDGERS = 64
+# A ledger line is capped at MAX_EVENT_BYTES (256k); look back a little further for its start.
+_LINE_LOOKBACK_BYTES = 300_000
+
+
+class _LedgerTail:
+    """The newest parsed events of one ledger (at most TAIL_CAPACITY events and about
+    TAIL_MAX_BYTES of ledger lines) plus the active-file position they cover."""
+
+    __slots__ = ("lock", "events", "sizes", "bytes", "ids", "inode", "end_offset", "complete")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.events: Deque[Dict[str, Any]] = deque()
+        # Raw line length of each event in `events`, and their sum.
+        self.sizes: Deque[int] = deque()
+        self.bytes = 0
+        self.ids: set[str] = set()
+        self.inode = -1
+        self.end_offset = -1
+        self.complete = False
+
+    def push(self, event: Dict[str, Any], size: int) -> None:
+        """Append an event whose ledger line is `size` bytes, evicting the oldest over budget."""
+        event_id = str(event.get("id") or "")
+        if event_id and event_id in self.ids:
+            return
+        size = max(0, int(size))
+        # The newest event is always kept, even when it alone exceeds the byte budget.
+        while self.events and (len(self.events) >= TAIL_CAPACITY or self.bytes + size > TAIL_MAX_BYTES):
+            dropped = self.events.popleft()
+            self.bytes -= self.sizes.popleft()
+            self.ids.discard(str(dropped.get("id") or ""))
+            self.complete = False
+        self.events.append(event)
+        self.sizes.append(size)
+        self.bytes += size
+        if event_id:
+            self.ids.add(event_id)
+
+
+_CACHES: "OrderedDict[str, _LedgerTail]" = OrderedDict()
+_CACHES_LOCK = threading.Lock()
+
+
+def _cache_for(ledger_path: Path, *, create: bool) -> Optional[_LedgerTail]:
+    key = str(ledger_path)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is not None:
+            _CACHES.move_to_end(key)
+            return cache
+        if not create:
+            return None
+        cache = _LedgerTail()
+        _CACHES[key] = cache
+        while len(_CACHES) > _MAX_CACHED_LEDGERS:
+            _CACHES.popitem(last=False)
+        return cache
+
+
+def _line_start_before(path: Path, offset: int) -> int:
+    """Offset of the first byte of the line containing offset - 1 (0 at file start)."""
+    if offset <= 0:
+        return 0
+    start = max(0, offset - _LINE_LOOKBACK_BYTES)
+    with path.open("rb") as handle:
+        handle.seek(start, os.SEEK_SET)
+        chunk = handle.read(offset - start)
+    cut = chunk.rfind(b"\n", 0, max(0, len(chunk) - 1))
+    return start + cut + 1 if cut >= 0 else start
+
+
+def _read_delta(cache: _LedgerTail, ledger_path: Path, size: int) -> None:
+    with ledger_path.open("rb") as handle:
+        handle.seek(cache.end_offset, os.SEEK_SET)
+        chunk = handle.read(size - cache.end_offset)
+    cut = chunk.rfind(b"\n") + 1
+    for raw_line in chunk[:cut].split(b"\n"):
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line.decode("utf-8", errors="replace"))
+        except Exception:
+            continue
+        if isinstance(obj, dict):
+            cache.push(obj, len(line))
+    cache.end_offset += cut
+
+
+def _reload(cache: _LedgerTail, ledger_path: Path, inode: int, size: int) -> None:
+    newest_first: List[Dict[str, Any]] = []
+    sizes: List[int] = []
+    total = 0
+    complete = True
+    for event in iter_events_reverse(ledger_path):
+        # The reverse reader yields parsed events only; re-encode to estimate the line length.
+        event_size = len(json.dumps(event, ensure_ascii=False).encode("utf-8", errors="replace"))
+        if newest_first and (len(newest_first) >= TAIL_CAPACITY or total + event_size > TAIL_MAX_BYTES):
+            complete = False
+            break
+        newest_first.append(event)
+        sizes.append(event_size)
+        total += event_size
+    cache.events = deque(reversed(newest_first))
+    cache.sizes = deque(reversed(sizes))
+    cache.bytes = total
+    cache.ids = {str(ev.get("id") or "") for ev in cache.events if str(ev.get("id") or "")}
+    cache.complete = complete
+    cache.inode = inode
+    # The reverse read may have seen lines appended after the stat; re-reading the
+    # last line boundary onward is harmless because push() skips known ids.
+    cache.end_offset = _line_start_before(ledger_path, size)
+    if size > cache.end_offset:
+        _read_delta(cache, ledger_path, size)
+
+
+def _refresh(cache: _LedgerTail, ledger_path: Path) -> None:
+    try:
+        st = ledger_path.stat()
+        inode = int(getattr(st, "st_ino", -1) or -1)
+        size = int(st.st_size)
+    except FileNotFoundError:
+        inode, size = -1, 0
+    if cache.end_offset >= 0 and inode == cache.inode and size == cache.end_offset:
+        return
+    if cache.end_offset >= 0 and inode == cache.inode and size > cache.end_offset:
+        _read_delta(cache, ledger_path, size)
+        return
+    _reload(cache, ledger_path, inode, size)
+
+
+def recent_ledger_events(
+    ledger_path: Path,
+    limit: int,
+    *,
+    kinds: Optional[set[str]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Return the last `limit` events (oldest first), optionally only of `kinds`.
+
+    Served from an in-memory tail that is revalidated with a single stat() and
+    extended by reading only newly appended bytes. Returns None when the cached
+    window cannot answer (limit above TAIL_CAPACITY, or too few matching events
+    in a window that does not reach the start of the ledger, e.g. because large
+    events exhausted TAIL_MAX_BYTES); callers then fall back to reading the ledger. Returned events are deep copies, so callers may
+    mutate them (including nested data) without touching the cache.
+    """
+    limit = int(limit or 0)
+    if limit <= 0:
+        return []
+    if limit > TAIL_CAPACITY:
+        return None
+    cache = _cache_for(ledger_path, create=True)
+    assert cache is not None
+    with cache.lock:
+        try:
+            _refresh(cache, ledger_path)
+        except Exception:
+            cache.end_offset = -1
+            return None
+        out: List[Dict[str, Any]] = []
+        for event in reversed(cache.events):
+            if kinds is not None and str(event.get("kind") or "") not in kinds:
+                continue
+            out.append(event)
+            if len(out) >= limit:
+                break
+        if len(out) < limit and not cache.complete:
+            return None
+    out.reverse()
+    return copy.deepcopy(out)
+
+
+def has_older_ledger_event(ledger_path: Path, before_id: str, *, kinds: set[str]) -> Optional[bool]:
+    """Whether an event of `kinds` precedes `before_id`; None when the cached window cannot tell."""
+    cache = _cache_for(ledger_path, create=False)
+    if cache is None:
+        return None
+    with cache.lock:
+        seen_anchor = False
+        for event in reversed(cache.events):
+            if not seen_anchor:
+                seen_anchor = str(event.get("id") or "") == before_id
+                continue
+            if str(event.get("kind") or "") in kinds:
+                return True
+        if not seen_anchor:
+            return None
+        return False if cache.complete else None
+
+
+def note_ledger_appended(ledger_path: Path, lines: List[tuple[str, int]]) -> None:
+    """Extend a warm tail with lines this process just appended ((line, next_offset_bytes) pairs).
+
+    Only applies when the tail ends exactly where the batch starts; otherwise the next
+    read catches up from the file.
+    """
+    if not lines:
+        return
+    cache = _cache_for(ledger_path, create=False)
+    if cache is None:
+        return
+    first_line, first_end = lines[0]
+    start = int(first_end or 0) - len((first_line + "\n").encode("utf-8", errors="replace"))
+    with cache.lock:
+        if cache.end_offset < 0 or start != cache.end_offset:
+            return
+        for line, _ in lines:
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                cache.push(obj, len(line.encode("utf-8", errors="replace")))
+        cache.end_offset = int(lines[-1][1] or 0)
+
+
+def invalidate_ledger_tail_cache(ledger_path: Optional[Path] = None) -> None:
+    """Forget cached tails (all ledgers when ledger_path is None), e.g. after rotation."""
+    with _CACHES_LOCK:
+        if ledger_path is None:
+            _CACHES.clear()
+        else:
+            _CACHES.pop(str(ledger_path), None)
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..util.time import parse_utc_iso
+from .actors import get_effective_role, is_internal_actor, list_actors
+from .group import Group, load_group
+from .inbox import is_message_for_actor, load_cursors
+from .ledger_index import pooled_state_connection
+from .ledger_segments import iter_source_lines, list_ledger_sources
+from .ledger_state_snapshot import _active_prefix_sha256, can_replay_from_basis, current_ledger_basis
+
+_SCHEMA_VERSION = 1
+_UNREAD_KINDS = ("chat.message", "system.notify")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+logger = logging.getLogger("cccc.ledger.unread_index")
+
+
+def _unread_index_path(group: Group) -> Path:
+    return group.path / "state" / "ledger" / "unread.sqlite3"
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS unread (
+            seq INTEGER PRIMARY KEY,
+            actor_id TEXT NOT NULL,
+            event_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            ts_us INTEGER,
+            UNIQUE (actor_id, event_id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_unread_actor_ts ON unread(actor_id, ts_us);
+        """
+    )
+    if _meta_text(conn, "schema_version") != str(_SCHEMA_VERSION):
+        conn.execute("DELETE FROM unread")
+        conn.execute("DELETE FROM meta")
+        _set_meta(conn, "schema_version", str(_SCHEMA_VERSION))
+    conn.commit()
+
+
+def _connection(group: Group) -> sqlite3.Connection:
+    return pooled_state_connection(_unread_index_path(group), ensure_schema=_ensure_schema)
+
+
+def _meta_text(conn: sqlite3.Connection, key: str) -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (str(key or "").strip(),)).fetchone()
+    return str(row[0] or "") if row is not None else ""
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta(key, value) VALUES(?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+        (str(key or "").strip(), str(value or "")),
+    )
+
+
+def _stored_basis(conn: sqlite3.Connection) -> Dict[str, Any]:
+    try:
+        raw = json.loads(_meta_text(conn, "ledger_basis") or "{}")
+    except Exception:
+        raw = {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def _store_basis(conn: sqlite3.Connection, basis: Dict[str, Any]) -> None:
+    doc = {
+        "segment_ids": [str(item) for item in (basis.get("segment_ids") or [])],
+        "active_size": max(0, int(basis.get("active_size") or 0)),
+        "active_prefix_sha256": str(basis.get("active_prefix_sha256") or ""),
+    }
+    _set_meta(conn, "ledger_basis", json.dumps(doc, sort_keys=True))
+
+
+def _same_basis(stored: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    return (
+        list(stored.get("segment_ids") or []) == list(current.get("segment_ids") or [])
+        and int(stored.get("active_size") or 0) == int(current.get("active_size") or 0)
+        and str(stored.get("active_prefix_sha256") or "") == str(current.get("active_prefix_sha256") or "")
+    )
+
+
+def _ts_us(ts: str) -> Optional[int]:
+    dt = parse_utc_iso(ts) if ts else None
+    if dt is None:
+        return None
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _cursor_ts_us(cursors: Dict[str, Any], actor_id: str) -> Optional[int]:
+    cur = cursors.get(actor_id)
+    return _ts_us(str(cur.get("ts") or "")) if isinstance(cur, dict) else None
+
+
+def _kinds_for_filter(kind_filter: str) -> tuple[str, ...]:
+    if kind_filter == "chat":
+        return ("chat.message",)
+    if kind_filter == "notify":
+        return ("system.notify",)
+    return _UNREAD_KINDS
+
+
+def _topology(group: Group) -> tuple[Dict[str, str], str]:
+    """Actor ids with effective roles, plus a signature over everything visibility depends on."""
+    roles: Dict[str, str] = {}
+    digest = hashlib.sha256()
+    for actor in list_actors(group):
+        actor_id = str(actor.get("id") or "").strip()
+        if not actor_id:
+            continue
+        roles[actor_id] = str(get_effective_role(group, actor_id) or "")
+        digest.update(f"{actor_id}\0{roles[actor_id]}\0{int(is_internal_actor(actor))}\n".encode("utf-8"))
+    return roles, digest.hexdigest()
+
+
+def _apply_events(
+    conn: sqlite3.Connection,
+    group: Group,
+    events: Iterable[Dict[str, Any]],
+    *,
+    roles: Dict[str, str],
+    cursors: Dict[str, Any],
+) -> None:
+    cursor_us = {actor_id: _cursor_ts_us(cursors, actor_id) for actor_id in roles}
+    for event in events:
+        kind = str(event.get("kind") or "")
+        event_id = str(event.get("id") or "").strip()
+        if kind not in _UNREAD_KINDS or not event_id:
+            continue
+        by = str(event.get("by") or "").strip()
+        ts_us = _ts_us(str(event.get("ts") or ""))
+        for actor_id, role in roles.items():
+            if kind == "chat.message" and by == actor_id:
+                continue
+            seen_us = cursor_us.get(actor_id)
+            if seen_us is not None and ts_us is not None and ts_us <= seen_us:
+                continue
+            if not is_message_for_actor(group, actor_id=actor_id, event=event, role=role):
+                continue
+            conn.execute(
+                "INSERT OR IGNORE INTO unread(actor_id, event_id, kind, ts_us) VALUES(?, ?, ?, ?)",
+                (actor_id, event_id, kind, ts_us),
+            )
+
+
+def _parse_lines(lines: Iterable[bytes | str]) -> Iterable[Dict[str, Any]]:
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except Exception:
+            continue
+        if isinstance(obj, dict):
+            yield obj
+
+
+def _read_range(path: Path, start: int, end: int) -> tuple[List[Dict[str, Any]], int]:
+    """Parse whole lines of a plain ledger file in [start, end); returns (events, consumed end offset)."""
+    start = max(0, int(start or 0))
+    if end <= start or not path.exists():
+        return [], start
+    with path.open("rb") as handle:
+        handle.seek(start, os.SEEK_SET)
+        chunk = handle.read(end - start)
+    cut = chunk.rfind(b"\n") + 1
+    return list(_parse_lines(chunk[:cut].split(b"\n"))), start + cut
+
+
+def _rebuild(conn: sqlite3.Connection, group: Group, basis: Dict[str, Any], *, roles: Dict[str, str], cursors: Dict[str, Any]) -> int:
+    conn.execute("DELETE FROM unread")
+    for source in list_ledger_sources(group.path, include_active=False):
+        abs_path = source.get("abs_path")
+        if isinstance(abs_path, Path) and abs_path.exists():
+            _apply_events(conn, group, _parse_lines(iter_source_lines(abs_path)), roles=roles, cursors=cursors)
+    events, consumed = _read_range(group.ledger_path, 0, int(basis.get("active_size") or 0))
+    _apply_events(conn, group, events, roles=roles, cursors=cursors)
+    return consumed
+
+
+def sync_unread_index(group: Group) -> Dict[str, str]:
+    """Bring the unread index up to the current ledger and actor topology.
+
+    The persisted index carries the ledger basis it covers. An unchanged basis costs
+    a stat; a grown active ledger replays only the new bytes; anything else (rotation
+    we did not witness, truncation, actor topology change) rebuilds from the ledger.
+    Returns the actor roles the index was built for.
+    """
+    roles, topology = _topology(group)
+    conn = _connection(group)
+    basis = current_ledger_basis(group)
+    if _meta_text(conn, "topology") == topology and _same_basis(_stored_basis(conn), basis):
+        return roles
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        stored = _stored_basis(conn)
+        cursors = load_cursors(group)
+        if _meta_text(conn, "topology") == topology and stored and can_replay_from_basis(stored, basis):
+            events, consumed = _read_range(
+                group.ledger_path,
+                int(stored.get("active_size") or 0),
+                int(basis.get("active_size") or 0),
+            )
+            _apply_events(conn, group, events, roles=roles, cursors=cursors)
+        elif _meta_text(conn, "topology") != topology or not _same_basis(stored, basis):
+            consumed = _rebuild(conn, group, basis, roles=roles, cursors=cursors)
+            logger.debug("ledger_unread_index_rebuild group_id=%s actors=%d", group.group_id, len(roles))
+        else:
+            consumed = int(basis.get("active_size") or 0)
+        _set_meta(conn, "topology", topology)
+        _store_basis(conn, {**basis, "active_size": consumed})
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return roles
+
+
+def update_unread_index_on_append_batch(
+    ledger_path: Path,
+    entries: List[tuple[Dict[str, Any], int]],
+    *,
+    group: Optional[Group] = None,
+) -> None:
+    """Apply events just appended to the active ledger (no-op until the index exists).
+
+    Each entry is (event, next_offset_bytes). Pass the group the appender already has
+    loaded to avoid reloading it. When the index is exactly caught up to the first
+    event's line the events are applied from memory; otherwise (another writer got in
+    between, or the ledger rotated) the index resyncs from the file.
+    """
+    entries = [(event, offset) for event, offset in entries if str(event.get("kind") or "") in _UNREAD_KINDS]
+    if not entries:
+        return
+    if group is None:
+        group = load_group(str(entries[0][0].get("group_id") or ""))
+    if group is None or group.path / "ledger.jsonl" != ledger_path or not _unread_index_path(group).exists():
+        return
+    first_event, first_end = entries[0]
+    first_len = len((json.dumps(first_event, ensure_ascii=False) + "\n").encode("utf-8", errors="replace"))
+    start = max(0, int(first_end or 0) - first_len)
+    end = int(entries[-1][1] or 0)
+    roles, topology = _topology(group)
+    conn = _connection(group)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        stored = _stored_basis(conn)
+        if _meta_text(conn, "topology") != topology or not stored or int(stored.get("active_size") or 0) != start:
+            conn.rollback()
+            sync_unread_index(group)
+            return
+        # Events appended just now are newer than every read cursor, and queries filter
+        # by cursor anyway, so the cursors file is not consulted here.
+        _apply_events(conn, group, [event for event, _ in entries], roles=roles, cursors={})
+        basis = dict(stored)
+        basis["active_size"] = end
+        if start < 4096:
+            basis["active_prefix_sha256"] = current_ledger_basis(group).get("active_prefix_sha256")
+        _store_basis(conn, basis)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def rebase_unread_index_after_rotation(group: Group, *, segment: Dict[str, Any]) -> None:
+    """Carry the index across a ledger rotation (the caller holds the ledger lock).
+
+    Rotation moves the active ledger verbatim into a new sealed segment, so an index
+    that covered a prefix of that file only needs the rest of the segment replayed.
+    Must run before the segment is compressed. Anything else is left to the next sync.
+    """
+    if not _unread_index_path(group).exists():
+        return
+    roles, topology = _topology(group)
+    conn = _connection(group)
+    basis = current_ledger_basis(group)
+    segment_ids = list(basis.get("segment_ids") or [])
+    segment_path = group.path / str(segment.get("path") or "")
+    rotated = {
+        "segment_ids": segment_ids[:-1],
+        "active_size": max(0, int(segment.get("size_bytes") or 0)),
+        "active_prefix_sha256": _active_prefix_sha256(segment_path),
+    }
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        stored = _stored_basis(conn)
+        if (
+            not stored
+            or not segment_ids
+            or segment_ids[-1] != str(segment.get("id") or "")
+            or _meta_text(conn, "topology") != topology
+            or not can_replay_from_basis(stored, rotated)
+        ):
+            conn.rollback()
+            return
+        events, _ = _read_range(segment_path, int(stored.get("active_size") or 0), int(rotated["active_size"]))
+        _apply_events(conn, group, events, roles=roles, cursors=load_cursors(group))
+        _store_basis(conn, basis)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def prune_unread_index_for_cursor(group: Group, actor_id: str, *, ts: str) -> None:
+    """Drop index rows the actor's read cursor now covers."""
+    ts_us = _ts_us(ts)
+    if ts_us is None:
+        return
+    path = _unread_index_path(group)
+    if not path.exists():
+        return
+    conn = _connection(group)
+    conn.execute(
+        "DELETE FROM unread WHERE actor_id = ? AND ts_us IS NOT NULL AND ts_us <= ?",
+        (str(actor_id or ""), ts_us),
+    )
+    conn.commit()
+
+
+def _unread_where(actor_id: str, kinds: tuple[str, ...], cursor_us: Optional[int]) -> tuple[str, tuple[Any, ...]]:
+    placeholders = ", ".join("?" for _ in kinds)
+    where = f"actor_id = ? AND kind IN ({placeholders})"
+    params: tuple[Any, ...] = (actor_id, *kinds)
+    if cursor_us is not None:
+        where += " AND (ts_us IS NULL OR ts_us > ?)"
+        params += (cursor_us,)
+    return where, params
+
+
+def indexed_unread_counts(group: Group, actor_ids: List[str], *, kind_filter: str = "all") -> Optional[Dict[str, int]]:
+    """Unread counts per actor, or None when an actor is not covered by the index."""
+    roles = sync_unread_index(group)
+    if any(actor_id not in roles for actor_id in actor_ids):
+        return None
+    kinds = _kinds_for_filter(kind_filter)
+    cursors = load_cursors(group)
+    conn = _connection(group)
+    out: Dict[str, int] = {}
+    for actor_id in actor_ids:
+        where, params = _unread_where(actor_id, kinds, _cursor_ts_us(cursors, actor_id))
+        row = conn.execute(f"SELECT COUNT(*) FROM unread WHERE {where}", params).fetchone()
+        out[actor_id] = int(row[0] or 0) if row is not None else 0
+    return out
+
+
+def indexed_unread_event_ids(
+    group: Group,
+    actor_id: str,
+    *,
+    kind_filter: str = "all",
+    limit: int = 0,
+    newest_first: bool = False,
+) -> Optional[List[str]]:
+    """Unread event ids in ledger order, or None when the actor is not covered by the index."""
+    roles = sync_unread_index(group)
+    if actor_id not in roles:
+        return None
+    where, params = _unread_where(actor_id, _kinds_for_filter(kind_filter), _cursor_ts_us(load_cursors(group), actor_id))
+    sql = f"SELECT event_id FROM unread WHERE {where} ORDER BY seq {'DESC' if newest_first else 'ASC'}"
+    if limit > 0:
+        sql += " LIMIT ?"
+        params += (int(limit),)
+    rows = _connection(group).execute(sql, params).fetchall()
+    return [str(row[0]) for row in rows]
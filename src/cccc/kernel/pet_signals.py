@@ -7,6 +7,7 @@ from ..util.time import parse_utc_iso, utc_now_iso
 from .actors import find_foreman
 from .inbox import get_obligation_status_batch
 from .ledger_index import lookup_events_by_ids, search_event_ids_indexed
+from .ledger_tail_cache import recent_ledger_events
 
 if TYPE_CHECKING:
     from .group import Group
@@ -20,6 +21,12 @@ _RECENT_CONTEXT_SYNC_LIMIT = 120
 
 def _iter_recent_chat_events(group: Group, *, limit: int = _RECENT_CHAT_LIMIT) -> Iterable[Dict[str, Any]]:
     remaining = max(1, int(limit or _RECENT_CHAT_LIMIT))
+    cached = recent_ledger_events(group.ledger_path, remaining, kinds={"chat.message"})
+    if cached is not None:
+        # Same page order as the index walk below: newest page first, each page oldest-first.
+        for end in range(len(cached), 0, -_RECENT_PAGE_SIZE):
+            yield from cached[max(0, end - _RECENT_PAGE_SIZE) : end]
+        return
     before_id = ""
     while remaining > 0:
         page_limit = min(_RECENT_PAGE_SIZE, remaining)
@@ -6,7 +6,8 @@ Supported platforms: Telegram, Slack, Discord, Feishu/Lark, DingTalk, WeCom.
 Each group can bind to one IM bot for remote control and notifications.
 
 Architecture:
-- Bridge runs as independent process per group
+- Bridge runs as independent process per group, or as a bridge host (host.py)
+  serving many groups per platform credential (CCCC_IM_BRIDGE_HOST=1 on autostart)
 - Inbound: IM messages → daemon API (send) → ledger
 - Outbound: ledger events → filter → IM platform
 
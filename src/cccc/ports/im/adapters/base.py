@@ -4,9 +4,197 @@ Base class for IM platform adapters.
 
 from __future__ import annotations
 
+import importlib.util
+import threading
+import time
 from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, TypedDict
+from urllib.parse import urlsplit
+
+import httpx
+
+# Statuses worth retrying: the platform asked us to back off, or a proxy/gateway hiccuped.
+_RETRY_STATUSES = {429, 502, 503, 504}
+# Failures that happen before the request reached the server, so retrying cannot duplicate a send.
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# RemoteProtocolError usually means a pooled keep-alive connection the server closed while
+# idle, but it can also follow a request the server already accepted, so it is retried
+# only for idempotent calls.
+_RETRY_IDEMPOTENT_ERRORS = _RETRY_ERRORS + (httpx.RemoteProtocolError,)
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class IMHttpError(Exception):
+    """HTTP error status from a platform API (mirrors urllib's HTTPError for adapter error paths)."""
+
+    def __init__(self, status: int, body: bytes = b"") -> None:
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = int(status)
+        self.body = body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", "ignore")
+
+
+class IMHttpClient:
+    """
+    Pooled HTTP client shared by every IM adapter in the process.
+
+    Keeps connections to each platform host alive across API calls (HTTP/2 when the
+    optional ``h2`` package is installed), retries connection failures and 429/5xx
+    gateway responses with exponential backoff (honouring Retry-After), and records
+    per-host request timings for status reporting.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = 2,
+        backoff_s: float = 0.5,
+        max_backoff_s: float = 8.0,
+        max_connections: int = 32,
+    ) -> None:
+        self.retries = max(0, int(retries))
+        self.backoff_s = max(0.0, float(backoff_s))
+        self.max_backoff_s = max(0.0, float(max_backoff_s))
+        self._limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(1, int(max_connections)),
+            keepalive_expiry=60.0,
+        )
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                # Built lazily so proxy environment changes made by adapters at connect() apply.
+                self._client = httpx.Client(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=self._limits,
+                    follow_redirects=True,
+                )
+            return self._client
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        content: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+        retries: Optional[int] = None,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        Send a request over the shared pool.
+
+        idempotent: whether repeating the call is harmless (defaults to True for GET/HEAD/
+        OPTIONS). Pass True for read-only POST APIs (e.g. Telegram getUpdates) so they are
+        also retried after a dropped keep-alive connection.
+
+        Raises IMHttpError for HTTP error statuses (after retries) and httpx transport
+        errors when the host stays unreachable.
+        """
+        attempts = 1 + (self.retries if retries is None else max(0, int(retries)))
+        host = urlsplit(url).netloc
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        retry_errors = _RETRY_IDEMPOTENT_ERRORS if idempotent else _RETRY_ERRORS
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                resp = self._get_client().request(
+                    method, url, content=content, params=params, headers=headers, timeout=timeout
+                )
+            except retry_errors:
+                self._record(host, started, status=0, retried=attempt + 1 < attempts)
+                if attempt + 1 >= attempts:
+                    raise
+                time.sleep(self._backoff(attempt, None))
+                continue
+            except Exception:
+                self._record(host, started, status=0, retried=False)
+                raise
+            retry = resp.status_code in _RETRY_STATUSES and attempt + 1 < attempts
+            self._record(host, started, status=resp.status_code, retried=retry)
+            if retry:
+                time.sleep(self._backoff(attempt, resp.headers.get("Retry-After")))
+                continue
+            if resp.status_code >= 400:
+                raise IMHttpError(resp.status_code, resp.content)
+            return resp
+        raise RuntimeError("unreachable")
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = self.backoff_s * (2**attempt)
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except Exception:
+                    pass
+        return min(self.max_backoff_s, max(0.0, delay))
+
+    def _record(self, host: str, started: float, *, status: int, retried: bool) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            entry = self._stats.setdefault(
+                host,
+                {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0, "last_status": 0},
+            )
+            entry["requests"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_status"] = status
+            if status == 0 or status >= 400:
+                entry["errors"] += 1
+            if retried:
+                entry["retries"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request counts and latency (ms) since the client was created."""
+        with self._lock:
+            out: Dict[str, Dict[str, Any]] = {}
+            for host, entry in self._stats.items():
+                item = dict(entry)
+                item["avg_ms"] = round(item["total_ms"] / item["requests"], 1) if item["requests"] else 0.0
+                item["total_ms"] = round(item["total_ms"], 1)
+                item["max_ms"] = round(item["max_ms"], 1)
+                out[host] = item
+            return out
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+_SHARED_HTTP_CLIENT: Optional[IMHttpClient] = None
+_SHARED_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def shared_http_client() -> IMHttpClient:
+    """Return the process-wide pooled client used by IM adapters."""
+    global _SHARED_HTTP_CLIENT
+    with _SHARED_HTTP_CLIENT_LOCK:
+        if _SHARED_HTTP_CLIENT is None:
+            _SHARED_HTTP_CLIENT = IMHttpClient()
+        return _SHARED_HTTP_CLIENT
 
 
 class OutboundStreamHandle(TypedDict):
@@ -28,6 +216,9 @@ class IMAdapter(ABC):
     """
 
     platform: str = "unknown"
+    # How long poll() may block waiting for updates. Only long-polling adapters
+    # (Telegram) block; queue-backed adapters return immediately and ignore it.
+    poll_timeout_s: float = 25.0
 
     def _log(self, msg: str) -> None:
         """Log a message. Subclasses should override with actual logging."""
@@ -122,6 +313,21 @@ class IMAdapter(ABC):
             # Agent to user message
             return f"[{by}] {text}"
 
+    def send_wait_s(self, chat_id: str) -> float:
+        """
+        Seconds until send_message() to chat_id would go out without waiting on the
+        adapter's per-chat rate limiter (0.0 for adapters without one). Does not
+        consume the limiter.
+        """
+        limiter = getattr(self, "_rate_limiter", None)
+        peek = getattr(limiter, "peek", None)
+        if not callable(peek):
+            return 0.0
+        try:
+            return max(0.0, float(peek(str(chat_id))))
+        except Exception:
+            return 0.0
+
     def send_chat_action(self, chat_id: str, action: str = "typing") -> bool:
         """Send a chat action indicator. Default: no-op."""
         return False
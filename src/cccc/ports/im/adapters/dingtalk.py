@@ -19,14 +19,12 @@ import base64
 import json
 import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .base import IMAdapter, OutboundStreamHandle
+from .base import IMAdapter, IMHttpError, OutboundStreamHandle, shared_http_client
 
 # DingTalk API limits
 DINGTALK_MAX_MESSAGE_LENGTH = 4096
@@ -68,6 +66,12 @@ class RateLimiter:
             else:
                 return self.min_interval - elapsed
 
+    def peek(self, chat_id: str) -> float:
+        """Seconds until a send to this chat would not wait (does not acquire)."""
+        with self.lock:
+            elapsed = time.time() - self.last_send.get(chat_id, 0)
+            return max(0.0, self.min_interval - elapsed)
+
     def wait_and_acquire(self, chat_id: str) -> None:
         """Wait if needed, then acquire."""
         wait_time = self.acquire(chat_id)
@@ -176,23 +180,19 @@ class DingTalkAdapter(IMAdapter):
         query = urllib.parse.urlencode(params)
         full_url = f"{url}?{query}"
 
-        req = urllib.request.Request(full_url, method="GET")
-        req.add_header("Accept", "application/json")
-
         try:
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                body = resp.read().decode("utf-8", errors="replace")
-                result = json.loads(body)
-
-                if result.get("errcode") == 0:
-                    self._token = result.get("access_token", "")
-                    expire = int(result.get("expires_in", 7200))
-                    self._token_expires = time.time() + expire
-                    self._log(f"[token] Refreshed, expires in {expire}s")
-                    return True
-                else:
-                    self._log(f"[token] Failed: {result.get('errmsg', 'unknown')}")
-                    return False
+            resp = shared_http_client().request("GET", full_url, headers={"Accept": "application/json"}, timeout=10)
+            result = json.loads(resp.content.decode("utf-8", errors="replace"))
+
+            if result.get("errcode") == 0:
+                self._token = result.get("access_token", "")
+                expire = int(result.get("expires_in", 7200))
+                self._token_expires = time.time() + expire
+                self._log(f"[token] Refreshed, expires in {expire}s")
+                return True
+            else:
+                self._log(f"[token] Failed: {result.get('errmsg', 'unknown')}")
+                return False
         except Exception as e:
             self._log(f"[token] Error: {e}")
             return False
@@ -229,21 +229,14 @@ class DingTalkAdapter(IMAdapter):
                 url = f"{url}{sep}access_token={token}"
             data = json.dumps(body or {}, ensure_ascii=False).encode("utf-8") if body else None
 
-        req = urllib.request.Request(url, data=data, method=method)
-        req.add_header("Content-Type", "application/json; charset=utf-8")
-        req.add_header("Accept", "application/json")
+        headers = {"Content-Type": "application/json; charset=utf-8", "Accept": "application/json"}
 
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                result_body = resp.read().decode("utf-8", errors="replace")
-                return json.loads(result_body)
-        except urllib.error.HTTPError as e:
-            http_status = e.code
-            err_text = ""
-            try:
-                err_text = e.read().decode("utf-8", "ignore")[:300]
-            except Exception:
-                pass
+            resp = shared_http_client().request(method, url, content=data, headers=headers, timeout=timeout)
+            return json.loads(resp.content.decode("utf-8", errors="replace"))
+        except IMHttpError as e:
+            http_status = e.status
+            err_text = e.text[:300]
             self._log(f"[api_old] {method} {endpoint}: HTTP {http_status} - {err_text}")
             return {"errcode": http_status, "errmsg": str(e), "error": err_text}
         except Exception as e:
@@ -275,22 +268,18 @@ class DingTalkAdapter(IMAdapter):
         else:
             data = json.dumps(body or {}, ensure_ascii=False).encode("utf-8") if body else None
 
-        req = urllib.request.Request(url, data=data, method=method)
-        req.add_header("x-acs-dingtalk-access-token", token)
-        req.add_header("Content-Type", "application/json; charset=utf-8")
-        req.add_header("Accept", "application/json")
+        headers = {
+            "x-acs-dingtalk-access-token": token,
+            "Content-Type": "application/json; charset=utf-8",
+            "Accept": "application/json",
+        }
 
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                result_body = resp.read().decode("utf-8", errors="replace")
-                return json.loads(result_body)
-        except urllib.error.HTTPError as e:
-            http_status = e.code
-            err_text = ""
-            try:
-                err_text = e.read().decode("utf-8", "ignore")[:300]
-            except Exception:
-                pass
+            resp = shared_http_client().request(method, url, content=data, headers=headers, timeout=timeout)
+            return json.loads(resp.content.decode("utf-8", errors="replace"))
+        except IMHttpError as e:
+            http_status = e.status
+            err_text = e.text[:300]
             self._log(f"[api_new] {method} {endpoint}: HTTP {http_status} - {err_text}")
             return {"code": http_status, "message": str(e), "error": err_text}
         except Exception as e:
@@ -801,17 +790,16 @@ class DingTalkAdapter(IMAdapter):
             body["at"] = {"atUserIds": cleaned_at_user_ids}
         data = json.dumps(body, ensure_ascii=False).encode('utf-8')
 
-        req = urllib.request.Request(webhook_url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json; charset=utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
 
         try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                result = json.loads(resp.read().decode('utf-8', errors='replace'))
-                if result.get('errcode') == 0:
-                    self._log(f"[webhook] Sent successfully")
-                    return True
-                self._log(f"[webhook] Failed: {result}")
-                return False
+            resp = shared_http_client().request("POST", webhook_url, content=data, headers=headers, timeout=15)
+            result = json.loads(resp.content.decode('utf-8', errors='replace'))
+            if result.get('errcode') == 0:
+                self._log(f"[webhook] Sent successfully")
+                return True
+            self._log(f"[webhook] Failed: {result}")
+            return False
         except Exception as e:
             self._log(f"[webhook] Error: {e}")
             return False
@@ -1080,11 +1068,8 @@ class DingTalkAdapter(IMAdapter):
             raise ValueError(f"Failed to get download URL: {resp}")
 
         # Download file
-        req = urllib.request.Request(download_url, method="GET")
-
         try:
-            with urllib.request.urlopen(req, timeout=30) as r:
-                return r.read()
+            return shared_http_client().request("GET", download_url, timeout=30).content
         except Exception as e:
             raise ValueError(f"Download failed: {e}")
 
@@ -1141,12 +1126,11 @@ class DingTalkAdapter(IMAdapter):
         body += raw
         body += f"\r\n--{boundary}--\r\n".encode("utf-8")
 
-        req = urllib.request.Request(upload_url, data=body, method="POST")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
 
         try:
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                result = json.loads(resp.read().decode("utf-8", errors="replace"))
+            resp = shared_http_client().request("POST", upload_url, content=body, headers=headers, timeout=60)
+            result = json.loads(resp.content.decode("utf-8", errors="replace"))
 
             if result.get("errcode") != 0:
                 self._log(f"[upload_media] Upload failed: {result.get('errmsg', 'unknown')}")
@@ -1209,17 +1193,16 @@ class DingTalkAdapter(IMAdapter):
 
         data = json.dumps(body, ensure_ascii=False).encode('utf-8')
 
-        req = urllib.request.Request(webhook_url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json; charset=utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
 
         try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                result = json.loads(resp.read().decode('utf-8', errors='replace'))
-                if result.get('errcode') == 0:
-                    self._log(f"[send_file_webhook] Sent successfully via webhook")
-                    return True
-                self._log(f"[send_file_webhook] Failed: {result}")
-                return False
+            resp = shared_http_client().request("POST", webhook_url, content=data, headers=headers, timeout=15)
+            result = json.loads(resp.content.decode('utf-8', errors='replace'))
+            if result.get('errcode') == 0:
+                self._log(f"[send_file_webhook] Sent successfully via webhook")
+                return True
+            self._log(f"[send_file_webhook] Failed: {result}")
+            return False
         except Exception as e:
             self._log(f"[send_file_webhook] Error: {e}")
             return False
@@ -16,7 +16,7 @@ import urllib.request
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .base import IMAdapter
+from .base import IMAdapter, shared_http_client
 
 # Discord limits
 DISCORD_MAX_MESSAGE_LENGTH = 2000
@@ -315,9 +315,7 @@ class DiscordAdapter(IMAdapter):
         url = str(attachment.get("url") or "").strip()
         if not url:
             raise ValueError("missing discord attachment url")
-        req = urllib.request.Request(url, method="GET")
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return resp.read()
+        return shared_http_client().request("GET", url, timeout=30).content
 
     def send_file(
         self,
@@ -16,14 +16,12 @@ from __future__ import annotations
 import json
 import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .base import IMAdapter
+from .base import IMAdapter, IMHttpError, shared_http_client
 
 # Feishu API limits
 FEISHU_MAX_MESSAGE_LENGTH = 30720  # 30 KB (Safe limit for Posts, well within 150 KB for Text)
@@ -80,6 +78,12 @@ class RateLimiter:
             else:
                 return self.min_interval - elapsed
 
+    def peek(self, chat_id: str) -> float:
+        """Seconds until a send to this chat would not wait (does not acquire)."""
+        with self.lock:
+            elapsed = time.time() - self.last_send.get(chat_id, 0)
+            return max(0.0, self.min_interval - elapsed)
+
     def wait_and_acquire(self, chat_id: str) -> None:
         """Wait if needed, then acquire."""
         wait_time = self.acquire(chat_id)
@@ -169,23 +173,21 @@ class FeishuAdapter(IMAdapter):
             "app_secret": self.app_secret,
         }, ensure_ascii=False).encode("utf-8")
 
-        req = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json; charset=utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
 
         try:
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                body = resp.read().decode("utf-8", errors="replace")
-                result = json.loads(body)
-
-                if result.get("code") == 0:
-                    self._token = result.get("tenant_access_token", "")
-                    expire = int(result.get("expire", 7200))
-                    self._token_expires = time.time() + expire
-                    self._log(f"[token] Refreshed, expires in {expire}s")
-                    return True
-                else:
-                    self._log(f"[token] Failed: {result.get('msg', 'unknown')}")
-                    return False
+            resp = shared_http_client().request("POST", url, content=data, headers=headers, timeout=10)
+            result = json.loads(resp.content.decode("utf-8", errors="replace"))
+
+            if result.get("code") == 0:
+                self._token = result.get("tenant_access_token", "")
+                expire = int(result.get("expire", 7200))
+                self._token_expires = time.time() + expire
+                self._log(f"[token] Refreshed, expires in {expire}s")
+                return True
+            else:
+                self._log(f"[token] Failed: {result.get('msg', 'unknown')}")
+                return False
         except Exception as e:
             self._log(f"[token] Error: {e}")
             return False
@@ -220,22 +222,18 @@ class FeishuAdapter(IMAdapter):
         else:
             data = json.dumps(body or {}, ensure_ascii=False).encode("utf-8") if body else None
 
-        req = urllib.request.Request(url, data=data, method=method)
-        req.add_header("Authorization", f"Bearer {token}")
-        req.add_header("Content-Type", "application/json; charset=utf-8")
-        req.add_header("Accept", "application/json")
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json; charset=utf-8",
+            "Accept": "application/json",
+        }
 
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                result_body = resp.read().decode("utf-8", errors="replace")
-                return json.loads(result_body)
-        except urllib.error.HTTPError as e:
-            http_status = e.code
-            err_text = ""
-            try:
-                err_text = e.read().decode("utf-8", "ignore")[:300]
-            except Exception:
-                pass
+            resp = shared_http_client().request(method, url, content=data, headers=headers, timeout=timeout)
+            return json.loads(resp.content.decode("utf-8", errors="replace"))
+        except IMHttpError as e:
+            http_status = e.status
+            err_text = e.text[:300]
             self._log(f"[api] {method} {endpoint}: HTTP {http_status} - {err_text}")
             return {"code": http_status, "msg": str(e), "error": err_text}
         except Exception as e:
@@ -710,12 +708,8 @@ class FeishuAdapter(IMAdapter):
         else:
             raise ValueError(f"Unknown attachment kind: {kind}")
 
-        req = urllib.request.Request(url, method="GET")
-        req.add_header("Authorization", f"Bearer {token}")
-
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                return resp.read()
+            return shared_http_client().request("GET", url, headers={"Authorization": f"Bearer {token}"}, timeout=30).content
         except Exception as e:
             raise ValueError(f"Download failed: {e}")
 
@@ -779,13 +773,11 @@ class FeishuAdapter(IMAdapter):
         body += raw
         body += f"\r\n--{boundary}--\r\n".encode("utf-8")
 
-        req = urllib.request.Request(upload_url, data=body, method="POST")
-        req.add_header("Authorization", f"Bearer {token}")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": f"multipart/form-data; boundary={boundary}"}
 
         try:
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                result = json.loads(resp.read().decode("utf-8", errors="replace"))
+            resp = shared_http_client().request("POST", upload_url, content=body, headers=headers, timeout=60)
+            result = json.loads(resp.content.decode("utf-8", errors="replace"))
 
             if result.get("code") != 0:
                 self._log(f"[send_file] Upload failed: {result.get('msg', 'unknown')}")
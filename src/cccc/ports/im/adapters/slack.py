@@ -15,11 +15,10 @@ import os
 import re
 import threading
 import time
-import urllib.request
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from .base import IMAdapter
+from .base import IMAdapter, shared_http_client
 
 # Slack limits
 SLACK_MAX_MESSAGE_LENGTH = 4000  # Slack blocks limit, text limit is higher but 4000 is safe
@@ -283,10 +282,7 @@ class SlackAdapter(IMAdapter):
         url = str(attachment.get("url") or "").strip()
         if not url:
             raise ValueError("missing slack attachment url")
-        req = urllib.request.Request(url, method="GET")
-        req.add_header("Authorization", f"Bearer {self.bot_token}")
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return resp.read()
+        return shared_http_client().request("GET", url, headers={"Authorization": f"Bearer {self.bot_token}"}, timeout=30).content
 
     def send_file(
         self,
@@ -16,13 +16,12 @@ import re
 import threading
 import time
 import uuid
-import urllib.error
-import urllib.parse
-import urllib.request
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from .base import IMAdapter
+from .base import IMAdapter, IMHttpError, shared_http_client
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
 
 # Telegram API limits
 TELEGRAM_MAX_MESSAGE_LENGTH = 4096
@@ -60,6 +59,12 @@ class RateLimiter:
             else:
                 return self.min_interval - elapsed
 
+    def peek(self, chat_id: str) -> float:
+        """Seconds until a send to this chat would not wait (does not acquire)."""
+        with self.lock:
+            elapsed = time.time() - self.last_send.get(chat_id, 0)
+            return max(0.0, self.min_interval - elapsed)
+
     def wait_and_acquire(self, chat_id: str) -> None:
         """Wait if needed, then acquire."""
         wait_time = self.acquire(chat_id)
@@ -74,6 +79,7 @@ class TelegramAdapter(IMAdapter):
     """
 
     platform = "telegram"
+    api_base = TELEGRAM_API_BASE
 
     def __init__(
         self,
@@ -115,24 +121,19 @@ class TelegramAdapter(IMAdapter):
 
         Uses JSON body for consistent encoding (handles non-ASCII text).
         """
-        url = f"https://api.telegram.org/bot{self.token}/{method}"
+        url = f"{self.api_base}/bot{self.token}/{method}"
         data = json.dumps(params or {}, ensure_ascii=False).encode("utf-8")
-
-        req = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json; charset=utf-8")
-        req.add_header("Accept", "application/json")
+        headers = {"Content-Type": "application/json; charset=utf-8", "Accept": "application/json"}
 
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                body = resp.read().decode("utf-8", errors="replace")
-                return json.loads(body)
-        except urllib.error.HTTPError as e:
-            http_status = e.code
-            err_text = ""
-            try:
-                err_text = e.read().decode("utf-8", "ignore")[:300]
-            except Exception:
-                pass
+            # Bot API reads (getUpdates, getMe, getFile, ...) are safe to repeat; sends are not.
+            resp = shared_http_client().request(
+                "POST", url, content=data, headers=headers, timeout=timeout, idempotent=method.startswith("get")
+            )
+            return json.loads(resp.content.decode("utf-8", errors="replace"))
+        except IMHttpError as e:
+            http_status = e.status
+            err_text = e.text[:300]
             self._log(f"[error] api {method}: HTTP {http_status} - {err_text}")
             return {"ok": False, "error": str(e), "http_status": http_status}
         except Exception as e:
@@ -167,16 +168,17 @@ class TelegramAdapter(IMAdapter):
         if not self._connected:
             return []
 
+        poll_timeout = max(0, int(self.poll_timeout_s))
         resp = self._api(
             "getUpdates",
             {
                 "offset": self._offset,
-                "timeout": 25,
+                "timeout": poll_timeout,
                 # We intentionally ignore edited messages to avoid double-processing commands
                 # and accidental duplicate deliveries when a user edits a message.
                 "allowed_updates": ["message", "channel_post"],
             },
-            timeout=35,
+            timeout=poll_timeout + 10,
         )
 
         messages = []
@@ -292,10 +294,8 @@ class TelegramAdapter(IMAdapter):
         if not file_path:
             raise ValueError("missing telegram file_path")
 
-        url = f"https://api.telegram.org/file/bot{self.token}/{file_path}"
-        req = urllib.request.Request(url, method="GET")
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return resp.read()
+        url = f"{self.api_base}/file/bot{self.token}/{file_path}"
+        return shared_http_client().request("GET", url, timeout=30).content
 
     def send_file(
         self,
@@ -318,7 +318,7 @@ class TelegramAdapter(IMAdapter):
         self._rate_limiter.wait_and_acquire(str(chat_id))
 
         boundary = "----cccc" + uuid.uuid4().hex
-        url = f"https://api.telegram.org/bot{self.token}/sendDocument"
+        url = f"{self.api_base}/bot{self.token}/sendDocument"
 
         try:
             raw = file_path.read_bytes()
@@ -354,15 +354,12 @@ class TelegramAdapter(IMAdapter):
         body += raw
         body += f"\r\n--{boundary}--\r\n".encode("utf-8")
 
-        req = urllib.request.Request(url, data=body, method="POST")
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
-        req.add_header("Accept", "application/json")
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}", "Accept": "application/json"}
 
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                data = resp.read().decode("utf-8", errors="replace")
-                out = json.loads(data)
-                return bool(out.get("ok"))
+            resp = shared_http_client().request("POST", url, content=body, headers=headers, timeout=30)
+            out = json.loads(resp.content.decode("utf-8", errors="replace"))
+            return bool(out.get("ok"))
         except Exception as e:
             self._log(f"[send_file] failed: {e}")
             return False
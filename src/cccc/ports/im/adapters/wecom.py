@@ -24,14 +24,13 @@ import threading
 import time
 import uuid
 import urllib.parse
-import urllib.request
 from base64 import b64decode
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
-from .base import IMAdapter, OutboundStreamHandle
+from .base import IMAdapter, OutboundStreamHandle, shared_http_client
 
 # WeCom API limits
 WECOM_MAX_MESSAGE_LENGTH = 2048
@@ -62,6 +61,12 @@ class RateLimiter:
         self.last_send: Dict[str, float] = {}
         self.lock = threading.Lock()
 
+    def peek(self, chat_id: str) -> float:
+        """Seconds until a send to this chat would not wait (does not acquire)."""
+        with self.lock:
+            elapsed = time.time() - self.last_send.get(chat_id, 0)
+            return max(0.0, self.min_interval - elapsed)
+
     def wait_and_acquire(self, chat_id: str) -> None:
         with self.lock:
             now = time.time()
@@ -189,17 +194,16 @@ class WecomAdapter(IMAdapter):
         return ""
 
     def _post_json(self, url: str, payload: Dict[str, Any], *, timeout: int = 10) -> bool:
-        req = urllib.request.Request(
-            str(url or "").strip(),
-            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
-            method="POST",
-        )
-        req.add_header("Content-Type", "application/json")
-        req.add_header("Accept", "application/json")
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                status = int(getattr(resp, "status", 200) or 200)
-                raw = resp.read().decode("utf-8", errors="replace").strip()
+            resp = shared_http_client().request(
+                "POST",
+                str(url or "").strip(),
+                content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+                timeout=timeout,
+            )
+            status = int(resp.status_code)
+            raw = resp.content.decode("utf-8", errors="replace").strip()
         except Exception as e:
             self._log(f"[response_url] POST failed: {e}")
             return False
@@ -444,16 +448,15 @@ class WecomAdapter(IMAdapter):
         body += raw
         body += f"\r\n--{boundary}--\r\n".encode("utf-8")
 
-        req = urllib.request.Request(
-            self._build_media_api_url("/media/upload", type=media_type),
-            data=body,
-            method="POST",
-        )
-        req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
-
         try:
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                result = json.loads(resp.read().decode("utf-8", errors="replace"))
+            resp = shared_http_client().request(
+                "POST",
+                self._build_media_api_url("/media/upload", type=media_type),
+                content=body,
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                timeout=60,
+            )
+            result = json.loads(resp.content.decode("utf-8", errors="replace"))
         except Exception as e:
             raise ValueError(f"upload failed: {e}") from e
 
@@ -1094,10 +1097,8 @@ class WecomAdapter(IMAdapter):
         ).strip()
 
         if download_url:
-            req = urllib.request.Request(download_url, method="GET")
             try:
-                with urllib.request.urlopen(req, timeout=60) as resp:
-                    raw = resp.read()
+                raw = shared_http_client().request("GET", download_url, timeout=60).content
             except Exception as e:
                 raise ValueError(f"download failed: {e}") from e
 
@@ -1112,13 +1113,12 @@ class WecomAdapter(IMAdapter):
         if not media_id:
             raise ValueError("missing wecom attachment media_id or download_url")
 
-        req = urllib.request.Request(
-            self._build_media_api_url("/media/get", media_id=media_id),
-            method="GET",
-        )
         try:
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                return resp.read()
+            return shared_http_client().request(
+                "GET",
+                self._build_media_api_url("/media/get", media_id=media_id),
+                timeout=60,
+            ).content
         except Exception as e:
             raise ValueError(f"download failed: {e}") from e
 
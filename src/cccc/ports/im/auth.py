@@ -83,6 +83,10 @@ class KeyManager:
     # Public API
     # ------------------------------------------------------------------
 
+    def reload(self) -> None:
+        """Re-read pending keys and authorized chats written by other processes."""
+        self._load()
+
     def generate_key(self, chat_id: str, thread_id: int, platform: str) -> str:
         """Create a pending authorization key (``secrets.token_urlsafe(8)``)."""
         key = secrets.token_urlsafe(8)
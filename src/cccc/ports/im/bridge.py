@@ -19,16 +19,20 @@ import shlex
 import signal
 import sys
 import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from ...daemon.server import call_daemon
+from ...daemon.im.im_bridge_ops import IM_BRIDGE_HOST_MARKER
 from ...kernel.actors import list_actors, resolve_recipient_tokens
 from ...kernel.blobs import resolve_blob_attachment_path, store_blob_bytes
 from ...kernel.group import Group, load_group
 from ...kernel.messaging import disabled_recipient_actor_ids, get_default_send_to
 from ...paths import ensure_home
 from ...util.conv import coerce_bool
+from ...util.file_watch import FileChangeWatcher
+from ...util.time import utc_now_iso
 from .adapters.base import IMAdapter, OutboundStreamHandle
 from .adapters.telegram import TelegramAdapter
 from .adapters.slack import SlackAdapter
@@ -42,6 +46,7 @@ from .commands import (
     parse_message,
 )
 from .config_schema import canonicalize_im_config
+from .outbound import ChatOutbox, write_outbound_status
 from .auth import KeyManager
 from .subscribers import SubscriberManager
 
@@ -199,6 +204,7 @@ class LedgerWatcher:
         self._dev: Optional[int] = None
         self._ino: Optional[int] = None
         self._buf = ""
+        self._change_watcher: Optional[FileChangeWatcher] = None
 
         self._load_cursor()
 
@@ -262,6 +268,39 @@ class LedgerWatcher:
             self._log(f"[watcher] Failed to seek to end: {e}")
             return False
 
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until the ledger may have new data or timeout elapses.
+
+        Wakes immediately on ledger writes where file notifications are available;
+        otherwise sleeps for the full timeout. Returns True on a (possible) change.
+        """
+        watcher = self.change_watcher(poll_interval=timeout)
+        if watcher is None:
+            time.sleep(timeout)
+            return True
+        return watcher.wait(timeout)
+
+    def change_watcher(self, *, poll_interval: float = 0.5) -> Optional[FileChangeWatcher]:
+        """Return the ledger's file-change watcher, creating it on first use (None if unavailable)."""
+        if self._change_watcher is None:
+            try:
+                self._change_watcher = FileChangeWatcher(self.ledger_path, poll_interval=poll_interval)
+            except Exception:
+                return None
+        return self._change_watcher
+
+    @property
+    def event_driven(self) -> bool:
+        """True when wait() is backed by file notifications rather than sleeping."""
+        return self._change_watcher is not None and self._change_watcher.event_driven
+
+    def close(self) -> None:
+        """Release the file-change watcher."""
+        if self._change_watcher is not None:
+            self._change_watcher.close()
+            self._change_watcher = None
+
     def poll(self) -> List[Dict[str, Any]]:
         """
         Poll for new events.
@@ -367,6 +406,7 @@ class IMBridge:
 
         self._running = False
         self._last_outbound_check = 0.0
+        self._ledger_changed = False
         # Inbound history filtering baseline. Messages older than this moment
         # (with a small grace window) are treated as pre-start backlog.
         self._connected_at = 0.0
@@ -393,6 +433,18 @@ class IMBridge:
         # The bridge computes this from inbound metadata and passes it explicitly
         # to adapters instead of letting adapters guess from their own caches.
         self._mention_targets: Dict[str, List[str]] = {}
+        # Ledger events polled but not yet forwarded. A bridge host drains several
+        # bridges' queues round-robin so one busy group cannot starve the others.
+        self._outbound_pending: Deque[Dict[str, Any]] = deque()
+        self._outbound_labels: Dict[str, str] = {}
+        # Per-chat text queues: sends wait here instead of blocking on the adapter's
+        # rate limiter, and whatever piles up meanwhile goes out as one digest.
+        self._outbox = ChatOutbox(
+            max_chars=int(getattr(adapter, "max_chars", 0) or 4000),
+            max_lines=int(getattr(adapter, "max_lines", 0) or 64),
+        )
+        self._status_written_at = 0.0
+        self._status_signature: Optional[Tuple[Any, ...]] = None
 
     def _should_process_inbound(self, *, chat_id: str, thread_id: int, message_id: str) -> bool:
         """
@@ -439,9 +491,13 @@ class IMBridge:
         except Exception as e:
             return {"ok": False, "error": {"code": "daemon_error", "message": str(e)}}
 
-    def start(self) -> bool:
-        """Start the bridge."""
-        if not self.adapter.connect():
+    def start(self, *, connect: bool = True) -> bool:
+        """
+        Start the bridge.
+
+        Pass connect=False when the adapter is shared and already connected (bridge host).
+        """
+        if connect and not self.adapter.connect():
             self._log("[start] Failed to connect adapter")
             return False
         self._connected_at = time.time()
@@ -457,10 +513,20 @@ class IMBridge:
         self._log(f"[start] Bridge started for group {self.group.group_id}")
         return True
 
-    def stop(self) -> None:
+    def stop(self, *, disconnect: bool = True) -> None:
         """Stop the bridge."""
         self._running = False
-        self.adapter.disconnect()
+        # The ledger cursor is already past everything queued here, so deliver it now
+        # rather than dropping it (waits out the chats' rate limits).
+        try:
+            self._drain_outbound()
+            self._flush_chat_outbox(block=True)
+        except Exception as e:
+            self._log(f"[stop] Failed to flush queued outbound messages: {e}")
+        self._write_outbound_status(force=True)
+        if disconnect:
+            self.adapter.disconnect()
+        self.watcher.close()
         self._log("[stop] Bridge stopped")
 
     def run_once(self) -> None:
@@ -471,11 +537,15 @@ class IMBridge:
         # Refresh Telegram "typing" action for active indicators
         self._refresh_typing_actions()
 
-        # Process outbound events (throttled)
+        # Process outbound events (throttled, unless the ledger watcher saw a write)
         now = time.time()
-        if now - self._last_outbound_check >= 1.0:
+        if self._ledger_changed or now - self._last_outbound_check >= 1.0:
+            self._ledger_changed = False
             self._process_outbound()
             self._last_outbound_check = now
+        # Chats whose rate limit has cleared since the last pass get their digest now.
+        self._flush_chat_outbox()
+        self._write_outbound_status()
 
         # Periodic inbound health log (every 5 minutes)
         if now - self._last_health_log >= 300.0:
@@ -496,17 +566,23 @@ class IMBridge:
             except Exception as e:
                 self._log(f"[error] Loop error: {e}")
 
-            time.sleep(poll_interval)
+            # Sleeps for poll_interval (inbound adapters still need it) but wakes early on
+            # ledger writes so outbound delivery is not delayed by the poll cadence.
+            if self.watcher.wait(self._outbound_wait_s(poll_interval)) and self.watcher.event_driven:
+                self._ledger_changed = True
 
     def _process_inbound(self) -> None:
         """Process incoming IM messages."""
-        # Reload authorized-chat state from disk so that binds performed by the
-        # daemon (a separate process) are picked up without restarting the bridge.
-        self.key_manager._load()
-
         messages = self.adapter.poll()
         if messages:
             self._log(f"[inbound] Polled {len(messages)} messages")
+        self._handle_inbound_messages(messages)
+
+    def _handle_inbound_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """Handle polled IM messages addressed to this group."""
+        # Reload authorized-chat state from disk so that binds performed by the
+        # daemon (a separate process) are picked up without restarting the bridge.
+        self.key_manager._load()
 
         for msg in messages:
             chat_id = str(msg.get("chat_id") or "").strip()
@@ -657,6 +733,11 @@ class IMBridge:
 
     def _process_outbound(self) -> None:
         """Process outbound events from ledger."""
+        self._collect_outbound()
+        self._drain_outbound()
+
+    def _collect_outbound(self) -> int:
+        """Queue new ledger events for delivery. Returns the pending queue depth."""
         # Reload subscriber state from disk so that subscriptions created by the
         # daemon (e.g. auto-subscribe on bind) are picked up without restarting.
         self.subscribers._load()
@@ -664,10 +745,110 @@ class IMBridge:
         self.key_manager._load()
 
         events = self.watcher.poll()
-        actor_labels = self._actor_display_map()
+        if events:
+            self._outbound_pending.extend(events)
+            self._outbound_labels = self._actor_display_map()
+        return len(self._outbound_pending)
+
+    def _drain_outbound(self, max_events: Optional[int] = None) -> int:
+        """Forward up to max_events queued events (all when None). Returns how many were forwarded."""
+        forwarded = 0
+        while self._outbound_pending and (max_events is None or forwarded < max_events):
+            event = self._outbound_pending.popleft()
+            forwarded += 1
+            try:
+                self._forward_event(event, actor_labels=self._outbound_labels)
+            except Exception as e:
+                self._log(f"[outbound] Forward failed: {e}")
+        return forwarded
 
-        for event in events:
-            self._forward_event(event, actor_labels=actor_labels)
+    def _flush_chat_outbox(self, *, block: bool = False, only: Optional[str] = None) -> int:
+        """
+        Send queued chat texts. Returns the number of messages sent.
+
+        Without block, a chat is skipped while its rate limiter is saturated, so its queue
+        keeps growing into a digest; one message per chat goes out per pass. With block,
+        the chat's queue is drained completely (used to keep ordering ahead of file and
+        stream deliveries).
+        """
+        sent = 0
+        for key in self._outbox.keys():
+            if only is not None and key != only:
+                continue
+            chat_id, _thread_id = self._outbox.target(key)
+            while self._outbox.depth(key):
+                if not block and self._send_wait_s(chat_id) > 0:
+                    break
+                digest = self._outbox.take_digest(key)
+                if digest is None:
+                    break
+                try:
+                    if digest["mention_user_ids"] is None:
+                        ok = bool(self.adapter.send_message(chat_id, digest["text"], thread_id=digest["thread_id"]))
+                    else:
+                        ok = bool(
+                            self.adapter.send_message(
+                                chat_id,
+                                digest["text"],
+                                thread_id=digest["thread_id"],
+                                mention_user_ids=digest["mention_user_ids"],
+                            )
+                        )
+                except Exception as e:
+                    self._log(f"[outbound] Send failed chat={chat_id}: {e}")
+                    ok = False
+                self._outbox.record_sent(key, digest, ok)
+                if ok:
+                    sent += 1
+                    if digest["count"] > 1:
+                        self._log(f"[outbound] Sent digest of {digest['count']} messages to chat={chat_id}")
+                    # Remove typing indicator only after outbound delivery is actually completed.
+                    if digest["user_facing"]:
+                        self._remove_typing_indicator(chat_id)
+                if not block:
+                    break
+        return sent
+
+    def _send_wait_s(self, chat_id: str) -> float:
+        send_wait_s = getattr(self.adapter, "send_wait_s", None)
+        return float(send_wait_s(chat_id)) if callable(send_wait_s) else 0.0
+
+    def _outbound_wait_s(self, default: float) -> float:
+        """How long the loop may idle before outbound work is due again."""
+        if self._outbound_pending:
+            return 0.0
+        waits = [self._send_wait_s(self._outbox.target(key)[0]) for key in self._outbox.keys()]
+        if not waits:
+            return default
+        return min(default, max(0.02, min(waits)))
+
+    def outbound_status(self) -> Dict[str, Any]:
+        """Outbound backlog: ledger events not yet forwarded plus per-chat queue depth and lag."""
+        return {
+            "pending_events": len(self._outbound_pending),
+            "queued": self._outbox.depth(),
+            "chats": self._outbox.status(),
+        }
+
+    def _write_outbound_status(self, *, force: bool = False) -> None:
+        """Publish outbound_status() to the group state dir (throttled, only when it changed)."""
+        now = time.time()
+        if not force and now - self._status_written_at < 2.0:
+            return
+        status = self.outbound_status()
+        signature = (
+            status["pending_events"],
+            tuple(sorted((key, chat["depth"], chat.get("sent", 0), chat.get("failed", 0)) for key, chat in status["chats"].items())),
+        )
+        # Lag grows while anything is queued, so keep refreshing until the backlog clears.
+        if not force and signature == self._status_signature and not status["queued"] and not status["pending_events"]:
+            return
+        self._status_signature = signature
+        self._status_written_at = now
+        write_outbound_status(
+            self.group.path / "state",
+            {"v": 1, "pid": os.getpid(), "updated_at": utc_now_iso(), **status},
+        )
 
     def _actor_display_map(self) -> Dict[str, str]:
         """Build actor_id -> display label map (title first, id fallback)."""
@@ -791,6 +972,8 @@ class IMBridge:
             target_key = self._stream_target_key(sub.chat_id, sub.thread_id)
 
             if op == "start":
+                # Deliver queued texts first so the stream does not overtake them.
+                self._flush_chat_outbox(block=True, only=target_key)
                 try:
                     handle = self.adapter.begin_stream(sub.chat_id, stream_id, text=text, thread_id=sub.thread_id)
                 except Exception:
@@ -875,6 +1058,9 @@ class IMBridge:
         # Determine if this event is user-facing (to:user or broadcast).
         # Agent-to-agent messages should NOT cancel typing indicators.
         is_user_facing = not to or "user" in to
+        # Addressed to the user (not merely broadcast) or flagged attention: goes first
+        # when the chat's queued messages are merged into a digest.
+        is_priority = "user" in to or str(data.get("priority") or "normal").strip() == "attention"
         display_labels = actor_labels or self._actor_display_map()
 
         for sub in subscribed:
@@ -920,7 +1106,9 @@ class IMBridge:
                 max_mb = default_max_mb
             max_bytes = max(0, max_mb) * 1024 * 1024
 
-            if files_enabled and isinstance(attachments, list):
+            if files_enabled and isinstance(attachments, list) and attachments:
+                # Files are sent directly; deliver queued texts first to keep chat order.
+                self._flush_chat_outbox(block=True, only=target_key)
                 for i, a in enumerate(attachments):
                     if not isinstance(a, dict):
                         continue
@@ -960,27 +1148,26 @@ class IMBridge:
                         if is_user_facing:
                             delivered_user_facing = True
 
-            # If we didn't send any files, or if there's text with no files, send message.
+            # If we didn't send any files, or if there's text with no files, queue the message.
+            # The outbox sends it right away unless the chat is rate limited.
             if formatted and not sent_any_file and not skip_text_due_to_stream:
-                if mention_user_ids is None:
-                    sent_msg = bool(self.adapter.send_message(sub.chat_id, formatted, thread_id=sub.thread_id))
-                else:
-                    sent_msg = bool(
-                        self.adapter.send_message(
-                            sub.chat_id,
-                            formatted,
-                            thread_id=sub.thread_id,
-                            mention_user_ids=mention_user_ids,
-                        )
-                    )
-                if sent_msg and is_user_facing:
-                    delivered_user_facing = True
+                self._outbox.put(
+                    target_key,
+                    sub.chat_id,
+                    sub.thread_id,
+                    formatted,
+                    mention_user_ids=mention_user_ids,
+                    priority=is_priority,
+                    user_facing=is_user_facing,
+                )
 
             # Remove typing indicator only after outbound delivery for this event
             # is actually completed for this chat.
             if delivered_user_facing:
                 self._remove_typing_indicator(sub.chat_id)
 
+        self._flush_chat_outbox()
+
     def _should_forward(self, event: Dict[str, Any], verbose: bool) -> bool:
         """Determine if event should be forwarded based on verbose setting."""
         kind = event.get("kind", "")
@@ -1431,11 +1618,12 @@ class IMBridge:
             )
 
 
-def start_bridge(group_id: str, platform: str = "telegram") -> None:
+def _resolve_bridge_spec(group_id: str, platform: str) -> Dict[str, Any]:
     """
-    Start IM bridge for a group.
+    Load a group's IM config and resolve the platform credentials for its bridge.
 
-    This is the main entry point called by CLI.
+    Prints an error and exits on misconfiguration. The returned spec feeds
+    _create_adapter() and carries the credential lock identity.
     """
     # Load group
     group = load_group(group_id)
@@ -1464,6 +1652,8 @@ def start_bridge(group_id: str, platform: str = "telegram") -> None:
     dingtalk_app_key: str = ""
     dingtalk_app_secret: str = ""
     dingtalk_robot_code: str = ""
+    wecom_bot_id: str = ""
+    wecom_secret: str = ""
     weixin_account_id: str = ""
 
     def _resolve_secret(*, value_key: str, env_key: str, default_env: str) -> str:
@@ -1624,14 +1814,10 @@ def start_bridge(group_id: str, platform: str = "telegram") -> None:
                 print(f"Set environment variable: {token_env}")
             sys.exit(1)
 
-    # Paths
     state_dir = group.path / "state"
-    log_path = state_dir / "im_bridge.log"
-    lock_path = state_dir / "im_bridge.lock"
-    pid_path = state_dir / "im_bridge.pid"
 
-    # Acquire global singleton lock per credential set to avoid multiple groups (or
-    # multiple processes) consuming the same inbound stream (Telegram getUpdates, Slack Socket Mode, etc.).
+    # Credential identity: only one process may consume a credential set's inbound stream
+    # (Telegram getUpdates, Slack Socket Mode, etc.).
     lock_identity = ""
     if platform.lower() == "slack":
         lock_identity = f"slack|bot={bot_token or ''}|app={app_token or ''}"
@@ -1645,9 +1831,162 @@ def start_bridge(group_id: str, platform: str = "telegram") -> None:
         lock_identity = f"weixin|cred_path={state_dir / 'im_weixin_credentials.json'}"
     else:
         lock_identity = f"{platform.lower()}|token={bot_token or ''}"
-    token_material = lock_identity
-    token_fingerprint = hashlib.sha256(token_material.encode("utf-8")).hexdigest()[:12]
-    token_lock_path = ensure_home() / "locks" / f"im_bridge_{platform.lower()}_{token_fingerprint}.lock"
+
+    return {
+        "group": group,
+        "platform": platform.lower(),
+        "im_config": im_config,
+        "state_dir": state_dir,
+        "lock_identity": lock_identity,
+        "bot_token": bot_token or "",
+        "app_token": app_token or "",
+        "feishu_app_id": feishu_app_id,
+        "feishu_app_secret": feishu_app_secret,
+        "dingtalk_app_key": dingtalk_app_key,
+        "dingtalk_app_secret": dingtalk_app_secret,
+        "dingtalk_robot_code": dingtalk_robot_code,
+        "wecom_bot_id": wecom_bot_id,
+        "wecom_secret": wecom_secret,
+        "weixin_account_id": weixin_account_id,
+    }
+
+
+def _credential_lock_path(spec: Dict[str, Any]) -> Path:
+    """Global lock file guarding a credential set's inbound stream."""
+    fingerprint = hashlib.sha256(str(spec["lock_identity"]).encode("utf-8")).hexdigest()[:12]
+    return ensure_home() / "locks" / f"im_bridge_{spec['platform']}_{fingerprint}.lock"
+
+
+def _credential_host_marker_path(lock_path: Path) -> Path:
+    """Marker a bridge host writes (its pid) next to a credential lock while it serves it."""
+    return lock_path.with_suffix(".host")
+
+
+def _read_pid_file(path: Path) -> int:
+    try:
+        return int(path.read_text(encoding="utf-8").strip().splitlines()[0])
+    except Exception:
+        return 0
+
+
+# How long a bridge started for a group waits for a running bridge host to attach it.
+HOST_HANDOVER_TIMEOUT_S = 15.0
+
+
+def _hand_over_to_bridge_host(group_id: str, state_dir: Path, host_pid: int) -> int:
+    """
+    Hand a group to the bridge host already serving its credential set.
+
+    Pointing the group's pid file at the host makes the host attach the group on its next
+    reconcile; waits until it holds the group's lock. Returns the process exit code.
+    """
+    pid_path = state_dir / "im_bridge.pid"
+    marker_path = state_dir / IM_BRIDGE_HOST_MARKER
+    state_dir.mkdir(parents=True, exist_ok=True)
+    # Marker first: stop paths that see the pid file must know it names a host.
+    marker_path.write_text(str(host_pid), encoding="utf-8")
+    pid_path.write_text(str(host_pid), encoding="utf-8")
+    print(f"[info] Handing group {group_id} to the running bridge host (pid={host_pid})")
+
+    deadline = time.time() + HOST_HANDOVER_TIMEOUT_S
+    while time.time() < deadline:
+        time.sleep(0.2)
+        if not pid_path.exists():
+            # Stopped meanwhile, or the host cannot serve this group.
+            break
+        if _read_pid_file(pid_path) != host_pid:
+            # The launcher recorded our own pid after the hand-over; point it back at the host.
+            pid_path.write_text(str(host_pid), encoding="utf-8")
+            continue
+        probe = _acquire_singleton_lock(state_dir / "im_bridge.lock")
+        if probe is None:
+            print(f"[info] Bridge host attached group {group_id}")
+            return 0
+        try:
+            probe.close()
+        except Exception:
+            pass
+
+    print(f"[error] Bridge host (pid={host_pid}) did not attach group {group_id}")
+    for path in (pid_path, marker_path):
+        if _read_pid_file(path) == host_pid:
+            try:
+                path.unlink(missing_ok=True)
+            except Exception:
+                pass
+    return 1
+
+
+def _create_adapter(spec: Dict[str, Any], log_path: Optional[Path]) -> IMAdapter:
+    """Create the platform adapter for a resolved bridge spec."""
+    platform = str(spec["platform"])
+    im_config = spec["im_config"]
+    state_dir = spec["state_dir"]
+    if platform == "telegram":
+        return TelegramAdapter(token=spec["bot_token"], log_path=log_path)
+    elif platform == "slack":
+        return SlackAdapter(bot_token=spec["bot_token"], app_token=spec["app_token"], log_path=log_path)
+    elif platform == "discord":
+        return DiscordAdapter(token=spec["bot_token"], log_path=log_path)
+    elif platform == "feishu":
+        from .adapters.feishu import FeishuAdapter
+
+        return FeishuAdapter(
+            app_id=spec["feishu_app_id"],
+            app_secret=spec["feishu_app_secret"],
+            domain=str(im_config.get("feishu_domain") or "https://open.feishu.cn"),
+            log_path=log_path,
+        )
+    elif platform == "dingtalk":
+        from .adapters.dingtalk import DingTalkAdapter
+
+        return DingTalkAdapter(
+            app_key=spec["dingtalk_app_key"],
+            app_secret=spec["dingtalk_app_secret"],
+            robot_code=spec["dingtalk_robot_code"],
+            log_path=log_path,
+        )
+    elif platform == "wecom":
+        from .adapters.wecom import WecomAdapter
+
+        return WecomAdapter(
+            bot_id=spec["wecom_bot_id"],
+            secret=spec["wecom_secret"],
+            log_path=log_path,
+            ws_url=str(im_config.get("wecom_ws_url") or ""),
+        )
+    elif platform == "weixin":
+        from .adapters.weixin import WeixinAdapter
+
+        return WeixinAdapter(
+            account_id=spec["weixin_account_id"],
+            log_path=log_path,
+            cred_path=state_dir / "im_weixin_credentials.json",
+            context_cache_path=state_dir / "im_weixin_context_tokens.json",
+        )
+    print(f"[error] Unsupported platform: {platform}")
+    sys.exit(1)
+
+
+def start_bridge(group_id: str, platform: str = "telegram") -> None:
+    """
+    Start IM bridge for a group.
+
+    This is the main entry point called by CLI.
+    """
+    spec = _resolve_bridge_spec(group_id, platform)
+    group = spec["group"]
+    im_config = spec["im_config"]
+
+    # Paths
+    state_dir = group.path / "state"
+    log_path = state_dir / "im_bridge.log"
+    lock_path = state_dir / "im_bridge.lock"
+    pid_path = state_dir / "im_bridge.pid"
+
+    # Acquire global singleton lock per credential set to avoid multiple groups (or
+    # multiple processes) consuming the same inbound stream (Telegram getUpdates, Slack Socket Mode, etc.).
+    token_lock_path = _credential_lock_path(spec)
     token_lock_file = _acquire_singleton_lock(token_lock_path)
     if token_lock_file is None:
         other_pid = ""
@@ -1655,6 +1994,10 @@ def start_bridge(group_id: str, platform: str = "telegram") -> None:
             other_pid = token_lock_path.read_text(encoding="utf-8").strip().splitlines()[0]
         except Exception:
             other_pid = ""
+        # A bridge host (`cccc.ports.im.host`) holding the credential set serves this group too.
+        host_pid = _read_pid_file(_credential_host_marker_path(token_lock_path))
+        if host_pid > 0 and str(host_pid) == other_pid:
+            sys.exit(_hand_over_to_bridge_host(group_id, state_dir, host_pid))
         pid_hint = f" (pid={other_pid})" if other_pid else ""
         print(f"[error] Another {platform} bridge is already running for this credential set{pid_hint}")
         print("Stop it before starting a new bridge, or use different credentials.")
@@ -1670,52 +2013,16 @@ def start_bridge(group_id: str, platform: str = "telegram") -> None:
             pass
         sys.exit(1)
 
-    # Write PID file
+    # Write PID file (dropping a host marker a crashed bridge host may have left behind)
     pid_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        (state_dir / IM_BRIDGE_HOST_MARKER).unlink(missing_ok=True)
+    except Exception:
+        pass
     pid_path.write_text(str(os.getpid()), encoding="utf-8")
 
     # Create adapter
-    if platform.lower() == "telegram":
-        adapter = TelegramAdapter(token=bot_token, log_path=log_path)
-    elif platform.lower() == "slack":
-        adapter = SlackAdapter(bot_token=bot_token, app_token=app_token, log_path=log_path)
-    elif platform.lower() == "discord":
-        adapter = DiscordAdapter(token=bot_token, log_path=log_path)
-    elif platform.lower() == "feishu":
-        from .adapters.feishu import FeishuAdapter
-        adapter = FeishuAdapter(
-            app_id=feishu_app_id,
-            app_secret=feishu_app_secret,
-            domain=str(im_config.get("feishu_domain") or "https://open.feishu.cn"),
-            log_path=log_path,
-        )
-    elif platform.lower() == "dingtalk":
-        from .adapters.dingtalk import DingTalkAdapter
-        adapter = DingTalkAdapter(
-            app_key=dingtalk_app_key,
-            app_secret=dingtalk_app_secret,
-            robot_code=dingtalk_robot_code,
-            log_path=log_path,
-        )
-    elif platform.lower() == "wecom":
-        from .adapters.wecom import WecomAdapter
-        adapter = WecomAdapter(
-            bot_id=wecom_bot_id,
-            secret=wecom_secret,
-            log_path=log_path,
-            ws_url=str(im_config.get("wecom_ws_url") or ""),
-        )
-    elif platform.lower() == "weixin":
-        from .adapters.weixin import WeixinAdapter
-        adapter = WeixinAdapter(
-            account_id=weixin_account_id,
-            log_path=log_path,
-            cred_path=state_dir / "im_weixin_credentials.json",
-            context_cache_path=state_dir / "im_weixin_context_tokens.json",
-        )
-    else:
-        print(f"[error] Unsupported platform: {platform}")
-        sys.exit(1)
+    adapter = _create_adapter(spec, log_path)
 
     # Read skip_pending_on_start option from config
     # When True, bridge will skip messages that accumulated during downtime
@@ -0,0 +1,472 @@
+"""
+CCCC IM Bridge Host - serve many groups from one process.
+
+A bridge process per (group, platform) re-imports cccc, opens its own long-poll or
+socket connection and tails its own ledger. The host instead runs one adapter per
+platform credential set and attaches an IMBridge per group to it:
+
+- Inbound: the host loop polls the shared adapter (long polls are capped at
+  poll_timeout_s) and hands each message to the group whose authorized chats include
+  it (chat subscription demux). Polling and sending share one thread, as in a
+  single-group bridge, because adapters keep unlocked per-connection state.
+- Outbound: each group keeps its own ledger watcher and outbound queue; queues are
+  drained round-robin, one event per group per turn, so a chatty group cannot starve
+  the others. Per-chat pacing and digests are handled by each bridge's ChatOutbox.
+- Attach/detach: a group is detached once its pid file stops naming the host
+  (`cccc im stop`), and attached when a bridge started for it hands its pid file over
+  to the host that holds its credential set (see bridge.start_bridge).
+
+Usage:
+    python -m cccc.ports.im.host <platform> <group_id> [<group_id> ...]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ...daemon.im.im_bridge_ops import IM_BRIDGE_HOST_MARKER
+from ...kernel.group import load_group
+from ...paths import ensure_home
+from ...util.conv import coerce_bool
+from ...util.file_watch import wait_any
+from .adapters.base import IMAdapter
+from .bridge import (
+    IMBridge,
+    _acquire_singleton_lock,
+    _create_adapter,
+    _credential_host_marker_path,
+    _credential_lock_path,
+    _now,
+    _resolve_bridge_spec,
+)
+from .commands import CommandType, parse_message
+
+
+class BridgeHost:
+    """
+    Drive several groups' IMBridges over one shared, already-authenticated adapter.
+
+    Bridges are attached with add_bridge(); the order they were added in is the routing
+    priority when one chat is authorized for more than one group.
+    """
+
+    def __init__(
+        self,
+        adapter: IMAdapter,
+        *,
+        log_path: Optional[Path] = None,
+        outbound_budget_s: float = 0.5,
+        reconcile_interval_s: float = 2.0,
+        poll_timeout_s: float = 1.0,
+        platform: str = "",
+        lock_identity: str = "",
+    ):
+        self.adapter = adapter
+        # Credential set served by the adapter; groups handed over later must match it.
+        self.platform = str(platform or "").strip().lower()
+        self.lock_identity = str(lock_identity or "")
+        # A long poll blocks the whole loop, so keep it short enough that outbound
+        # deliveries for every group stay responsive.
+        self.adapter.poll_timeout_s = max(0.0, float(poll_timeout_s))
+        self.log_path = log_path
+        # Upper bound on one round of outbound draining, so inbound handling and ledger
+        # polling keep running while rate-limited sends are backed up.
+        self.outbound_budget_s = max(0.0, float(outbound_budget_s))
+        self.reconcile_interval_s = max(0.0, float(reconcile_interval_s))
+
+        self._bridges: Dict[str, IMBridge] = {}
+        self._pid_paths: Dict[str, Path] = {}
+        self._releases: Dict[str, Callable[[], None]] = {}
+        self._running = False
+        self._rr_offset = 0
+        self._last_reconcile = 0.0
+
+    def _log(self, msg: str) -> None:
+        """Log message."""
+        if self.log_path:
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.log_path.open("a", encoding="utf-8") as f:
+                    f.write(f"{_now()} {msg}\n")
+            except Exception:
+                pass
+
+    @property
+    def group_ids(self) -> List[str]:
+        return list(self._bridges)
+
+    def add_bridge(
+        self,
+        bridge: IMBridge,
+        *,
+        pid_path: Optional[Path] = None,
+        release: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Attach a group's bridge.
+
+        pid_path: the group's bridge pid file; the bridge is detached once the file no
+        longer names this process (`cccc im stop` removes it). release: called on detach,
+        e.g. to drop the group's singleton lock.
+        """
+        group_id = bridge.group.group_id
+        self._bridges[group_id] = bridge
+        if pid_path is not None:
+            self._pid_paths[group_id] = pid_path
+        if release is not None:
+            self._releases[group_id] = release
+        if self._running:
+            bridge.start(connect=False)
+        self._log(f"[host] Attached group {group_id}")
+
+    def attach(self, spec: Dict[str, Any]) -> bool:
+        """
+        Take over a group resolved by bridge._resolve_bridge_spec(): hold its singleton
+        lock, record this process in its pid file and attach its bridge.
+
+        Returns False if another bridge instance holds the group.
+        """
+        group = spec["group"]
+        state_dir = spec["state_dir"]
+        group_lock_file = _acquire_singleton_lock(state_dir / "im_bridge.lock")
+        if group_lock_file is None:
+            return False
+        pid_path = state_dir / "im_bridge.pid"
+        pid_path.parent.mkdir(parents=True, exist_ok=True)
+        # Marker first: stop paths that see the pid file must know it names a host.
+        (state_dir / IM_BRIDGE_HOST_MARKER).write_text(str(os.getpid()), encoding="utf-8")
+        pid_path.write_text(str(os.getpid()), encoding="utf-8")
+        bridge = IMBridge(
+            group=group,
+            adapter=self.adapter,
+            log_path=state_dir / "im_bridge.log",
+            skip_pending_on_start=coerce_bool(spec["im_config"].get("skip_pending_on_start"), default=True),
+        )
+        self.add_bridge(bridge, pid_path=pid_path, release=group_lock_file.close)
+        return True
+
+    def remove_bridge(self, group_id: str) -> bool:
+        """
+        Detach a group's bridge. Returns False if it was not attached.
+
+        The bridge delivers its queued outbound messages on stop, while the shared
+        adapter is still connected.
+        """
+        bridge = self._bridges.pop(group_id, None)
+        if bridge is None:
+            return False
+        try:
+            bridge.stop(disconnect=False)
+        except Exception as e:
+            self._log(f"[host] Failed to stop bridge for {group_id}: {e}")
+        pid_path = self._pid_paths.pop(group_id, None)
+        if pid_path is not None:
+            for path in (pid_path, pid_path.with_name(IM_BRIDGE_HOST_MARKER)):
+                if _pid_file_names_us(path):
+                    try:
+                        path.unlink(missing_ok=True)
+                    except Exception:
+                        pass
+        release = self._releases.pop(group_id, None)
+        if release is not None:
+            try:
+                release()
+            except Exception:
+                pass
+        self._log(f"[host] Detached group {group_id}")
+        return True
+
+    def start(self) -> bool:
+        """Connect the shared adapter and start every attached bridge."""
+        if not self.adapter.connect():
+            self._log("[host] Failed to connect adapter")
+            return False
+        self._running = True
+        self._last_reconcile = time.time()
+        for bridge in list(self._bridges.values()):
+            bridge.start(connect=False)
+        self._log(f"[host] Started for groups {', '.join(self._bridges)}")
+        return True
+
+    def stop(self) -> None:
+        """Detach every bridge and disconnect the shared adapter."""
+        self._running = False
+        for group_id in list(self._bridges):
+            self.remove_bridge(group_id)
+        try:
+            self.adapter.disconnect()
+        except Exception:
+            pass
+        self._log("[host] Stopped")
+
+    def route_inbound(self, messages: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group inbound messages by the group that should handle them (unroutable ones are dropped)."""
+        if not messages:
+            return {}
+        for bridge in self._bridges.values():
+            bridge.key_manager.reload()
+        routed: Dict[str, List[Dict[str, Any]]] = {}
+        for msg in messages:
+            bridge = self._route(msg)
+            if bridge is None:
+                continue
+            routed.setdefault(bridge.group.group_id, []).append(msg)
+        return routed
+
+    def _route(self, msg: Dict[str, Any]) -> Optional[IMBridge]:
+        if not self._bridges:
+            return None
+        chat_id = str(msg.get("chat_id") or "").strip()
+        try:
+            thread_id = int(msg.get("thread_id") or 0)
+        except Exception:
+            thread_id = 0
+        # `/subscribe <group_id>` names its group explicitly (a chat may bind to several).
+        parsed = parse_message(str(msg.get("text") or ""))
+        if parsed.type == CommandType.SUBSCRIBE and parsed.args:
+            target = self._bridges.get(parsed.args[0].strip())
+            if target is not None:
+                return target
+        for bridge in self._bridges.values():
+            if bridge.key_manager.is_authorized(chat_id, thread_id):
+                return bridge
+        # A bare /subscribe from an unknown chat is unambiguous only when one group is
+        # attached; otherwise it must name its group. Everything else is dropped.
+        if parsed.type == CommandType.SUBSCRIBE and not parsed.args and len(self._bridges) == 1:
+            return next(iter(self._bridges.values()))
+        self._log(f"[auth] Dropped message from unauthorized chat={chat_id} thread={thread_id}")
+        return None
+
+    def _drain_outbound_fair(self) -> int:
+        """Forward queued outbound events round-robin across groups within the time budget."""
+        bridges = list(self._bridges.values())
+        if not bridges:
+            return 0
+        start = self._rr_offset % len(bridges)
+        order = bridges[start:] + bridges[:start]
+        self._rr_offset += 1
+        deadline = time.monotonic() + self.outbound_budget_s
+        forwarded = 0
+        while True:
+            progressed = False
+            for bridge in order:
+                if bridge._drain_outbound(max_events=1):
+                    forwarded += 1
+                    progressed = True
+                if time.monotonic() >= deadline:
+                    return forwarded
+            if not progressed:
+                return forwarded
+
+    def _reconcile(self) -> None:
+        """Detach groups that were stopped (pid file released) or deleted; attach handed-over ones."""
+        for group_id in list(self._bridges):
+            pid_path = self._pid_paths.get(group_id)
+            if pid_path is not None and not _pid_file_names_us(pid_path):
+                self._log(f"[host] Group {group_id} released its pid file; detaching")
+                self.remove_bridge(group_id)
+            elif load_group(group_id) is None:
+                self._log(f"[host] Group {group_id} no longer exists; detaching")
+                self.remove_bridge(group_id)
+        self._attach_handed_over()
+
+    def _attach_handed_over(self) -> None:
+        """Attach groups whose pid file a starting bridge handed over to this process."""
+        if not self.lock_identity:
+            return
+        for pid_path in (ensure_home() / "groups").glob("*/state/im_bridge.pid"):
+            group_id = pid_path.parent.parent.name
+            if group_id in self._bridges or not _pid_file_names_us(pid_path):
+                continue
+            try:
+                spec: Optional[Dict[str, Any]] = _resolve_bridge_spec(group_id, self.platform)
+            except SystemExit:
+                spec = None
+            if spec is None or str(spec["lock_identity"]) != self.lock_identity:
+                # Release the pid file so the waiting bridge reports the failure.
+                self._log(f"[host] Group {group_id} does not use this host's credentials; not attaching")
+                for path in (pid_path, pid_path.with_name(IM_BRIDGE_HOST_MARKER)):
+                    if _pid_file_names_us(path):
+                        try:
+                            path.unlink(missing_ok=True)
+                        except Exception:
+                            pass
+                continue
+            if not self.attach(spec):
+                self._log(f"[host] Group {group_id} is locked by another bridge; retrying")
+
+    def run_once(self) -> None:
+        """Run one iteration of the host loop."""
+        try:
+            messages = self.adapter.poll()
+        except Exception as e:
+            self._log(f"[host] Inbound poll failed: {e}")
+            messages = []
+        for group_id, batch in self.route_inbound(messages).items():
+            bridge = self._bridges.get(group_id)
+            if bridge is not None:
+                bridge._log(f"[inbound] Routed {len(batch)} messages")
+                bridge._handle_inbound_messages(batch)
+                bridge._inbound_count += len(batch)
+
+        now = time.time()
+        for bridge in list(self._bridges.values()):
+            bridge._refresh_typing_actions()
+            if bridge._ledger_changed or now - bridge._last_outbound_check >= 1.0:
+                bridge._ledger_changed = False
+                bridge._collect_outbound()
+                bridge._last_outbound_check = now
+
+        self._drain_outbound_fair()
+        for bridge in list(self._bridges.values()):
+            bridge._flush_chat_outbox()
+            bridge._write_outbound_status()
+
+        if now - self._last_reconcile >= self.reconcile_interval_s:
+            self._last_reconcile = now
+            self._reconcile()
+
+    def run_forever(self, poll_interval: float = 0.5) -> None:
+        """Run the host loop until stopped or every group has been detached."""
+        while self._running and self._bridges:
+            try:
+                self.run_once()
+            except Exception as e:
+                self._log(f"[error] Host loop error: {e}")
+
+            # One wait covers every group's ledger; cut short while outbound work is due.
+            watched = []
+            for bridge in self._bridges.values():
+                watcher = bridge.watcher.change_watcher(poll_interval=poll_interval)
+                if watcher is not None:
+                    watched.append((watcher, bridge))
+            timeout = min([bridge._outbound_wait_s(poll_interval) for bridge in self._bridges.values()] or [poll_interval])
+            if not watched:
+                time.sleep(timeout)
+                continue
+            changed = {id(w) for w in wait_any([w for w, _ in watched], timeout)}
+            for watcher, bridge in watched:
+                if id(watcher) in changed and watcher.event_driven:
+                    bridge._ledger_changed = True
+        self._running = False
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-group outbound backlog (see IMBridge.outbound_status)."""
+        return {group_id: bridge.outbound_status() for group_id, bridge in self._bridges.items()}
+
+
+def _pid_file_names_us(pid_path: Path) -> bool:
+    try:
+        return int(pid_path.read_text(encoding="utf-8").strip()) == os.getpid()
+    except Exception:
+        return False
+
+
+def start_bridge_host(platform: str, group_ids: List[str]) -> None:
+    """
+    Serve IM bridges for several groups of one platform from this process.
+
+    Groups are partitioned by credential set; each set gets one adapter and one host
+    loop thread. Groups that are misconfigured or already bridged elsewhere are skipped.
+    Groups started later with the same credentials are handed over to the running host.
+    """
+    platform = str(platform or "").strip().lower()
+    lanes: Dict[str, List[Dict[str, Any]]] = {}
+    for group_id in group_ids:
+        try:
+            spec = _resolve_bridge_spec(group_id, platform)
+        except SystemExit:
+            print(f"[warn] Skipping group {group_id}")
+            continue
+        lanes.setdefault(str(spec["lock_identity"]), []).append(spec)
+
+    home_log_dir = ensure_home() / "daemon"
+    hosts: List[BridgeHost] = []
+    held_locks: List[Any] = []
+    host_markers: List[Path] = []
+    for identity, specs in lanes.items():
+        token_lock_path = _credential_lock_path(specs[0])
+        token_lock_file = _acquire_singleton_lock(token_lock_path)
+        if token_lock_file is None:
+            print(f"[error] Another {platform} bridge is already running for the credential set of {specs[0]['group'].group_id}")
+            continue
+        held_locks.append(token_lock_file)
+
+        fingerprint = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:12]
+        host_log = home_log_dir / f"im_bridge_host_{platform}_{fingerprint}.log"
+        host = BridgeHost(
+            _create_adapter(specs[0], host_log),
+            log_path=host_log,
+            platform=platform,
+            lock_identity=identity,
+        )
+        for spec in specs:
+            if not host.attach(spec):
+                print(f"[warn] Another bridge instance is already running for group {spec['group'].group_id}")
+        if not host.group_ids:
+            continue
+        if not host.start():
+            print(f"[error] Failed to connect {platform} adapter for groups {', '.join(host.group_ids)}")
+            host.stop()
+            continue
+        hosts.append(host)
+        # Lets a bridge started later for this credential set find the host (see bridge.start_bridge).
+        host_marker = _credential_host_marker_path(token_lock_path)
+        host_marker.write_text(str(os.getpid()), encoding="utf-8")
+        host_markers.append(host_marker)
+        print(f"[info] IM bridge host serving {', '.join(host.group_ids)} ({platform}); log: {host_log}")
+
+    if not hosts:
+        for lock_file in held_locks:
+            try:
+                lock_file.close()
+            except Exception:
+                pass
+        print("[error] No groups to serve")
+        sys.exit(1)
+
+    def handle_signal(signum: int, frame: Any) -> None:
+        print(f"\n[signal] Received signal {signum}, stopping...")
+        for host in hosts:
+            host._running = False
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    threads = [threading.Thread(target=host.run_forever, name="cccc-im-host", daemon=True) for host in hosts]
+    for thread in threads:
+        thread.start()
+    try:
+        # Join with a timeout so the main thread keeps handling signals.
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+    finally:
+        for host_marker in host_markers:
+            try:
+                host_marker.unlink(missing_ok=True)
+            except Exception:
+                pass
+        for host in hosts:
+            host.stop()
+        for lock_file in held_locks:
+            try:
+                lock_file.close()
+            except Exception:
+                pass
+
+    print("[info] Bridge host stopped")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m cccc.ports.im.host <platform> <group_id> [<group_id> ...]")
+        sys.exit(1)
+    start_bridge_host(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,168 @@
+"""
+Per-chat outbound scheduling for the IM bridge.
+
+Text deliveries are queued per chat instead of blocking on the adapter's per-chat
+rate limiter. A chat is flushed only when its limiter would let a message through;
+whatever queued up in the meantime goes out as one digest, messages addressed to
+the user (or flagged attention) first, sized to the platform's message limits.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+OUTBOUND_STATUS_FILE = "im_outbound_status.json"
+DIGEST_SEPARATOR = "\n\n"
+
+
+class ChatOutbox:
+    """
+    Per-chat queues of formatted outbound texts.
+
+    Keys are the bridge's target keys (chat_id or chat_id:thread_id). Items keep their
+    arrival order; take_digest() packs priority items first, then the rest, stopping at
+    the first item that would overflow max_chars/max_lines.
+    """
+
+    def __init__(self, *, max_chars: int = 4000, max_lines: int = 64) -> None:
+        self.max_chars = max(1, int(max_chars))
+        self.max_lines = max(1, int(max_lines))
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._targets: Dict[str, Tuple[str, int]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+
+    def put(
+        self,
+        key: str,
+        chat_id: str,
+        thread_id: int,
+        text: str,
+        *,
+        mention_user_ids: Optional[List[str]] = None,
+        priority: bool = False,
+        user_facing: bool = False,
+    ) -> None:
+        self._seq += 1
+        self._targets[key] = (str(chat_id), int(thread_id or 0))
+        self._queues.setdefault(key, deque()).append(
+            {
+                "seq": self._seq,
+                "text": text,
+                "mention_user_ids": mention_user_ids,
+                "priority": bool(priority),
+                "user_facing": bool(user_facing),
+                "queued_at": time.time(),
+            }
+        )
+
+    def depth(self, key: Optional[str] = None) -> int:
+        if key is not None:
+            return len(self._queues.get(key) or ())
+        return sum(len(q) for q in self._queues.values())
+
+    def target(self, key: str) -> Tuple[str, int]:
+        return self._targets[key]
+
+    def keys(self) -> List[str]:
+        """Queued chats, those holding priority messages first, then oldest backlog first."""
+        queued = [(key, q) for key, q in self._queues.items() if q]
+        queued.sort(key=lambda kv: (not any(item["priority"] for item in kv[1]), kv[1][0]["queued_at"]))
+        return [key for key, _ in queued]
+
+    def take_digest(self, key: str) -> Optional[Dict[str, Any]]:
+        """Remove and merge the next batch of queued texts for a chat (None if empty)."""
+        q = self._queues.get(key)
+        if not q:
+            return None
+        ordered = sorted(q, key=lambda item: (not item["priority"], item["seq"]))
+        sep_lines = DIGEST_SEPARATOR.count("\n")
+        picked: List[Dict[str, Any]] = []
+        chars = lines = 0
+        for item in ordered:
+            item_chars = len(item["text"])
+            item_lines = item["text"].count("\n") + 1
+            if picked:
+                item_chars += len(DIGEST_SEPARATOR)
+                item_lines += sep_lines
+                if chars + item_chars > self.max_chars or lines + item_lines > self.max_lines:
+                    break
+            picked.append(item)
+            chars += item_chars
+            lines += item_lines
+        taken = {item["seq"] for item in picked}
+        self._queues[key] = deque(item for item in q if item["seq"] not in taken)
+
+        mentions: Optional[List[str]] = None
+        for item in picked:
+            if item["mention_user_ids"] is None:
+                continue
+            if mentions is None:
+                mentions = []
+            mentions.extend(m for m in item["mention_user_ids"] if m not in mentions)
+        chat_id, thread_id = self._targets[key]
+        return {
+            "chat_id": chat_id,
+            "thread_id": thread_id,
+            "text": DIGEST_SEPARATOR.join(item["text"] for item in picked),
+            "mention_user_ids": mentions,
+            "count": len(picked),
+            "user_facing": any(item["user_facing"] for item in picked),
+            "oldest_queued_at": min(item["queued_at"] for item in picked),
+        }
+
+    def record_sent(self, key: str, digest: Dict[str, Any], ok: bool) -> None:
+        stats = self._stats.setdefault(key, {"sent": 0, "digests": 0, "coalesced": 0, "failed": 0, "last_lag_s": 0.0})
+        now = time.time()
+        if not ok:
+            stats["failed"] += 1
+            return
+        stats["sent"] += 1
+        if digest["count"] > 1:
+            stats["digests"] += 1
+            stats["coalesced"] += digest["count"]
+        stats["last_lag_s"] = round(max(0.0, now - float(digest["oldest_queued_at"])), 3)
+        stats["last_sent_at"] = now
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-chat queue depth, current lag (age of the oldest queued text) and send counters."""
+        now = time.time()
+        out: Dict[str, Dict[str, Any]] = {}
+        for key in set(self._queues) | set(self._stats):
+            q = self._queues.get(key) or deque()
+            chat_id, thread_id = self._targets.get(key, (key, 0))
+            out[key] = {
+                "chat_id": chat_id,
+                "thread_id": thread_id,
+                "depth": len(q),
+                "priority": sum(1 for item in q if item["priority"]),
+                "lag_s": round(max(0.0, now - q[0]["queued_at"]), 3) if q else 0.0,
+                **self._stats.get(key, {}),
+            }
+        return out
+
+
+def write_outbound_status(state_dir: Path, payload: Dict[str, Any]) -> None:
+    """Atomically write the bridge's outbound status snapshot (best effort)."""
+    try:
+        state_dir.mkdir(parents=True, exist_ok=True)
+        path = state_dir / OUTBOUND_STATUS_FILE
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(path)
+    except Exception:
+        pass
+
+
+def read_outbound_status(state_dir: Path) -> Optional[Dict[str, Any]]:
+    """Read the last outbound status snapshot written by the group's bridge."""
+    try:
+        data = json.loads((state_dir / OUTBOUND_STATUS_FILE).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
@@ -21,7 +21,7 @@ from starlette.concurrency import run_in_threadpool
 
 from ... import __version__
 from ...daemon.server import call_daemon
-from ...kernel.access_tokens import list_access_tokens, lookup_access_token
+from ...kernel.access_tokens import access_tokens_active, lookup_access_token
 from ...paths import ensure_home
 from ...util.obslog import apply_logger_levels, setup_root_json_logging
 from ...util.process import pid_is_alive, terminate_pid
@@ -435,7 +435,7 @@ def create_app() -> FastAPI:
         request_token_parts=_request_token_parts,
         is_public_path=_is_public_path,
         resolve_principal=_resolve_principal,
-        tokens_active=list_access_tokens,
+        tokens_active=access_tokens_active,
     )
     app.add_middleware(ReadOnlyGuardMiddleware, read_only=read_only)
     app.add_middleware(UiCacheControlMiddleware)
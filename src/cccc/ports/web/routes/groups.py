@@ -28,6 +28,7 @@ from ....kernel.query_projections import get_groups_projection
 from ....daemon.runner_state_ops import headless_state_path, pty_state_path
 from ....kernel.group_template import parse_group_template
 from ....kernel.ledger import read_last_lines
+from ....kernel.ledger_tail_cache import has_older_ledger_event, recent_ledger_events
 from ....kernel.prompt_files import (
     DEFAULT_PREAMBLE_BODY,
     HELP_FILENAME,
@@ -45,7 +46,7 @@ from ....kernel.pet_signals import load_pet_signals
 from ....kernel.pet_task_evidence import build_pet_task_evidence
 from ....daemon.pet.review_scheduler import request_manual_pet_review
 from ...mcp.utils.help_markdown import parse_help_markdown
-from ....kernel.access_tokens import list_access_tokens
+from ....kernel.access_tokens import access_tokens_active
 from ....kernel.pet_decisions import load_pet_decisions
 from ....util.conv import coerce_bool
 from ....util.fs import atomic_write_text
@@ -1648,7 +1649,7 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
         token = _request_access_token(request)
         if not token:
             # Empty password mode: no tokens configured → allow with empty token
-            if not list_access_tokens():
+            if not access_tokens_active():
                 return {"ok": True, "result": {"token": ""}}
             raise HTTPException(
                 status_code=403,
@@ -2060,19 +2061,29 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
                 )
                 events = list(reversed(events))
             else:
-                raw_lines = read_last_lines(group.ledger_path, effective_limit)
-                events = []
-                for ln in raw_lines:
-                    try:
-                        events.append(json.loads(ln))
-                    except Exception:
-                        continue
+                cached_events = recent_ledger_events(group.ledger_path, effective_limit)
+                if cached_events is not None:
+                    events = cached_events
+                else:
+                    events = []
+                    for ln in read_last_lines(group.ledger_path, effective_limit):
+                        try:
+                            events.append(json.loads(ln))
+                        except Exception:
+                            continue
 
                 events = events[-effective_limit:] if effective_limit > 0 else events
                 has_more = False
                 if effective_limit > 0 and events:
                     first_event_id = str(events[0].get("id") or "").strip()
-                    if first_event_id:
+                    cached_has_more = (
+                        has_older_ledger_event(group.ledger_path, first_event_id, kinds={"chat.message", "system.notify"})
+                        if first_event_id
+                        else None
+                    )
+                    if cached_has_more is not None:
+                        has_more = cached_has_more
+                    elif first_event_id:
                         from ....kernel.inbox import search_messages
 
                         older_events, older_has_more = search_messages(
@@ -2111,6 +2122,7 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
         before: str = "",
         after: str = "",
         limit: int = 50,
+        order: str = "time",
         with_read_status: bool = False,
         with_ack_status: bool = False,
         with_obligation_status: bool = False,
@@ -2134,6 +2146,7 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
                 before_id=before,
                 after_id=after,
                 limit=clamped_limit,
+                order=("relevance" if order == "relevance" else "time"),
             )
 
             if with_read_status or with_ack_status or with_obligation_status:
@@ -11,10 +11,11 @@ from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
 
-from ....daemon.im.im_bridge_ops import stop_im_bridges_for_group
+from ....daemon.im.im_bridge_ops import is_im_bridge_host_pid, stop_im_bridges_for_group
 from ....kernel.group import load_group
 from ....paths import ensure_home
 from ....ports.im.config_schema import canonicalize_im_config
+from ....ports.im.outbound import read_outbound_status
 from ....util.conv import coerce_bool
 from ....util.process import SOFT_TERMINATE_SIGNAL, best_effort_signal_pid, pid_is_alive, resolve_background_python_argv, supervised_process_popen_kwargs
 from ..schemas import (
@@ -323,6 +324,7 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
                 "running": running,
                 "pid": pid,
                 "subscribers": subscriber_count,
+                "outbound": read_outbound_status(group.path / "state") if running else None,
             }
         }
 
@@ -587,7 +589,7 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
                         return {"ok": False, "error": {"code": "already_running", "message": f"bridge already running (pid={pid})"}}
                     pid_path.unlink(missing_ok=True)
             except ValueError:
-                pass
+                pid_path.unlink(missing_ok=True)
 
         # Check IM config
         im_cfg = canonicalize_im_config(group.doc.get("im", {}))
@@ -713,7 +715,10 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
                         },
                     }
 
-                pid_path.write_text(str(proc.pid), encoding="utf-8")
+                # A bridge that handed the group to a running bridge host has already
+                # pointed the pid file at the host.
+                if not pid_path.exists():
+                    pid_path.write_text(str(proc.pid), encoding="utf-8")
                 return {"ok": True, "result": {"group_id": req.group_id, "platform": platform, "pid": proc.pid}}
         except Exception as e:
             return {"ok": False, "error": {"code": "start_failed", "message": str(e)}}
@@ -743,7 +748,9 @@ def create_routers(ctx: RouteContext) -> list[APIRouter]:
         if pid_path.exists():
             try:
                 pid = int(pid_path.read_text(encoding="utf-8").strip())
-                best_effort_signal_pid(pid, SOFT_TERMINATE_SIGNAL, include_group=True)
+                # A bridge host detaches this group once the pid file is removed.
+                if not is_im_bridge_host_pid(pid, pid_path):
+                    best_effort_signal_pid(pid, SOFT_TERMINATE_SIGNAL, include_group=True)
                 stopped += 1
             except Exception:
                 pass
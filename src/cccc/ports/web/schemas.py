@@ -12,7 +12,7 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from ...contracts.v1.actor import ActorSubmit, AgentRuntime, RunnerKind
 from ...contracts.v1.automation import AutomationRule
-from ...kernel.access_tokens import list_access_tokens, lookup_access_token
+from ...kernel.access_tokens import access_tokens_active, lookup_access_token
 
 
 def _default_runner_kind() -> str:
@@ -549,7 +549,7 @@ def _anonymous_principal() -> Any:
 
 
 def _tokens_enabled() -> bool:
-    return bool(list_access_tokens())
+    return access_tokens_active()
 
 
 def _principal_kind(principal: Any) -> str:
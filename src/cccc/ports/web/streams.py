@@ -9,6 +9,8 @@ from typing import AsyncIterator, Dict, Optional, Set, TextIO, Tuple
 
 from starlette.responses import StreamingResponse
 
+from ...util.file_watch import FileChangeWatcher
+
 
 async def sse_jsonl_tail(
     path: Path,
@@ -24,6 +26,7 @@ async def sse_jsonl_tail(
     inode = -1
     f: TextIO | None = None
     last_send = time.monotonic()
+    watcher = FileChangeWatcher(path, poll_interval=poll_interval_s)
 
     def _open() -> None:
         nonlocal f, inode
@@ -45,37 +48,54 @@ async def sse_jsonl_tail(
 
     yield b": connected\n\n"
 
-    while True:
-        line = f.readline()
-        if line:
-            raw = line.rstrip("\n")
-            if raw:
-                yield f"event: {event_name}\n".encode("utf-8")
-                yield b"data: " + raw.encode("utf-8", errors="replace") + b"\n\n"
-                last_send = time.monotonic()
-            continue
-
-        now = time.monotonic()
-        if heartbeat_s > 0 and now - last_send >= heartbeat_s:
-            yield b": heartbeat\n\n"
-            last_send = now
-
-        await asyncio.sleep(max(0.01, float(poll_interval_s or 0.2)))
-        try:
-            st = path.stat()
-            cur_inode = int(getattr(st, "st_ino", -1) or -1)
-            if inode != -1 and cur_inode != -1 and cur_inode != inode:
-                _open()
-                continue
-            if st.st_size < f.tell():
-                _open()
+    try:
+        while True:
+            line = f.readline()
+            if line:
+                raw = line.rstrip("\n")
+                if raw:
+                    yield f"event: {event_name}\n".encode("utf-8")
+                    yield b"data: " + raw.encode("utf-8", errors="replace") + b"\n\n"
+                    last_send = time.monotonic()
                 continue
-        except Exception:
+
+            now = time.monotonic()
+            if heartbeat_s > 0 and now - last_send >= heartbeat_s:
+                yield b": heartbeat\n\n"
+                last_send = now
+
+            await watcher.wait_async(_idle_wait(heartbeat_s, last_send, watcher))
             try:
-                path.touch(exist_ok=True)
+                st = path.stat()
+                cur_inode = int(getattr(st, "st_ino", -1) or -1)
+                if inode != -1 and cur_inode != -1 and cur_inode != inode:
+                    _open()
+                    continue
+                if st.st_size < f.tell():
+                    _open()
+                    continue
             except Exception:
-                pass
-            _open()
+                try:
+                    path.touch(exist_ok=True)
+                except Exception:
+                    pass
+                _open()
+    finally:
+        watcher.close()
+        try:
+            f.close()
+        except Exception:
+            pass
+
+
+def _idle_wait(heartbeat_s: float, last_send: float, watcher: FileChangeWatcher) -> float:
+    """How long a tailer may block: until the next heartbeat is due, capped by the watcher's default."""
+    if not watcher.event_driven:
+        return watcher.poll_interval
+    limit = watcher.idle_timeout
+    if heartbeat_s > 0:
+        limit = min(limit, max(0.0, heartbeat_s - (time.monotonic() - last_send)))
+    return max(watcher.poll_interval, limit)
 
 
 async def sse_ledger_tail(path: Path) -> AsyncIterator[bytes]:
@@ -117,12 +137,13 @@ class _SharedJSONLTailer:
         self._poll_interval_s = max(0.01, float(poll_interval_s or 0.2))
         self._inode: int = -1
         self._f: TextIO | None = None
+        self._watcher: FileChangeWatcher | None = None
         self._last_send = time.monotonic()
         self._subscribers: Set[asyncio.Queue[bytes | None]] = set()
         self._task: Optional[asyncio.Task[None]] = None
         self._has_subscribers = asyncio.Event()
 
-    def _ensure_open(self) -> None:
+    def _ensure_open(self, *, from_start: bool = False) -> None:
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._path.touch(exist_ok=True)
 
@@ -137,7 +158,21 @@ class _SharedJSONLTailer:
             self._inode = int(getattr(st, "st_ino", -1) or -1)
         except Exception:
             self._inode = -1
-        self._f.seek(0, 2)
+        if not from_start:
+            self._f.seek(0, 2)
+
+    def _drain(self) -> None:
+        """Broadcast whatever is left in the current handle (e.g. a file that was just rotated away)."""
+        if self._f is None:
+            return
+        try:
+            for line in self._f.readlines():
+                raw = line.rstrip("\n")
+                if raw:
+                    self._broadcast(self._encode_event(raw))
+                    self._last_send = time.monotonic()
+        except Exception:
+            pass
 
     def _encode_event(self, raw: str) -> bytes:
         # Note: SSE requires \n\n to terminate an event.
@@ -170,9 +205,14 @@ class _SharedJSONLTailer:
 
     async def _run(self) -> None:
         try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._watcher = FileChangeWatcher(self._path, poll_interval=self._poll_interval_s)
             self._ensure_open()
             assert self._f is not None
         except Exception:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
             return
 
         while True:
@@ -208,14 +248,19 @@ class _SharedJSONLTailer:
                 self._broadcast(b": heartbeat\n\n")
                 self._last_send = now
 
-            await asyncio.sleep(self._poll_interval_s)
+            if self._watcher is not None:
+                await self._watcher.wait_async(_idle_wait(self._heartbeat_s, self._last_send, self._watcher))
+            else:
+                await asyncio.sleep(self._poll_interval_s)
 
             # Detect file rotation / truncation.
             try:
                 st = self._path.stat()
                 cur_inode = int(getattr(st, "st_ino", -1) or -1)
                 if self._inode != -1 and cur_inode != -1 and cur_inode != self._inode:
-                    self._ensure_open()
+                    # Rotated: finish the old file, then follow the replacement from its first line.
+                    self._drain()
+                    self._ensure_open(from_start=True)
                     continue
                 if self._f is not None and st.st_size < self._f.tell():
                     self._ensure_open()
@@ -243,6 +288,9 @@ class _SharedJSONLTailer:
             except Exception:
                 pass
         self._f = None
+        if self._watcher is not None:
+            self._watcher.close()
+        self._watcher = None
         self._task = None
 
         # Remove stale tailer entry from the global registry so long-running web
@@ -0,0 +1,123 @@
+"""Fixed-capacity byte ring for PTY output, addressed by absolute stream offsets.
+
+Every byte a session ever produced has a stream offset (0, 1, 2, ...) that never
+goes backwards, even when old bytes are evicted or the backlog is cleared.  Readers
+ask for "bytes since offset X" or "the last N bytes" and only the requested range
+is copied; attached terminal clients keep their own offset and are streamed
+straight out of the ring via memoryview slices instead of private buffer copies.
+
+The ring has a single writer (the session's I/O loop thread).  Callers serialize
+access with the session lock; memoryviews returned by ``views`` stay valid until
+the next ``write``, so the writer thread may use them after releasing the lock.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+_INITIAL_BYTES = 64 * 1024
+
+
+class OutputRing:
+    def __init__(self, capacity: int) -> None:
+        self._capacity = max(1, int(capacity))
+        # Grown geometrically up to capacity so idle sessions do not pin the whole ring.
+        self._buf = bytearray(min(self._capacity, _INITIAL_BYTES))
+        self._view = memoryview(self._buf)
+        self._end = 0
+        self._size = 0
+        self._floor = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def end_offset(self) -> int:
+        """Stream offset one past the newest byte."""
+        return self._end
+
+    @property
+    def retained_offset(self) -> int:
+        """Offset of the oldest byte still physically held (ignores ``clear``)."""
+        return self._end - self._size
+
+    @property
+    def start_offset(self) -> int:
+        """Offset of the oldest byte still readable as backlog."""
+        return max(self._end - self._size, self._floor)
+
+    def __len__(self) -> int:
+        return self._end - self.start_offset
+
+    def write(self, data: bytes) -> None:
+        n = len(data)
+        if n <= 0:
+            return
+        src = memoryview(data)
+        if n >= self._capacity:
+            src = src[n - self._capacity :]
+        if len(self._buf) < self._capacity and self._size + len(src) > len(self._buf):
+            self._grow(self._size + len(src))
+        cap = len(self._buf)
+        m = len(src)
+        pos = (self._end + (n - m)) % cap
+        first = min(m, cap - pos)
+        self._view[pos : pos + first] = src[:first]
+        if first < m:
+            self._view[: m - first] = src[first:]
+        self._end += n
+        self._size = min(cap, self._size + n)
+
+    def clear(self) -> None:
+        """Drop the readable backlog; offsets keep counting and streaming readers are unaffected."""
+        self._floor = self._end
+
+    def views(self, offset: int, max_bytes: int = 0) -> Tuple[int, List[memoryview]]:
+        """Zero-copy views of the bytes from ``offset`` (clamped to retained data) to the end.
+
+        Returns ``(first_offset, views)``; ``first_offset > offset`` means the reader
+        was overrun and lost bytes.
+        """
+        start = max(int(offset), self.retained_offset)
+        stop = self._end
+        if max_bytes and max_bytes > 0:
+            stop = min(stop, start + int(max_bytes))
+        if start >= stop:
+            return min(start, self._end), []
+        cap = len(self._buf)
+        pos = start % cap
+        count = stop - start
+        first = min(count, cap - pos)
+        out = [self._view[pos : pos + first]]
+        if first < count:
+            out.append(self._view[: count - first])
+        return start, out
+
+    def read_since(self, offset: int, max_bytes: int = 0) -> Tuple[bytes, int]:
+        """Copy of the backlog bytes at or after ``offset``; returns ``(data, first_offset)``."""
+        first, parts = self.views(max(int(offset), self._floor), max_bytes)
+        return b"".join(parts), first
+
+    def tail(self, max_bytes: int) -> bytes:
+        """Copy of the last ``max_bytes`` backlog bytes."""
+        limit = max(0, int(max_bytes))
+        if limit <= 0:
+            return b""
+        data, _ = self.read_since(self._end - limit)
+        return data
+
+    def _grow(self, needed: int) -> None:
+        size = len(self._buf)
+        while size < needed:
+            size *= 2
+        size = min(self._capacity, size)
+        _, parts = self.views(self.retained_offset)
+        buf = bytearray(size)
+        pos = self.retained_offset % size
+        data = b"".join(parts)
+        first = min(len(data), size - pos)
+        buf[pos : pos + first] = data[:first]
+        buf[: len(data) - first] = data[first:]
+        self._buf = buf
+        self._view = memoryview(buf)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import fcntl
+import functools
+import logging
 import os
 import pty
 import queue
@@ -18,9 +20,19 @@ from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import termios
 from ..kernel.working_state import derive_pty_terminal_override
+from ..util.terminal_render import StreamTranscript
+from .output_ring import OutputRing
+
+logger = logging.getLogger(__name__)
 
 PTY_SUPPORTED = True
 TERMINAL_SIGNAL_BUFFER_CHARS = 4096
+# How often the reactor polls child processes for exit (EOF on the master fd is not
+# reliable while grandchildren still hold the slave side open).
+_REACTOR_POLL_INTERVAL_S = 0.1
+_MAX_READS_PER_EVENT = 16
+# Scrollback rows kept by each session's rendered transcript.
+TRANSCRIPT_MAX_ROWS = 10_000
 
 
 def _set_winsize(fd: int, *, cols: int, rows: int) -> None:
@@ -43,11 +55,168 @@ def _best_effort_killpg(pid: int, sig: signal.Signals) -> None:
             pass
 
 
+class _PtyReactor:
+    """One selector thread multiplexing every session's PTY master fd and client sockets.
+
+    Sessions are plain objects whose handlers run on the reactor thread; other threads
+    hand work over with ``call_soon``. Exit callbacks (ledger/group writes in the daemon)
+    run on a separate worker so they never stall terminal I/O of other sessions.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._calls: deque[Callable[[], None]] = deque()
+        self._sessions: set["PtySession"] = set()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, data=None)
+        self._thread: Optional[threading.Thread] = None
+        self._exits: queue.Queue["PtySession"] = queue.Queue()
+        self._exit_thread: Optional[threading.Thread] = None
+
+    def call_soon(self, fn: Callable[[], None]) -> None:
+        with self._lock:
+            self._calls.append(fn)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cccc-pty-reactor", daemon=True)
+                self._thread.start()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            # A full pipe already guarantees a wakeup.
+            pass
+
+    def add(self, session: "PtySession") -> None:
+        self.call_soon(functools.partial(self._add, session))
+
+    def finish(self, session: "PtySession") -> None:
+        self.call_soon(functools.partial(self._finish, session))
+
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    # -- selector access for sessions (reactor thread only) -------------------------------
+
+    def register(self, fileobj: object, events: int, data: object) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data=data)
+
+    def modify(self, fileobj: object, events: int, data: object) -> selectors.SelectorKey:
+        return self._selector.modify(fileobj, events, data=data)
+
+    def unregister(self, fileobj: object) -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+    def get_key(self, fileobj: object) -> selectors.SelectorKey:
+        return self._selector.get_key(fileobj)
+
+    # -- reactor thread -------------------------------------------------------------------
+
+    def _add(self, session: "PtySession") -> None:
+        self._sessions.add(session)
+        try:
+            session._on_reactor_added()
+        except Exception:
+            logger.exception("pty session %s/%s failed to start", session.group_id, session.actor_id)
+            self._finish(session)
+
+    def _finish(self, session: "PtySession") -> None:
+        if session not in self._sessions:
+            return
+        self._sessions.discard(session)
+        session._running = False
+        try:
+            session._close_all()
+        except Exception:
+            pass
+        if session._on_exit is not None:
+            self._exits.put(session)
+            if self._exit_thread is None or not self._exit_thread.is_alive():
+                self._exit_thread = threading.Thread(target=self._run_exits, name="cccc-pty-exit", daemon=True)
+                self._exit_thread.start()
+
+    def _run_calls(self) -> None:
+        while True:
+            with self._lock:
+                if not self._calls:
+                    return
+                fn = self._calls.popleft()
+            try:
+                fn()
+            except Exception:
+                logger.exception("pty reactor call failed")
+
+    def _poll_sessions(self) -> None:
+        for session in list(self._sessions):
+            if not session._running or session._proc.poll() is not None:
+                self._finish(session)
+
+    def _run(self) -> None:
+        next_poll = 0.0
+        while True:
+            timeout = _REACTOR_POLL_INTERVAL_S if self._sessions else None
+            for key, mask in self._selector.select(timeout=timeout):
+                if key.data is None:
+                    try:
+                        os.read(self._wake_r, 65536)
+                    except OSError:
+                        pass
+                    continue
+                session, (kind, meta) = key.data
+                if session not in self._sessions:
+                    continue
+                try:
+                    session._dispatch(kind, meta, mask)
+                except Exception:
+                    logger.exception("pty session %s/%s I/O failed", session.group_id, session.actor_id)
+                    session._running = False
+                if not session._running:
+                    self._finish(session)
+            self._run_calls()
+            now = time.monotonic()
+            if now >= next_poll:
+                next_poll = now + _REACTOR_POLL_INTERVAL_S
+                self._poll_sessions()
+
+    def _run_exits(self) -> None:
+        while True:
+            session = self._exits.get()
+            try:
+                session._on_exit(session)  # type: ignore[misc]
+            except Exception:
+                pass
+
+
+class _SessionSelector:
+    """A session's view of the shared reactor selector; keys are tagged with the session."""
+
+    def __init__(self, reactor: _PtyReactor, session: "PtySession") -> None:
+        self._reactor = reactor
+        self._session = session
+
+    def register(self, fileobj: object, events: int, data: object = None) -> selectors.SelectorKey:
+        return self._reactor.register(fileobj, events, (self._session, data))
+
+    def modify(self, fileobj: object, events: int, data: object = None) -> selectors.SelectorKey:
+        return self._reactor.modify(fileobj, events, (self._session, data))
+
+    def unregister(self, fileobj: object) -> selectors.SelectorKey:
+        return self._reactor.unregister(fileobj)
+
+    def get_key(self, fileobj: object) -> selectors.SelectorKey:
+        return self._reactor.get_key(fileobj)
+
+
+_REACTOR = _PtyReactor()
+
+
 @dataclass
 class _PtyClient:
     sock: socket.socket
     writer: bool
-    outbuf: bytearray
+    # Stream offset of the next ring byte to send to this client.
+    offset: int
 
 
 class PtySession:
@@ -73,23 +242,23 @@ class PtySession:
         self._started_at = time.monotonic()
         self._first_output_at: Optional[float] = None
         self._last_output_at: Optional[float] = None
-        self._max_backlog_bytes = int(max_backlog_bytes)
+        self._max_backlog_bytes = int(max_backlog_bytes) if int(max_backlog_bytes or 0) > 0 else 2_000_000
         # Allow some slack beyond the initial backlog so clients are not immediately detached if the
         # PTY produces output while we are still draining the attach-time backlog.
         slack = max(2_000_000, int(self._max_backlog_bytes // 8))
         self._max_client_buffer_bytes = max(int(max_client_buffer_bytes), int(self._max_backlog_bytes + slack))
+        # Clients stream from the ring at their own offset, so it also holds the slack a lagging client
+        # may fall behind; a client overrun by the ring is detached (as an overflowing buffer was).
+        self._ring = OutputRing(self._max_backlog_bytes + slack)
+        self._transcript = StreamTranscript(max_rows=TRANSCRIPT_MAX_ROWS)
 
-        self._selector = selectors.DefaultSelector()
+        self._reactor = _REACTOR
+        self._selector = _SessionSelector(self._reactor, self)
         self._lock = threading.Lock()
         self._clients: Dict[int, _PtyClient] = {}
         self._writer_fd: Optional[int] = None
         self._attach_q: queue.Queue[socket.socket] = queue.Queue()
-        self._cmd_r, self._cmd_w = os.pipe()
-        os.set_blocking(self._cmd_r, False)
-        os.set_blocking(self._cmd_w, False)
 
-        self._backlog: deque[bytes] = deque()
-        self._backlog_bytes = 0
         self._terminal_signal_buffer = ""
         self._terminal_override: Optional[Dict[str, str]] = None
         self._mode_tail = b""
@@ -136,12 +305,7 @@ class PtySession:
 
         self._master_fd = master_fd
         self._running = True
-
-        self._selector.register(master_fd, selectors.EVENT_READ, data=("pty", None))
-        self._selector.register(self._cmd_r, selectors.EVENT_READ, data=("cmd", None))
-
-        self._thread = threading.Thread(target=self._loop, name=f"cccc-pty:{group_id}:{actor_id}", daemon=True)
-        self._thread.start()
+        self._reactor.add(self)
 
     @property
     def pid(self) -> int:
@@ -188,33 +352,44 @@ class PtySession:
         This is intended for developer-mode diagnostics (e.g. terminal transcript tail).
         """
         limit = int(max_bytes or 0)
-        if limit <= 0:
-            limit = int(self._max_backlog_bytes or 0) or 2_000_000
+        if limit <= 0 or limit > self._max_backlog_bytes:
+            limit = self._max_backlog_bytes
         with self._lock:
-            chunks = list(self._backlog)
-        if not chunks:
-            return b""
-        out: list[bytes] = []
-        total = 0
-        for chunk in reversed(chunks):
-            out.append(chunk)
-            total += len(chunk)
-            if total >= limit:
-                break
-        data = b"".join(reversed(out))
-        if len(data) > limit:
-            data = data[-limit:]
-        return data
+            return self._ring.tail(limit)
+
+    def output_offset(self) -> int:
+        """Stream offset one past the newest output byte (monotonic for the session's lifetime)."""
+        with self._lock:
+            return self._ring.end_offset
+
+    def output_since(self, offset: int, *, max_bytes: int = 0) -> Tuple[bytes, int]:
+        """Return ``(data, first_offset)`` for backlog output at or after stream ``offset``.
+
+        ``first_offset`` is greater than ``offset`` when older bytes were already evicted
+        (or cleared); pass ``first_offset + len(data)`` as the next ``offset`` to follow the stream.
+        """
+        with self._lock:
+            start = max(int(offset or 0), self._ring.end_offset - self._max_backlog_bytes)
+            return self._ring.read_since(start, max_bytes=int(max_bytes or 0))
+
+    def render_tail(self, *, max_lines: int = 0, compact: bool = True) -> str:
+        """Rendered transcript (see ``render_transcript``) of the backlog, maintained incrementally.
+
+        Only output produced since the previous call is parsed; ``max_lines`` bounds the
+        rendering to the newest lines.
+        """
+        return self._transcript.render(self.output_since, compact=compact, max_lines=int(max_lines or 0))
 
     def clear_backlog(self) -> None:
         """Clear the in-memory PTY backlog/ring buffer (developer-mode only)."""
-        with self._lock:
-            try:
-                self._backlog.clear()
-            except Exception:
-                self._backlog = deque()
-            self._backlog_bytes = 0
-            self._mode_tail = b""
+
+        def _clear_ring() -> None:
+            with self._lock:
+                self._ring.clear()
+                self._mode_tail = b""
+
+        # Transcript lock first, then the session lock: the same order as render_tail.
+        self._transcript.reset(_clear_ring)
 
     def resize(self, *, cols: int, rows: int) -> None:
         if cols <= 0 or rows <= 0:
@@ -265,20 +440,16 @@ class PtySession:
             time.sleep(0.05)
         if self._proc.poll() is None:
             _best_effort_killpg(self.pid, signal.SIGKILL)
-        try:
-            os.close(self._master_fd)
-        except Exception:
-            pass
+        # The reactor unregisters the master fd before closing it, so a new session can never
+        # be handed the same fd number while the shared selector still tracks the old one.
+        self._reactor.finish(self)
 
     def attach_client(self, sock: socket.socket) -> None:
         try:
             self._attach_q.put_nowait(sock)
         except Exception:
             return
-        try:
-            os.write(self._cmd_w, b"x")
-        except Exception:
-            pass
+        self._reactor.call_soon(self._drain_attach_queue)
 
     def detach_client(self, fileno: int) -> None:
         with self._lock:
@@ -325,12 +496,7 @@ class PtySession:
             if self._first_output_at is None:
                 self._first_output_at = now
             self._last_output_at = now
-            self._backlog.append(chunk)
-            self._backlog_bytes += len(chunk)
-            limit = max(0, self._max_backlog_bytes)
-            while limit and self._backlog_bytes > limit and self._backlog:
-                drop = self._backlog.popleft()
-                self._backlog_bytes -= len(drop)
+            self._ring.write(chunk)
             merged = f"{self._terminal_signal_buffer}{text}"
             if len(merged) > TERMINAL_SIGNAL_BUFFER_CHARS:
                 merged = merged[-TERMINAL_SIGNAL_BUFFER_CHARS:]
@@ -350,19 +516,6 @@ class PtySession:
             os.close(self._master_fd)
         except Exception:
             pass
-        try:
-            self._selector.unregister(self._cmd_r)
-        except Exception:
-            pass
-        try:
-            os.close(self._cmd_r)
-        except Exception:
-            pass
-        try:
-            os.close(self._cmd_w)
-        except Exception:
-            pass
-
         with self._lock:
             items = list(self._clients.items())
             self._clients.clear()
@@ -379,10 +532,6 @@ class PtySession:
             except Exception:
                 pass
 
-        try:
-            self._selector.close()
-        except Exception:
-            pass
         while True:
             try:
                 sock = self._attach_q.get_nowait()
@@ -394,7 +543,9 @@ class PtySession:
                 pass
 
     def _on_pty_readable(self) -> None:
-        while True:
+        # Bounded so one chatty session cannot starve the others sharing the reactor; the
+        # selector is level-triggered and reports the fd again if more output is pending.
+        for _ in range(_MAX_READS_PER_EVENT):
             try:
                 chunk = os.read(self._master_fd, 65536)
             except BlockingIOError:
@@ -411,12 +562,13 @@ class PtySession:
             self._append_backlog(chunk)
             with self._lock:
                 clients = list(self._clients.items())
+                retained = self._ring.retained_offset
+                end = self._ring.end_offset
 
             for fileno, client in clients:
-                if self._max_client_buffer_bytes and (len(client.outbuf) + len(chunk) > self._max_client_buffer_bytes):
+                if client.offset < retained or end - client.offset > self._max_client_buffer_bytes:
                     self.detach_client(fileno)
                     continue
-                client.outbuf.extend(chunk)
                 try:
                     events = self._selector.get_key(client.sock).events
                     self._selector.modify(client.sock, events | selectors.EVENT_WRITE, data=("client", fileno))
@@ -468,17 +620,18 @@ class PtySession:
             keep = len(query) - 1
             self._query_tail = data[-keep:] if keep > 0 else b""
 
-    def _on_cmd_readable(self) -> None:
-        try:
-            os.read(self._cmd_r, 65536)
-        except Exception:
-            pass
-
+    def _drain_attach_queue(self) -> None:
         while True:
             try:
                 sock = self._attach_q.get_nowait()
             except queue.Empty:
                 return
+            if not self._running:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
+                continue
             self._attach_client_now(sock)
 
     def _attach_client_now(self, sock: socket.socket) -> None:
@@ -500,15 +653,16 @@ class PtySession:
             writer = self._writer_fd is None
             if writer:
                 self._writer_fd = fileno
-            backlog = b"".join(self._backlog) if self._backlog else b""
-            outbuf = bytearray(backlog)
-            client = _PtyClient(sock=sock, writer=writer, outbuf=outbuf)
+            # Replay the backlog by streaming it out of the ring from its start offset.
+            offset = max(self._ring.start_offset, self._ring.end_offset - self._max_backlog_bytes)
+            pending = self._ring.end_offset - offset
+            client = _PtyClient(sock=sock, writer=writer, offset=offset)
             self._clients[fileno] = client
 
         # Always register READ so the socket stays attached and disconnects can be observed.
         # WRITE is enabled only when there is pending backlog to flush.
         events = selectors.EVENT_READ
-        if outbuf:
+        if pending > 0:
             events |= selectors.EVENT_WRITE
         try:
             self._selector.register(sock, events, data=("client", fileno))
@@ -542,10 +696,16 @@ class PtySession:
     def _on_client_writable(self, fileno: int) -> None:
         with self._lock:
             client = self._clients.get(fileno)
-        if client is None:
+            if client is None:
+                return
+            # Only this (loop) thread writes the ring, so the views stay valid after unlocking.
+            first, views = self._ring.views(client.offset)
+        if first > client.offset:
+            # The ring overwrote bytes this client had not received yet.
+            self.detach_client(fileno)
             return
 
-        if not client.outbuf:
+        if not views:
             try:
                 events = self._selector.get_key(client.sock).events
                 self._selector.modify(client.sock, events & ~selectors.EVENT_WRITE, data=("client", fileno))
@@ -554,44 +714,31 @@ class PtySession:
             return
 
         try:
-            sent = client.sock.send(client.outbuf)
+            sent = client.sock.send(views[0])
         except BlockingIOError:
             return
         except Exception:
             self.detach_client(fileno)
             return
         if sent > 0:
-            del client.outbuf[:sent]
+            client.offset += sent
 
-    def _loop(self) -> None:
-        try:
-            while self._running and self._proc.poll() is None:
-                for key, mask in self._selector.select(timeout=0.1):
-                    kind, meta = key.data if isinstance(key.data, tuple) else ("", None)
-                    if kind == "pty":
-                        if mask & selectors.EVENT_READ:
-                            self._on_pty_readable()
-                        continue
-                    if kind == "cmd":
-                        if mask & selectors.EVENT_READ:
-                            self._on_cmd_readable()
-                        continue
-                    if kind == "client":
-                        fileno = int(meta or -1)
-                        if fileno < 0:
-                            continue
-                        if mask & selectors.EVENT_READ:
-                            self._on_client_readable(fileno)
-                        if mask & selectors.EVENT_WRITE:
-                            self._on_client_writable(fileno)
-        finally:
-            self._running = False
-            self._close_all()
-            if self._on_exit is not None:
-                try:
-                    self._on_exit(self)
-                except Exception:
-                    pass
+    def _on_reactor_added(self) -> None:
+        self._selector.register(self._master_fd, selectors.EVENT_READ, data=("pty", None))
+
+    def _dispatch(self, kind: str, meta: object, mask: int) -> None:
+        if kind == "pty":
+            if mask & selectors.EVENT_READ:
+                self._on_pty_readable()
+            return
+        if kind == "client":
+            fileno = int(meta or -1)  # type: ignore[call-overload]
+            if fileno < 0:
+                return
+            if mask & selectors.EVENT_READ:
+                self._on_client_readable(fileno)
+            if mask & selectors.EVENT_WRITE:
+                self._on_client_writable(fileno)
 
 
 class PtySupervisor:
@@ -652,6 +799,38 @@ class PtySupervisor:
         except Exception:
             return b""
 
+    def output_since(
+        self, *, group_id: str, actor_id: str, offset: int, max_bytes: int = 0
+    ) -> Tuple[bytes, int]:
+        """Return ``(data, first_offset)`` of an actor's PTY output at or after stream ``offset``.
+
+        Returns ``(b"", offset)`` when the actor has no PTY session.
+        """
+        key = (str(group_id or "").strip(), str(actor_id or "").strip())
+        if not key[0] or not key[1]:
+            return (b"", int(offset or 0))
+        with self._lock:
+            s = self._sessions.get(key)
+        if s is None:
+            return (b"", int(offset or 0))
+        try:
+            return s.output_since(int(offset or 0), max_bytes=int(max_bytes or 0))
+        except Exception:
+            return (b"", int(offset or 0))
+
+    def render_tail(self, *, group_id: str, actor_id: str, max_lines: int = 0, compact: bool = True) -> str:
+        key = (str(group_id or "").strip(), str(actor_id or "").strip())
+        if not key[0] or not key[1]:
+            return ""
+        with self._lock:
+            s = self._sessions.get(key)
+        if s is None:
+            return ""
+        try:
+            return s.render_tail(max_lines=int(max_lines or 0), compact=bool(compact))
+        except Exception:
+            return ""
+
     def clear_backlog(self, *, group_id: str, actor_id: str) -> bool:
         """Clear an actor's PTY backlog (returns False if actor not running)."""
         key = (str(group_id or "").strip(), str(actor_id or "").strip())
@@ -30,6 +30,14 @@ class PtySupervisor:
     def tail_output(self, *, group_id: str, actor_id: str, max_bytes: int = 2_000_000) -> bytes:
         return b""
 
+    def output_since(
+        self, *, group_id: str, actor_id: str, offset: int, max_bytes: int = 0
+    ) -> Tuple[bytes, int]:
+        return (b"", int(offset or 0))
+
+    def render_tail(self, *, group_id: str, actor_id: str, max_lines: int = 0, compact: bool = True) -> str:
+        return ""
+
     def terminal_override(self, *, group_id: str, actor_id: str):
         return None
 
@@ -7,12 +7,13 @@ import socket
 import subprocess
 import threading
 import time
-from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Dict, Iterable, Optional, Tuple
 
 from ..kernel.working_state import derive_pty_terminal_override
+from ..util.terminal_render import StreamTranscript
+from .output_ring import OutputRing
 from .platform_support import load_winpty_process_class, pty_support_error_message
 from ..util.process import terminate_pid
 
@@ -20,6 +21,7 @@ _WINPTY_PROCESS = load_winpty_process_class()
 
 PTY_SUPPORTED = bool(os.name == "nt" and _WINPTY_PROCESS is not None)
 TERMINAL_SIGNAL_BUFFER_CHARS = 4096
+TRANSCRIPT_MAX_ROWS = 10_000
 
 
 def _coerce_bytes(data: object) -> bytes:
@@ -41,7 +43,8 @@ def _looks_like_timeout(exc: BaseException) -> bool:
 class _PtyClient:
     sock: socket.socket
     writer: bool
-    outbuf: bytearray
+    # Stream offset of the next ring byte to send to this client.
+    offset: int
 
 
 class PtySession:
@@ -70,9 +73,11 @@ class PtySession:
         self._started_at = time.monotonic()
         self._first_output_at: Optional[float] = None
         self._last_output_at: Optional[float] = None
-        self._max_backlog_bytes = int(max_backlog_bytes)
+        self._max_backlog_bytes = int(max_backlog_bytes) if int(max_backlog_bytes or 0) > 0 else 2_000_000
         slack = max(2_000_000, int(self._max_backlog_bytes // 8))
         self._max_client_buffer_bytes = max(int(max_client_buffer_bytes), int(self._max_backlog_bytes + slack))
+        self._ring = OutputRing(self._max_backlog_bytes + slack)
+        self._transcript = StreamTranscript(max_rows=TRANSCRIPT_MAX_ROWS)
 
         self._selector = selectors.DefaultSelector()
         self._lock = threading.Lock()
@@ -80,8 +85,6 @@ class PtySession:
         self._writer_fd: Optional[int] = None
         self._attach_q: "queue.Queue[socket.socket]" = queue.Queue()
 
-        self._backlog: deque[bytes] = deque()
-        self._backlog_bytes = 0
         self._terminal_signal_buffer = ""
         self._terminal_override: Optional[Dict[str, str]] = None
         self._mode_tail = b""
@@ -205,33 +208,29 @@ class PtySession:
 
     def tail_output(self, *, max_bytes: int = 2_000_000) -> bytes:
         limit = int(max_bytes or 0)
-        if limit <= 0:
-            limit = int(self._max_backlog_bytes or 0) or 2_000_000
+        if limit <= 0 or limit > self._max_backlog_bytes:
+            limit = self._max_backlog_bytes
         with self._lock:
-            chunks = list(self._backlog)
-        if not chunks:
-            return b""
-        out: list[bytes] = []
-        total = 0
-        for chunk in reversed(chunks):
-            out.append(chunk)
-            total += len(chunk)
-            if total >= limit:
-                break
-        data = b"".join(reversed(out))
-        if len(data) > limit:
-            data = data[-limit:]
-        return data
+            return self._ring.tail(limit)
+
+    def output_offset(self) -> int:
+        with self._lock:
+            return self._ring.end_offset
+
+    def output_since(self, offset: int, *, max_bytes: int = 0) -> Tuple[bytes, int]:
+        with self._lock:
+            start = max(int(offset or 0), self._ring.end_offset - self._max_backlog_bytes)
+            return self._ring.read_since(start, max_bytes=int(max_bytes or 0))
+
+    def render_tail(self, *, max_lines: int = 0, compact: bool = True) -> str:
+        return self._transcript.render(self.output_since, compact=compact, max_lines=int(max_lines or 0))
 
     def clear_backlog(self) -> None:
         with self._lock:
-            try:
-                self._backlog.clear()
-            except Exception:
-                self._backlog = deque()
-            self._backlog_bytes = 0
+            self._ring.clear()
             self._mode_tail = b""
             self._query_tail = b""
+        self._transcript.reset()
 
     def _notify_wake(self) -> None:
         try:
@@ -248,12 +247,7 @@ class PtySession:
             if self._first_output_at is None:
                 self._first_output_at = now
             self._last_output_at = now
-            self._backlog.append(chunk)
-            self._backlog_bytes += len(chunk)
-            limit = max(0, self._max_backlog_bytes)
-            while limit and self._backlog_bytes > limit and self._backlog:
-                drop = self._backlog.popleft()
-                self._backlog_bytes -= len(drop)
+            self._ring.write(chunk)
             merged = f"{self._terminal_signal_buffer}{text}"
             if len(merged) > TERMINAL_SIGNAL_BUFFER_CHARS:
                 merged = merged[-TERMINAL_SIGNAL_BUFFER_CHARS:]
@@ -348,11 +342,12 @@ class PtySession:
             self._append_backlog(chunk)
             with self._lock:
                 clients = list(self._clients.items())
+                retained = self._ring.retained_offset
+                end = self._ring.end_offset
             for fileno, client in clients:
-                if self._max_client_buffer_bytes and (len(client.outbuf) + len(chunk) > self._max_client_buffer_bytes):
+                if client.offset < retained or end - client.offset > self._max_client_buffer_bytes:
                     self.detach_client(fileno)
                     continue
-                client.outbuf.extend(chunk)
                 try:
                     events = self._selector.get_key(client.sock).events
                     self._selector.modify(client.sock, events | selectors.EVENT_WRITE, data=("client", fileno))
@@ -508,13 +503,13 @@ class PtySession:
             writer = self._writer_fd is None
             if writer:
                 self._writer_fd = fileno
-            backlog = b"".join(self._backlog) if self._backlog else b""
-            outbuf = bytearray(backlog)
-            client = _PtyClient(sock=sock, writer=writer, outbuf=outbuf)
+            offset = max(self._ring.start_offset, self._ring.end_offset - self._max_backlog_bytes)
+            pending = self._ring.end_offset - offset
+            client = _PtyClient(sock=sock, writer=writer, offset=offset)
             self._clients[fileno] = client
 
         events = selectors.EVENT_READ
-        if outbuf:
+        if pending > 0:
             events |= selectors.EVENT_WRITE
         try:
             self._selector.register(sock, events, data=("client", fileno))
@@ -545,10 +540,14 @@ class PtySession:
     def _on_client_writable(self, fileno: int) -> None:
         with self._lock:
             client = self._clients.get(fileno)
-        if client is None:
+            if client is None:
+                return
+            first, views = self._ring.views(client.offset)
+        if first > client.offset:
+            self.detach_client(fileno)
             return
 
-        if not client.outbuf:
+        if not views:
             try:
                 events = self._selector.get_key(client.sock).events
                 self._selector.modify(client.sock, events & ~selectors.EVENT_WRITE, data=("client", fileno))
@@ -556,14 +555,14 @@ class PtySession:
                 self.detach_client(fileno)
             return
         try:
-            sent = client.sock.send(client.outbuf)
+            sent = client.sock.send(views[0])
         except BlockingIOError:
             return
         except Exception:
             self.detach_client(fileno)
             return
         if sent > 0:
-            del client.outbuf[:sent]
+            client.offset += sent
 
     def _close_all(self) -> None:
         try:
@@ -694,6 +693,34 @@ class PtySupervisor:
         except Exception:
             return b""
 
+    def output_since(
+        self, *, group_id: str, actor_id: str, offset: int, max_bytes: int = 0
+    ) -> Tuple[bytes, int]:
+        key = (str(group_id or "").strip(), str(actor_id or "").strip())
+        if not key[0] or not key[1]:
+            return (b"", int(offset or 0))
+        with self._lock:
+            s = self._sessions.get(key)
+        if s is None:
+            return (b"", int(offset or 0))
+        try:
+            return s.output_since(int(offset or 0), max_bytes=int(max_bytes or 0))
+        except Exception:
+            return (b"", int(offset or 0))
+
+    def render_tail(self, *, group_id: str, actor_id: str, max_lines: int = 0, compact: bool = True) -> str:
+        key = (str(group_id or "").strip(), str(actor_id or "").strip())
+        if not key[0] or not key[1]:
+            return ""
+        with self._lock:
+            s = self._sessions.get(key)
+        if s is None:
+            return ""
+        try:
+            return s.render_tail(max_lines=int(max_lines or 0), compact=bool(compact))
+        except Exception:
+            return ""
+
     def clear_backlog(self, *, group_id: str, actor_id: str) -> bool:
         key = (str(group_id or "").strip(), str(actor_id or "").strip())
         if not key[0] or not key[1]:
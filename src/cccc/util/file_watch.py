@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+_LOG = logging.getLogger("cccc.util.file_watch")
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_DIR_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+_LIBC: Any = None
+_LIBC_LOADED = False
+
+
+def _libc() -> Any:
+    global _LIBC, _LIBC_LOADED
+    if _LIBC_LOADED:
+        return _LIBC
+    _LIBC_LOADED = True
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        lib.inotify_init1.argtypes = [ctypes.c_int]
+        lib.inotify_init1.restype = ctypes.c_int
+        lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        lib.inotify_add_watch.restype = ctypes.c_int
+        _LIBC = lib
+    except Exception as e:
+        _LOG.debug("inotify unavailable: %s", e)
+        _LIBC = None
+    return _LIBC
+
+
+def _notifications_enabled() -> bool:
+    # CCCC_FILE_WATCH=poll forces the portable polling fallback.
+    return str(os.environ.get("CCCC_FILE_WATCH") or "").strip().lower() != "poll"
+
+
+def _wait_readable(fds: Sequence[int], timeout: float) -> set[int]:
+    """Return the fds in `fds` that become readable within `timeout` seconds.
+
+    Uses poll(2) rather than select(2), which rejects fds >= FD_SETSIZE (1024) in
+    processes holding many descriptors (daemon, bridge host).
+    """
+    poller = select.poll()
+    for fd in fds:
+        poller.register(fd, select.POLLIN)
+    events = poller.poll(max(0, int(timeout * 1000 + 0.999)))
+    return {fd for fd, _mask in events}
+
+
+class FileChangeWatcher:
+    """Wait for appends to, or replacement of, one file.
+
+    On Linux the parent directory is watched with inotify, so waits return as soon
+    as the file changes and idle waits cost no CPU. Elsewhere (or when inotify is
+    unavailable) wait() degrades to sleeping for the poll interval, which matches
+    the old readline()+sleep() tail loops. Spurious wakeups are possible either
+    way; callers always re-read the file after a wait.
+
+    Create the watcher before the first read so no change can slip in between.
+    """
+
+    def __init__(self, path: Path, *, poll_interval: float = 0.2, idle_timeout: float = 5.0) -> None:
+        self.path = Path(path)
+        self.poll_interval = max(0.01, float(poll_interval or 0.2))
+        # With notifications, still wake up periodically so callers can re-stat (e.g. after
+        # the parent directory was replaced) and emit heartbeats.
+        self.idle_timeout = max(self.poll_interval, float(idle_timeout or 0.0))
+        self._name = os.fsencode(self.path.name)
+        self._fd = -1
+        self._open_inotify()
+
+    def _open_inotify(self) -> None:
+        if not _notifications_enabled():
+            return
+        lib = _libc()
+        if lib is None:
+            return
+        fd = int(lib.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC))
+        if fd < 0:
+            _LOG.debug("inotify_init1 failed: errno=%s", ctypes.get_errno())
+            return
+        wd = int(lib.inotify_add_watch(fd, os.fsencode(str(self.path.parent)), _DIR_MASK))
+        if wd < 0:
+            _LOG.debug("inotify_add_watch failed: path=%s errno=%s", self.path.parent, ctypes.get_errno())
+            os.close(fd)
+            return
+        self._fd = fd
+
+    @property
+    def event_driven(self) -> bool:
+        return self._fd >= 0
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def _default_timeout(self) -> float:
+        return self.idle_timeout if self._fd >= 0 else self.poll_interval
+
+    def _drain(self) -> bool:
+        """Consume queued notifications; True if any concerned the watched file."""
+        changed = False
+        dir_gone = False
+        while self._fd >= 0:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                _LOG.debug("inotify read failed: %s", e)
+                self.close()
+                return True
+            if not buf:
+                break
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(buf):
+                _wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(buf, pos)
+                pos += _EVENT_HEADER.size
+                name = buf[pos : pos + name_len].rstrip(b"\0")
+                pos += name_len
+                if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                    dir_gone = True
+                if mask & _IN_Q_OVERFLOW or name == self._name:
+                    changed = True
+            if dir_gone:
+                # The watched directory itself went away; reopen against its replacement.
+                self.close()
+                self._open_inotify()
+                return True
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file may have changed or `timeout` elapses (default: idle/poll interval)."""
+        limit = self._default_timeout() if timeout is None else max(0.0, float(timeout))
+        if self._fd < 0:
+            time.sleep(limit)
+            return True
+        deadline = time.monotonic() + limit
+        while True:
+            if self._drain():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._fd < 0:
+                return self._fd < 0
+            try:
+                ready = _wait_readable([self._fd], remaining)
+            except InterruptedError:
+                continue
+            except OSError:
+                return True
+            if not ready:
+                return False
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """asyncio variant of wait(), using the event loop's reader callbacks."""
+        limit = self._default_timeout() if timeout is None else max(0.0, float(timeout))
+        if self._fd < 0:
+            await asyncio.sleep(limit)
+            return True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + limit
+        while True:
+            if self._drain():
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._fd < 0:
+                return self._fd < 0
+            fd = self._fd
+            ready: asyncio.Future[None] = loop.create_future()
+
+            def _on_readable() -> None:
+                if not ready.done():
+                    ready.set_result(None)
+
+            try:
+                loop.add_reader(fd, _on_readable)
+            except (NotImplementedError, RuntimeError, ValueError, OSError):
+                await asyncio.sleep(min(remaining, self.poll_interval))
+                return True
+            try:
+                await asyncio.wait({ready}, timeout=remaining)
+            finally:
+                try:
+                    loop.remove_reader(fd)
+                except Exception:
+                    pass
+                if not ready.done():
+                    ready.cancel()
+            if not ready.done() or ready.cancelled():
+                return False
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, -1
+        if fd >= 0:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "FileChangeWatcher":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def wait_any(watchers: Sequence[FileChangeWatcher], timeout: float) -> List[FileChangeWatcher]:
+    """Block until any of `watchers` sees a change or `timeout` elapses; return those that changed.
+
+    One poll() covers every notification-backed watcher, so a process following many
+    files does not need a wait per file. Polling-only watchers are always reported as
+    (possibly) changed once the wait ends.
+    """
+    limit = max(0.0, float(timeout))
+    live = [w for w in watchers if w.event_driven]
+    polled = [w for w in watchers if not w.event_driven]
+    changed = [w for w in live if w._drain()]
+    if changed or not live:
+        if not changed:
+            time.sleep(limit)
+        return changed + polled
+    try:
+        ready_fds = _wait_readable([w.fileno() for w in live], limit)
+    except InterruptedError:
+        ready_fds = set()
+    except OSError:
+        return list(watchers)
+    changed = [w for w in live if w.fileno() in ready_fds and w._drain()]
+    return changed + polled
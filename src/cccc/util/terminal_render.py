@@ -1,9 +1,20 @@
 from __future__ import annotations
 
-from typing import Optional
+import codecs
+import re
+import threading
+from typing import Callable, Optional, Tuple
 
 
 _HR_CHARS = set("─━-=═")
+# Runs of characters that are written to the screen as-is.
+_PLAIN_RUN = re.compile(r"[^\x1b\n\r\b\x00]+")
+_CSI_FINAL = re.compile(r"[@-~]")
+_OSC_END = re.compile(r"\x07|\x1b\\")
+# An unterminated escape sequence longer than this is dropped instead of carried over.
+_MAX_PENDING_ESCAPE = 65536
+# Clamp for cursor-movement parameters so a bogus "ESC[99999999B" cannot allocate huge buffers.
+_MAX_CSI_PARAM = 10_000
 
 
 def _is_horizontal_rule(line: str) -> bool:
@@ -40,72 +51,6 @@ def _parse_csi_params(param_str: str) -> list[int]:
     return out
 
 
-def _ensure_row(buf: list[list[str]], row: int) -> None:
-    while len(buf) <= row:
-        buf.append([])
-
-
-def _ensure_col(line: list[str], col: int) -> None:
-    if col < 0:
-        return
-    if len(line) <= col:
-        line.extend([" "] * (col + 1 - len(line)))
-
-
-def _set_char(buf: list[list[str]], row: int, col: int, ch: str) -> None:
-    if row < 0 or col < 0:
-        return
-    _ensure_row(buf, row)
-    line = buf[row]
-    _ensure_col(line, col)
-    line[col] = ch
-
-
-def _erase_in_line(buf: list[list[str]], row: int, col: int, mode: int) -> None:
-    if row < 0:
-        return
-    _ensure_row(buf, row)
-    line = buf[row]
-    if mode == 2:
-        # Clear entire line.
-        buf[row] = []
-        return
-    if mode == 1:
-        # Clear from start to cursor.
-        if col <= 0:
-            return
-        _ensure_col(line, col - 1)
-        for i in range(0, col):
-            line[i] = " "
-        return
-    # mode 0: clear from cursor to end.
-    if col < 0:
-        col = 0
-    if col >= len(line):
-        return
-    for i in range(col, len(line)):
-        line[i] = " "
-
-
-def _erase_in_display(buf: list[list[str]], row: int, col: int, mode: int) -> None:
-    if mode == 2:
-        # Clear whole screen.
-        buf.clear()
-        buf.append([])
-        return
-    if mode == 1:
-        # Clear from start to cursor.
-        for r in range(0, max(0, row)):
-            if r < len(buf):
-                buf[r] = []
-        _erase_in_line(buf, row, col, 1)
-        return
-    # mode 0: clear from cursor to end.
-    _erase_in_line(buf, row, col, 0)
-    for r in range(row + 1, len(buf)):
-        buf[r] = []
-
-
 def _compact_consecutive_duplicate_lines(lines: list[str]) -> list[str]:
     if not lines:
         return []
@@ -163,189 +108,302 @@ def _compact_consecutive_duplicate_blocks(
     return out
 
 
-def render_transcript(text: str, *, compact: bool = True) -> str:
-    """Render a best-effort, readable transcript from terminal output.
+class TerminalScreen:
+    """Incrementally fed screen/scrollback model behind ``render_transcript``.
 
-    Goals:
-    - Render terminal output into a stable, readable text view (best-effort)
-    - Handle common cursor movement + erase sequences so TUIs don't duplicate frames
-    - Optionally compact consecutive duplicated frames (common for TUIs)
-    - Keep output readable for debugging and incident review
+    Rows are plain strings and the cursor state survives between ``feed`` calls (an
+    escape sequence split across chunks is carried over), so a session can feed
+    output as it arrives and only pay for the new bytes. With ``max_rows`` the oldest
+    rows are dropped once the buffer grows past it. ``render`` is cached until the
+    next change and, given ``max_lines``, only looks at the newest rows.
 
     This is not a full terminal emulator; it is a pragmatic transcript renderer.
     """
-    s = (text or "")
-    if not s:
-        return ""
-
-    # Normalize common CRLF line endings.
-    s = s.replace("\r\n", "\n")
-
-    # Screen buffer.
-    buf: list[list[str]] = [[]]
-    row = 0
-    col = 0
-    saved_row = 0
-    saved_col = 0
 
-    i = 0
-    n = len(s)
-    while i < n:
-        ch = s[i]
-
-        # ESC sequences.
-        if ch == "\x1b":
-            if i + 1 >= n:
-                break
-            nxt = s[i + 1]
-
-            # OSC: ESC ] ... BEL  OR  ESC ] ... ESC \
-            if nxt == "]":
-                j = i + 2
-                while j < n:
-                    if s[j] == "\x07":
-                        j += 1
-                        break
-                    if s[j] == "\x1b" and j + 1 < n and s[j + 1] == "\\":
-                        j += 2
-                        break
-                    j += 1
+    def __init__(self, *, max_rows: int = 0) -> None:
+        self._max_rows = max(0, int(max_rows or 0))
+        self.reset()
+
+    def reset(self) -> None:
+        self._rows: list[str] = [""]
+        self._row = 0
+        self._col = 0
+        self._saved_row = 0
+        self._saved_col = 0
+        self._pending = ""
+        self._version = 0
+        self._render_cache: Optional[Tuple[Tuple[int, bool, int], str]] = None
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+        s = self._pending + text if self._pending else text
+        self._pending = ""
+        i = 0
+        n = len(s)
+        while i < n:
+            ch = s[i]
+            if ch == "\x1b":
+                j = self._escape(s, i)
+                if j < 0:
+                    # Incomplete sequence: finish it with the next chunk.
+                    if n - i <= _MAX_PENDING_ESCAPE:
+                        self._pending = s[i:]
+                    break
                 i = j
                 continue
-
-            # CSI: ESC [ ... <final>
-            if nxt == "[":
-                j = i + 2
-                private = False
-                if j < n and s[j] == "?":
-                    private = True
-                    j += 1
-                param_start = j
-                while j < n and not ("@" <= s[j] <= "~"):
-                    j += 1
-                if j >= n:
-                    break
-                final = s[j]
-                params = _parse_csi_params(s[param_start:j])
-
-                # Private modes: ignore (e.g. bracketed paste / alt screen toggles).
-                if private:
-                    i = j + 1
-                    continue
-
-                # SGR: styles/colors
-                if final == "m":
-                    i = j + 1
-                    continue
-
-                # Cursor position
-                if final in ("H", "f"):
-                    r = params[0] if len(params) >= 1 else 1
-                    c = params[1] if len(params) >= 2 else 1
-                    row = max(0, int(r) - 1)
-                    col = max(0, int(c) - 1)
-                    _ensure_row(buf, row)
-                    i = j + 1
-                    continue
-
-                # Cursor movements
-                if final == "A":  # up
-                    k = params[0] if params else 1
-                    row = max(0, row - int(k))
-                    i = j + 1
-                    continue
-                if final == "B":  # down
-                    k = params[0] if params else 1
-                    row = row + int(k)
-                    _ensure_row(buf, row)
-                    i = j + 1
-                    continue
-                if final == "C":  # forward
-                    k = params[0] if params else 1
-                    col = col + int(k)
-                    i = j + 1
-                    continue
-                if final == "D":  # back
-                    k = params[0] if params else 1
-                    col = max(0, col - int(k))
-                    i = j + 1
-                    continue
-                if final == "G":  # CHA (horizontal absolute)
-                    c = params[0] if params else 1
-                    col = max(0, int(c) - 1)
-                    i = j + 1
-                    continue
-                if final == "d":  # VPA (vertical absolute)
-                    r = params[0] if params else 1
-                    row = max(0, int(r) - 1)
-                    _ensure_row(buf, row)
-                    i = j + 1
-                    continue
-
-                # Erase in display / line
-                if final == "J":
-                    mode = params[0] if params else 0
-                    _erase_in_display(buf, row, col, int(mode))
-                    row = max(0, min(row, len(buf) - 1))
-                    col = max(0, col)
-                    i = j + 1
-                    continue
-                if final == "K":
-                    mode = params[0] if params else 0
-                    _erase_in_line(buf, row, col, int(mode))
-                    i = j + 1
-                    continue
-
-                # Save/restore cursor (best-effort)
-                if final == "s":
-                    saved_row, saved_col = row, col
-                    i = j + 1
-                    continue
-                if final == "u":
-                    row, col = saved_row, saved_col
-                    _ensure_row(buf, row)
-                    i = j + 1
-                    continue
-
-                # Unknown CSI: ignore.
-                i = j + 1
+            if ch == "\n":
+                self._row += 1
+                self._col = 0
+                self._ensure_row(self._row)
+                i += 1
+                continue
+            if ch == "\r":
+                self._col = 0
+                i += 1
+                continue
+            if ch == "\b":
+                self._col = max(0, self._col - 1)
+                i += 1
+                continue
+            if ch == "\x00":
+                i += 1
                 continue
+            m = _PLAIN_RUN.match(s, i)
+            assert m is not None
+            self._write(m.group())
+            i = m.end()
+        self._version += 1
+        self._trim()
+
+    def render(self, *, compact: bool = True, max_lines: int = 0) -> str:
+        """Render the buffer (or, with ``max_lines``, roughly its last ``max_lines`` output lines)."""
+        key = (self._version, bool(compact), max(0, int(max_lines or 0)))
+        if self._render_cache is not None and self._render_cache[0] == key:
+            return self._render_cache[1]
+        limit = key[2]
+        if limit <= 0:
+            out_lines = self._render_lines(self._rows, compact=compact)
+        else:
+            # Compaction can only shrink the output, so widen the raw window until it yields
+            # enough lines (or covers every row).
+            window = max(limit * 2, 120)
+            while True:
+                rows = self._rows[-window:]
+                out_lines = self._render_lines(rows, compact=compact)
+                if len(out_lines) >= limit or len(rows) >= len(self._rows):
+                    break
+                window *= 2
+            out_lines = out_lines[-limit:]
+        text = "\n".join(out_lines).rstrip()
+        self._render_cache = (key, text)
+        return text
+
+    # -- internals ----------------------------------------------------------------------
+
+    @staticmethod
+    def _render_lines(rows: list[str], *, compact: bool) -> list[str]:
+        out_lines = [line.rstrip() for line in rows]
+        # Trim trailing empty lines.
+        while out_lines and not out_lines[-1].strip():
+            out_lines.pop()
+        if compact:
+            out_lines = _compact_consecutive_duplicate_lines(out_lines)
+            out_lines = _compact_consecutive_duplicate_blocks(out_lines)
+        return out_lines
+
+    def _ensure_row(self, row: int) -> None:
+        missing = row + 1 - len(self._rows)
+        if missing > 0:
+            self._rows.extend([""] * missing)
+
+    def _write(self, run: str) -> None:
+        row, col = self._row, self._col
+        self._ensure_row(row)
+        line = self._rows[row]
+        if len(line) < col:
+            line += " " * (col - len(line))
+        self._rows[row] = line[:col] + run + line[col + len(run) :]
+        self._col = col + len(run)
+
+    def _erase_in_line(self, row: int, col: int, mode: int) -> None:
+        self._ensure_row(row)
+        line = self._rows[row]
+        if mode == 2:
+            # Clear entire line.
+            self._rows[row] = ""
+            return
+        if mode == 1:
+            # Clear from start to cursor.
+            if col <= 0:
+                return
+            self._rows[row] = " " * col + line[col:]
+            return
+        # mode 0: clear from cursor to end.
+        if col >= len(line):
+            return
+        self._rows[row] = line[:col] + " " * (len(line) - col)
 
-            # Other ESC: ignore.
-            i += 2
-            continue
+    def _erase_in_display(self, row: int, col: int, mode: int) -> None:
+        if mode == 2:
+            # Clear whole screen.
+            self._rows = [""]
+            return
+        if mode == 1:
+            # Clear from start to cursor.
+            for r in range(0, min(row, len(self._rows))):
+                self._rows[r] = ""
+            self._erase_in_line(row, col, 1)
+            return
+        # mode 0: clear from cursor to end.
+        self._erase_in_line(row, col, 0)
+        for r in range(row + 1, len(self._rows)):
+            self._rows[r] = ""
+
+    def _escape(self, s: str, i: int) -> int:
+        """Apply the escape sequence at ``s[i]``; return the index after it, or -1 if incomplete."""
+        n = len(s)
+        if i + 1 >= n:
+            return -1
+        nxt = s[i + 1]
+
+        # OSC: ESC ] ... BEL  OR  ESC ] ... ESC \
+        if nxt == "]":
+            m = _OSC_END.search(s, i + 2)
+            return m.end() if m is not None else -1
+
+        # Other ESC: ignore (the pair swallows a whole CRLF, as the line ending is one "\n").
+        if nxt != "[":
+            if nxt == "\r":
+                if i + 2 >= n:
+                    return -1
+                if s[i + 2] == "\n":
+                    return i + 3
+            return i + 2
+
+        # CSI: ESC [ ... <final>
+        j = i + 2
+        private = j < n and s[j] == "?"
+        if private:
+            j += 1
+        m = _CSI_FINAL.search(s, j)
+        if m is None:
+            return -1
+        end = m.end()
+        # Private modes (e.g. bracketed paste / alt screen toggles) and SGR styles: ignore.
+        final = m.group()
+        if private or final == "m":
+            return end
+        params = [min(p, _MAX_CSI_PARAM) for p in _parse_csi_params(s[j : m.start()])]
+
+        if final in ("H", "f"):  # cursor position
+            r = params[0] if len(params) >= 1 else 1
+            c = params[1] if len(params) >= 2 else 1
+            self._row = max(0, r - 1)
+            self._col = max(0, c - 1)
+            self._ensure_row(self._row)
+        elif final == "A":  # up
+            self._row = max(0, self._row - (params[0] if params else 1))
+        elif final == "B":  # down
+            self._row += params[0] if params else 1
+            self._ensure_row(self._row)
+        elif final == "C":  # forward
+            self._col += params[0] if params else 1
+        elif final == "D":  # back
+            self._col = max(0, self._col - (params[0] if params else 1))
+        elif final == "G":  # CHA (horizontal absolute)
+            self._col = max(0, (params[0] if params else 1) - 1)
+        elif final == "d":  # VPA (vertical absolute)
+            self._row = max(0, (params[0] if params else 1) - 1)
+            self._ensure_row(self._row)
+        elif final == "J":  # erase in display
+            self._erase_in_display(self._row, self._col, params[0] if params else 0)
+            self._row = max(0, min(self._row, len(self._rows) - 1))
+        elif final == "K":  # erase in line
+            self._erase_in_line(self._row, self._col, params[0] if params else 0)
+        elif final == "s":  # save cursor (best-effort)
+            self._saved_row, self._saved_col = self._row, self._col
+        elif final == "u":  # restore cursor
+            self._row, self._col = self._saved_row, self._saved_col
+            self._ensure_row(self._row)
+        # Unknown CSI: ignore.
+        return end
+
+    def _trim(self) -> None:
+        if not self._max_rows:
+            return
+        excess = len(self._rows) - self._max_rows
+        # Trim in batches so the list is not shifted on every new line.
+        if excess <= max(1, self._max_rows // 8):
+            return
+        del self._rows[:excess]
+        self._row = max(0, self._row - excess)
+        self._saved_row = max(0, self._saved_row - excess)
 
-        # Controls
-        if ch == "\n":
-            row += 1
-            col = 0
-            _ensure_row(buf, row)
-            i += 1
-            continue
-        if ch == "\r":
-            col = 0
-            i += 1
-            continue
-        if ch == "\b":
-            col = max(0, col - 1)
-            i += 1
-            continue
-        if ch == "\x00":
-            i += 1
-            continue
 
-        # Printable
-        _set_char(buf, row, col, ch)
-        col += 1
-        i += 1
+class StreamTranscript:
+    """A ``TerminalScreen`` kept up to date from an offset-addressed byte stream.
+
+    ``read_since(offset)`` must return ``(data, first_offset)`` for the stream bytes at
+    or after ``offset`` (e.g. ``PtySession.output_since``). Each render feeds only the
+    bytes that arrived since the previous one; if the stream skipped ahead (evicted or
+    cleared backlog) the screen restarts from the surviving bytes.
+    """
+
+    def __init__(self, *, max_rows: int = 0) -> None:
+        self._lock = threading.Lock()
+        self._screen = TerminalScreen(max_rows=max_rows)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._offset = 0
+
+    def reset(self, clear_stream: Optional[Callable[[], None]] = None) -> None:
+        """Forget the rendered screen; the next render starts from the stream's current backlog.
+
+        ``clear_stream`` (e.g. dropping the source backlog) runs under the render lock, so a
+        concurrent render cannot feed bytes read before the clear into the fresh screen.
+        """
+        with self._lock:
+            if clear_stream is not None:
+                clear_stream()
+            self._screen.reset()
+            self._decoder.reset()
+
+    def render(
+        self,
+        read_since: Callable[[int], Tuple[bytes, int]],
+        *,
+        compact: bool = True,
+        max_lines: int = 0,
+    ) -> str:
+        with self._lock:
+            data, first = read_since(self._offset)
+            if first != self._offset:
+                self._screen.reset()
+                self._decoder.reset()
+            if data:
+                self._screen.feed(self._decoder.decode(data))
+            self._offset = first + len(data)
+            return self._screen.render(compact=compact, max_lines=max_lines)
 
-    out_lines = ["".join(line).rstrip() for line in buf]
-    # Trim trailing empty lines.
-    while out_lines and not out_lines[-1].strip():
-        out_lines.pop()
 
-    if compact:
-        out_lines = _compact_consecutive_duplicate_lines(out_lines)
-        out_lines = _compact_consecutive_duplicate_blocks(out_lines)
+def render_transcript(text: str, *, compact: bool = True) -> str:
+    """Render a best-effort, readable transcript from terminal output.
 
-    return "\n".join(out_lines).rstrip()
+    Goals:
+    - Render terminal output into a stable, readable text view (best-effort)
+    - Handle common cursor movement + erase sequences so TUIs don't duplicate frames
+    - Optionally compact consecutive duplicated frames (common for TUIs)
+    - Keep output readable for debugging and incident review
+
+    Long-lived sessions should keep a ``TerminalScreen``/``StreamTranscript`` instead of
+    re-rendering their whole output tail.
+    """
+    if not text:
+        return ""
+    screen = TerminalScreen()
+    screen.feed(text)
+    return screen.render(compact=compact)
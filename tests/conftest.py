@@ -0,0 +1,34 @@
+import sys
+import tempfile
+
+import pytest
+
+
+def _drain_daemon_background_writers() -> None:
+    # Only modules a test actually imported can have started background work.
+    server = sys.modules.get("cccc.daemon.server")
+    if server is not None:
+        server.wait_for_auto_wakes()
+    context_ops = sys.modules.get("cccc.daemon.context.context_ops")
+    if context_ops is not None:
+        context_ops.wait_for_summary_rebuilds()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _drain_before_temp_home_cleanup():
+    """Drain daemon background writers before any TemporaryDirectory is removed.
+
+    Tests point CCCC_HOME at a TemporaryDirectory and remove it as soon as their last
+    op returns, while auto-wake and summary-rebuild threads may still be writing there.
+    """
+    original_cleanup = tempfile.TemporaryDirectory.cleanup
+
+    def cleanup(self) -> None:
+        _drain_daemon_background_writers()
+        original_cleanup(self)
+
+    tempfile.TemporaryDirectory.cleanup = cleanup
+    try:
+        yield
+    finally:
+        tempfile.TemporaryDirectory.cleanup = original_cleanup
@@ -63,6 +63,38 @@ class TestAccessTokens(unittest.TestCase):
         finally:
             cleanup()
 
+    def test_lookup_reuses_parsed_table_until_file_changes(self) -> None:
+        import time
+        from unittest.mock import patch
+
+        import yaml
+
+        from cccc.kernel.access_tokens import access_tokens_active, create_access_token, lookup_access_token
+
+        home, cleanup = self._with_home()
+        try:
+            self.assertFalse(access_tokens_active())
+            token = str(create_access_token("user-a").get("token") or "")
+            path = home / "access_tokens.yaml"
+            old = time.time() - 60
+            os.utime(path, (old, old))
+
+            with patch("cccc.kernel.access_tokens.yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+                for _ in range(5):
+                    self.assertEqual(str((lookup_access_token(token) or {}).get("user_id") or ""), "user-a")
+                    self.assertTrue(access_tokens_active())
+                self.assertIsNone(lookup_access_token(token + "x"))
+                self.assertEqual(safe_load.call_count, 1)
+
+                # Edits made outside save_access_tokens are picked up via the mtime check.
+                path.write_text("tokens:\n  acc_other:\n    user_id: user-b\n", encoding="utf-8")
+                os.utime(path, (old + 1, old + 1))
+                self.assertIsNone(lookup_access_token(token))
+                self.assertEqual(str((lookup_access_token("acc_other") or {}).get("user_id") or ""), "user-b")
+                self.assertEqual(safe_load.call_count, 2)
+        finally:
+            cleanup()
+
     def test_create_access_token_requires_user_id(self) -> None:
         from cccc.kernel.access_tokens import create_access_token
 
@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+
+def _utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestAutomationCronNextFire(unittest.TestCase):
+    def setUp(self) -> None:
+        from cccc.daemon.automation import engine
+
+        engine._CRON_NEXT_FIRE_CACHE.clear()
+
+    def _next(self, expr: str, tz: str, now: datetime):
+        from cccc.daemon.automation.engine import _cron_next_fire_utc
+
+        return _cron_next_fire_utc(cron_expr=expr, tz_name=tz, now_utc=now)
+
+    def test_basic_fields_and_rounding(self) -> None:
+        self.assertEqual(self._next("*/15 * * * *", "UTC", _utc(2026, 1, 1, 10, 7, 30)), _utc(2026, 1, 1, 10, 15))
+        # An exact minute boundary counts as "now".
+        self.assertEqual(self._next("0 9 * * *", "UTC", _utc(2026, 1, 1, 9, 0, 0)), _utc(2026, 1, 1, 9, 0))
+        self.assertEqual(self._next("0 9 * * *", "UTC", _utc(2026, 1, 1, 9, 0, 1)), _utc(2026, 1, 2, 9, 0))
+        # 2026-01-03 is a Saturday; weekday-only rules skip to Monday.
+        self.assertEqual(self._next("30 9 * * 1-5", "UTC", _utc(2026, 1, 3, 0, 0)), _utc(2026, 1, 5, 9, 30))
+        # dom and dow both restricted: either matches (Vixie cron semantics).
+        self.assertEqual(self._next("0 0 13 * 5", "UTC", _utc(2026, 2, 1, 0, 1)), _utc(2026, 2, 6, 0, 0))
+        self.assertEqual(self._next("0 8 * * *", "Asia/Shanghai", _utc(2026, 1, 1, 0, 30)), _utc(2026, 1, 2, 0, 0))
+
+    def test_yearly_and_impossible_expressions(self) -> None:
+        self.assertEqual(self._next("0 0 29 2 *", "UTC", _utc(2026, 3, 1)), _utc(2028, 2, 29))
+        self.assertIsNone(self._next("0 0 30 2 *", "UTC", _utc(2026, 3, 1)))
+        self.assertIsNone(self._next("0 0 31 4,6,9,11 *", "UTC", _utc(2026, 3, 1)))
+
+    def test_dst_gap_is_skipped_and_rollback_fires_twice(self) -> None:
+        # 2026-03-08 02:00 EST jumps to 03:00 EDT: 02:30 does not exist that day.
+        self.assertEqual(self._next("30 2 * * *", "America/New_York", _utc(2026, 3, 8, 5, 0)), _utc(2026, 3, 9, 6, 30))
+        # 2026-11-01 02:00 EDT falls back to 01:00 EST: 01:30 happens twice.
+        first = self._next("30 1 * * *", "America/New_York", _utc(2026, 11, 1, 5, 0))
+        self.assertEqual(first, _utc(2026, 11, 1, 5, 30))
+        second = self._next("30 1 * * *", "America/New_York", first + timedelta(minutes=1))
+        self.assertEqual(second, _utc(2026, 11, 1, 6, 30))
+        # Late in the first pass, the repeated hour is still ahead.
+        self.assertEqual(self._next("10 1 * * *", "America/New_York", _utc(2026, 11, 1, 5, 50)), _utc(2026, 11, 1, 6, 10))
+
+    def test_results_are_cached_per_minute(self) -> None:
+        from cccc.daemon.automation import engine
+
+        now = _utc(2026, 1, 1, 10, 7, 5)
+        with patch.object(engine, "_cron_solve_next_fire", wraps=engine._cron_solve_next_fire) as solve:
+            a = self._next("0 0 1 1 *", "UTC", now)
+            b = self._next("0 0 1 1 *", "UTC", now + timedelta(seconds=20))
+            c = self._next("0 0 1 1 *", "UTC", now + timedelta(minutes=1))
+        self.assertEqual(a, _utc(2027, 1, 1))
+        self.assertEqual(a, b)
+        self.assertEqual(a, c)
+        self.assertEqual(solve.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
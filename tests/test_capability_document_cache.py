@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+def _normalize(raw):
+    doc = dict(raw) if isinstance(raw, dict) else {}
+    doc.setdefault("items", {})
+    return doc
+
+
+class TestCapabilityDocumentCache(unittest.TestCase):
+    def setUp(self) -> None:
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.path = Path(td.name) / "state.json"
+
+    def _cache(self, write_behind_s: float = 0.0):
+        from cccc.daemon.ops.capability_ops import CapabilityDocumentCache
+
+        cache = CapabilityDocumentCache(write_behind_s=write_behind_s)
+        self.addCleanup(cache.flush)
+        return cache
+
+    def test_loads_are_cached_isolated_and_revalidated(self) -> None:
+        self.path.write_text(json.dumps({"items": {"a": [1]}}), encoding="utf-8")
+        cache = self._cache()
+        first = cache.load(self.path, _normalize)
+        first["items"]["a"].append(2)
+        second = cache.load(self.path, _normalize)
+        self.assertEqual(second, {"items": {"a": [1]}})
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+
+        # An external rewrite is picked up through the mtime/size check.
+        self.path.write_text(json.dumps({"items": {"b": [3, 4]}}), encoding="utf-8")
+        os.utime(self.path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+        self.assertEqual(cache.load(self.path, _normalize), {"items": {"b": [3, 4]}})
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_synchronous_saves_write_through(self) -> None:
+        cache = self._cache()
+        cache.save(self.path, {"items": {"a": 1}}, _normalize)
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {"items": {"a": 1}})
+        self.assertEqual(cache.load(self.path, _normalize), {"items": {"a": 1}})
+        stats = cache.stats()
+        self.assertEqual((stats["writes"], stats["hits"], stats["misses"]), (1, 1, 0))
+
+    def test_write_behind_coalesces_saves_into_one_write(self) -> None:
+        cache = self._cache(write_behind_s=60.0)
+        for i in range(20):
+            doc = cache.load(self.path, _normalize)
+            doc["items"][f"k{i}"] = i
+            cache.save(self.path, doc, _normalize)
+        self.assertFalse(self.path.exists())
+        self.assertEqual(len(cache.load(self.path, _normalize)["items"]), 20)
+
+        cache.flush()
+        self.assertEqual(len(json.loads(self.path.read_text(encoding="utf-8"))["items"]), 20)
+        stats = cache.stats()
+        self.assertEqual((stats["saves"], stats["writes"], stats["coalesced"], stats["pending"]), (20, 1, 19, 0))
+
+    def test_background_writer_flushes_after_window(self) -> None:
+        cache = self._cache(write_behind_s=0.05)
+        cache.save(self.path, {"items": {"a": 1}}, _normalize)
+        deadline = time.monotonic() + 3.0
+        while not self.path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {"items": {"a": 1}})
+
+        # Pending writes into a directory that has since been removed are dropped.
+        gone = self.path.parent / "gone" / "state.json"
+        gone.parent.mkdir()
+        cache.set_write_behind(60.0)
+        cache.save(gone, {"items": {}}, _normalize)
+        gone.parent.rmdir()
+        cache.flush()
+        self.assertFalse(gone.parent.exists())
+        self.assertEqual(cache.stats()["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_FAKE_STDIO_SERVER = textwrap.dedent(
+    """
+    import json, os, sys, time
+
+    inits = 0
+    for line in sys.stdin:
+        req = json.loads(line)
+        if "id" not in req:
+            continue
+        method = req.get("method")
+        if method == "initialize":
+            inits += 1
+            result = {"protocolVersion": "2024-11-05", "capabilities": {}}
+        elif method == "tools/call":
+            name = req["params"]["name"]
+            if name == "crash":
+                sys.stderr.write("boom\\n")
+                sys.stderr.flush()
+                os._exit(3)
+            if name == "sleep":
+                time.sleep(float(req["params"]["arguments"].get("s") or 0))
+            result = {"pid": os.getpid(), "inits": inits, "env": os.environ.get("POOL_TEST_ENV", "")}
+        else:
+            result = {}
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": result}) + "\\n")
+        sys.stdout.flush()
+    """
+)
+
+
+class TestCapabilityRuntimePool(unittest.TestCase):
+    def setUp(self) -> None:
+        from cccc.daemon.ops.capability_ops import close_capability_runtime_pool
+
+        close_capability_runtime_pool()
+        self.addCleanup(close_capability_runtime_pool)
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.script = Path(td.name) / "fake_mcp.py"
+        self.script.write_text(_FAKE_STDIO_SERVER, encoding="utf-8")
+
+    def _install(self, env=None):
+        invoker = {"type": "package_stdio", "command": [sys.executable, str(self.script)]}
+        if env:
+            invoker["env"] = env
+        return {"invoker": invoker}
+
+    def _call(self, install, name="whoami", **arguments):
+        from cccc.daemon.ops.capability_ops import _invoke_installed_external_tool
+
+        return _invoke_installed_external_tool(install, real_tool_name=name, arguments=arguments)
+
+    def test_stdio_sessions_are_reused_and_restarted_after_crash(self) -> None:
+        from cccc.daemon.ops.capability_ops import _capability_runtime_pool
+
+        install = self._install()
+        first = self._call(install)
+        second = self._call(install)
+        self.assertEqual(first["pid"], second["pid"])
+        self.assertEqual(second["inits"], 1)
+
+        with self.assertRaisesRegex(RuntimeError, "exited with code 3: boom"):
+            self._call(install, "crash")
+        third = self._call(install)
+        self.assertNotEqual(third["pid"], first["pid"])
+        pool = _capability_runtime_pool()
+        assert pool is not None
+        self.assertEqual(pool.stats["restarted"], 1)
+
+        # Different env overrides get their own process.
+        other = self._call(self._install(env={"POOL_TEST_ENV": "x"}))
+        self.assertEqual(other["env"], "x")
+        self.assertNotEqual(other["pid"], third["pid"])
+
+    def test_timeout_kills_session_and_idle_sessions_are_evicted(self) -> None:
+        from cccc.daemon.ops.capability_ops import _capability_runtime_pool
+
+        install = self._install()
+        first = self._call(install)
+        pool = _capability_runtime_pool()
+        assert pool is not None
+        with self.assertRaises(TimeoutError):
+            pool.request(install["invoker"], "tools/call", {"name": "sleep", "arguments": {"s": 5}}, timeout_s=0.3)
+        self.assertNotEqual(self._call(install)["pid"], first["pid"])
+
+        self.assertEqual(pool.evict_idle(now=time.monotonic() + pool.idle_ttl_s + 1), 1)
+        self.assertEqual(len(pool._sessions), 0)
+        self.assertEqual(pool._key_locks, {})
+
+    def test_max_processes_evicts_least_recently_used(self) -> None:
+        from cccc.daemon.ops.capability_ops import CapabilityRuntimePool
+        from cccc.daemon.ops.capability_ops._mcp_pool import _invoker_pool_key
+
+        pool = CapabilityRuntimePool(max_processes=1, idle_ttl_s=60, health_check_after_s=60)
+        self.addCleanup(pool.close_all)
+        a = self._install(env={"POOL_TEST_ENV": "a"})["invoker"]
+        b = self._install(env={"POOL_TEST_ENV": "b"})["invoker"]
+        pid_a = pool.request(a, "tools/call", {"name": "whoami", "arguments": {}}, timeout_s=10)["result"]["pid"]
+        pool.request(b, "tools/call", {"name": "whoami", "arguments": {}}, timeout_s=10)
+        self.assertEqual(list(pool._sessions), [_invoker_pool_key(b)])
+        self.assertEqual(set(pool._key_locks), set(pool._sessions))
+        self.assertNotEqual(pool.request(a, "tools/call", {"name": "whoami", "arguments": {}}, timeout_s=10)["result"]["pid"], pid_a)
+
+    def test_concurrent_cold_starts_respect_max_processes(self) -> None:
+        from cccc.daemon.ops.capability_ops import CapabilityRuntimePool
+
+        class _FakeSession:
+            alive = True
+            in_flight = 1
+
+            def __init__(self) -> None:
+                self.last_used = time.monotonic()
+
+            def close(self) -> None:
+                return None
+
+        pool = CapabilityRuntimePool(max_processes=1, idle_ttl_s=60, health_check_after_s=60)
+        release = threading.Event()
+        started: list = []
+
+        def _factory():
+            started.append(1)
+            release.wait(5.0)
+            return _FakeSession()
+
+        results: dict = {}
+        first = threading.Thread(target=lambda: results.setdefault("a", pool._acquire(("stdio", "a", ""), _factory)))
+        first.start()
+        deadline = time.monotonic() + 5.0
+        while not started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # The first start is still running; its reserved slot leaves no room for another key.
+        self.assertIsNone(pool._acquire(("stdio", "b", ""), _factory))
+        release.set()
+        first.join(5.0)
+        self.assertIsNotNone(results.get("a"))
+        self.assertEqual((len(started), list(pool._sessions)), (1, [("stdio", "a", "")]))
+        self.assertEqual(pool._starting, 0)
+
+    def test_pool_can_be_disabled(self) -> None:
+        from cccc.daemon.ops.capability_ops import _capability_runtime_pool
+
+        os.environ["CCCC_CAPABILITY_RUNTIME_POOL"] = "0"
+        try:
+            self.assertIsNone(_capability_runtime_pool())
+            install = self._install()
+            self.assertNotEqual(self._call(install)["pid"], self._call(install)["pid"])
+        finally:
+            os.environ.pop("CCCC_CAPABILITY_RUNTIME_POOL", None)
+
+    def test_http_sessions_reuse_mcp_session_id(self) -> None:
+        state = {"inits": 0, "calls": [], "expire": False}
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args) -> None:
+                return None
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                session = self.headers.get("Mcp-Session-Id") or ""
+                if body.get("method") == "initialize":
+                    state["inits"] += 1
+                    session = f"s{state['inits']}"
+                    payload = {"jsonrpc": "2.0", "id": body["id"], "result": {}}
+                elif "id" not in body:
+                    self.send_response(202)
+                    self.end_headers()
+                    return
+                elif state["expire"] and session == "s1":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                else:
+                    state["calls"].append(session)
+                    payload = {"jsonrpc": "2.0", "id": body["id"], "result": {"session": session}}
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Mcp-Session-Id", session)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        install = {"invoker": {"type": "remote_http", "url": f"http://127.0.0.1:{server.server_address[1]}/mcp"}}
+        self.assertEqual(self._call(install)["session"], "s1")
+        self.assertEqual(self._call(install)["session"], "s1")
+        self.assertEqual(state["inits"], 1)
+
+        state["expire"] = True
+        self.assertEqual(self._call(install)["session"], "s2")
+        self.assertEqual(state["inits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
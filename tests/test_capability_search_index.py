@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+def _record(cap_id: str, name: str, description: str = "", **extra):
+    rec = {
+        "capability_id": cap_id,
+        "kind": "mcp_toolpack",
+        "name": name,
+        "description_short": description,
+        "source_id": "mcp_registry_official",
+        "source_tier": "official",
+        "trust_tier": "official",
+        "qualification_status": "qualified",
+        "enable_supported": True,
+        "sync_state": "fresh",
+    }
+    rec.update(extra)
+    return rec
+
+
+_CORPUS = [
+    _record("mcp:github", "GitHub", "Issues and pull requests", tags=["vcs", "git"]),
+    _record("mcp:gitlab", "GitLab", "Merge requests", tool_names=["list_pipelines"]),
+    _record("mcp:postgres", "Postgres", "Query a PostgreSQL database", tags=["sql"]),
+    _record("mcp:browser", "Browser automation", "Drive a headless browser", use_when=["scrape web pages"]),
+    _record("skill:web-search", "Web search", "Search the web", kind="skill"),
+    _record("mcp:desktop-commander", "desktop-commander", "Terminal and file tools"),
+    _record("mcp:ab", "ab", "tiny"),
+]
+
+
+class TestCapabilitySearchIndex(unittest.TestCase):
+    def _index(self, records):
+        from cccc.daemon.ops.capability_ops._search import _search_fields
+        from cccc.daemon.ops.capability_ops._search_index import CapabilitySearchIndex
+
+        index = CapabilitySearchIndex(_search_fields)
+        index.sync(lambda: records, signature=None)
+        return index
+
+    def test_matches_agree_with_linear_search(self) -> None:
+        from cccc.daemon.ops.capability_ops import _search_matches
+
+        index = self._index(_CORPUS)
+        queries = [
+            "git", "github", "itla", "pipelines", "postgresql", "sql database", "mcp", "tools",
+            "mcp server git", "scrape", "desktop-commander", "ab", "a", "web search", "nothing-here",
+        ]
+        for query in queries:
+            expected = {r["capability_id"] for r in _CORPUS if _search_matches(query, r)}
+            self.assertEqual(set(index.query(query, score_tokens=[]).matched or ()), expected, query)
+
+    def test_sync_reindexes_only_changed_records(self) -> None:
+        index = self._index(_CORPUS)
+        self.assertEqual(index.stats()["indexed"], len(_CORPUS))
+
+        updated = [dict(r) for r in _CORPUS[:-1]]
+        updated[0]["description_short"] = "Code hosting with actions"
+        index.sync(lambda: updated, signature=("v2",))
+        stats = index.stats()
+        self.assertEqual((stats["indexed"], stats["removed"]), (len(_CORPUS) + 1, 1))
+        self.assertEqual(set(index.query("actions", score_tokens=[]).matched or ()), {"mcp:github"})
+        self.assertEqual(index.query("tiny", score_tokens=[]).matched, frozenset())
+
+        index.sync(lambda: self.fail("loader must not run for an unchanged signature"), signature=("v2",))
+        self.assertEqual(index.stats()["skipped_syncs"], 1)
+
+    def test_relevance_prefers_name_hits(self) -> None:
+        index = self._index(
+            [
+                _record("mcp:a", "Notes", "Sync with calendar"),
+                _record("mcp:b", "Calendar", "Sync notes"),
+            ]
+        )
+        hits = index.query("calendar", score_tokens=["calendar"], relevance_tokens=["calendar"])
+        self.assertEqual(hits.token_scores, {"mcp:a": 1, "mcp:b": 1})
+        self.assertGreater(hits.relevance["mcp:b"], hits.relevance["mcp:a"])
+        self.assertGreater(index.relevance_of(_record("mcp:c", "Calendar"), ["calendar"]), 0.0)
+
+
+class TestCapabilitySearchIndexIntegration(unittest.TestCase):
+    def _call(self, op: str, args: dict):
+        from cccc.contracts.v1 import DaemonRequest
+        from cccc.daemon.server import handle_request
+
+        return handle_request(DaemonRequest.model_validate({"op": op, "args": args}))
+
+    def test_search_reflects_catalog_updates(self) -> None:
+        from cccc.daemon.ops import capability_ops as ops
+
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as td, patch.dict(
+            os.environ, {"CCCC_HOME": td, "CCCC_CAPABILITY_SEARCH_REMOTE_FALLBACK": "0"}
+        ):
+            cfg_dir = Path(td) / "config"
+            cfg_dir.mkdir(parents=True, exist_ok=True)
+            (cfg_dir / "capability-allowlist.user.yaml").write_text(
+                "defaults:\n  source_level:\n    mcp_registry_official: mounted\n",
+                encoding="utf-8",
+            )
+            create_resp, _ = self._call("group_create", {"title": "search-index", "topic": "", "by": "user"})
+            self.assertTrue(create_resp.ok, getattr(create_resp, "error", None))
+            gid = str((create_resp.result or {}).get("group_id") or "")
+
+            def search(query: str):
+                resp, _ = self._call(
+                    "capability_search",
+                    {"group_id": gid, "by": "user", "query": query, "include_external": True, "limit": 50},
+                )
+                self.assertTrue(resp.ok, getattr(resp, "error", None))
+                return [str(item.get("capability_id") or "") for item in (resp.result or {}).get("items") or []]
+
+            catalog_path, catalog_doc = ops._load_catalog_doc()
+            catalog_doc["records"]["mcp:zebra-notes"] = _record("mcp:zebra-notes", "Zebra notes", "Striped notebook")
+            catalog_doc["records"]["mcp:zebra-calendar"] = _record("mcp:zebra-calendar", "Calendar", "zebra sync")
+            ops._save_catalog_doc(catalog_path, catalog_doc)
+            # Equal lexical score: the name hit outranks the description hit.
+            self.assertEqual(search("zebra"), ["mcp:zebra-notes", "mcp:zebra-calendar"])
+
+            indexed_before = ops._search._SEARCH_INDEX.stats()["indexed"]
+            catalog_path, catalog_doc = ops._load_catalog_doc()
+            catalog_doc["records"]["mcp:zebra-notes"]["name"] = "Okapi notes"
+            ops._save_catalog_doc(catalog_path, catalog_doc)
+            self.assertEqual(search("okapi"), ["mcp:zebra-notes"])
+            self.assertEqual(ops._search._SEARCH_INDEX.stats()["indexed"], indexed_before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2207,7 +2207,7 @@ class TestCodexAppFlow(unittest.TestCase):
                 if str(item.get("type") or "") == "headless.message.delta"
                 and str(((item.get("data") or {}).get("stream_id") or "")) == "msg-fallback"
             ]
-            self.assertEqual([str((item.get("data") or {}).get("delta") or "") for item in deltas], ["Hel", "lo"])
+            self.assertEqual([str((item.get("data") or {}).get("delta") or "") for item in deltas], ["Hello"])
 
             completed = next(
                 item for item in headless_events
@@ -2552,6 +2552,8 @@ class TestCodexAppFlow(unittest.TestCase):
                     "session_id": "sess-1",
                 }
             )
+            # Activity updates are coalesced for a short window; read the log after it is written out.
+            session._events.flush()
 
             events_path = headless_events_path(loaded_group.path)
             self.assertTrue(events_path.exists())
@@ -328,10 +328,12 @@ class TestContextV2Ops(unittest.TestCase):
             )
             self.assertTrue(ok_resp.ok, getattr(ok_resp, "error", None))
 
-            from cccc.daemon.context.context_ops import _rebuild_summary_snapshot
+            from cccc.daemon.context.context_ops import _rebuild_summary_snapshot, _wait_for_summary_snapshot_rebuild
 
             from cccc.kernel.context import ContextStorage
 
+            # The sync scheduled a background rebuild; it must not run under the patches below.
+            _wait_for_summary_snapshot_rebuild(gid, timeout_s=2.0)
             _rebuild_summary_snapshot(gid)
 
             original_list_tasks = ContextStorage.list_tasks
@@ -384,10 +386,12 @@ class TestContextV2Ops(unittest.TestCase):
             )
             self.assertTrue(seed_resp.ok, getattr(seed_resp, "error", None))
 
-            from cccc.daemon.context.context_ops import _rebuild_summary_snapshot
+            from cccc.daemon.context.context_ops import _rebuild_summary_snapshot, _wait_for_summary_snapshot_rebuild
 
             from cccc.kernel.context import ContextStorage
 
+            # The sync scheduled a background rebuild; it must not run under the patches below.
+            _wait_for_summary_snapshot_rebuild(gid, timeout_s=2.0)
             _rebuild_summary_snapshot(gid)
 
             original_list_tasks = ContextStorage.list_tasks
@@ -522,9 +526,11 @@ class TestContextV2Ops(unittest.TestCase):
             )
             self.assertTrue(sync_resp.ok, getattr(sync_resp, "error", None))
 
-            from cccc.daemon.context.context_ops import _rebuild_summary_snapshot
+            from cccc.daemon.context.context_ops import _rebuild_summary_snapshot, _wait_for_summary_snapshot_rebuild
             from cccc.kernel.context import ContextStorage
 
+            # The sync scheduled a background rebuild; it must not consume the mocked sequences.
+            _wait_for_summary_snapshot_rebuild(gid, timeout_s=2.0)
             stable_basis = {"context_rev": 1, "tasks_rev": 0, "agents_rev": 0, "actors_rev": 0}
             newer_basis = {"context_rev": 2, "tasks_rev": 0, "agents_rev": 0, "actors_rev": 0}
 
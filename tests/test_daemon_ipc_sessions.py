@@ -0,0 +1,152 @@
+import logging
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+class TestDaemonIpcSessions(unittest.TestCase):
+    def setUp(self) -> None:
+        from cccc.daemon.client_ops import close_daemon_sessions
+
+        close_daemon_sessions()
+        self.addCleanup(close_daemon_sessions)
+
+    def _start_server(self, sock_path: Path, *, sessions: bool = True):
+        """Accept loop wired like the daemon's, with a threaded executor that replies out of order."""
+        from cccc.contracts.v1 import DaemonRequest, DaemonResponse
+        from cccc.daemon.ops.socket_accept_ops import handle_incoming_connection
+        from cccc.daemon.ops.socket_session_ops import close_all_ipc_sessions, start_ipc_session
+        from cccc.daemon.socket_protocol_ops import dump_response, recv_json_line, send_json
+
+        stop = threading.Event()
+        accepted = []
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen(16)
+        server.settimeout(0.05)
+
+        def handle(req):
+            delay = float(req.args.get("delay") or 0.0)
+            time.sleep(delay)
+            if req.op == "ipc_session":
+                return DaemonResponse(ok=False, error={"code": "unknown_op", "message": "unknown op"}), False
+            return DaemonResponse(ok=True, result={"echo": req.args.get("n")}), False
+
+        def schedule(req, conn) -> bool:
+            def _run() -> None:
+                resp, _ = handle(req)
+                try:
+                    send_json(conn, dump_response(resp))
+                finally:
+                    conn.close()
+
+            threading.Thread(target=_run, daemon=True).start()
+            return True
+
+        def serve() -> None:
+            while not stop.is_set():
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                accepted.append(conn)
+                handle_incoming_connection(
+                    conn,
+                    recv_json_line=recv_json_line,
+                    parse_request=DaemonRequest.model_validate,
+                    make_invalid_request_error=lambda err: DaemonResponse(ok=False, error={"code": "invalid_request", "message": err}),
+                    send_json=send_json,
+                    dump_response=dump_response,
+                    try_handle_special=lambda _req, _conn: False,
+                    handle_request=handle,
+                    schedule_request=schedule,
+                    start_session=(
+                        (
+                            lambda _req, c: start_ipc_session(
+                                c,
+                                parse_request=DaemonRequest.model_validate,
+                                schedule_request=schedule,
+                                send_json=send_json,
+                                dump_response=dump_response,
+                                stop_event=stop,
+                                logger=logging.getLogger("test"),
+                            )
+                        )
+                        if sessions
+                        else None
+                    ),
+                    logger=logging.getLogger("test"),
+                )
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+
+        def shutdown() -> None:
+            stop.set()
+            close_all_ipc_sessions()
+            thread.join(timeout=1)
+            server.close()
+
+        self.addCleanup(shutdown)
+        return accepted
+
+    def _call(self, sock_path: Path, n: int, *, delay: float = 0.0):
+        from cccc.daemon.client_ops import send_daemon_request
+
+        return send_daemon_request(
+            {"transport": "unix", "path": str(sock_path)},
+            {"v": 1, "op": "ping", "args": {"n": n, "delay": delay}},
+            timeout_s=2.0,
+            sock_path_default=sock_path,
+            reuse_connection=True,
+        )
+
+    def test_concurrent_requests_share_one_connection(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            sock_path = Path(td) / "d.sock"
+            accepted = self._start_server(sock_path)
+            self.assertEqual(self._call(sock_path, 0)["result"], {"echo": 0})
+
+            results = {}
+
+            def worker(n: int) -> None:
+                # Earlier requests finish last, so replies come back out of order.
+                results[n] = self._call(sock_path, n, delay=0.05 * (5 - n))
+
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=5)
+            self.assertEqual({n: r["result"]["echo"] for n, r in results.items()}, {1: 1, 2: 2, 3: 3, 4: 4})
+            self.assertLessEqual(len(accepted), 2)
+
+    def test_reconnects_after_daemon_drops_sessions(self) -> None:
+        from cccc.daemon.ops.socket_session_ops import close_all_ipc_sessions
+
+        with tempfile.TemporaryDirectory() as td:
+            sock_path = Path(td) / "d.sock"
+            accepted = self._start_server(sock_path)
+            self.assertTrue(self._call(sock_path, 1)["ok"])
+            close_all_ipc_sessions()
+            time.sleep(0.05)
+            self.assertEqual(self._call(sock_path, 2)["result"], {"echo": 2})
+            self.assertEqual(len(accepted), 2)
+
+    def test_falls_back_to_one_shot_for_daemons_without_sessions(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            sock_path = Path(td) / "d.sock"
+            accepted = self._start_server(sock_path, sessions=False)
+            self.assertEqual(self._call(sock_path, 1)["result"], {"echo": 1})
+            self.assertEqual(self._call(sock_path, 2)["result"], {"echo": 2})
+            # One rejected upgrade, then one connection per request without re-probing.
+            self.assertEqual(len(accepted), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -146,15 +146,15 @@ class TestWebhookAtMention:
         """Webhook body should include at.atUserIds when at_user_ids provided."""
         captured: List[bytes] = []
 
-        def mock_urlopen(req, timeout=None):
-            captured.append(req.data)
+        def mock_request(method, url, content=None, **_kwargs):
+            captured.append(content)
             resp = MagicMock()
-            resp.read.return_value = json.dumps({"errcode": 0}).encode()
-            resp.__enter__ = lambda s: resp
-            resp.__exit__ = lambda s, *a: None
+            resp.content = json.dumps({"errcode": 0}).encode()
             return resp
 
-        with patch("cccc.ports.im.adapters.dingtalk.urllib.request.urlopen", side_effect=mock_urlopen):
+        client = MagicMock()
+        client.request.side_effect = mock_request
+        with patch("cccc.ports.im.adapters.dingtalk.shared_http_client", return_value=client):
             ok = adapter._send_via_webhook(
                 "https://webhook.example.com",
                 "Hello group",
@@ -171,15 +171,15 @@ class TestWebhookAtMention:
         """Webhook body should NOT include at field when at_user_ids is None."""
         captured: List[bytes] = []
 
-        def mock_urlopen(req, timeout=None):
-            captured.append(req.data)
+        def mock_request(method, url, content=None, **_kwargs):
+            captured.append(content)
             resp = MagicMock()
-            resp.read.return_value = json.dumps({"errcode": 0}).encode()
-            resp.__enter__ = lambda s: resp
-            resp.__exit__ = lambda s, *a: None
+            resp.content = json.dumps({"errcode": 0}).encode()
             return resp
 
-        with patch("cccc.ports.im.adapters.dingtalk.urllib.request.urlopen", side_effect=mock_urlopen):
+        client = MagicMock()
+        client.request.side_effect = mock_request
+        with patch("cccc.ports.im.adapters.dingtalk.shared_http_client", return_value=client):
             ok = adapter._send_via_webhook(
                 "https://webhook.example.com",
                 "Hello group",
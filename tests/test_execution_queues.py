@@ -125,5 +125,117 @@ class TestExecutionQueues(unittest.TestCase):
         self.assertEqual(reruns, [("g1", True, "peer2")])
 
 
+    def tearDown(self) -> None:
+        from cccc.daemon.ops.execution_queues import _unregister_executor
+
+        _unregister_executor("test-write")
+
+    def _sharded_executor(self, handle, *, workers: int = 3):
+        from cccc.daemon.ops.execution_queues import GroupShardedRequestExecutor
+
+        stop_event = threading.Event()
+        executor = GroupShardedRequestExecutor(
+            stop_event=stop_event,
+            handle_request=handle,
+            send_json=lambda queued_conn, payload: queued_conn.sent.append(payload),
+            dump_response=lambda resp: resp.model_dump(),
+            logger=__import__("logging").getLogger("test"),
+            on_should_exit=lambda: None,
+            lane_for=lambda req: req.get("group_id") or "",
+            name="test-write",
+        )
+        threads = [threading.Thread(target=executor.run_forever, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        def stop() -> None:
+            stop_event.set()
+            for thread in threads:
+                thread.join(timeout=1.0)
+
+        self.addCleanup(stop)
+        return executor
+
+    @staticmethod
+    def _wait_closed(conns: list[_Conn], timeout: float = 2.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not all(c.closed for c in conns):
+            time.sleep(0.01)
+
+    def test_sharded_executor_runs_groups_in_parallel_and_each_group_in_order(self) -> None:
+        from cccc.contracts.v1 import DaemonResponse
+
+        release_a = threading.Event()
+        order: list[str] = []
+
+        def handle(req):
+            if req["name"] == "a1":
+                release_a.wait(2.0)
+            order.append(req["name"])
+            return DaemonResponse(ok=True, result={}), False
+
+        executor = self._sharded_executor(handle)
+        conns = {name: _Conn() for name in ("a1", "a2", "b1")}
+        executor.submit(conn=conns["a1"], req={"group_id": "g_a", "name": "a1"})
+        executor.submit(conn=conns["a2"], req={"group_id": "g_a", "name": "a2"})
+        executor.submit(conn=conns["b1"], req={"group_id": "g_b", "name": "b1"})
+
+        # Group B is not stuck behind the long request in group A; A's second request is.
+        self._wait_closed([conns["b1"]])
+        self.assertTrue(conns["b1"].closed)
+        self.assertFalse(conns["a2"].closed)
+
+        release_a.set()
+        self._wait_closed(list(conns.values()))
+        self.assertEqual(order, ["b1", "a1", "a2"])
+
+        stats = executor.stats()
+        self.assertEqual(stats["workers"], 3)
+        self.assertEqual(stats["lanes"]["g_a"]["completed"], 2)
+        self.assertEqual(stats["lanes"]["g_a"]["max_depth"], 2)
+        self.assertGreater(stats["lanes"]["g_a"]["wait_max_ms"], 0.0)
+
+    def test_sharded_executor_global_lane_is_exclusive(self) -> None:
+        from cccc.contracts.v1 import DaemonResponse
+        from cccc.daemon.ops.execution_queues import REQUEST_WRITE_GLOBAL_LANE, request_execution_stats
+
+        release_a = threading.Event()
+        lock = threading.Lock()
+        active: set[str] = set()
+        overlaps: list[tuple[str, frozenset]] = []
+        order: list[str] = []
+
+        def handle(req):
+            name = req["name"]
+            with lock:
+                if active:
+                    overlaps.append((name, frozenset(active)))
+                active.add(name)
+            if name == "a1":
+                release_a.wait(2.0)
+            time.sleep(0.02)
+            with lock:
+                active.discard(name)
+                order.append(name)
+            return DaemonResponse(ok=True, result={}), False
+
+        executor = self._sharded_executor(handle)
+        conns = {name: _Conn() for name in ("a1", "global", "b1")}
+        executor.submit(conn=conns["a1"], req={"group_id": "g_a", "name": "a1"})
+        time.sleep(0.05)
+        executor.submit(conn=conns["global"], req={"name": "global"})
+        executor.submit(conn=conns["b1"], req={"group_id": "g_b", "name": "b1"})
+        time.sleep(0.1)
+        # The waiting global request holds back group B as well.
+        self.assertFalse(conns["b1"].closed)
+
+        release_a.set()
+        self._wait_closed(list(conns.values()))
+        self.assertEqual(order, ["a1", "global", "b1"])
+        self.assertEqual(overlaps, [])
+        self.assertIn(REQUEST_WRITE_GLOBAL_LANE, executor.stats()["lanes"])
+        self.assertIn("test-write", request_execution_stats())
+
+
 if __name__ == "__main__":
     unittest.main()
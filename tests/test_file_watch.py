@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+class TestFileChangeWatcher(unittest.TestCase):
+    def _append_later(self, path: Path, text: str, delay: float = 0.05) -> threading.Thread:
+        def _write() -> None:
+            time.sleep(delay)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(text)
+
+        t = threading.Thread(target=_write)
+        t.start()
+        return t
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_wait_returns_on_append_before_idle_timeout(self) -> None:
+        from cccc.util.file_watch import FileChangeWatcher
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "ledger.jsonl"
+            path.touch()
+            with FileChangeWatcher(path, idle_timeout=10.0) as watcher:
+                self.assertTrue(watcher.event_driven)
+                t = self._append_later(path, "{}\n")
+                started = time.monotonic()
+                self.assertTrue(watcher.wait())
+                self.assertLess(time.monotonic() - started, 5.0)
+                t.join()
+                watcher.wait(0.05)  # drain the writer's trailing close notification
+
+                # Writes to sibling files do not count as changes.
+                (Path(td) / "other.txt").write_text("x", encoding="utf-8")
+                self.assertFalse(watcher.wait(0.05))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_wait_sees_file_replacement(self) -> None:
+        from cccc.util.file_watch import FileChangeWatcher
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "ledger.jsonl"
+            path.write_text("old\n", encoding="utf-8")
+            with FileChangeWatcher(path, idle_timeout=10.0) as watcher:
+                tmp = Path(td) / "ledger.jsonl.tmp"
+                tmp.write_text("new\n", encoding="utf-8")
+                self.assertFalse(watcher.wait(0.05))
+                os.replace(tmp, path)
+                self.assertTrue(watcher.wait(1.0))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_waits_block_for_descriptors_above_fd_setsize(self) -> None:
+        import resource
+
+        from cccc.util.file_watch import FileChangeWatcher, wait_any
+
+        high_fd = 1500
+        if resource.getrlimit(resource.RLIMIT_NOFILE)[0] <= high_fd:
+            self.skipTest("fd limit too low")
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "ledger.jsonl"
+            path.touch()
+            with FileChangeWatcher(path, idle_timeout=10.0) as watcher:
+                os.dup2(watcher._fd, high_fd)
+                os.close(watcher._fd)
+                watcher._fd = high_fd
+                self.assertFalse(watcher.wait(0.1))
+                started = time.monotonic()
+                self.assertEqual(wait_any([watcher], 0.1), [])
+                self.assertGreaterEqual(time.monotonic() - started, 0.09)
+                t = self._append_later(path, "{}\n")
+                self.assertEqual(wait_any([watcher], 5.0), [watcher])
+                t.join()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_wait_async_returns_on_append(self) -> None:
+        from cccc.util.file_watch import FileChangeWatcher
+
+        async def _run(path: Path) -> bool:
+            with FileChangeWatcher(path, idle_timeout=10.0) as watcher:
+                t = self._append_later(path, "{}\n")
+                try:
+                    return await asyncio.wait_for(watcher.wait_async(), timeout=5.0)
+                finally:
+                    t.join()
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "ledger.jsonl"
+            path.touch()
+            self.assertTrue(asyncio.run(_run(path)))
+
+    def test_polling_fallback_sleeps_for_poll_interval(self) -> None:
+        from cccc.util.file_watch import FileChangeWatcher
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "ledger.jsonl"
+            path.touch()
+            with patch.dict(os.environ, {"CCCC_FILE_WATCH": "poll"}):
+                watcher = FileChangeWatcher(path, poll_interval=0.01, idle_timeout=10.0)
+            try:
+                self.assertFalse(watcher.event_driven)
+                started = time.monotonic()
+                self.assertTrue(watcher.wait())
+                self.assertLess(time.monotonic() - started, 1.0)
+            finally:
+                watcher.close()
+
+    def test_follow_yields_appended_lines(self) -> None:
+        from cccc.kernel.ledger import follow
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "ledger.jsonl"
+            lines = follow(path, sleep_seconds=0.05)
+            t = self._append_later(path, "a\nb\n", delay=0.1)
+            # follow() opens lazily on first next(); the delayed writer lands after the seek to end.
+            self.assertEqual(next(lines), "a")
+            self.assertEqual(next(lines), "b")
+            t.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
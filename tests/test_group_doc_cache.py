@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+class TestGroupDocCache(unittest.TestCase):
+    def _with_home(self):
+        old_home = os.environ.get("CCCC_HOME")
+        td_ctx = tempfile.TemporaryDirectory()
+        td = td_ctx.__enter__()
+        os.environ["CCCC_HOME"] = td
+
+        def cleanup() -> None:
+            td_ctx.__exit__(None, None, None)
+            if old_home is None:
+                os.environ.pop("CCCC_HOME", None)
+            else:
+                os.environ["CCCC_HOME"] = old_home
+
+        return td, cleanup
+
+    def _create_group(self) -> str:
+        from cccc.kernel.group import create_group
+        from cccc.kernel.registry import load_registry
+
+        reg = load_registry()
+        group = create_group(reg, title="cache")
+        return group.group_id
+
+    def test_repeated_loads_parse_once_and_return_private_copies(self) -> None:
+        from cccc.kernel import group as group_module
+        from cccc.kernel.group import load_group
+
+        _, cleanup = self._with_home()
+        try:
+            group_id = self._create_group()
+            with patch.object(group_module.yaml, "safe_load", wraps=group_module.yaml.safe_load) as parse:
+                first = load_group(group_id)
+                second = load_group(group_id)
+            assert first is not None and second is not None
+            self.assertEqual(parse.call_count, 1)
+
+            first.doc["title"] = "mutated"
+            first.doc["actors"].append({"id": "ghost"})
+            third = load_group(group_id)
+            assert third is not None
+            self.assertEqual(third.doc["title"], "cache")
+            self.assertEqual(third.doc["actors"], [])
+        finally:
+            cleanup()
+
+    def test_save_and_external_writes_are_picked_up(self) -> None:
+        from cccc.kernel.group import load_group
+
+        _, cleanup = self._with_home()
+        try:
+            group_id = self._create_group()
+            group = load_group(group_id)
+            assert group is not None
+            group.doc["title"] = "renamed"
+            group.save()
+            reloaded = load_group(group_id)
+            assert reloaded is not None
+            self.assertEqual(reloaded.doc["title"], "renamed")
+
+            # A write from another process (same size, rewritten in place) is caught by mtime/inode.
+            path = reloaded.path / "group.yaml"
+            text = path.read_text(encoding="utf-8").replace("renamed", "remaned")
+            path.write_text(text, encoding="utf-8")
+            os.utime(path, ns=(0, 1))
+            external = load_group(group_id)
+            assert external is not None
+            self.assertEqual(external.doc["title"], "remaned")
+
+            path.unlink()
+            self.assertIsNone(load_group(group_id))
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1203,6 +1203,10 @@ class TestGroupSpaceOps(unittest.TestCase):
             self.assertTrue(generated.ok, getattr(generated, "error", None))
             gen_result = generated.result if isinstance(generated.result, dict) else {}
             self.assertEqual(str(gen_result.get("kind") or ""), "slide_deck")
+
+            # Let the async generate worker finish before the home dir is removed.
+            for worker in [t for t in threading.enumerate() if t.name == "cccc-space-generate"]:
+                worker.join(timeout=5.0)
         finally:
             temp_ctx.cleanup()
             cleanup_stub()
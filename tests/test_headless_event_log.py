@@ -0,0 +1,109 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+def _event(actor_id: str, event_type: str, **data):
+    from cccc.kernel.headless_events import _new_headless_event
+
+    return _new_headless_event(group_id="g_log", actor_id=actor_id, event_type=event_type, data=data)
+
+
+class TestHeadlessEventLog(unittest.TestCase):
+    def test_iter_lines_reverse_reports_offsets_across_blocks(self) -> None:
+        from cccc.kernel.ledger import iter_lines_reverse, read_last_lines
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "log.jsonl"
+            data = b"alpha\n\nb\xc3\xa9ta\ngamma-gamma\npartial"
+            path.write_bytes(data)
+            got = list(iter_lines_reverse(path, block_size=3))
+            self.assertEqual(got, [(25, b"partial"), (13, b"gamma-gamma"), (7, b"b\xc3\xa9ta"), (6, b""), (0, b"alpha")])
+            self.assertEqual(read_last_lines(path, 3), ["béta", "gamma-gamma", "partial"])
+
+    def test_rotation_keeps_newest_segments_and_replay_spans_them(self) -> None:
+        from cccc.kernel import headless_events as he
+
+        with tempfile.TemporaryDirectory() as td, patch.object(he, "HEADLESS_ROTATE_BYTES", 2048), patch.object(he, "HEADLESS_KEEP_SEGMENTS", 2):
+            group_dir = Path(td)
+            for turn in range(12):
+                he.append_headless_events(group_dir, [_event("coder", "headless.turn.started", turn_id=f"t{turn}")])
+                for i in range(6):
+                    he.append_headless_events(group_dir, [_event("coder", "headless.message.delta", stream_id=f"s{turn}", delta=f"chunk {i} " * 8)])
+                he.append_headless_events(group_dir, [_event("coder", "headless.turn.completed", turn_id=f"t{turn}")])
+
+            manifest = he.load_headless_manifest(group_dir)
+            self.assertEqual(len(manifest["segments"]), 2)
+            self.assertEqual(sorted(p.name for p in he.headless_segments_dir(group_dir).iterdir()), sorted(Path(s["path"]).name for s in manifest["segments"]))
+            self.assertGreater(manifest["next_segment_seq"], 3)
+            self.assertLess(he.headless_events_path(group_dir).stat().st_size, 2048 + 1024)
+
+            events = he.read_headless_replay_events(group_dir, limit=50)
+            self.assertEqual(events[0]["type"], "headless.turn.started")
+            self.assertEqual(events[0]["data"]["turn_id"], "t11")
+            self.assertEqual(events[-1]["type"], "headless.turn.completed")
+            self.assertEqual(len(events), 8)
+
+    def test_replay_jumps_to_indexed_turn_start_older_than_the_tail_window(self) -> None:
+        from cccc.kernel import headless_events as he
+
+        with tempfile.TemporaryDirectory() as td, patch.object(he, "HEADLESS_ROTATE_BYTES", 32 * 1024):
+            group_dir = Path(td)
+            he.append_headless_events(group_dir, [_event("reviewer", "headless.turn.started", turn_id="r1")])
+            he.append_headless_events(group_dir, [_event("reviewer", "headless.turn.completed", turn_id="r1")])
+            he.append_headless_events(group_dir, [_event("coder", "headless.turn.started", turn_id="long")])
+            for i in range(300):
+                he.append_headless_events(group_dir, [_event("coder", "headless.message.delta", stream_id="s", delta=f"{i:04d}")])
+            self.assertTrue(he.load_headless_manifest(group_dir)["segments"])
+
+            events = he.read_headless_replay_events(group_dir, limit=50)
+            self.assertEqual(events[0]["type"], "headless.turn.started")
+            self.assertEqual(events[0]["data"]["turn_id"], "long")
+            deltas = [event["data"]["delta"] for event in events[1:]]
+            self.assertEqual(deltas, [f"{i:04d}" for i in range(300)])
+            # The reviewer's completed turn fell out of the tail window and is not replayed.
+            self.assertFalse([event for event in events if event["actor_id"] == "reviewer"])
+
+            with patch.object(he, "HEADLESS_REPLAY_MAX_BYTES", 1024):
+                capped = he.read_headless_replay_events(group_dir, limit=50)
+            self.assertEqual(capped, [])
+
+            raw = json.loads(he.headless_manifest_path(group_dir).read_text(encoding="utf-8"))
+            self.assertEqual(set(raw["turn_starts"]), {"reviewer", "coder"})
+
+    def test_stream_tailer_follows_rotation_without_dropping_lines(self) -> None:
+        from cccc.kernel import headless_events as he
+        from cccc.ports.web import streams
+
+        async def _run_case(group_dir: Path) -> list:
+            path = he.headless_events_path(group_dir)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+            tailer = streams._SharedJSONLTailer(path, event_name="headless", heartbeat_s=0, poll_interval_s=0.02)  # type: ignore[attr-defined]
+            q: asyncio.Queue = asyncio.Queue()
+            tailer.subscribe(q)
+            await asyncio.sleep(0.1)
+            received = []
+            try:
+                for i in range(6):
+                    he.append_headless_events(group_dir, [_event("coder", "headless.message.delta", stream_id="s", delta=str(i))])
+                    if i == 2:
+                        he.rotate_headless_events(group_dir)
+                while len(received) < 6:
+                    item = await asyncio.wait_for(q.get(), timeout=5.0)
+                    received.append(json.loads(item.decode("utf-8").split("data: ", 1)[1])["data"]["delta"])
+            finally:
+                tailer.unsubscribe(q)
+                if tailer._task is not None:  # type: ignore[attr-defined]
+                    tailer._task.cancel()  # type: ignore[attr-defined]
+            return received
+
+        with tempfile.TemporaryDirectory() as td:
+            self.assertEqual(asyncio.run(_run_case(Path(td))), ["0", "1", "2", "3", "4", "5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
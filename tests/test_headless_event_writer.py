@@ -0,0 +1,85 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+def _read_events(group_dir: Path):
+    from cccc.kernel.headless_events import headless_events_path
+
+    path = headless_events_path(group_dir)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+class TestHeadlessEventWriter(unittest.TestCase):
+    def _writer(self, group_dir: Path, **kwargs):
+        from cccc.kernel.headless_events import HeadlessEventWriter
+
+        resolved = []
+
+        def resolve(group_id: str):
+            resolved.append(group_id)
+            return group_dir if group_dir.is_dir() else None
+
+        writer = HeadlessEventWriter(group_id="g_writer", actor_id="coder", resolve_group_dir=resolve, **kwargs)
+        return writer, resolved
+
+    def test_consecutive_deltas_merge_and_boundaries_flush_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            group_dir = Path(td)
+            writer, resolved = self._writer(group_dir, window_s=60.0)
+            delta = {"turn_id": "t1", "event_id": "e1", "stream_id": "s1"}
+            writer.emit("headless.turn.started", {"turn_id": "t1"})
+            for chunk in ("Hel", "lo", ", wor", "ld"):
+                writer.emit("headless.message.delta", {**delta, "delta": chunk})
+            writer.emit("headless.activity.updated", {"activity_id": "reasoning:r1", "summary": "thinking"})
+            writer.emit("headless.message.delta", {**delta, "delta": "!"})
+            writer.emit("headless.message.delta", {**delta, "stream_id": "s2", "delta": "other"})
+            self.assertEqual(len(_read_events(group_dir)), 1)
+
+            writer.emit("headless.turn.completed", {"turn_id": "t1"})
+            events = _read_events(group_dir)
+            self.assertEqual(
+                [(e["type"], e["data"].get("stream_id"), e["data"].get("delta")) for e in events],
+                [
+                    ("headless.turn.started", None, None),
+                    ("headless.message.delta", "s1", "Hello, world"),
+                    ("headless.activity.updated", None, None),
+                    ("headless.message.delta", "s1", "!"),
+                    ("headless.message.delta", "s2", "other"),
+                    ("headless.turn.completed", None, None),
+                ],
+            )
+            self.assertEqual(resolved, ["g_writer"])
+
+    def test_buffered_events_flush_after_window_or_byte_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            group_dir = Path(td)
+            writer, _ = self._writer(group_dir, window_s=0.05, max_bytes=10)
+            writer.emit("headless.message.delta", {"stream_id": "s1", "delta": "abc"})
+            deadline = time.monotonic() + 5.0
+            while not _read_events(group_dir) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual([e["data"]["delta"] for e in _read_events(group_dir)], ["abc"])
+
+            writer.emit("headless.message.delta", {"stream_id": "s1", "delta": "0123456789"})
+            self.assertEqual([e["data"]["delta"] for e in _read_events(group_dir)], ["abc", "0123456789"])
+
+    def test_events_for_a_removed_group_are_dropped(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            group_dir = Path(td) / "g_writer"
+            writer, resolved = self._writer(group_dir)
+            writer.emit("headless.session.stopped", {})
+            self.assertEqual(_read_events(group_dir), [])
+            self.assertEqual(resolved, ["g_writer"])
+
+            group_dir.mkdir()
+            writer.emit("headless.session.stopped", {})
+            self.assertEqual([e["type"] for e in _read_events(group_dir)], ["headless.session.stopped"])
+
+
+if __name__ == "__main__":
+    unittest.main()
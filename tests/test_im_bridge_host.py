@@ -0,0 +1,262 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from cccc.kernel.group import Group
+from cccc.ports.im.adapters.base import IMAdapter
+
+
+class _SharedAdapter(IMAdapter):
+    platform = "telegram"
+
+    def __init__(self) -> None:
+        self.sent: List[tuple] = []
+        self.connects = 0
+        self.inbox: List[Dict[str, Any]] = []
+        self.poll_threads: List[str] = []
+
+    def connect(self) -> bool:
+        self.connects += 1
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def poll(self) -> List[Dict[str, Any]]:
+        self.poll_threads.append(threading.current_thread().name)
+        messages, self.inbox = self.inbox, []
+        return messages
+
+    def send_message(self, chat_id: str, text: str, thread_id: Optional[int] = None, **_kwargs: Any) -> bool:
+        self.sent.append((chat_id, text))
+        return True
+
+    def get_chat_title(self, chat_id: str) -> str:
+        return str(chat_id)
+
+
+def _make_bridge(root: Path, group_id: str, adapter: IMAdapter, *, chat_id: str):
+    from cccc.ports.im.bridge import IMBridge
+
+    group_path = root / group_id
+    (group_path / "state").mkdir(parents=True, exist_ok=True)
+    (group_path / "ledger.jsonl").touch()
+    group = Group(group_id=group_id, path=group_path, doc={"group_id": group_id})
+    bridge = IMBridge(group=group, adapter=adapter)
+    bridge.key_manager.authorize(chat_id, 0, "telegram", "k")
+    bridge.subscribers.subscribe(chat_id, "chat", platform="telegram")
+    return bridge
+
+
+def _append_ledger(bridge, *texts: str) -> None:
+    with bridge.group.ledger_path.open("a", encoding="utf-8") as f:
+        for text in texts:
+            event = {"kind": "chat.message", "by": "peer", "data": {"text": text, "to": ["user"]}}
+            f.write(json.dumps(event) + "\n")
+
+
+class TestBridgeHost(unittest.TestCase):
+    def setUp(self) -> None:
+        from cccc.ports.im.host import BridgeHost
+
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.root = Path(td.name)
+        self.adapter = _SharedAdapter()
+        self.host = BridgeHost(self.adapter, outbound_budget_s=60.0)
+        self.g1 = _make_bridge(self.root, "g_one", self.adapter, chat_id="c1")
+        self.g2 = _make_bridge(self.root, "g_two", self.adapter, chat_id="c2")
+        self.host.add_bridge(self.g1)
+        self.host.add_bridge(self.g2)
+
+    def test_inbound_is_demultiplexed_by_chat_authorization(self) -> None:
+        routed = self.host.route_inbound(
+            [
+                {"chat_id": "c2", "text": "/status"},
+                {"chat_id": "c1", "text": "hi"},
+                {"chat_id": "stranger", "text": "/subscribe g_two"},
+                {"chat_id": "c1", "text": "/subscribe g_two"},
+                {"chat_id": "stranger", "text": "/subscribe"},
+            ]
+        )
+        texts = {gid: [(m["chat_id"], m["text"]) for m in batch] for gid, batch in routed.items()}
+        self.assertEqual(texts["g_one"], [("c1", "hi")])
+        self.assertEqual(texts["g_two"], [("c2", "/status"), ("stranger", "/subscribe g_two"), ("c1", "/subscribe g_two")])
+
+    def test_unauthorized_chats_do_not_fall_through_to_a_group(self) -> None:
+        self.assertEqual(self.host.route_inbound([{"chat_id": "stranger", "text": "hello"}]), {})
+        self.host.remove_bridge("g_two")
+        routed = self.host.route_inbound([{"chat_id": "stranger", "text": "/subscribe"}, {"chat_id": "stranger", "text": "hi"}])
+        self.assertEqual({gid: [m["text"] for m in batch] for gid, batch in routed.items()}, {"g_one": ["/subscribe"]})
+
+    def test_outbound_queues_are_drained_round_robin(self) -> None:
+        self.assertTrue(self.host.start())
+        self.addCleanup(self.host.stop)
+        self.assertEqual(self.adapter.connects, 1)
+
+        _append_ledger(self.g1, *[f"one-{i}" for i in range(4)])
+        _append_ledger(self.g2, "two-0", "two-1")
+        self.host.run_once()
+
+        order = [chat for chat, _ in self.adapter.sent]
+        self.assertEqual(order, ["c1", "c2", "c1", "c2", "c1", "c1"])
+        status = self.host.status()
+        self.assertEqual([status[gid]["pending_events"] for gid in ("g_one", "g_two")], [0, 0])
+        self.assertEqual(status["g_one"]["chats"]["c1:0"]["sent"], 4)
+
+    def test_adapter_is_polled_on_the_host_loop_thread(self) -> None:
+        self.assertEqual(self.adapter.poll_timeout_s, 1.0)
+        self.assertTrue(self.host.start())
+        self.addCleanup(self.host.stop)
+        self.adapter.inbox = [{"chat_id": "c2", "text": "hello"}]
+        with patch.object(self.g2, "_handle_inbound_messages") as handle:
+            self.host.run_once()
+        self.assertEqual(self.adapter.poll_threads, [threading.current_thread().name])
+        self.assertEqual(handle.call_args.args[0], [{"chat_id": "c2", "text": "hello"}])
+
+    def test_outbound_budget_leaves_backlog_queued(self) -> None:
+        self.host.outbound_budget_s = 0.0
+        _append_ledger(self.g1, "a", "b", "c")
+        self.g1._collect_outbound()
+        self.assertEqual(self.host._drain_outbound_fair(), 1)
+        self.assertEqual(self.host.status()["g_one"]["pending_events"], 2)
+
+    def test_group_is_detached_when_its_pid_file_is_released(self) -> None:
+        from cccc.ports.im.host import BridgeHost
+
+        released: List[str] = []
+        pid_path = self.g1.group.path / "state" / "im_bridge.pid"
+        pid_path.write_text(str(os.getpid()), encoding="utf-8")
+        marker_path = pid_path.with_name("im_bridge.host")
+        marker_path.write_text(str(os.getpid()), encoding="utf-8")
+        host = BridgeHost(self.adapter)
+        host.add_bridge(self.g1, pid_path=pid_path, release=lambda: released.append("g_one"))
+        with patch("cccc.ports.im.host.load_group", return_value=self.g1.group):
+            host._reconcile()
+            self.assertEqual(host.group_ids, ["g_one"])
+            pid_path.unlink()
+            host._reconcile()
+        self.assertEqual(host.group_ids, [])
+        self.assertEqual(released, ["g_one"])
+        self.assertFalse(marker_path.exists())
+
+    def test_groups_handed_over_later_are_attached(self) -> None:
+        from cccc.ports.im.host import BridgeHost
+
+        host = BridgeHost(self.adapter, platform="telegram", lock_identity="telegram|token=t")
+        specs = {}
+        for gid, identity in (("g_new", "telegram|token=t"), ("g_other", "telegram|token=u")):
+            state_dir = self.root / "groups" / gid / "state"
+            state_dir.mkdir(parents=True)
+            (state_dir.parent / "ledger.jsonl").touch()
+            (state_dir / "im_bridge.pid").write_text(str(os.getpid()), encoding="utf-8")
+            group = Group(group_id=gid, path=state_dir.parent, doc={"group_id": gid})
+            specs[gid] = {"group": group, "state_dir": state_dir, "im_config": {}, "lock_identity": identity}
+
+        with patch.dict(os.environ, {"CCCC_HOME": str(self.root)}), patch(
+            "cccc.ports.im.host._resolve_bridge_spec", side_effect=lambda gid, _platform: specs[gid]
+        ):
+            host._reconcile()
+        self.addCleanup(host.stop)
+
+        self.assertEqual(host.group_ids, ["g_new"])
+        self.assertTrue((self.root / "groups" / "g_new" / "state" / "im_bridge.host").exists())
+        self.assertFalse((self.root / "groups" / "g_other" / "state" / "im_bridge.pid").exists())
+
+
+class TestBridgeHandOver(unittest.TestCase):
+    def test_start_waits_for_the_host_to_attach_the_group(self) -> None:
+        from cccc.ports.im import bridge as bridge_mod
+        from cccc.util.file_lock import acquire_lockfile
+
+        with tempfile.TemporaryDirectory() as td:
+            state_dir = Path(td) / "state"
+
+            def host_attaches() -> None:
+                while not (state_dir / "im_bridge.pid").exists():
+                    time.sleep(0.01)
+                held.append(acquire_lockfile(state_dir / "im_bridge.lock"))
+
+            held: List[Any] = []
+            attacher = threading.Thread(target=host_attaches)
+            attacher.start()
+            try:
+                rc = bridge_mod._hand_over_to_bridge_host("g_a", state_dir, 4242)
+            finally:
+                attacher.join()
+                for f in held:
+                    f.close()
+            self.assertEqual(rc, 0)
+            self.assertEqual((state_dir / "im_bridge.pid").read_text(encoding="utf-8"), "4242")
+            self.assertEqual((state_dir / "im_bridge.host").read_text(encoding="utf-8"), "4242")
+
+    def test_start_gives_up_when_the_host_never_attaches(self) -> None:
+        from cccc.ports.im import bridge as bridge_mod
+
+        with tempfile.TemporaryDirectory() as td:
+            state_dir = Path(td) / "state"
+            with patch.object(bridge_mod, "HOST_HANDOVER_TIMEOUT_S", 0.3):
+                rc = bridge_mod._hand_over_to_bridge_host("g_a", state_dir, 4242)
+            self.assertEqual(rc, 1)
+            self.assertFalse((state_dir / "im_bridge.pid").exists())
+            self.assertFalse((state_dir / "im_bridge.host").exists())
+
+
+class TestBridgeHostProcessManagement(unittest.TestCase):
+    def test_autostart_spawns_one_host_per_platform(self) -> None:
+        from cccc.daemon.im import bootstrap_im_ops
+
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td)
+            groups = {}
+            for gid in ("g_a", "g_b"):
+                (home / "groups" / gid).mkdir(parents=True)
+                (home / "groups" / gid / "group.yaml").touch()
+                groups[gid] = Group(group_id=gid, path=home / "groups" / gid, doc={"im": {"enabled": True, "platform": "telegram"}})
+
+            with patch.dict(os.environ, {"CCCC_IM_BRIDGE_HOST": "1"}), patch.object(
+                bootstrap_im_ops, "load_group", side_effect=groups.get
+            ), patch.object(bootstrap_im_ops.subprocess, "Popen") as popen, patch.object(bootstrap_im_ops.time, "sleep"):
+                popen.return_value.poll.return_value = None
+                bootstrap_im_ops.autostart_enabled_im_bridges(home)
+
+            self.assertEqual(popen.call_count, 1)
+            argv = popen.call_args.args[0]
+            self.assertEqual(argv[argv.index("cccc.ports.im.host") + 1 :][:1], ["telegram"])
+            self.assertEqual(sorted(argv[argv.index("cccc.ports.im.host") + 2 :]), ["g_a", "g_b"])
+
+    def test_stopping_a_group_detaches_it_instead_of_killing_the_host(self) -> None:
+        from cccc.daemon.im import im_bridge_ops
+
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td)
+            pid_path = home / "groups" / "g_a" / "state" / "im_bridge.pid"
+            pid_path.parent.mkdir(parents=True)
+            pid_path.write_text("4242", encoding="utf-8")
+            (pid_path.parent / im_bridge_ops.IM_BRIDGE_HOST_MARKER).write_text("4242", encoding="utf-8")
+            killed: List[int] = []
+            stopped = im_bridge_ops.stop_im_bridges_for_group(
+                home, group_id="g_a", best_effort_killpg=lambda pid, _sig: killed.append(pid)
+            )
+            self.assertEqual((stopped, killed), (1, []))
+            self.assertFalse(pid_path.exists())
+
+    def test_host_marker_must_name_the_pid_file_process(self) -> None:
+        from cccc.daemon.im import im_bridge_ops
+
+        with tempfile.TemporaryDirectory() as td:
+            pid_path = Path(td) / "im_bridge.pid"
+            self.assertFalse(im_bridge_ops.is_im_bridge_host_pid(4242, pid_path))
+            (Path(td) / im_bridge_ops.IM_BRIDGE_HOST_MARKER).write_text("4243", encoding="utf-8")
+            self.assertFalse(im_bridge_ops.is_im_bridge_host_pid(4242, pid_path))
+            self.assertTrue(im_bridge_ops.is_im_bridge_host_pid(4243, pid_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
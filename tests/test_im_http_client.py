@@ -0,0 +1,131 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+
+class _FakeBotApi(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeBotApiHandler)
+        self.connections = 0
+        self.calls: list = []
+        self.fail_next: list = []
+
+
+class _FakeBotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _FakeBotApi
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        pass
+
+    def _reply(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        method = self.path.rsplit("/", 1)[-1]
+        self.server.calls.append((method, raw))
+        if self.server.fail_next:
+            status = self.server.fail_next.pop(0)
+            self._reply(status, {"ok": False, "description": "retry later"}, {"Retry-After": "0"})
+            return
+        if method == "getMe":
+            self._reply(200, {"ok": True, "result": {"id": 1, "username": "cccc_bot"}})
+        elif method == "sendMessage":
+            params = json.loads(raw.decode("utf-8"))
+            self._reply(200, {"ok": True, "result": {"message_id": len(self.server.calls), "text": params.get("text")}})
+        else:
+            self._reply(400, {"ok": False, "description": f"unknown method {method}"})
+
+
+class TestIMHttpClient(unittest.TestCase):
+    def setUp(self) -> None:
+        from cccc.ports.im.adapters.base import IMHttpClient
+        from cccc.ports.im.adapters.telegram import TelegramAdapter
+
+        self.server = _FakeBotApi()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.client = IMHttpClient(backoff_s=0.0)
+        self.addCleanup(self.client.close)
+        patcher = patch("cccc.ports.im.adapters.telegram.shared_http_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.adapter = TelegramAdapter(token="TEST")
+        self.adapter.api_base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_bot_api_calls_reuse_one_keep_alive_connection(self) -> None:
+        self.assertTrue(self.adapter._api("getMe").get("ok"))
+        for i in range(5):
+            out = self.adapter._api("sendMessage", {"chat_id": 1, "text": f"héllo {i}"})
+            self.assertEqual(out["result"]["text"], f"héllo {i}")
+
+        self.assertEqual(self.server.connections, 1)
+        stats = self.client.stats()[f"127.0.0.1:{self.server.server_address[1]}"]
+        self.assertEqual((stats["requests"], stats["errors"], stats["retries"]), (6, 0, 0))
+        self.assertGreater(stats["max_ms"], 0.0)
+
+    def test_rate_limited_and_gateway_errors_are_retried(self) -> None:
+        self.server.fail_next = [429, 502]
+        out = self.adapter._api("sendMessage", {"chat_id": 1, "text": "after backoff"})
+        self.assertTrue(out.get("ok"), out)
+        self.assertEqual([name for name, _ in self.server.calls], ["sendMessage"] * 3)
+        stats = next(iter(self.client.stats().values()))
+        self.assertEqual((stats["requests"], stats["retries"], stats["last_status"]), (3, 2, 200))
+
+    def test_client_errors_surface_as_http_status_without_retry(self) -> None:
+        out = self.adapter._api("banChatMember", {"chat_id": 1})
+        self.assertEqual(out.get("http_status"), 400)
+        self.assertFalse(out.get("ok"))
+        self.assertEqual(len(self.server.calls), 1)
+
+    def test_dropped_connection_is_retried_only_for_idempotent_calls(self) -> None:
+        import httpx
+
+        from cccc.ports.im.adapters.base import IMHttpClient
+
+        calls: list = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if len(calls) % 2:
+                raise httpx.RemoteProtocolError("Server disconnected without sending a response.", request=request)
+            return httpx.Response(200, json={"ok": True})
+
+        client = IMHttpClient(backoff_s=0.0)
+        self.addCleanup(client.close)
+        client._client = httpx.Client(transport=httpx.MockTransport(_handler))
+
+        with self.assertRaises(httpx.RemoteProtocolError):
+            client.request("POST", "http://bot.test/sendMessage", content=b"{}")
+        self.assertEqual(calls, ["/sendMessage"])
+
+        calls.clear()
+        self.assertEqual(client.request("POST", "http://bot.test/getUpdates", content=b"{}", idempotent=True).status_code, 200)
+        calls.clear()
+        self.assertEqual(client.request("GET", "http://bot.test/file").status_code, 200)
+        self.assertEqual(calls, ["/file", "/file"])
+
+
+if __name__ == "__main__":
+    unittest.main()
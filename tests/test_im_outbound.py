@@ -0,0 +1,140 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cccc.kernel.group import Group
+from cccc.ports.im.adapters.base import IMAdapter
+
+
+class _ThrottledAdapter(IMAdapter):
+    platform = "telegram"
+
+    def __init__(self) -> None:
+        self.sent: List[tuple] = []
+        self.wait_s = 0.0
+
+    def connect(self) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def poll(self) -> List[Dict[str, Any]]:
+        return []
+
+    def send_message(self, chat_id: str, text: str, thread_id: Optional[int] = None, **_kwargs: Any) -> bool:
+        self.sent.append((chat_id, text))
+        return True
+
+    def get_chat_title(self, chat_id: str) -> str:
+        return str(chat_id)
+
+    def send_wait_s(self, chat_id: str) -> float:
+        return self.wait_s
+
+
+def _chat_event(text: str, *, to: List[str], priority: str = "normal") -> Dict[str, Any]:
+    return {"kind": "chat.message", "by": "peer", "data": {"text": text, "to": to, "priority": priority}}
+
+
+class TestChatOutbox(unittest.TestCase):
+    def test_digest_puts_priority_first_and_respects_limits(self) -> None:
+        from cccc.ports.im.outbound import ChatOutbox
+
+        box = ChatOutbox(max_chars=20, max_lines=64)
+        box.put("c1:0", "c1", 0, "one", mention_user_ids=["u1"])
+        box.put("c1:0", "c1", 0, "two")
+        box.put("c1:0", "c1", 0, "urgent", priority=True, mention_user_ids=["u2", "u1"])
+        box.put("c1:0", "c1", 0, "x" * 30)
+
+        digest = box.take_digest("c1:0")
+        self.assertEqual(digest["text"], "urgent\n\none\n\ntwo")
+        self.assertEqual((digest["count"], digest["mention_user_ids"]), (3, ["u2", "u1"]))
+        # An oversized text still goes out on its own rather than blocking the queue.
+        self.assertEqual(box.take_digest("c1:0")["text"], "x" * 30)
+        self.assertIsNone(box.take_digest("c1:0"))
+
+    def test_keys_prefer_chats_holding_priority_messages(self) -> None:
+        from cccc.ports.im.outbound import ChatOutbox
+
+        box = ChatOutbox()
+        box.put("a:0", "a", 0, "old")
+        box.put("b:0", "b", 0, "new", priority=True)
+        self.assertEqual(box.keys(), ["b:0", "a:0"])
+        status = box.status()
+        self.assertEqual((status["a:0"]["depth"], status["b:0"]["priority"]), (1, 1))
+
+
+class TestBridgeOutboundCoalescing(unittest.TestCase):
+    def setUp(self) -> None:
+        from cccc.ports.im.bridge import IMBridge
+
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        group_path = Path(td.name) / "g_out"
+        (group_path / "state").mkdir(parents=True)
+        (group_path / "ledger.jsonl").touch()
+        self.adapter = _ThrottledAdapter()
+        self.bridge = IMBridge(group=Group(group_id="g_out", path=group_path, doc={"group_id": "g_out"}), adapter=self.adapter)
+        self.bridge.key_manager.authorize("c1", 0, "telegram", "k")
+        self.bridge.subscribers.subscribe("c1", "chat", platform="telegram")
+        self.bridge.subscribers.set_verbose("c1", True)
+
+    def test_rate_limited_chat_gets_one_digest_with_priority_first(self) -> None:
+        self.adapter.wait_s = 5.0
+        self.bridge._forward_event(_chat_event("peer chatter", to=["coder"]))
+        self.bridge._forward_event(_chat_event("needs review", to=["user"]))
+        self.bridge._forward_event(_chat_event("heads up", to=["coder"], priority="attention"))
+        self.assertEqual(self.adapter.sent, [])
+
+        status = self.bridge.outbound_status()
+        self.assertEqual((status["queued"], status["chats"]["c1:0"]["priority"]), (3, 2))
+        self.assertGreater(self.bridge._outbound_wait_s(1.0), 0.0)
+
+        self.adapter.wait_s = 0.0
+        self.assertEqual(self.bridge._flush_chat_outbox(), 1)
+        self.assertEqual(len(self.adapter.sent), 1)
+        text = self.adapter.sent[0][1]
+        self.assertLess(text.index("needs review"), text.index("heads up"))
+        self.assertLess(text.index("heads up"), text.index("peer chatter"))
+        chat = self.bridge.outbound_status()["chats"]["c1:0"]
+        self.assertEqual((chat["depth"], chat["sent"], chat["coalesced"]), (0, 1, 3))
+
+    def test_stop_delivers_messages_still_queued_behind_the_rate_limit(self) -> None:
+        self.adapter.wait_s = 5.0
+        self.bridge._forward_event(_chat_event("first", to=["user"]))
+        self.bridge._outbound_pending.append(_chat_event("second", to=["user"]))
+        self.bridge.stop(disconnect=False)
+        self.assertEqual(len(self.adapter.sent), 1)
+        self.assertIn("first", self.adapter.sent[0][1])
+        self.assertIn("second", self.adapter.sent[0][1])
+        status = json.loads((self.bridge.group.path / "state" / "im_outbound_status.json").read_text(encoding="utf-8"))
+        self.assertEqual((status["queued"], status["pending_events"]), (0, 0))
+
+    def test_status_snapshot_is_published_to_group_state(self) -> None:
+        from cccc.ports.im.outbound import OUTBOUND_STATUS_FILE, read_outbound_status
+
+        self.adapter.wait_s = 5.0
+        self.bridge._forward_event(_chat_event("queued", to=["user"]))
+        self.bridge._write_outbound_status(force=True)
+
+        state_dir = self.bridge.group.path / "state"
+        snapshot = read_outbound_status(state_dir)
+        self.assertEqual(snapshot["queued"], 1)
+        self.assertEqual(snapshot["chats"]["c1:0"]["depth"], 1)
+        self.assertEqual(json.loads((state_dir / OUTBOUND_STATUS_FILE).read_text(encoding="utf-8"))["v"], 1)
+
+    def test_rate_limiter_peek_does_not_consume(self) -> None:
+        from cccc.ports.im.adapters.telegram import RateLimiter
+
+        limiter = RateLimiter(max_per_second=1.0)
+        self.assertEqual(limiter.peek("c1"), 0.0)
+        self.assertEqual(limiter.acquire("c1"), 0.0)
+        self.assertGreater(limiter.peek("c1"), 0.0)
+        self.assertGreater(limiter.peek("c1"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
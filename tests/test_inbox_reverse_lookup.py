@@ -72,6 +72,117 @@ class TestInboxReverseLookup(unittest.TestCase):
         finally:
             cleanup()
 
+    def _group_with_messages(self, count: int):
+        from cccc.contracts.v1 import ChatMessageData, DaemonRequest
+        from cccc.daemon.server import handle_request
+        from cccc.kernel.group import load_group
+        from cccc.kernel.ledger import append_event
+
+        create_resp, _ = handle_request(
+            DaemonRequest.model_validate({"op": "group_create", "args": {"title": "lookup", "topic": "", "by": "user"}})
+        )
+        self.assertTrue(create_resp.ok, getattr(create_resp, "error", None))
+        group_id = str((create_resp.result or {}).get("group_id") or "").strip()
+        group = load_group(group_id)
+        assert group is not None
+        ids = []
+        for idx in range(count):
+            event = append_event(
+                group.ledger_path,
+                kind="chat.message",
+                group_id=group_id,
+                scope_key="",
+                by="user",
+                data=ChatMessageData(text=f"msg {idx}", to=["user"]).model_dump(),
+            )
+            ids.append(str(event.get("id") or ""))
+        return group, ids
+
+    def test_prefix_resolution_uses_index_without_reverse_scan(self) -> None:
+        from unittest.mock import patch
+
+        from cccc.kernel.inbox import event_lookup_stats, find_event, resolve_event_id
+
+        _, cleanup = self._with_home()
+        try:
+            group, ids = self._group_with_messages(20)
+            target = ids[7]
+            unique_prefix = next(
+                target[:n] for n in range(4, len(target) + 1) if sum(1 for i in ids if i.startswith(target[:n])) == 1
+            )
+            before = int(event_lookup_stats().get("indexed") or 0)
+            with patch("cccc.kernel.inbox.iter_events_reverse", side_effect=AssertionError("index should resolve ids")):
+                self.assertEqual(resolve_event_id(group, target), target)
+                self.assertEqual(resolve_event_id(group, unique_prefix), target)
+                self.assertEqual(resolve_event_id(group, ""), "")
+                self.assertEqual(resolve_event_id(group, "zzzz-missing"), "")
+                found = find_event(group, unique_prefix)
+            self.assertEqual(str((found or {}).get("id") or ""), target)
+            self.assertGreater(int(event_lookup_stats().get("indexed") or 0), before)
+        finally:
+            cleanup()
+
+    def test_ambiguous_prefix_resolves_to_nothing(self) -> None:
+        from cccc.kernel.inbox import resolve_event_id
+
+        _, cleanup = self._with_home()
+        try:
+            group, ids = self._group_with_messages(40)
+            shared = next(
+                ids[i][:1] for i in range(len(ids)) if sum(1 for j in ids if j.startswith(ids[i][:1])) > 1
+            )
+            self.assertEqual(resolve_event_id(group, shared), "")
+        finally:
+            cleanup()
+
+    def test_reverse_scan_is_recovery_fallback_when_index_fails(self) -> None:
+        from unittest.mock import patch
+
+        from cccc.kernel.inbox import event_lookup_stats, find_event_with_chat_ack
+
+        _, cleanup = self._with_home()
+        try:
+            group, ids = self._group_with_messages(5)
+            before = event_lookup_stats()
+            with patch("cccc.kernel.inbox.resolve_event_id_indexed", side_effect=RuntimeError("index broken")), patch(
+                "cccc.kernel.inbox.lookup_event_by_id", side_effect=RuntimeError("index broken")
+            ):
+                found, found_ack = find_event_with_chat_ack(group, event_id=ids[2][:12], actor_id="user")
+            self.assertEqual(str((found or {}).get("id") or ""), ids[2])
+            self.assertFalse(found_ack)
+            after = event_lookup_stats()
+            self.assertEqual(after.get("last_path"), "scan_fallback")
+            self.assertGreaterEqual(int(after.get("scan_fallback") or 0), int(before.get("scan_fallback") or 0) + 2)
+        finally:
+            cleanup()
+
+    def test_fallback_scan_stops_at_the_event_when_no_ack_exists(self) -> None:
+        from unittest.mock import patch
+
+        import cccc.kernel.inbox as inbox
+
+        _, cleanup = self._with_home()
+        try:
+            group, ids = self._group_with_messages(30)
+            real_iter = inbox.iter_events_reverse
+            seen: list[str] = []
+
+            def _counting_iter(path):
+                for ev in real_iter(path):
+                    seen.append(str(ev.get("id") or ""))
+                    yield ev
+
+            with patch("cccc.kernel.inbox.lookup_event_by_id", return_value=None), patch(
+                "cccc.kernel.inbox.iter_events_reverse", side_effect=_counting_iter
+            ):
+                found, found_ack = inbox.find_event_with_chat_ack(group, event_id=ids[25], actor_id="user")
+            self.assertEqual(str((found or {}).get("id") or ""), ids[25])
+            self.assertFalse(found_ack)
+            self.assertEqual(seen[-1], ids[25])
+            self.assertNotIn(ids[24], seen)
+        finally:
+            cleanup()
+
 
 if __name__ == "__main__":
     unittest.main()
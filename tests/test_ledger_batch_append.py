@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+class TestLedgerBatchAppend(unittest.TestCase):
+    def _with_home(self):
+        old_home = os.environ.get("CCCC_HOME")
+        td_ctx = tempfile.TemporaryDirectory()
+        td = td_ctx.__enter__()
+        os.environ["CCCC_HOME"] = td
+
+        def cleanup() -> None:
+            from cccc.kernel.ledger import set_append_hook, set_group_commit_window
+            from cccc.kernel.ledger_index import close_ledger_index_connections
+
+            set_append_hook(None)
+            set_group_commit_window(None)
+            close_ledger_index_connections()
+            td_ctx.__exit__(None, None, None)
+            if old_home is None:
+                os.environ.pop("CCCC_HOME", None)
+            else:
+                os.environ["CCCC_HOME"] = old_home
+
+        return Path(td), cleanup
+
+    @staticmethod
+    def _item(text: str) -> dict:
+        return {
+            "kind": "chat.message",
+            "group_id": "g_batch",
+            "scope_key": "",
+            "by": "user",
+            "data": {"text": text, "to": ["user"]},
+        }
+
+    def _ledger_ids(self, ledger_path: Path) -> list[str]:
+        lines = [line for line in ledger_path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        return [str(json.loads(line).get("id") or "") for line in lines]
+
+    def test_append_events_writes_in_order_and_indexes_offsets(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel.ledger import append_event, append_events, set_append_hook
+            from cccc.kernel.ledger_index import lookup_events_by_ids
+
+            ledger_path = home / "g_batch" / "ledger.jsonl"
+            first = append_event(ledger_path, **self._item("solo"))
+            seen: list[str] = []
+            set_append_hook(lambda ev: seen.append(str(ev.get("id") or "")))
+            batch = append_events(ledger_path, [self._item(f"batch {idx}") for idx in range(4)])
+
+            batch_ids = [str(ev.get("id") or "") for ev in batch]
+            self.assertEqual(seen, batch_ids)
+            self.assertEqual(self._ledger_ids(ledger_path), [str(first.get("id") or ""), *batch_ids])
+            found = lookup_events_by_ids(ledger_path, batch_ids)
+            self.assertEqual([str((ev or {}).get("data", {}).get("text") or "") for ev in found], [f"batch {idx}" for idx in range(4)])
+        finally:
+            cleanup()
+
+    def test_append_events_validates_before_writing(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger as ledger_mod
+
+            ledger_path = home / "g_batch" / "ledger.jsonl"
+            with patch.object(ledger_mod, "MAX_EVENT_BYTES", 400):
+                with self.assertRaises(ValueError):
+                    ledger_mod.append_events(ledger_path, [self._item("ok"), self._item("x" * 1000)])
+            self.assertFalse(ledger_path.exists() and ledger_path.read_text(encoding="utf-8").strip())
+        finally:
+            cleanup()
+
+    def test_group_commit_coalesces_concurrent_appends(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger as ledger_mod
+
+            ledger_path = home / "g_batch" / "ledger.jsonl"
+            ledger_mod.append_event(ledger_path, **self._item("warmup"))
+            ledger_mod.set_group_commit_window(0.05)
+            hooked: list[str] = []
+            ledger_mod.set_append_hook(lambda ev: hooked.append(str(ev.get("id") or "")))
+            commits: list[int] = []
+            real_commit = ledger_mod._commit_prepared
+            first_commit_started = threading.Event()
+            release_first_commit = threading.Event()
+
+            def _counting_commit(path, prepared, **kwargs):
+                commits.append(len(prepared))
+                if len(commits) == 1:
+                    # Hold the first (uncontended) commit so the other appenders queue up.
+                    first_commit_started.set()
+                    release_first_commit.wait(5.0)
+                return real_commit(path, prepared, **kwargs)
+
+            results: list[dict] = []
+            results_lock = threading.Lock()
+
+            def _worker(idx: int) -> None:
+                out = ledger_mod.append_event(ledger_path, **self._item(f"concurrent {idx}"))
+                # The event must be durable by the time append_event returns.
+                self.assertIn(str(out.get("id") or ""), self._ledger_ids(ledger_path))
+                with results_lock:
+                    results.append(out)
+
+            with patch.object(ledger_mod, "_commit_prepared", side_effect=_counting_commit):
+                threads = [threading.Thread(target=_worker, args=(idx,)) for idx in range(8)]
+                threads[0].start()
+                self.assertTrue(first_commit_started.wait(5.0))
+                for t in threads[1:]:
+                    t.start()
+                time.sleep(0.05)
+                release_first_commit.set()
+                for t in threads:
+                    t.join(timeout=10.0)
+
+            self.assertEqual(len(results), 8)
+            self.assertEqual(sum(commits), 8)
+            self.assertEqual(commits[0], 1)
+            self.assertLess(len(commits), 8)
+            ids_on_disk = self._ledger_ids(ledger_path)[1:]
+            self.assertEqual(sorted(ids_on_disk), sorted(str(ev.get("id") or "") for ev in results))
+            self.assertEqual(hooked, ids_on_disk)
+        finally:
+            cleanup()
+
+    def test_uncontended_group_commit_does_not_wait_for_the_window(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger as ledger_mod
+
+            ledger_path = home / "g_batch" / "ledger.jsonl"
+            ledger_mod.set_group_commit_window(5.0)
+            with patch.object(ledger_mod.time, "sleep") as sleep:
+                out = ledger_mod.append_event(ledger_path, **self._item("alone"))
+            sleep.assert_not_called()
+            self.assertEqual(self._ledger_ids(ledger_path), [str(out.get("id") or "")])
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
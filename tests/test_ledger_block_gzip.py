@@ -0,0 +1,125 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+class TestLedgerBlockGzip(unittest.TestCase):
+    def _with_home(self):
+        old_home = os.environ.get("CCCC_HOME")
+        td_ctx = tempfile.TemporaryDirectory()
+        td = td_ctx.__enter__()
+        os.environ["CCCC_HOME"] = td
+
+        def cleanup() -> None:
+            from cccc.kernel.ledger_index import close_ledger_index_connections
+
+            close_ledger_index_connections()
+            td_ctx.__exit__(None, None, None)
+            if old_home is None:
+                os.environ.pop("CCCC_HOME", None)
+            else:
+                os.environ["CCCC_HOME"] = old_home
+
+        return Path(td), cleanup
+
+    def _seed_sealed_segment(self, home: Path, count: int) -> tuple[Path, list[str]]:
+        from cccc.kernel.ledger import append_events
+        from cccc.kernel.ledger_segments import rotate_active_ledger
+
+        ledger_path = home / "g_blocks" / "ledger.jsonl"
+        events = append_events(
+            ledger_path,
+            [
+                {
+                    "kind": "chat.message",
+                    "group_id": "g_blocks",
+                    "scope_key": "",
+                    "by": "user",
+                    "data": {"text": f"message {idx} " + ("x" * 200), "to": ["user"]},
+                }
+                for idx in range(count)
+            ],
+        )
+        rotation = rotate_active_ledger(ledger_path.parent, reason="test")
+        self.assertTrue(rotation.get("rotated"))
+        return ledger_path, [str(ev.get("id") or "") for ev in events]
+
+    def test_compressed_segment_is_multi_member_and_gzip_readable(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel.ledger_segments import compress_sealed_segments, list_ledger_sources
+
+            ledger_path, event_ids = self._seed_sealed_segment(home, 120)
+            with patch("cccc.kernel.ledger_segments._GZIP_BLOCK_BYTES", 4096):
+                result = compress_sealed_segments(ledger_path.parent, force=True)
+            self.assertEqual(result.get("count"), 1)
+
+            sources = [src for src in list_ledger_sources(ledger_path.parent) if src.get("compressed")]
+            self.assertEqual(len(sources), 1)
+            with gzip.open(sources[0]["abs_path"], "rt", encoding="utf-8") as handle:
+                ids = [str(json.loads(line).get("id") or "") for line in handle if line.strip()]
+            self.assertEqual(ids, event_ids)
+        finally:
+            cleanup()
+
+    def test_lookup_and_reverse_iteration_read_single_blocks(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger_index
+            from cccc.kernel.inbox import iter_events_reverse
+            from cccc.kernel.ledger_index import compressed_source_block_offsets, lookup_event_by_id, lookup_events_by_ids
+            from cccc.kernel.ledger_segments import compress_sealed_segments, list_ledger_sources
+
+            ledger_path, event_ids = self._seed_sealed_segment(home, 120)
+            with patch("cccc.kernel.ledger_segments._GZIP_BLOCK_BYTES", 4096):
+                compress_sealed_segments(ledger_path.parent, force=True)
+            source = [src for src in list_ledger_sources(ledger_path.parent) if src.get("compressed")][0]
+
+            offsets = compressed_source_block_offsets(ledger_path, source["path"])
+            self.assertGreater(len(offsets), 3)
+            self.assertEqual(offsets[0], 0)
+
+            with patch.object(ledger_index, "iter_source_lines", side_effect=AssertionError("full scan")):
+                event = lookup_event_by_id(ledger_path, event_ids[77])
+                batch = lookup_events_by_ids(ledger_path, [event_ids[0], event_ids[-1]])
+            self.assertEqual(str((event or {}).get("id") or ""), event_ids[77])
+            self.assertEqual([str((ev or {}).get("id") or "") for ev in batch], [event_ids[0], event_ids[-1]])
+
+            reversed_ids = [str(ev.get("id") or "") for ev in iter_events_reverse(ledger_path)]
+            self.assertEqual(reversed_ids, list(reversed(event_ids)))
+        finally:
+            cleanup()
+
+    def test_legacy_single_stream_segment_still_resolves(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel.inbox import iter_events_reverse
+            from cccc.kernel.ledger_index import catch_up_ledger_index, compressed_source_block_offsets, lookup_event_by_id
+            from cccc.kernel.ledger_segments import list_ledger_sources, load_ledger_manifest, save_ledger_manifest
+
+            ledger_path, event_ids = self._seed_sealed_segment(home, 30)
+            catch_up_ledger_index(ledger_path)
+            manifest = load_ledger_manifest(ledger_path.parent)
+            segment = manifest["segments"][0]
+            src = ledger_path.parent / segment["path"]
+            with src.open("rb") as in_handle, gzip.open(str(src) + ".gz", "wb") as out_handle:
+                out_handle.write(in_handle.read())
+            src.unlink()
+            segment["path"] = segment["path"] + ".gz"
+            segment["compressed"] = True
+            save_ledger_manifest(ledger_path.parent, manifest)
+
+            source = [s for s in list_ledger_sources(ledger_path.parent) if s.get("compressed")][0]
+            self.assertEqual(compressed_source_block_offsets(ledger_path, source["path"]), [0])
+            self.assertEqual(str((lookup_event_by_id(ledger_path, event_ids[12]) or {}).get("id") or ""), event_ids[12])
+            self.assertEqual([str(ev.get("id") or "") for ev in iter_events_reverse(ledger_path)], list(reversed(event_ids)))
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+class TestLedgerIndexPool(unittest.TestCase):
+    def _with_home(self):
+        old_home = os.environ.get("CCCC_HOME")
+        td_ctx = tempfile.TemporaryDirectory()
+        td = td_ctx.__enter__()
+        os.environ["CCCC_HOME"] = td
+
+        def cleanup() -> None:
+            from cccc.kernel.ledger_index import close_ledger_index_connections
+
+            close_ledger_index_connections()
+            td_ctx.__exit__(None, None, None)
+            if old_home is None:
+                os.environ.pop("CCCC_HOME", None)
+            else:
+                os.environ["CCCC_HOME"] = old_home
+
+        return Path(td), cleanup
+
+    def _append(self, ledger_path: Path, text: str):
+        from cccc.kernel.ledger import append_event
+
+        return append_event(
+            ledger_path,
+            kind="chat.message",
+            group_id="g_pool",
+            scope_key="",
+            by="user",
+            data={"text": text, "to": ["user"]},
+        )
+
+    def test_schema_verified_once_across_appends(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger_index
+
+            ledger_path = home / "g_pool" / "ledger.jsonl"
+            self._append(ledger_path, "warmup")
+            with patch.object(ledger_index, "_ensure_schema", wraps=ledger_index._ensure_schema) as ensure:
+                events = [self._append(ledger_path, f"hello {idx}") for idx in range(5)]
+                found = ledger_index.lookup_events_by_ids(ledger_path, [str(ev.get("id") or "") for ev in events])
+            self.assertEqual(ensure.call_count, 0)
+            self.assertEqual([str((ev or {}).get("id") or "") for ev in found], [str(ev.get("id") or "") for ev in events])
+        finally:
+            cleanup()
+
+    def test_pool_keeps_one_connection_per_thread(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger_index
+
+            ledger_path = home / "g_pool" / "ledger.jsonl"
+            event = self._append(ledger_path, "hello")
+            index_path = ledger_index._index_path_for_ledger(ledger_path)
+            first = ledger_index._pooled_connection(index_path)
+            self.assertIs(ledger_index._pooled_connection(index_path), first)
+
+            seen: list[object] = []
+
+            def _worker() -> None:
+                seen.append(ledger_index._pooled_connection(index_path))
+                seen.append(ledger_index.lookup_event_by_id(ledger_path, str(event.get("id") or "")))
+                ledger_index.close_ledger_index_connections(ledger_path)
+
+            worker = threading.Thread(target=_worker)
+            worker.start()
+            worker.join(timeout=5.0)
+            self.assertEqual(len(seen), 2)
+            self.assertIsNot(seen[0], first)
+            self.assertEqual(str((seen[1] or {}).get("id") or ""), str(event.get("id") or ""))
+        finally:
+            cleanup()
+
+    def test_close_invalidates_other_threads_and_reverifies_schema(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger_index
+
+            ledger_path = home / "g_pool" / "ledger.jsonl"
+            self._append(ledger_path, "hello")
+            index_path = ledger_index._index_path_for_ledger(ledger_path)
+            before = ledger_index._pooled_connection(index_path)
+
+            worker = threading.Thread(target=ledger_index.close_ledger_index_connections, args=(ledger_path,))
+            worker.start()
+            worker.join(timeout=5.0)
+
+            with patch.object(ledger_index, "_ensure_schema", wraps=ledger_index._ensure_schema) as ensure:
+                self._append(ledger_path, "again")
+            self.assertEqual(ensure.call_count, 1)
+            self.assertIsNot(ledger_index._pooled_connection(index_path), before)
+        finally:
+            cleanup()
+
+    def test_slow_schema_verification_does_not_block_other_indexes(self) -> None:
+        home, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger_index
+
+            slow_ledger = home / "g_slow" / "ledger.jsonl"
+            fast_ledger = home / "g_fast" / "ledger.jsonl"
+            entered = threading.Event()
+            release = threading.Event()
+            real_ensure = ledger_index._ensure_schema
+
+            def _slow_ensure(conn):
+                if str(slow_ledger.parent) in str(conn.execute("PRAGMA database_list").fetchone()[2]):
+                    entered.set()
+                    release.wait(5.0)
+                return real_ensure(conn)
+
+            with patch.object(ledger_index, "_ensure_schema", side_effect=_slow_ensure):
+                worker = threading.Thread(target=self._append, args=(slow_ledger, "slow"))
+                worker.start()
+                self.assertTrue(entered.wait(5.0))
+                try:
+                    # Verifying g_slow's schema holds only its own lock.
+                    started = time.monotonic()
+                    fast = self._append(fast_ledger, "fast")
+                    self.assertLess(time.monotonic() - started, 2.0)
+                finally:
+                    release.set()
+                    worker.join(timeout=5.0)
+            found = ledger_index.lookup_event_by_id(fast_ledger, str(fast.get("id") or ""))
+            self.assertEqual(str((found or {}).get("id") or ""), str(fast.get("id") or ""))
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -131,6 +131,107 @@ class TestLedgerSearchIndex(unittest.TestCase):
         finally:
             cleanup()
 
+    def _create_group_with_messages(self, title: str, texts: list[str]):
+        from cccc.kernel.group import load_group
+
+        create, _ = self._call("group_create", {"title": title, "topic": "", "by": "user"})
+        self.assertTrue(create.ok, getattr(create, "error", None))
+        group_id = str((create.result or {}).get("group_id") or "").strip()
+        self.assertTrue(group_id)
+        for text in texts:
+            sent, _ = self._call("send", {"group_id": group_id, "text": text, "by": "user", "to": ["user"]})
+            self.assertTrue(sent.ok, getattr(sent, "error", None))
+        group = load_group(group_id)
+        assert group is not None
+        return group
+
+    def test_fts_backend_matches_cjk_substrings_and_short_queries(self) -> None:
+        _, cleanup = self._with_home()
+        try:
+            from cccc.kernel.inbox import search_messages
+            from cccc.kernel.ledger_index import fts5_supported, ledger_search_backend
+
+            if not fts5_supported():
+                self.skipTest("sqlite build lacks FTS5 trigram tokenizer")
+            group = self._create_group_with_messages(
+                "search-fts-cjk",
+                ["部署流水线已经完成", "deploy pipeline finished", "unrelated chatter"],
+            )
+            self.assertEqual(ledger_search_backend(group.ledger_path), "fts5")
+
+            with patch("cccc.kernel.inbox.iter_events", side_effect=AssertionError("fts search should avoid ledger scan")):
+                cjk, _ = search_messages(group, query="流水线", kind_filter="chat", limit=10)
+                short, _ = search_messages(group, query="部署", kind_filter="chat", limit=10)
+                prefix, _ = search_messages(group, query="pipe*", kind_filter="chat", limit=10)
+                missing, missing_more = search_messages(group, query="nothing-like-this", kind_filter="chat", limit=10)
+            text_of = lambda evs: [str((ev.get("data") or {}).get("text") or "") for ev in evs]
+            self.assertEqual(text_of(cjk), ["部署流水线已经完成"])
+            self.assertEqual(text_of(short), ["部署流水线已经完成"])
+            self.assertEqual(text_of(prefix), ["deploy pipeline finished"])
+            self.assertEqual((missing, missing_more), ([], False))
+        finally:
+            cleanup()
+
+    def test_relevance_order_ranks_denser_matches_first(self) -> None:
+        _, cleanup = self._with_home()
+        try:
+            from cccc.kernel.inbox import search_messages
+            from cccc.kernel.ledger_index import fts5_supported
+
+            if not fts5_supported():
+                self.skipTest("sqlite build lacks FTS5 trigram tokenizer")
+            group = self._create_group_with_messages(
+                "search-fts-rank",
+                [
+                    "release notes release release",
+                    "a very long message that mentions the release once among many many other words here",
+                ],
+            )
+            by_time, _ = search_messages(group, query="release", kind_filter="chat", limit=10)
+            by_rank, _ = search_messages(group, query="release", kind_filter="chat", limit=10, order="relevance")
+            self.assertEqual(len(by_rank), 2)
+            self.assertEqual(str((by_rank[0].get("data") or {}).get("text") or ""), "release notes release release")
+            self.assertEqual({ev.get("id") for ev in by_time}, {ev.get("id") for ev in by_rank})
+        finally:
+            cleanup()
+
+    def test_like_fallback_when_fts5_unavailable(self) -> None:
+        _, cleanup = self._with_home()
+        try:
+            from cccc.kernel import ledger_index
+            from cccc.kernel.inbox import search_messages
+
+            with patch.object(ledger_index, "_FTS5_SUPPORTED", False):
+                ledger_index.close_ledger_index_connections()
+                group = self._create_group_with_messages("search-like", ["hello fallback", "other"])
+                self.assertEqual(ledger_index.ledger_search_backend(group.ledger_path), "like")
+                events, _ = search_messages(group, query="fallback", kind_filter="chat", limit=10)
+                self.assertEqual(len(events), 1)
+            ledger_index.close_ledger_index_connections()
+            if ledger_index.fts5_supported():
+                # Re-enabling FTS5 backfills the full-text index from event_search.
+                self.assertEqual(ledger_index.ledger_search_backend(group.ledger_path), "fts5")
+                events, _ = search_messages(group, query="fallback", kind_filter="chat", limit=10)
+                self.assertEqual(len(events), 1)
+        finally:
+            cleanup()
+
+    def test_query_refilter_pages_past_index_only_matches(self) -> None:
+        _, cleanup = self._with_home()
+        try:
+            from cccc.kernel.inbox import search_messages
+
+            # "chat.message" is part of the indexed searchable text but not of the message
+            # body, so every event matches the index while only two survive the re-filter.
+            texts = ["needle chat.message-free one", *[f"filler {idx}" for idx in range(6)], "needle two"]
+            group = self._create_group_with_messages("search-refilter", texts)
+            with patch("cccc.kernel.inbox.iter_events", side_effect=AssertionError("should page the index")):
+                events, has_more = search_messages(group, query="chat.message", kind_filter="chat", limit=2)
+            self.assertEqual([str((ev.get("data") or {}).get("text") or "") for ev in events], ["needle chat.message-free one"])
+            self.assertFalse(has_more)
+        finally:
+            cleanup()
+
 
 if __name__ == "__main__":
     unittest.main()
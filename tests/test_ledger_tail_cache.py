@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+class TestLedgerTailCache(unittest.TestCase):
+    def _with_home(self):
+        old_home = os.environ.get("CCCC_HOME")
+        td_ctx = tempfile.TemporaryDirectory()
+        td = td_ctx.__enter__()
+        os.environ["CCCC_HOME"] = td
+
+        def cleanup() -> None:
+            from cccc.kernel.ledger_tail_cache import invalidate_ledger_tail_cache
+
+            invalidate_ledger_tail_cache()
+            td_ctx.__exit__(None, None, None)
+            if old_home is None:
+                os.environ.pop("CCCC_HOME", None)
+            else:
+                os.environ["CCCC_HOME"] = old_home
+
+        return td, cleanup
+
+    def _create_group(self):
+        from cccc.contracts.v1 import DaemonRequest
+        from cccc.daemon.server import handle_request
+        from cccc.kernel.group import load_group
+
+        resp, _ = handle_request(
+            DaemonRequest.model_validate({"op": "group_create", "args": {"title": "tail", "topic": "", "by": "user"}})
+        )
+        self.assertTrue(resp.ok, getattr(resp, "error", None))
+        group = load_group(str((resp.result or {}).get("group_id") or ""))
+        assert group is not None
+        return group
+
+    def _append_notes(self, group, count: int, *, start: int = 0) -> None:
+        from cccc.kernel.ledger import append_event
+
+        for i in range(start, start + count):
+            append_event(
+                group.ledger_path,
+                kind="system.notify",
+                group_id=group.group_id,
+                scope_key="",
+                by="system",
+                data={"kind": "info", "title": f"n{i}", "message": "", "target_actor_id": None},
+            )
+
+    def _file_tail(self, group, n: int):
+        from cccc.kernel.ledger import read_last_lines
+
+        return [json.loads(line) for line in read_last_lines(group.ledger_path, n)]
+
+    def test_steady_state_tail_does_not_read_ledger(self) -> None:
+        from cccc.kernel import ledger_tail_cache
+        from cccc.kernel.ledger_tail_cache import recent_ledger_events
+
+        _, cleanup = self._with_home()
+        try:
+            group = self._create_group()
+            self._append_notes(group, 30)
+            warm = recent_ledger_events(group.ledger_path, 20)
+            assert warm is not None
+            self.assertEqual([ev["id"] for ev in warm], [ev["id"] for ev in self._file_tail(group, 20)])
+
+            # In-process appends extend the warm tail directly; later reads only stat().
+            self._append_notes(group, 5, start=30)
+            with patch.object(ledger_tail_cache, "_read_delta", side_effect=AssertionError("read")), patch.object(
+                ledger_tail_cache, "iter_events_reverse", side_effect=AssertionError("reload")
+            ):
+                tail = recent_ledger_events(group.ledger_path, 20)
+            assert tail is not None
+            self.assertEqual([ev["id"] for ev in tail], [ev["id"] for ev in self._file_tail(group, 20)])
+            self.assertEqual(tail[-1]["data"]["title"], "n34")
+        finally:
+            cleanup()
+
+    def test_external_append_is_read_as_delta(self) -> None:
+        from cccc.kernel import ledger_tail_cache
+        from cccc.kernel.ledger_tail_cache import recent_ledger_events
+
+        _, cleanup = self._with_home()
+        try:
+            group = self._create_group()
+            self._append_notes(group, 3)
+            self.assertIsNotNone(recent_ledger_events(group.ledger_path, 10))
+
+            # Simulate another process appending: bypass the in-process hook.
+            with patch.object(ledger_tail_cache, "note_ledger_appended"):
+                self._append_notes(group, 2, start=3)
+            with patch.object(ledger_tail_cache, "iter_events_reverse", side_effect=AssertionError("reload")):
+                tail = recent_ledger_events(group.ledger_path, 2, kinds={"system.notify"})
+            assert tail is not None
+            self.assertEqual([ev["data"]["title"] for ev in tail], ["n3", "n4"])
+        finally:
+            cleanup()
+
+    def test_returned_events_do_not_alias_the_cache(self) -> None:
+        from cccc.kernel.ledger_tail_cache import recent_ledger_events
+
+        _, cleanup = self._with_home()
+        try:
+            group = self._create_group()
+            self._append_notes(group, 3)
+            first = recent_ledger_events(group.ledger_path, 3)
+            assert first is not None
+            first[-1]["data"]["title"] = "mutated"
+            first[-1]["kind"] = "mutated"
+
+            again = recent_ledger_events(group.ledger_path, 3)
+            assert again is not None
+            self.assertEqual((again[-1]["kind"], again[-1]["data"]["title"]), ("system.notify", "n2"))
+        finally:
+            cleanup()
+
+    def test_rotation_reloads_tail_across_segments(self) -> None:
+        from cccc.kernel.ledger_segments import rotate_active_ledger
+        from cccc.kernel.ledger_tail_cache import has_older_ledger_event, recent_ledger_events
+
+        _, cleanup = self._with_home()
+        try:
+            group = self._create_group()
+            self._append_notes(group, 4)
+            self.assertIsNotNone(recent_ledger_events(group.ledger_path, 10))
+
+            rotation = rotate_active_ledger(group.path, reason="test")
+            self.assertTrue(rotation.get("rotated"))
+            self._append_notes(group, 2, start=4)
+
+            tail = recent_ledger_events(group.ledger_path, 5, kinds={"system.notify"})
+            assert tail is not None
+            self.assertEqual([ev["data"]["title"] for ev in tail], ["n1", "n2", "n3", "n4", "n5"])
+            self.assertTrue(has_older_ledger_event(group.ledger_path, tail[0]["id"], kinds={"system.notify"}))
+            self.assertFalse(
+                has_older_ledger_event(group.ledger_path, tail[0]["id"], kinds={"chat.message"})
+            )
+        finally:
+            cleanup()
+
+    def test_tail_is_bounded_by_bytes(self) -> None:
+        from cccc.kernel import ledger_tail_cache
+        from cccc.kernel.ledger_tail_cache import recent_ledger_events
+
+        _, cleanup = self._with_home()
+        try:
+            group = self._create_group()
+            self._append_notes(group, 3)
+            from cccc.kernel.ledger import read_last_lines
+
+            line_size = max(len(line.encode("utf-8")) for line in read_last_lines(group.ledger_path, 3))
+            with patch.object(ledger_tail_cache, "TAIL_MAX_BYTES", line_size * 3):
+                self.assertIsNotNone(recent_ledger_events(group.ledger_path, 3))
+                self._append_notes(group, 3, start=3)
+
+                tail = recent_ledger_events(group.ledger_path, 2)
+                assert tail is not None
+                self.assertEqual([ev["data"]["title"] for ev in tail], ["n4", "n5"])
+                cache = ledger_tail_cache._cache_for(group.ledger_path, create=False)
+                assert cache is not None
+                self.assertLessEqual(cache.bytes, line_size * 3)
+                self.assertEqual(cache.bytes, sum(cache.sizes))
+                # The byte budget evicted older events, so a deeper window falls back to the file.
+                self.assertIsNone(recent_ledger_events(group.ledger_path, 6))
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,6 @@ import selectors
 import socket
 import threading
 import unittest
-from collections import deque
 
 
 class _FakeSelector:
@@ -28,12 +27,14 @@ class _FakeSelector:
 class TestPtyAttachSelectorEvents(unittest.TestCase):
     def test_non_writer_client_registers_with_read_event_even_without_backlog(self) -> None:
         from cccc.runners import pty as pty_runner
+        from cccc.runners.output_ring import OutputRing
 
         session = pty_runner.PtySession.__new__(pty_runner.PtySession)
         session._lock = threading.Lock()
         session._clients = {}
         session._writer_fd = 999  # Simulate an existing writer so this attach is non-writer.
-        session._backlog = deque()
+        session._ring = OutputRing(1024)
+        session._max_backlog_bytes = 1024
         session._selector = _FakeSelector()
 
         client_sock, peer_sock = socket.socketpair()
@@ -0,0 +1,96 @@
+import os
+import socket
+import sys
+import time
+import unittest
+from pathlib import Path
+
+
+class TestOutputRing(unittest.TestCase):
+    def test_offsets_survive_wraparound_and_eviction(self) -> None:
+        from cccc.runners.output_ring import OutputRing
+
+        ring = OutputRing(10)
+        stream = b""
+        for chunk in (b"abc", b"defgh", b"ijklmn", b"", b"0123456789xyz"):
+            ring.write(chunk)
+            stream += chunk
+            self.assertEqual(ring.end_offset, len(stream))
+            self.assertEqual(ring.tail(10), stream[-10:])
+            self.assertEqual(ring.tail(4), stream[-4:])
+
+        self.assertEqual(ring.start_offset, len(stream) - 10)
+        self.assertEqual(ring.read_since(len(stream) - 3), (stream[-3:], len(stream) - 3))
+        # A reader that fell behind the ring resumes at the oldest retained byte.
+        self.assertEqual(ring.read_since(0), (stream[-10:], len(stream) - 10))
+        self.assertEqual(ring.read_since(len(stream) - 8, max_bytes=2), (stream[-8:-6], len(stream) - 8))
+        first, views = ring.views(len(stream) - 10)
+        self.assertEqual(b"".join(bytes(v) for v in views), stream[-10:])
+
+    def test_clear_hides_backlog_without_resetting_offsets(self) -> None:
+        from cccc.runners.output_ring import OutputRing
+
+        ring = OutputRing(64)
+        ring.write(b"before")
+        ring.clear()
+        self.assertEqual((ring.tail(64), len(ring), ring.end_offset), (b"", 0, 6))
+        ring.write(b"after")
+        self.assertEqual(ring.tail(64), b"after")
+        self.assertEqual(ring.read_since(0), (b"after", 6))
+        # Streaming readers (attached clients) still see bytes written before the clear.
+        _, views = ring.views(0)
+        self.assertEqual(b"".join(bytes(v) for v in views), b"beforeafter")
+
+    def test_grows_lazily_up_to_capacity(self) -> None:
+        from cccc.runners.output_ring import OutputRing
+
+        ring = OutputRing(1_000_000)
+        self.assertLess(len(ring._buf), 1_000_000)
+        payload = bytes(range(256)) * 4000
+        ring.write(payload[:100_000])
+        ring.write(payload[100_000:])
+        self.assertEqual(len(ring._buf), 1_000_000)
+        self.assertEqual(ring.tail(1_000_000), payload[-1_000_000:])
+
+
+@unittest.skipIf(os.name == "nt", "POSIX PTY backend")
+class TestPtySessionOutputRing(unittest.TestCase):
+    def test_attach_streams_backlog_and_offset_reads_follow_output(self) -> None:
+        from cccc.runners import pty as pty_runner
+
+        session = pty_runner.PtySession(
+            group_id="g_ring",
+            actor_id="a_ring",
+            cwd=Path.cwd(),
+            command=[sys.executable, "-c", "import sys,time; sys.stdout.write('x' * 5000 + 'END'); sys.stdout.flush(); time.sleep(30)"],
+            env={},
+            max_backlog_bytes=4096,
+        )
+        self.addCleanup(session.stop)
+        deadline = time.monotonic() + 10.0
+        while not session.tail_output(max_bytes=16).endswith(b"END") and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        tail = session.tail_output(max_bytes=0)
+        self.assertEqual(tail, (b"x" * 5000 + b"END")[-4096:])
+        end = session.output_offset()
+        self.assertEqual(end, 5003)
+        self.assertEqual(session.output_since(end - 3), (b"END", end - 3))
+        # Offsets older than the backlog window resume at its start.
+        self.assertEqual(session.output_since(0), (tail, end - 4096))
+
+        ours, theirs = socket.socketpair()
+        self.addCleanup(theirs.close)
+        session.attach_client(ours)
+        theirs.settimeout(5.0)
+        received = b""
+        while len(received) < len(tail):
+            chunk = theirs.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+        self.assertEqual(received, tail)
+
+
+if __name__ == "__main__":
+    unittest.main()
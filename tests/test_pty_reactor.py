@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return bool(predicate())
+
+
+@unittest.skipIf(os.name == "nt", "POSIX PTY backend")
+class TestPtyReactor(unittest.TestCase):
+    def _start(self, actor_id: str, command, on_exit=None):
+        from cccc.runners import pty as pty_runner
+
+        session = pty_runner.PtySession(
+            group_id="g_reactor",
+            actor_id=actor_id,
+            cwd=Path.cwd(),
+            command=command,
+            env={},
+            on_exit=on_exit,
+        )
+        self.addCleanup(session.stop)
+        return session
+
+    def test_sessions_share_one_reactor_thread(self) -> None:
+        before = {t.name for t in threading.enumerate()}
+        sessions = [self._start(f"cat{i}", ["cat"]) for i in range(6)]
+        for i, session in enumerate(sessions):
+            self.assertTrue(session.write_input(f"ping-{i}\n".encode()))
+        for i, session in enumerate(sessions):
+            self.assertTrue(_wait_for(lambda: f"ping-{i}".encode() in session.tail_output(max_bytes=0)))
+
+        names = [t.name for t in threading.enumerate() if t.name not in before]
+        self.assertFalse([n for n in names if n.startswith("cccc-pty:")], names)
+        self.assertLessEqual(len([t for t in threading.enumerate() if t.name == "cccc-pty-reactor"]), 1)
+
+    def test_exit_callback_runs_for_stop_and_natural_exit(self) -> None:
+        exited = []
+        done = threading.Event()
+
+        def on_exit(session) -> None:
+            exited.append(session.actor_id)
+            if len(exited) == 2:
+                done.set()
+
+        stopped = self._start("stopped", ["cat"], on_exit=on_exit)
+        self._start("natural", ["sh", "-c", "exit 0"], on_exit=on_exit)
+        stopped.stop()
+        self.assertTrue(done.wait(10.0), exited)
+        self.assertEqual(sorted(exited), ["natural", "stopped"])
+        self.assertFalse(stopped.is_running())
+
+    def test_restart_cycles_do_not_collide_on_reused_fds(self) -> None:
+        for i in range(10):
+            session = self._start(f"cycle{i}", ["cat"])
+            self.assertTrue(session.write_input(b"hello\n"))
+            self.assertTrue(_wait_for(lambda: b"hello" in session.tail_output(max_bytes=0)))
+            session.stop()
+            self.assertTrue(_wait_for(lambda: not session.is_running()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -49,3 +49,14 @@ class TestServerRequestQueueRouting(unittest.TestCase):
         selected = _request_queue_for(req, read_queue=read_queue, fast_queue=fast_queue, slow_queue=slow_queue)
 
         self.assertIs(selected, read_queue)
+
+    def test_write_lane_is_group_scoped_except_registry_ops(self) -> None:
+        from cccc.daemon.ops.execution_queues import REQUEST_WRITE_GLOBAL_LANE
+        from cccc.daemon.server import _request_write_lane
+
+        self.assertEqual(_request_write_lane(SimpleNamespace(op="actor_start", args={"group_id": "g1"})), "g1")
+        self.assertEqual(_request_write_lane(SimpleNamespace(op="group_update", args={"group_id": "g1"})), REQUEST_WRITE_GLOBAL_LANE)
+        self.assertEqual(_request_write_lane(SimpleNamespace(op="observability_update", args={})), REQUEST_WRITE_GLOBAL_LANE)
+        self.assertEqual(_request_write_lane(SimpleNamespace(op="capability_uninstall", args={"group_id": "g1"})), REQUEST_WRITE_GLOBAL_LANE)
+        self.assertEqual(_request_write_lane(SimpleNamespace(op="group_space_bind", args={"group_id": "g1"})), REQUEST_WRITE_GLOBAL_LANE)
+        self.assertEqual(_request_write_lane(SimpleNamespace(op="group_space_jobs", args={"group_id": "g1"})), REQUEST_WRITE_GLOBAL_LANE)
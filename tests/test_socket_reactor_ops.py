@@ -0,0 +1,113 @@
+import json
+import logging
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+class TestSocketReactorOps(unittest.TestCase):
+    def _start(self, td: str, **kwargs):
+        from cccc.daemon.ops.socket_reactor_ops import RequestFrameReactor
+
+        sock_path = Path(td) / "d.sock"
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen(50)
+        stop = threading.Event()
+        frames: list[dict] = []
+        result: dict = {}
+
+        def on_frame(conn, raw) -> bool:
+            frames.append(raw)
+            conn.sendall((json.dumps({"echo": raw}) + "\n").encode("utf-8"))
+            conn.close()
+            return bool(raw.get("exit"))
+
+        reactor = RequestFrameReactor(server, on_frame=on_frame, stop_event=stop, logger=logging.getLogger("test"), **kwargs)
+        thread = threading.Thread(target=lambda: result.setdefault("exit", reactor.run()), daemon=True)
+        thread.start()
+
+        def shutdown() -> None:
+            stop.set()
+            thread.join(timeout=2)
+            server.close()
+
+        self.addCleanup(shutdown)
+        return sock_path, frames, thread, result
+
+    @staticmethod
+    def _connect(sock_path: Path) -> socket.socket:
+        c = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        c.settimeout(3.0)
+        c.connect(str(sock_path))
+        return c
+
+    @staticmethod
+    def _read_line(c: socket.socket) -> bytes:
+        buf = b""
+        while b"\n" not in buf:
+            chunk = c.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+        return buf
+
+    def test_slow_client_does_not_block_others(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            sock_path, _, _, _ = self._start(td)
+            slow = self._connect(sock_path)
+            slow.sendall(b'{"n": ')
+            time.sleep(0.05)
+
+            started = time.monotonic()
+            fast = self._connect(sock_path)
+            fast.sendall(b'{"n": 2}\n')
+            self.assertEqual(json.loads(self._read_line(fast)), {"echo": {"n": 2}})
+            self.assertLess(time.monotonic() - started, 0.4)
+
+            slow.sendall(b"1}\n")
+            self.assertEqual(json.loads(self._read_line(slow)), {"echo": {"n": 1}})
+            slow.close()
+            fast.close()
+
+    def test_stalled_connection_is_dropped_after_deadline(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            sock_path, frames, _, _ = self._start(td, frame_deadline_s=0.2)
+            stalled = self._connect(sock_path)
+            stalled.sendall(b'{"partial": ')
+            self.assertEqual(stalled.recv(10), b"")
+            self.assertEqual(frames, [])
+            stalled.close()
+
+    def test_oversized_and_eof_frames_are_cut_like_recv_json_line(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            sock_path, frames, _, _ = self._start(td, max_frame_bytes=1000)
+            big = self._connect(sock_path)
+            big.sendall(b"x" * 5000)
+            self.assertEqual(json.loads(self._read_line(big)), {"echo": {}})
+            big.close()
+
+            # A request without a trailing newline still counts once the client half-closes.
+            eof = self._connect(sock_path)
+            eof.sendall(b'{"n": 3}')
+            eof.shutdown(socket.SHUT_WR)
+            self.assertEqual(json.loads(self._read_line(eof)), {"echo": {"n": 3}})
+            eof.close()
+
+    def test_exit_request_stops_reactor(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            sock_path, _, thread, result = self._start(td)
+            c = self._connect(sock_path)
+            c.sendall(b'{"exit": true}\n')
+            self._read_line(c)
+            c.close()
+            thread.join(timeout=2)
+            self.assertFalse(thread.is_alive())
+            self.assertTrue(result["exit"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import time
+import unittest
+from pathlib import Path
+
+
+_TUI_OUTPUT = (
+    "\x1b]0;agent\x07\x1b[?2004hwelcome\r\n"
+    "\x1b[32mstep 1\x1b[0m done\r\n"
+    "spinner |\r\x1b[Kspinner /\r\x1b[Kspinner -\r\n"
+    "────────────────────────────\r\n"
+    "frame A\r\nframe B\r\nframe C\r\n"
+    "frame A\r\nframe B\r\nframe C\r\n"
+    "\x1b[2Aoverwritten\x1b[K\r\n"
+    "tail line\x1b[3Dend\r\n"
+    "prompt> "
+)
+
+
+class TestTerminalScreen(unittest.TestCase):
+    def test_chunked_feed_matches_one_shot_render(self) -> None:
+        from cccc.util.terminal_render import TerminalScreen, render_transcript
+
+        expected = render_transcript(_TUI_OUTPUT, compact=True)
+        self.assertIn("spinner -", expected)
+        self.assertNotIn("spinner |", expected)
+        for size in (1, 2, 3, 7, 64):
+            screen = TerminalScreen()
+            for i in range(0, len(_TUI_OUTPUT), size):
+                screen.feed(_TUI_OUTPUT[i : i + size])
+            self.assertEqual(screen.render(compact=True), expected, size)
+            self.assertEqual(screen.render(compact=False), render_transcript(_TUI_OUTPUT, compact=False), size)
+
+    def test_max_lines_renders_only_the_newest_rows(self) -> None:
+        from cccc.util.terminal_render import TerminalScreen
+
+        screen = TerminalScreen()
+        screen.feed("".join(f"line {i}\r\n" for i in range(1000)))
+        self.assertEqual(screen.render(max_lines=3), "line 997\nline 998\nline 999")
+        screen.feed("line 1000\r\n")
+        self.assertEqual(screen.render(max_lines=2), "line 999\nline 1000")
+
+    def test_scrollback_is_bounded(self) -> None:
+        from cccc.util.terminal_render import TerminalScreen
+
+        screen = TerminalScreen(max_rows=100)
+        for i in range(1000):
+            screen.feed(f"row {i}\n")
+        self.assertLessEqual(screen.row_count, 100 + 100 // 8 + 1)
+        self.assertTrue(screen.render().endswith("row 998\nrow 999"))
+        screen.feed("\x1b[1Aedited")
+        self.assertTrue(screen.render().endswith("row 998\nedited9"))
+
+    def test_stream_transcript_feeds_only_new_bytes_and_restarts_after_gaps(self) -> None:
+        from cccc.util.terminal_render import StreamTranscript
+
+        stream = bytearray()
+        start = [0]
+        reads = []
+
+        def read_since(offset: int):
+            first = max(offset, start[0])
+            reads.append(first)
+            return bytes(stream[first:]), first
+
+        transcript = StreamTranscript()
+        # A UTF-8 sequence split across reads is decoded once both halves arrived.
+        stream += "héllo\r\nwor".encode("utf-8") + "é".encode("utf-8")[:1]
+        self.assertEqual(transcript.render(read_since), "héllo\nwor")
+        stream += "é".encode("utf-8")[1:] + b"ld\r\n"
+        self.assertEqual(transcript.render(read_since), "héllo\nworéld")
+        self.assertEqual(reads[-1], len("héllo\r\nwor".encode("utf-8")) + 1)
+
+        # The backlog was cleared/evicted past the transcript's offset: restart from what survives.
+        stream += b"evicted\r\n"
+        start[0] = len(stream)
+        stream += b"fresh\r\n"
+        self.assertEqual(transcript.render(read_since), "fresh")
+
+    def test_stream_transcript_reset_clears_the_stream_under_the_render_lock(self) -> None:
+        from cccc.util.terminal_render import StreamTranscript
+
+        stream = bytearray(b"old\r\n")
+        transcript = StreamTranscript()
+        self.assertEqual(transcript.render(lambda offset: (bytes(stream[offset:]), offset)), "old")
+        held = []
+
+        def clear_stream() -> None:
+            held.append(transcript._lock.locked())
+            stream.clear()
+
+        transcript.reset(clear_stream)
+        self.assertEqual(held, [True])
+        self.assertEqual(transcript.render(lambda offset: (b"", offset)), "")
+
+
+@unittest.skipIf(os.name == "nt", "POSIX PTY backend")
+class TestPtySessionRenderTail(unittest.TestCase):
+    def test_render_tail_follows_session_output(self) -> None:
+        from cccc.runners import pty as pty_runner
+
+        session = pty_runner.PtySession(group_id="g_screen", actor_id="a_screen", cwd=Path.cwd(), command=["cat"], env={})
+        self.addCleanup(session.stop)
+        for word in ("alpha", "beta"):
+            self.assertTrue(session.write_input(f"{word}\n".encode()))
+            deadline = time.monotonic() + 10.0
+            while word not in session.render_tail(max_lines=5) and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertIn(word, session.render_tail(max_lines=5))
+        session.clear_backlog()
+        self.assertEqual(session.render_tail(max_lines=5), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -737,20 +737,15 @@ class TestWecomSendMessage(unittest.TestCase):
 
 
 class _FakeHttpResponse:
-    def __init__(self, payload: bytes):
-        self._payload = payload
+    def __init__(self, payload: bytes, status_code: int = 200):
+        self.content = payload
+        self.status_code = status_code
 
-    def read(self) -> bytes:
-        return self._payload
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb) -> bool:
-        _ = exc_type
-        _ = exc
-        _ = tb
-        return False
+def _patch_http_client(**request_kwargs):
+    client = unittest.mock.MagicMock()
+    client.request = unittest.mock.MagicMock(**request_kwargs)
+    return patch("cccc.ports.im.adapters.wecom.shared_http_client", return_value=client)
 
 
 class TestWecomAttachments(unittest.TestCase):
@@ -763,15 +758,16 @@ class TestWecomAttachments(unittest.TestCase):
     def test_download_attachment_uses_media_get(self):
         adapter = self._make_adapter()
 
-        def fake_urlopen(req, timeout=0):
-            self.assertIn("/media/get?", req.full_url)
-            self.assertIn("media_id=media_abc", req.full_url)
-            self.assertIn("bot_id=corp", req.full_url)
-            self.assertIn("secret=sec", req.full_url)
+        def fake_request(method, url, timeout=0, **_kwargs):
+            self.assertEqual(method, "GET")
+            self.assertIn("/media/get?", url)
+            self.assertIn("media_id=media_abc", url)
+            self.assertIn("bot_id=corp", url)
+            self.assertIn("secret=sec", url)
             self.assertEqual(timeout, 60)
             return _FakeHttpResponse(b"image-bytes")
 
-        with patch("cccc.ports.im.adapters.wecom.urllib.request.urlopen", side_effect=fake_urlopen):
+        with _patch_http_client(side_effect=fake_request):
             raw = adapter.download_attachment({"media_id": "media_abc"})
 
         self.assertEqual(raw, b"image-bytes")
@@ -779,12 +775,12 @@ class TestWecomAttachments(unittest.TestCase):
     def test_download_attachment_uses_direct_url_and_decrypts_when_aeskey_present(self):
         adapter = self._make_adapter()
 
-        def fake_urlopen(req, timeout=0):
-            self.assertEqual(req.full_url, "https://example.test/media.enc")
+        def fake_request(method, url, timeout=0, **_kwargs):
+            self.assertEqual(url, "https://example.test/media.enc")
             self.assertEqual(timeout, 60)
             return _FakeHttpResponse(b"encrypted-bytes")
 
-        with patch("cccc.ports.im.adapters.wecom.urllib.request.urlopen", side_effect=fake_urlopen):
+        with _patch_http_client(side_effect=fake_request):
             with patch.object(adapter, "_decrypt_media_bytes", return_value=b"plain-bytes") as mock_decrypt:
                 raw = adapter.download_attachment({
                     "download_url": "https://example.test/media.enc",
@@ -799,12 +795,12 @@ class TestWecomAttachments(unittest.TestCase):
         aes_key = "12345678901234567890123456789012"
         encrypted = _encrypt_wecom_media_for_test(b"plain attachment bytes", aes_key)
 
-        def fake_urlopen(req, timeout=0):
-            self.assertEqual(req.full_url, "https://example.test/media.enc")
+        def fake_request(method, url, timeout=0, **_kwargs):
+            self.assertEqual(url, "https://example.test/media.enc")
             self.assertEqual(timeout, 60)
             return _FakeHttpResponse(encrypted)
 
-        with patch("cccc.ports.im.adapters.wecom.urllib.request.urlopen", side_effect=fake_urlopen):
+        with _patch_http_client(side_effect=fake_request):
             with patch.object(subprocess, "run", side_effect=AssertionError("external openssl should not be used")):
                 raw = adapter.download_attachment({
                     "download_url": "https://example.test/media.enc",
@@ -816,12 +812,12 @@ class TestWecomAttachments(unittest.TestCase):
     def test_download_attachment_uses_direct_url_without_decrypt_when_no_aeskey(self):
         adapter = self._make_adapter()
 
-        def fake_urlopen(req, timeout=0):
-            self.assertEqual(req.full_url, "https://example.test/media.bin")
+        def fake_request(method, url, timeout=0, **_kwargs):
+            self.assertEqual(url, "https://example.test/media.bin")
             self.assertEqual(timeout, 60)
             return _FakeHttpResponse(b"raw-bytes")
 
-        with patch("cccc.ports.im.adapters.wecom.urllib.request.urlopen", side_effect=fake_urlopen):
+        with _patch_http_client(side_effect=fake_request):
             with patch.object(adapter, "_decrypt_media_bytes") as mock_decrypt:
                 raw = adapter.download_attachment({
                     "download_url": "https://example.test/media.bin",
@@ -838,7 +834,7 @@ class TestWecomAttachments(unittest.TestCase):
             image_path = Path(td) / "photo.png"
             image_path.write_bytes(b"\x89PNG\r\n\x1a\nfake")
 
-            with patch("cccc.ports.im.adapters.wecom.urllib.request.urlopen") as mock_urlopen:
+            with _patch_http_client() as mock_http_client:
                 with patch.object(adapter, "_ws_send_and_wait_ack", return_value=(True, {"errcode": 0})) as mock_ws:
                     with patch.object(adapter, "send_message", return_value=True) as mock_caption:
                         ok = adapter.send_file(
@@ -849,7 +845,7 @@ class TestWecomAttachments(unittest.TestCase):
                         )
 
         self.assertTrue(ok)
-        mock_urlopen.assert_not_called()
+        mock_http_client.return_value.request.assert_not_called()
         payload = mock_ws.call_args[0][0]
         self.assertEqual(payload["cmd"], "aibot_respond_msg")
         self.assertEqual(payload["headers"]["req_id"], "req_test")
@@ -875,17 +871,13 @@ class TestWecomAttachments(unittest.TestCase):
 
         # Mock HTTP upload response
         upload_response = json.dumps({"errcode": 0, "media_id": "media_file"}).encode()
-        mock_resp = unittest.mock.MagicMock()
-        mock_resp.read.return_value = upload_response
-        mock_resp.status = 200
-        mock_resp.__enter__ = lambda s: s
-        mock_resp.__exit__ = unittest.mock.MagicMock(return_value=False)
+        mock_resp = _FakeHttpResponse(upload_response)
 
         with tempfile.TemporaryDirectory() as td:
             file_path = Path(td) / "report.pdf"
             file_path.write_bytes(b"%PDF-1.4")
 
-            with patch("urllib.request.urlopen", return_value=mock_resp) as mock_urlopen:
+            with _patch_http_client(return_value=mock_resp) as mock_http_client:
                 with patch.object(adapter, "_ws_send_and_wait_ack", side_effect=fake_ws_send_and_wait_ack) as mock_ws:
                     with patch.object(adapter, "send_message", return_value=True) as mock_caption:
                         ok = adapter.send_file(
@@ -897,7 +889,7 @@ class TestWecomAttachments(unittest.TestCase):
 
         self.assertTrue(ok)
         # HTTP upload should have been called
-        mock_urlopen.assert_called_once()
+        mock_http_client.return_value.request.assert_called_once()
         # WS respond_msg should contain file msgtype with correct media_id
         respond = [c for c in ws_calls if c.get("cmd") == "aibot_respond_msg"]
         self.assertEqual(len(respond), 1)
@@ -2,7 +2,6 @@ import os
 import queue
 import time
 import unittest
-from collections import deque
 from pathlib import Path
 
 
@@ -32,6 +31,7 @@ class _NonReentrantLock:
 
 class TestWindowsPtyBackendInternals(unittest.TestCase):
     def test_on_wake_readable_does_not_reenter_session_lock(self) -> None:
+        from cccc.runners.output_ring import OutputRing
         from cccc.runners.pty_win import PtySession
 
         session = object.__new__(PtySession)
@@ -42,8 +42,7 @@ class TestWindowsPtyBackendInternals(unittest.TestCase):
         session._lock = _NonReentrantLock()
         session._clients = {}
         session._running = True
-        session._backlog = deque()
-        session._backlog_bytes = 0
+        session._ring = OutputRing(4096)
         session._first_output_at = None
         session._last_output_at = None
         session._max_backlog_bytes = 1024